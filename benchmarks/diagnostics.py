@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+#
+# Compares the time taken to calculate the effective sample size and rhat with
+# the FFT-based, vectorised diagnostics, and with the previous implementation
+# (which used an O(n^2) autocorrelation, and handled one parameter at a time).
+#
+# This file is part of PINTS.
+#  Copyright (c) 2017-2018, University of Oxford.
+#  For licensing information, see the LICENSE file distributed with the PINTS
+#  software package.
+#
+from __future__ import absolute_import, division
+from __future__ import print_function, unicode_literals
+import argparse
+import timeit
+
+import numpy as np
+
+import pints
+import pints._diagnostics
+
+
+def previous_ess(samples):
+    """
+    Effective sample size, as calculated by the previous implementation.
+    """
+    ess = []
+    for i in range(samples.shape[1]):
+        x = samples[:, i]
+        x = (x - np.mean(x)) / (np.std(x) * np.sqrt(len(x)))
+        rho = np.correlate(x, x, mode='full')
+        rho = rho[int(rho.size / 2):]
+        T = pints._diagnostics.autocorrelate_negative(rho)
+        ess.append(len(x) / (1 + 2 * np.sum(rho[0:T])))
+    return ess
+
+
+def previous_rhat(chains):
+    """
+    Rhat, as calculated by the previous implementation.
+    """
+    return [pints._diagnostics.rhat(x)
+            for x in pints._diagnostics.reorder_all_params(chains)]
+
+
+def timed(f, *args):
+    """
+    Returns the result of ``f(*args)`` and the time it took, in seconds.
+    """
+    t = timeit.default_timer()
+    result = f(*args)
+    return result, timeit.default_timer() - t
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description='Benchmarks the MCMC diagnostics.')
+    parser.add_argument(
+        '--iterations', type=int, nargs='+',
+        default=[1000, 10000, 100000, 1000000],
+        help='Numbers of iterations per chain.')
+    parser.add_argument(
+        '--chains', type=int, default=4, help='Number of chains.')
+    parser.add_argument(
+        '--parameters', type=int, default=10, help='Number of parameters.')
+    parser.add_argument(
+        '--max-previous', type=int, default=100000,
+        help='Largest number of samples to run the previous ESS on.')
+    args = parser.parse_args()
+
+    print('Time (s) for ' + str(args.chains) + ' chains, '
+          + str(args.parameters) + ' parameters')
+    print('{:>10s}{:>12s}{:>12s}{:>12s}{:>12s}{:>12s}'.format(
+        'iterations', 'prev. ess', 'ess', 'prev. rhat', 'rhat',
+        'rank diag.'))
+    for n in args.iterations:
+        np.random.seed(1)
+        chains = np.random.normal(size=(args.chains, n, args.parameters))
+        stacked = np.vstack(chains)
+
+        if len(stacked) <= args.max_previous:
+            ess0, t_ess0 = timed(previous_ess, stacked)
+            ess1, t_ess1 = timed(pints.effective_sample_size, stacked)
+            assert np.allclose(ess0, ess1)
+            t_ess0 = '{:>12.4f}'.format(t_ess0)
+        else:
+            ess1, t_ess1 = timed(pints.effective_sample_size, stacked)
+            t_ess0 = '{:>12s}'.format('-')
+
+        rhat0, t_rhat0 = timed(previous_rhat, chains)
+        rhat1, t_rhat1 = timed(pints.rhat_all_params, chains)
+        assert np.allclose(rhat0, rhat1)
+
+        t = timeit.default_timer()
+        pints.rank_normalised_rhat(chains)
+        pints.bulk_effective_sample_size(chains)
+        pints.tail_effective_sample_size(chains)
+        pints.monte_carlo_standard_error(chains)
+        t_rank = timeit.default_timer() - t
+
+        print('{:>10d}'.format(n) + t_ess0 + ''.join(
+            ['{:>12.4f}'.format(x) for x in (t_ess1, t_rhat0, t_rhat1, t_rank)]
+        ))
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+#
+# Benchmarks the number of evaluations per second achieved by the evaluators,
+# on a cheap sum-of-squares error for the logistic toy model.
+#
+# This file is part of PINTS.
+#  Copyright (c) 2017-2018, University of Oxford.
+#  For licensing information, see the LICENSE file distributed with the PINTS
+#  software package.
+#
+from __future__ import absolute_import, division
+from __future__ import print_function, unicode_literals
+import argparse
+import timeit
+
+import numpy as np
+
+import pints
+import pints.toy
+
+
+def benchmark(evaluator, positions, repeats):
+    """
+    Returns the number of evaluations per second achieved by ``evaluator``.
+    """
+    # Warm up (starts any worker processes)
+    evaluator.evaluate(positions)
+
+    t = timeit.default_timer()
+    for i in range(repeats):
+        evaluator.evaluate(positions)
+    return repeats * len(positions) / (timeit.default_timer() - t)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description='Benchmarks the PINTS evaluators.')
+    parser.add_argument(
+        '--points', type=int, default=1000,
+        help='Number of points evaluated per call.')
+    parser.add_argument(
+        '--repeats', type=int, default=20,
+        help='Number of calls to time.')
+    parser.add_argument(
+        '--workers', type=int, default=None,
+        help='Number of worker processes.')
+    args = parser.parse_args()
+
+    model = pints.toy.LogisticModel()
+    times = np.linspace(0, 1000, 100)
+    values = model.simulate([0.015, 500], times)
+    problem = pints.SingleOutputProblem(model, times, values)
+    error = pints.SumOfSquaresError(problem)
+    positions = np.random.uniform([0.01, 400], [0.02, 600], (args.points, 2))
+
+    evaluators = [
+        ('SequentialEvaluator', pints.SequentialEvaluator(error)),
+        ('BatchEvaluator', pints.BatchEvaluator(error)),
+        ('ParallelEvaluator', pints.ParallelEvaluator(
+            error, n_workers=args.workers)),
+        ('SharedMemoryEvaluator', pints.SharedMemoryEvaluator(
+            error, n_workers=args.workers)),
+    ]
+    print('Evaluating ' + str(args.points) + ' points, '
+          + str(args.repeats) + ' times.')
+    for name, evaluator in evaluators:
+        rate = benchmark(evaluator, positions, args.repeats)
+        print('{:<24} {:>12.0f} evaluations/s'.format(name, rate))
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+#
+# Measures the time taken to save and load chains with pints.io, and compares
+# it with a row-by-row, pure Python implementation.
+#
+# This file is part of PINTS.
+#  Copyright (c) 2017-2018, University of Oxford.
+#  For licensing information, see the LICENSE file distributed with the PINTS
+#  software package.
+#
+from __future__ import absolute_import, division
+from __future__ import print_function, unicode_literals
+import argparse
+import os
+import shutil
+import tempfile
+import timeit
+
+import numpy as np
+
+import pints
+import pints.io
+
+
+def reference_save(filename, samples):
+    """ Saves samples one float at a time. """
+    with open(filename, 'w') as f:
+        f.write(','.join(['"p' + str(j) + '"' for j in range(
+            samples.shape[1])]) + '\n')
+        for sample in samples:
+            f.write(','.join([pints.strfloat(x) for x in sample]) + '\n')
+
+
+def reference_load(filename):
+    """ Loads samples one float at a time. """
+    with open(filename, 'r') as f:
+        lines = iter(f)
+        next(lines)
+        return np.asarray(
+            [[float(x) for x in line.split(',')] for line in lines])
+
+
+def time(f, *args, **kwargs):
+    """ Calls ``f`` and returns the time taken and the result. """
+    t = timeit.default_timer()
+    result = f(*args, **kwargs)
+    return timeit.default_timer() - t, result
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description='Benchmarks saving and loading samples with pints.io.')
+    parser.add_argument(
+        '--samples', type=int, default=100000, help='Samples per chain.')
+    parser.add_argument(
+        '--parameters', type=int, default=20, help='Number of parameters.')
+    parser.add_argument(
+        '--chains', type=int, default=4, help='Number of chains.')
+    args = parser.parse_args()
+
+    chains = [np.random.normal(size=(args.samples, args.parameters))
+              for i in range(args.chains)]
+    n = args.chains
+
+    d = tempfile.mkdtemp()
+    try:
+        path = os.path.join(d, 'chain.csv')
+        paths = [os.path.join(d, 'chain_' + str(i) + '.csv')
+                 for i in range(n)]
+        print('Chains of ' + str(args.samples) + ' x ' + str(args.parameters)
+              + ' samples, ' + str(n) + ' files.')
+
+        # Saving
+        t0, _ = time(lambda: [reference_save(p, c)
+                              for p, c in zip(paths, chains)])
+        t1, _ = time(pints.io.save_samples, path, *chains)
+        print('Save CSV:              reference {:>7.2f} s  pints.io {:>7.2f}'
+              ' s  gain {:>5.2f}x'.format(t0, t1, t0 / t1))
+
+        # Loading
+        t0, r0 = time(lambda: [reference_load(p) for p in paths])
+        t1, r1 = time(pints.io.load_samples, path, n)
+        assert all(np.all(a == b) for a, b in zip(r0, r1))
+        assert all(np.all(a == b) for a, b in zip(chains, r1))
+        print('Load CSV:              reference {:>7.2f} s  pints.io {:>7.2f}'
+              ' s  gain {:>5.2f}x'.format(t0, t1, t0 / t1))
+
+        # Loading in parallel
+        t2, r2 = time(pints.io.load_samples, path, n, parallel=True)
+        assert all(np.all(a == b) for a, b in zip(r1, r2))
+        print('Load CSV in parallel:  reference {:>7.2f} s  pints.io {:>7.2f}'
+              ' s  gain {:>5.2f}x ({} cores)'.format(
+                  t0, t2, t0 / t2, pints.ParallelEvaluator.cpu_count()))
+
+        # Loading with burn-in and thinning
+        b = args.samples // 2
+        t3, r3 = time(pints.io.load_samples, path, n, burn_in=b, thinning=10)
+        assert all(np.all(a[b::10] == c) for a, c in zip(chains, r3))
+        print('Load half, thinned:    reference {:>7.2f} s  pints.io {:>7.2f}'
+              ' s  gain {:>5.2f}x'.format(t0, t3, t0 / t3))
+
+        # Binary files
+        path = os.path.join(d, 'chain.npy')
+        t4, _ = time(pints.io.save_samples, path, *chains)
+        t5, r5 = time(
+            lambda: [np.array(x) for x in pints.io.load_samples(path, n)])
+        assert all(np.all(a == c) for a, c in zip(chains, r5))
+        print('Save/load binary:      save {:>7.2f} s  load {:>7.2f} s'.format(
+            t4, t5))
+    finally:
+        shutil.rmtree(d)
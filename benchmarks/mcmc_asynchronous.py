@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+#
+# Compares the throughput of lockstep and asynchronous MCMC runs, using slice
+# sampling (which needs a variable number of evaluations per sample) on a
+# log-pdf with a variable evaluation time.
+#
+# This file is part of PINTS.
+#  Copyright (c) 2017-2018, University of Oxford.
+#  For licensing information, see the LICENSE file distributed with the PINTS
+#  software package.
+#
+from __future__ import absolute_import, division
+from __future__ import print_function, unicode_literals
+import argparse
+import time
+import timeit
+
+import numpy as np
+
+import pints
+import pints.toy
+
+
+class SlowLogPDF(pints.LogPDF):
+    """
+    Wraps a LogPDF, adding a delay of up to ``delay`` seconds (which releases
+    the GIL, like an ODE solver would).
+    """
+    def __init__(self, log_pdf, delay):
+        self._log_pdf = log_pdf
+        self._delay = delay
+
+    def n_parameters(self):
+        return self._log_pdf.n_parameters()
+
+    def __call__(self, x):
+        time.sleep(self._delay * (abs(x[0]) * 1e6 % 1))
+        return self._log_pdf(x)
+
+
+def run(log_pdf, x0, method, iterations, workers, asynchronous):
+    """
+    Runs an MCMC routine and returns the number of samples per second.
+    """
+    np.random.seed(1)
+    mcmc = pints.MCMCController(log_pdf, len(x0), x0, method=method)
+    mcmc.set_max_iterations(iterations)
+    mcmc.set_log_to_screen(False)
+    mcmc.set_parallel(workers, backend='threads')
+    mcmc.set_asynchronous(asynchronous)
+    t = timeit.default_timer()
+    mcmc.run()
+    return len(x0) * iterations / (timeit.default_timer() - t)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description='Compares lockstep and asynchronous MCMC.')
+    parser.add_argument(
+        '--chains', type=int, default=8, help='Number of chains.')
+    parser.add_argument(
+        '--iterations', type=int, default=50, help='Number of iterations.')
+    parser.add_argument(
+        '--delay', type=float, default=0.02,
+        help='Maximum evaluation time, in seconds.')
+    args = parser.parse_args()
+
+    log_pdf = SlowLogPDF(
+        pints.toy.GaussianLogPDF([0, 0], [1, 2]), args.delay)
+    x0 = np.random.uniform(-1, 1, size=(args.chains, 2))
+
+    print('Samples per second, using ' + str(args.chains) + ' chains and '
+          + str(args.chains) + ' worker threads.')
+    for method in (pints.SliceDoublingMCMC, pints.SliceStepoutMCMC):
+        lockstep = run(
+            log_pdf, x0, method, args.iterations, args.chains, False)
+        asynchronous = run(
+            log_pdf, x0, method, args.iterations, args.chains, True)
+        print('{:<20} lockstep {:>8.1f}  asynchronous {:>8.1f}  '
+              'gain {:>5.2f}x'.format(
+                  method.__name__, lockstep, asynchronous,
+                  asynchronous / lockstep))
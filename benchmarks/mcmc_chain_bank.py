@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+#
+# Measures the time taken to run many chains of a cheap log pdf with
+# independent single-chain samplers, and with a vectorised chain bank.
+#
+# This file is part of PINTS.
+#  Copyright (c) 2017-2018, University of Oxford.
+#  For licensing information, see the LICENSE file distributed with the PINTS
+#  software package.
+#
+from __future__ import absolute_import, division
+from __future__ import print_function, unicode_literals
+import argparse
+import timeit
+
+import numpy as np
+
+import pints
+
+
+class StandardNormalLogPDF(pints.LogPDF):
+    """ A log pdf that is as cheap as possible to evaluate. """
+
+    def __init__(self, n_parameters):
+        self._n_parameters = n_parameters
+
+    def __call__(self, x):
+        return -0.5 * np.dot(x, x)
+
+    def n_parameters(self):
+        return self._n_parameters
+
+
+def run(method, log_pdf, x0, iterations):
+    """ Runs an MCMC controller and returns the time taken. """
+    mcmc = pints.MCMCController(log_pdf, len(x0), x0, method=method)
+    mcmc.set_max_iterations(iterations)
+    mcmc.set_initial_phase_iterations(iterations // 4)
+    mcmc.set_log_to_screen(False)
+    t = timeit.default_timer()
+    mcmc.run()
+    return timeit.default_timer() - t
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description='Benchmarks single-chain adaptive covariance MCMC against'
+                    ' a vectorised chain bank.')
+    parser.add_argument(
+        '--chains', type=int, nargs='+', default=[1, 8, 64, 256],
+        help='Numbers of chains.')
+    parser.add_argument(
+        '--parameters', type=int, default=10, help='Number of parameters.')
+    parser.add_argument(
+        '--iterations', type=int, default=1000, help='Number of iterations.')
+    args = parser.parse_args()
+
+    log_pdf = StandardNormalLogPDF(args.parameters)
+    print('Seconds to run ' + str(args.iterations) + ' iterations with '
+          + str(args.parameters) + ' parameters.')
+    print('Chains  HaarioBardenetACMC  BankedHaarioBardenetACMC   gain')
+    for n in args.chains:
+        x0 = np.random.normal(size=(n, args.parameters))
+        t0 = run(pints.HaarioBardenetACMC, log_pdf, x0, args.iterations)
+        t1 = run(pints.BankedHaarioBardenetACMC, log_pdf, x0, args.iterations)
+        print('{:>6d} {:>19.2f} {:>25.2f} {:>6.1f}x'.format(
+            n, t0, t1, t0 / t1))
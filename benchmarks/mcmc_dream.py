@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+#
+# Measures the number of DREAM iterations per second, for different numbers
+# of chains and parameters, using a log pdf that is as cheap as possible to
+# evaluate (so that the time spent in the sampler dominates).
+#
+# This file is part of PINTS.
+#  Copyright (c) 2017-2018, University of Oxford.
+#  For licensing information, see the LICENSE file distributed with the PINTS
+#  software package.
+#
+from __future__ import absolute_import, division
+from __future__ import print_function, unicode_literals
+import argparse
+import timeit
+
+import numpy as np
+
+import pints
+
+
+def iterations_per_second(n_chains, n_parameters, iterations):
+    """
+    Runs DREAM with the ask-and-tell interface, and returns the number of
+    iterations per second.
+    """
+    np.random.seed(1)
+    x0 = np.random.normal(size=(n_chains, n_parameters))
+    mcmc = pints.DreamMCMC(n_chains, x0)
+    t = timeit.default_timer()
+    for i in range(iterations):
+        xs = mcmc.ask()
+        mcmc.tell(-0.5 * np.sum(xs**2, axis=1))
+    return iterations / (timeit.default_timer() - t)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description='Benchmarks the number of DREAM iterations per second.')
+    parser.add_argument(
+        '--chains', type=int, nargs='+', default=[10, 30, 100],
+        help='Numbers of chains.')
+    parser.add_argument(
+        '--parameters', type=int, nargs='+', default=[5, 20, 50],
+        help='Numbers of parameters.')
+    parser.add_argument(
+        '--iterations', type=int, default=200, help='Number of iterations.')
+    args = parser.parse_args()
+
+    print('DREAM iterations per second')
+    print('Chains  ' + ''.join(
+        ['{:>10s}'.format(str(d) + ' params') for d in args.parameters]))
+    for n in args.chains:
+        rates = [iterations_per_second(n, d, args.iterations)
+                 for d in args.parameters]
+        print('{:>6d}  '.format(n) + ''.join(
+            ['{:>10.0f}'.format(r) for r in rates]))
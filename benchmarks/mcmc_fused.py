@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+#
+# Measures the time taken to run gradient-based samplers on a cheap log pdf,
+# with and without fused iterations.
+#
+# This file is part of PINTS.
+#  Copyright (c) 2017-2018, University of Oxford.
+#  For licensing information, see the LICENSE file distributed with the PINTS
+#  software package.
+#
+from __future__ import absolute_import, division
+from __future__ import print_function, unicode_literals
+import argparse
+import timeit
+
+import numpy as np
+
+import pints
+import pints.toy
+
+
+def run(method, log_pdf, x0, iterations, fused, parallel):
+    """ Runs an MCMC controller and returns the time taken. """
+    np.random.seed(1)
+    mcmc = pints.MCMCController(log_pdf, len(x0), x0, method=method)
+    mcmc.set_max_iterations(iterations)
+    mcmc.set_initial_phase_iterations(iterations // 4)
+    mcmc.set_log_to_screen(False)
+    mcmc.set_fused_iterations(fused)
+    mcmc.set_parallel(parallel)
+    t = timeit.default_timer()
+    mcmc.run()
+    return timeit.default_timer() - t
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description='Benchmarks gradient-based samplers with and without'
+                    ' fused iterations.')
+    parser.add_argument(
+        '--chains', type=int, default=4, help='Number of chains.')
+    parser.add_argument(
+        '--parameters', type=int, default=10, help='Number of parameters.')
+    parser.add_argument(
+        '--iterations', type=int, default=500, help='Number of iterations.')
+    parser.add_argument(
+        '--parallel', action='store_true',
+        help='Run the chains in parallel.')
+    args = parser.parse_args()
+
+    n = args.parameters
+    log_pdf = pints.toy.GaussianLogPDF(np.zeros(n), np.ones(n))
+    x0 = np.random.normal(size=(args.chains, n))
+    print('Seconds to run ' + str(args.iterations) + ' iterations of '
+          + str(args.chains) + ' chains with ' + str(n) + ' parameters.')
+    print('Method                   Unfused    Fused   gain')
+    for method in (pints.HamiltonianMCMC, pints.NoUTurnMCMC):
+        t0 = run(method, log_pdf, x0, args.iterations, False, args.parallel)
+        t1 = run(method, log_pdf, x0, args.iterations, True, args.parallel)
+        print('{:<22s} {:>9.2f} {:>8.2f} {:>5.1f}x'.format(
+            method.__name__, t0, t1, t0 / t1))
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+#
+# Compares the number of gradient evaluations per effective sample for
+# Hamiltonian MCMC methods with and without mass matrix adaptation, on a badly
+# scaled (and correlated) Gaussian distribution.
+#
+# This file is part of PINTS.
+#  Copyright (c) 2017-2018, University of Oxford.
+#  For licensing information, see the LICENSE file distributed with the PINTS
+#  software package.
+#
+from __future__ import absolute_import, division
+from __future__ import print_function, unicode_literals
+import argparse
+
+import numpy as np
+
+import pints
+import pints.toy
+
+
+class CountingLogPDF(pints.LogPDF):
+    """ Wraps a log pdf and counts the number of gradient evaluations. """
+
+    def __init__(self, log_pdf):
+        self._log_pdf = log_pdf
+        self.count = 0
+
+    def __call__(self, x):
+        return self._log_pdf(x)
+
+    def evaluateS1(self, x):
+        self.count += 1
+        return self._log_pdf.evaluateS1(x)
+
+    def n_parameters(self):
+        return self._log_pdf.n_parameters()
+
+
+def run(method, adaptation, log_pdf, x0, iterations, warm_up):
+    """
+    Runs an MCMC controller and returns the number of gradient evaluations per
+    effective sample (using the minimum effective sample size over all
+    parameters, after discarding the warm-up).
+    """
+    log_pdf = CountingLogPDF(log_pdf)
+    mcmc = pints.MCMCController(log_pdf, 1, [x0], method=method)
+    mcmc.set_max_iterations(iterations)
+    mcmc.set_initial_phase_iterations(warm_up)
+    mcmc.set_log_to_screen(False)
+    mcmc.samplers()[0].set_mass_matrix_adaptation(adaptation)
+    chain = mcmc.run()[0]
+    ess = np.min(pints.effective_sample_size(chain[warm_up:]))
+    return log_pdf.count / ess
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description='Benchmarks gradient evaluations per effective sample'
+                    ' with and without mass matrix adaptation.')
+    parser.add_argument(
+        '--iterations', type=int, default=2000, help='Number of iterations.')
+    parser.add_argument(
+        '--warm-up', type=int, default=500,
+        help='Number of warm-up iterations to discard (and use for'
+             ' adaptation).')
+    parser.add_argument(
+        '--seed', type=int, default=1, help='Random seed.')
+    args = parser.parse_args()
+
+    # Create a Gaussian with standard deviations spanning four orders of
+    # magnitude, and a correlation between the last two parameters
+    std = np.array([0.01, 0.1, 1, 10, 100])
+    corr = np.eye(len(std))
+    corr[3, 4] = corr[4, 3] = 0.9
+    mean = 10 * std
+    log_pdf = pints.toy.GaussianLogPDF(mean, corr * np.outer(std, std))
+    x0 = mean * 1.01
+
+    print('Gradient evaluations per effective sample, using '
+          + str(args.iterations) + ' iterations.')
+    print('Method                  None   Diagonal      Dense')
+    for method in (pints.HamiltonianMCMC, pints.NoUTurnMCMC):
+        results = []
+        for adaptation in (None, 'diagonal', 'dense'):
+            np.random.seed(args.seed)
+            results.append(run(
+                method, adaptation, log_pdf, x0, args.iterations,
+                args.warm_up))
+        print('{:<17s} {:>10.1f} {:>10.1f} {:>10.1f}'.format(
+            method.__name__, *results))
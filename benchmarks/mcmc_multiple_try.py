@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+#
+# Measures the mixing of a single multiple-try Metropolis chain, for different
+# numbers of tries (i.e. candidates that can be evaluated in parallel).
+#
+# This file is part of PINTS.
+#  Copyright (c) 2017-2018, University of Oxford.
+#  For licensing information, see the LICENSE file distributed with the PINTS
+#  software package.
+#
+from __future__ import absolute_import, division
+from __future__ import print_function, unicode_literals
+import argparse
+
+import numpy as np
+
+import pints
+import pints.toy
+
+
+def min_ess(n_tries, independent, log_pdf, x0, sigma0, iterations):
+    """
+    Runs a single chain, and returns its minimum effective sample size over
+    all parameters.
+    """
+    np.random.seed(1)
+    mcmc = pints.MCMCController(
+        log_pdf, 1, [x0], sigma0=sigma0, method=pints.MultipleTryMCMC)
+    mcmc.samplers()[0].set_n_tries(n_tries)
+    mcmc.samplers()[0].set_independent_proposals(independent)
+    mcmc.set_max_iterations(iterations)
+    mcmc.set_log_to_screen(False)
+    chain = mcmc.run()[0][iterations // 10:]
+    return np.min(pints.effective_sample_size(chain))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description='Benchmarks the effective sample size per iteration of'
+                    ' multiple-try Metropolis.')
+    parser.add_argument(
+        '--tries', type=int, nargs='+', default=[1, 2, 4, 8, 16],
+        help='Numbers of tries.')
+    parser.add_argument(
+        '--parameters', type=int, default=5, help='Number of parameters.')
+    parser.add_argument(
+        '--iterations', type=int, default=5000, help='Number of iterations.')
+    args = parser.parse_args()
+
+    # Correlated Gaussian target, with a random walk proposal covariance that
+    # is too large for plain Metropolis
+    n = args.parameters
+    sigma = 0.5 * np.ones((n, n)) + 0.5 * np.eye(n)
+    log_pdf = pints.toy.GaussianLogPDF(np.zeros(n), sigma)
+    x0 = np.zeros(n)
+    sigma0 = 2 * sigma
+
+    print('Minimum ESS per 1000 iterations, with ' + str(n) + ' parameters.')
+    print('Tries  Random walk  Independent')
+    for k in args.tries:
+        e1 = min_ess(k, False, log_pdf, x0, sigma0, args.iterations)
+        e2 = min_ess(k, True, log_pdf, x0, 4 * sigma, args.iterations)
+        print('{:>5d} {:>12.0f} {:>12.0f}'.format(
+            k, 1000 * e1 / args.iterations, 1000 * e2 / args.iterations))
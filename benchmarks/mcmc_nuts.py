@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+#
+# Compares the number of effective samples per gradient evaluation obtained
+# with Hamiltonian MCMC and with the No-U-Turn sampler, on a Fitzhugh-Nagumo
+# model with a Gaussian log-likelihood.
+#
+# This file is part of PINTS.
+#  Copyright (c) 2017-2018, University of Oxford.
+#  For licensing information, see the LICENSE file distributed with the PINTS
+#  software package.
+#
+from __future__ import absolute_import, division
+from __future__ import print_function, unicode_literals
+import argparse
+import timeit
+
+import numpy as np
+
+import pints
+import pints.toy
+
+
+class CountingLogPDF(pints.LogPDF):
+    """ Wraps a log pdf and counts the number of gradient evaluations. """
+
+    def __init__(self, log_pdf):
+        self._log_pdf = log_pdf
+        self.count = 0
+
+    def __call__(self, x):
+        return self._log_pdf(x)
+
+    def evaluateS1(self, x):
+        self.count += 1
+        return self._log_pdf.evaluateS1(x)
+
+    def n_parameters(self):
+        return self._log_pdf.n_parameters()
+
+
+def run(method, log_pdf, x0, iterations, warm_up):
+    """
+    Runs an MCMC controller and returns the minimum effective sample size
+    (over all parameters, after discarding the warm-up), the number of
+    gradient evaluations, and the time taken.
+    """
+    log_pdf = CountingLogPDF(log_pdf)
+    mcmc = pints.MCMCController(log_pdf, 1, [x0], method=method)
+    mcmc.set_max_iterations(iterations)
+    mcmc.set_log_to_screen(False)
+    if mcmc.method_needs_initial_phase():
+        mcmc.set_initial_phase_iterations(warm_up)
+    t = timeit.default_timer()
+    chain = mcmc.run()[0]
+    t = timeit.default_timer() - t
+    ess = np.min(pints.effective_sample_size(chain[warm_up:]))
+    return ess, log_pdf.count, t
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description='Benchmarks effective samples per gradient evaluation for'
+                    ' HamiltonianMCMC and NoUTurnMCMC.')
+    parser.add_argument(
+        '--iterations', type=int, default=1000, help='Number of iterations.')
+    parser.add_argument(
+        '--warm-up', type=int, default=200,
+        help='Number of warm-up iterations to discard (and use for step size'
+             ' adaptation).')
+    parser.add_argument(
+        '--seed', type=int, default=1, help='Random seed.')
+    args = parser.parse_args()
+
+    # Create a Fitzhugh-Nagumo problem with noisy data
+    np.random.seed(args.seed)
+    model = pints.toy.FitzhughNagumoModel()
+    times = model.suggested_times()
+    real_parameters = model.suggested_parameters()
+    values = model.simulate(real_parameters, times)
+    values += np.random.normal(0, 0.1, values.shape)
+    problem = pints.MultiOutputProblem(model, times, values)
+    log_pdf = pints.GaussianLogLikelihood(problem)
+    x0 = np.concatenate((real_parameters, [0.1, 0.1])) * 1.01
+
+    print('Running ' + str(args.iterations) + ' iterations.')
+    print('Method                         ESS  Gradients  ESS/1000 gradients'
+          '   Time (s)')
+    for method in (pints.HamiltonianMCMC, pints.NoUTurnMCMC):
+        np.random.seed(args.seed)
+        ess, n, t = run(method, log_pdf, x0, args.iterations, args.warm_up)
+        print('{:<25s} {:>8.1f} {:>10d} {:>19.2f} {:>10.1f}'.format(
+            method.__name__, ess, n, 1000 * ess / n, t))
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+#
+# Measures the speed-up obtained by speculative prefetching, for a single
+# Metropolis or adaptive covariance chain on a log-pdf with a fixed evaluation
+# time.
+#
+# This file is part of PINTS.
+#  Copyright (c) 2017-2018, University of Oxford.
+#  For licensing information, see the LICENSE file distributed with the PINTS
+#  software package.
+#
+from __future__ import absolute_import, division
+from __future__ import print_function, unicode_literals
+import argparse
+import time
+import timeit
+
+import numpy as np
+
+import pints
+import pints.toy
+
+
+class SlowLogPDF(pints.LogPDF):
+    """
+    Wraps a LogPDF, adding a delay of ``delay`` seconds (which releases the
+    GIL, like an ODE solver would).
+    """
+    def __init__(self, log_pdf, delay):
+        self._log_pdf = log_pdf
+        self._delay = delay
+
+    def n_parameters(self):
+        return self._log_pdf.n_parameters()
+
+    def __call__(self, x):
+        time.sleep(self._delay)
+        return self._log_pdf(x)
+
+
+def run(log_pdf, x0, sigma0, method, iterations, workers):
+    """
+    Runs a single chain, and returns the chain and the time taken.
+    """
+    np.random.seed(1)
+    mcmc = pints.MCMCController(log_pdf, 1, [x0], sigma0, method=method)
+    mcmc.set_max_iterations(iterations)
+    mcmc.set_log_to_screen(False)
+    if workers > 1:
+        mcmc.set_parallel(workers, backend='threads')
+        mcmc.set_prefetching(True)
+    t = timeit.default_timer()
+    chain = mcmc.run()[0]
+    return chain, timeit.default_timer() - t
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description='Benchmarks speculative prefetching for a single chain.')
+    parser.add_argument(
+        '--workers', type=int, nargs='+', default=[2, 4, 8, 16],
+        help='Numbers of workers.')
+    parser.add_argument(
+        '--iterations', type=int, default=400, help='Number of iterations.')
+    parser.add_argument(
+        '--delay', type=float, default=0.005,
+        help='Time per evaluation, in seconds.')
+    args = parser.parse_args()
+
+    # Gaussian target, with a proposal that gives an acceptance rate of about
+    # 25%
+    log_pdf = SlowLogPDF(
+        pints.toy.GaussianLogPDF([1, 2, 3], [1, 4, 9]), args.delay)
+    x0 = [1, 2, 3]
+    sigma0 = [2, 8, 18]
+
+    print('Speed-up with respect to a sequential chain')
+    print('Workers  MetropolisRandomWalkMCMC  HaarioBardenetACMC')
+    methods = (pints.MetropolisRandomWalkMCMC, pints.HaarioBardenetACMC)
+    reference = [run(log_pdf, x0, sigma0, method, args.iterations, 1)
+                 for method in methods]
+    for n in args.workers:
+        gains = []
+        for method, (chain0, t0) in zip(methods, reference):
+            chain, t = run(log_pdf, x0, sigma0, method, args.iterations, n)
+            assert np.all(chain == chain0)
+            gains.append(t0 / t)
+        print('{:>7d} {:>25.1f}x {:>18.1f}x'.format(n, *gains))
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+#
+# Measures the number of Gaussian proposals per second that can be generated
+# with a cached Cholesky factor, for a fixed and for an adapting covariance
+# matrix, and compares it with np.random.multivariate_normal.
+#
+# This file is part of PINTS.
+#  Copyright (c) 2017-2018, University of Oxford.
+#  For licensing information, see the LICENSE file distributed with the PINTS
+#  software package.
+#
+from __future__ import absolute_import, division
+from __future__ import print_function, unicode_literals
+import argparse
+import timeit
+
+import numpy as np
+
+from pints._mcmc._proposal import GaussianProposal
+
+
+def rate(f, n):
+    """ Calls ``f(i)`` for ``i`` in ``0:n`` and returns calls per second. """
+    t = timeit.default_timer()
+    for i in range(n):
+        f(i)
+    return n / (timeit.default_timer() - t)
+
+
+def reference_adaptive(sigma, xs, n):
+    """ Adapts ``sigma`` and calls multivariate_normal ``n`` times. """
+    mean = np.zeros(len(sigma))
+
+    def f(i):
+        sigma[:] = 0.99 * sigma + 0.01 * np.outer(xs[i], xs[i])
+        np.random.multivariate_normal(mean, sigma)
+
+    return rate(f, n)
+
+
+def cached_adaptive(sigma, xs, n):
+    """ Adapts a :class:`GaussianProposal` and samples ``n`` times. """
+    proposal = GaussianProposal(sigma)
+    mean = np.zeros(len(sigma))
+
+    def f(i):
+        proposal.update(0.99, 0.01, xs[i])
+        proposal.sample(mean)
+
+    return rate(f, n)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description='Benchmarks Gaussian proposal generation against the'
+                    ' number of parameters.')
+    parser.add_argument(
+        '--dimensions', type=int, nargs='+',
+        default=[2, 10, 50, 100, 200], help='Numbers of parameters.')
+    parser.add_argument(
+        '--proposals', type=int, default=100,
+        help='Number of proposals to time for each setting.')
+    args = parser.parse_args()
+
+    n = args.proposals
+    print('Proposals per second (' + str(n) + ' proposals per setting).')
+    print('                     Fixed covariance              '
+          'Adapted covariance')
+    print('Dimension   multivariate_normal     Cholesky   '
+          'multivariate_normal     Cholesky')
+    for d in args.dimensions:
+        a = np.random.normal(size=(d, d))
+        sigma = np.dot(a, a.T) / d + np.eye(d)
+        xs = np.random.normal(size=(n, d))
+        mean = np.zeros(d)
+
+        # Fixed covariance (e.g. MetropolisRandomWalkMCMC)
+        r0 = rate(lambda i: np.random.multivariate_normal(mean, sigma), n)
+        proposal = GaussianProposal(sigma)
+        r1 = rate(lambda i: proposal.sample(mean), n)
+
+        # Adapted after every proposal (e.g. HaarioBardenetACMC)
+        r2 = reference_adaptive(np.array(sigma), xs, n)
+        r3 = cached_adaptive(np.array(sigma), xs, n)
+
+        print('{:>9d} {:>21.0f} {:>12.0f} {:>21.0f} {:>12.0f}'.format(
+            d, r0, r1, r2, r3))
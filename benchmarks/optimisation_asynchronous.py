@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+#
+# Compares the time needed by synchronous (generational) and asynchronous
+# (steady-state) optimisation to reach a threshold, when fitting the
+# Fitzhugh-Nagumo model with an error measure that has a variable evaluation
+# time.
+#
+# This file is part of PINTS.
+#  Copyright (c) 2017-2018, University of Oxford.
+#  For licensing information, see the LICENSE file distributed with the PINTS
+#  software package.
+#
+from __future__ import absolute_import, division
+from __future__ import print_function, unicode_literals
+import argparse
+import time
+import timeit
+
+import numpy as np
+
+import pints
+import pints.toy
+
+
+class SlowErrorMeasure(pints.ErrorMeasure):
+    """
+    Wraps an ErrorMeasure, adding a delay of up to ``delay`` seconds.
+    """
+    def __init__(self, error, delay):
+        self._error = error
+        self._delay = delay
+
+    def n_parameters(self):
+        return self._error.n_parameters()
+
+    def __call__(self, x):
+        time.sleep(self._delay * (abs(x[0]) * 1e6 % 1))
+        return self._error(x)
+
+
+def run(error, x0, boundaries, method, threshold, workers, asynchronous):
+    """
+    Runs an optimisation and returns the time taken and the final score.
+    """
+    np.random.seed(1)
+    opt = pints.OptimisationController(
+        error, x0, boundaries=boundaries, method=method)
+    opt.set_threshold(threshold)
+    opt.set_max_iterations(1000)
+    opt.set_max_unchanged_iterations(None)
+    opt.set_log_to_screen(False)
+    opt.set_parallel(workers)
+    opt.set_asynchronous(asynchronous)
+    t = timeit.default_timer()
+    x, f = opt.run()
+    return timeit.default_timer() - t, f
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description='Compares synchronous and asynchronous optimisation.')
+    parser.add_argument(
+        '--workers', type=int, default=8, help='Number of worker processes.')
+    parser.add_argument(
+        '--threshold', type=float, default=1.5,
+        help='Sum-of-squares error at which to stop.')
+    parser.add_argument(
+        '--delay', type=float, default=0.02,
+        help='Maximum added evaluation time, in seconds.')
+    args = parser.parse_args()
+
+    # Create a noisy Fitzhugh-Nagumo fitting problem
+    np.random.seed(1)
+    model = pints.toy.FitzhughNagumoModel()
+    parameters = model.suggested_parameters()
+    times = model.suggested_times()
+    values = model.simulate(parameters, times)
+    values += np.random.normal(0, 0.05, values.shape)
+    problem = pints.MultiOutputProblem(model, times, values)
+    error = SlowErrorMeasure(pints.SumOfSquaresError(problem), args.delay)
+    boundaries = pints.RectangularBoundaries([0, 0, 0], [1, 1, 10])
+    x0 = [0.5, 0.5, 5]
+
+    print('Seconds to reach threshold ' + str(args.threshold) + ', using '
+          + str(args.workers) + ' worker processes.')
+    for method in (pints.PSO, pints.XNES, pints.SNES):
+        t1, f1 = run(error, x0, boundaries, method, args.threshold,
+                     args.workers, False)
+        t2, f2 = run(error, x0, boundaries, method, args.threshold,
+                     args.workers, True)
+        print('{:<6} synchronous {:>7.2f} (f={:.3g})  asynchronous {:>7.2f}'
+              ' (f={:.3g})  gain {:>5.2f}x'.format(
+                  method.__name__, t1, f1, t2, f2, t1 / t2))
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+#
+# Measures how the run time of the adaptive tempered SMC sampler scales with
+# the number of parallel workers, for a log-likelihood with a fixed cost per
+# evaluation, and compares its marginal likelihood estimate with the exact
+# value.
+#
+# This file is part of PINTS.
+#  Copyright (c) 2017-2018, University of Oxford.
+#  For licensing information, see the LICENSE file distributed with the PINTS
+#  software package.
+#
+from __future__ import absolute_import, division
+from __future__ import print_function, unicode_literals
+import argparse
+import time
+import timeit
+
+import numpy as np
+
+import pints
+import pints.toy
+
+
+class SlowLogPDF(pints.LogPDF):
+    """
+    Wraps a :class:`LogPDF`, and waits ``delay`` seconds before every
+    evaluation (without holding the global interpreter lock).
+    """
+    def __init__(self, log_pdf, delay):
+        self._log_pdf = log_pdf
+        self._delay = delay
+
+    def __call__(self, x):
+        time.sleep(self._delay)
+        return self._log_pdf(x)
+
+    def n_parameters(self):
+        return self._log_pdf.n_parameters()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description='Benchmarks parallel scaling of the SMC sampler.')
+    parser.add_argument(
+        '--workers', type=int, nargs='+', default=[1, 2, 4, 8],
+        help='Numbers of worker threads.')
+    parser.add_argument(
+        '--particles', type=int, default=500, help='Number of particles.')
+    parser.add_argument(
+        '--parameters', type=int, default=3, help='Number of parameters.')
+    parser.add_argument(
+        '--delay', type=float, default=1e-4,
+        help='Time (s) taken by each evaluation.')
+    args = parser.parse_args()
+
+    # Normalised Gaussian likelihood on a uniform prior: Z = 1 / 20^d
+    d = args.parameters
+    log_likelihood = SlowLogPDF(
+        pints.toy.GaussianLogPDF([1] * d, [0.5] * d), args.delay)
+    log_prior = pints.UniformLogPrior([-10] * d, [10] * d)
+    print('Exact log(Z): ' + str(-d * np.log(20)))
+
+    print('{:>8s}{:>8s}{:>12s}{:>12s}{:>12s}'.format(
+        'workers', 'stages', 'log(Z)', 'time (s)', 'speed-up'))
+    t1 = None
+    for n_workers in args.workers:
+        np.random.seed(1)
+        smc = pints.SMCController(log_likelihood, log_prior)
+        smc.set_n_particles(args.particles)
+        smc.set_log_to_screen(False)
+        if n_workers > 1:
+            smc.set_parallel(n_workers, backend='threads')
+
+        t = timeit.default_timer()
+        smc.run()
+        t = timeit.default_timer() - t
+        if t1 is None:
+            t1 = t
+
+        print('{:>8d}{:>8d}{:>12.4f}{:>12.4f}{:>12.2f}'.format(
+            n_workers, len(smc.temperatures()) - 1,
+            smc.marginal_log_likelihood(), t, t1 / t))
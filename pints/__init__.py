@@ -148,9 +148,13 @@ from ._error_measures import (
 #
 from ._evaluation import (
     evaluate,
+    AsynchronousEvaluator,
+    BatchEvaluator,
     Evaluator,
     ParallelEvaluator,
     SequentialEvaluator,
+    SharedMemoryEvaluator,
+    ThreadedEvaluator,
 )
 
 
@@ -178,9 +182,13 @@ from ._optimisers._xnes import XNES
 # Diagnostics
 #
 from ._diagnostics import (
+    bulk_effective_sample_size,
     effective_sample_size,
+    monte_carlo_standard_error,
+    rank_normalised_rhat,
     rhat,
     rhat_all_params,
+    tail_effective_sample_size,
 )
 
 
@@ -196,6 +204,10 @@ from ._mcmc import (
     SingleChainMCMC,
 )
 from ._mcmc._adaptive_covariance import AdaptiveCovarianceMC
+from ._mcmc._chain_bank import (
+    BankedHaarioBardenetACMC,
+    BankedMetropolisRandomWalkMCMC,
+)
 from ._mcmc._differential_evolution import DifferentialEvolutionMCMC
 from ._mcmc._dream import DreamMCMC
 from ._mcmc._emcee_hammer import EmceeHammerMCMC
@@ -206,6 +218,9 @@ from ._mcmc._hamiltonian import HamiltonianMCMC
 from ._mcmc._mala import MALAMCMC
 from ._mcmc._metropolis import MetropolisRandomWalkMCMC
 from ._mcmc._monomial_gamma_hamiltonian import MonomialGammaHamiltonianMCMC
+from ._mcmc._multiple_try import MultipleTryMCMC
+from ._mcmc._nuts import NoUTurnMCMC
+from ._mcmc._parallel_tempering import ParallelTemperingMCMC
 from ._mcmc._population import PopulationMCMC
 from ._mcmc._rao_blackwell_ac import RaoBlackwellACMC
 from ._mcmc._relativistic import RelativisticMCMC
@@ -223,6 +238,12 @@ from ._nested._rejection import NestedRejectionSampler
 from ._nested._ellipsoid import NestedEllipsoidSampler
 
 
+#
+# Sequential Monte Carlo
+#
+from ._smc import SMCController
+
+
 #
 # Noise generators (always import!)
 #
@@ -52,6 +52,30 @@ class ForwardModel(object):
         """
         raise NotImplementedError
 
+    def simulate_batch(self, parameters, times):
+        """
+        Runs a forward simulation for each row in ``parameters``, and returns
+        the resulting time-series stacked in a single NumPy array.
+
+        The returned array has shape ``(n_points, n_times)`` (for single output
+        problems) or ``(n_points, n_times, n_outputs)`` (for multi-output
+        problems).
+
+        By default this method calls :meth:`simulate()` once for every point,
+        but models that can evaluate several parameter sets at once (for
+        example by vectorising over the first axis) can override it to avoid
+        the per-point overhead.
+
+        Parameters
+        ----------
+        parameters
+            A sequence of parameter vectors, with shape
+            ``(n_points, n_parameters)``.
+        times
+            The times at which to evaluate, as in :meth:`simulate()`.
+        """
+        return np.array([self.simulate(x, times) for x in parameters])
+
     def n_outputs(self):
         """
         Returns the number of outputs this model has. The default is 1.
@@ -155,6 +179,18 @@ class SingleOutputProblem(object):
         y = np.asarray(self._model.simulate(parameters, self._times))
         return y.reshape((self._n_times,))
 
+    def evaluate_batch(self, parameters):
+        """
+        Runs a simulation for every parameter vector in ``parameters`` (an
+        array of shape ``(n_points, n_parameters)``), returning the simulated
+        values as a NumPy array of shape ``(n_points, n_times)``.
+
+        See :meth:`ForwardModel.simulate_batch()`.
+        """
+        parameters = pints.matrix2d(parameters)
+        y = np.asarray(self._model.simulate_batch(parameters, self._times))
+        return y.reshape((len(parameters), self._n_times))
+
     def evaluateS1(self, parameters):
         """
         Runs a simulation with first-order sensitivity calculation, returning
@@ -265,6 +301,21 @@ class MultiOutputProblem(object):
         y = np.asarray(self._model.simulate(parameters, self._times))
         return y.reshape(self._n_times, self._n_outputs)
 
+    def evaluate_batch(self, parameters):
+        """
+        Runs a simulation for every parameter vector in ``parameters`` (an
+        array of shape ``(n_points, n_parameters)``), returning the simulated
+        values.
+
+        The returned data is a NumPy array with shape
+        ``(n_points, n_times, n_outputs)``.
+
+        See :meth:`ForwardModel.simulate_batch()`.
+        """
+        parameters = pints.matrix2d(parameters)
+        y = np.asarray(self._model.simulate_batch(parameters, self._times))
+        return y.reshape(len(parameters), self._n_times, self._n_outputs)
+
     def evaluateS1(self, parameters):
         """
         Runs a simulation using the given parameters, returning the simulated
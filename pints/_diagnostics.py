@@ -5,17 +5,34 @@
 #  Copyright (c) 2017-2018, University of Oxford.
 #  For licensing information, see the LICENSE file distributed with the PINTS
 #  software package.
+from __future__ import absolute_import, division
+from __future__ import print_function, unicode_literals
 import numpy as np
+import scipy.special
+import scipy.stats
 
 
-def autocorrelation(x):
+def autocorrelation(x, axis=0):
     """
-    Calculate autocorrelation for a vector x using a spectrum density
-    calculation.
+    Calculate the autocorrelation of ``x`` along the given ``axis``, using a
+    fast Fourier transform.
+
+    For a vector ``x``, this returns a vector ``rho`` where ``rho[k]`` is the
+    autocorrelation at lag ``k``. For multi-dimensional arrays, the
+    autocorrelation of every series along ``axis`` is calculated at once.
     """
-    x = (x - np.mean(x)) / (np.std(x) * np.sqrt(len(x)))
-    result = np.correlate(x, x, mode='full')
-    return result[int(result.size / 2):]
+    x = np.asarray(x, dtype=float)
+    n = x.shape[axis]
+    x = x - np.mean(x, axis=axis, keepdims=True)
+
+    # Zero-pad to a power of two, at least twice the series length, to avoid
+    # circular wrapping of the correlation
+    m = 1 << int(2 * n - 1).bit_length()
+    f = np.fft.rfft(x, n=m, axis=axis)
+    acov = np.fft.irfft(f * np.conjugate(f), n=m, axis=axis)
+    acov = np.take(acov, np.arange(n), axis=axis)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return acov / np.take(acov, [0], axis=axis)
 
 
 def autocorrelate_negative(autocorrelation):
@@ -34,11 +51,17 @@ def ess_single_param(x):
     """
     Calculates ESS for a single parameter.
     """
-    rho = autocorrelation(x)
-    T = autocorrelate_negative(rho)
-    n = len(x)
-    ess = n / (1 + 2 * np.sum(rho[0:T]))
-    return ess
+    return _ess_first_negative(np.asarray(x).reshape((-1, 1)))[0]
+
+
+def _ess_first_negative(samples):
+    """
+    Calculates the ESS of every column in a 2d array of ``samples``, summing
+    the autocorrelation up to (but excluding) its first negative value.
+    """
+    rho = autocorrelation(samples, axis=0)
+    positive = np.cumprod(rho >= 0, axis=0, dtype=bool)
+    return len(samples) / (1 + 2 * np.sum(rho * positive, axis=0))
 
 
 def effective_sample_size(samples):
@@ -52,15 +75,15 @@ def effective_sample_size(samples):
     if n_samples < 2:
         raise ValueError('At least two samples must be given.')
 
-    return [ess_single_param(samples[:, i]) for i in range(0, n_params)]
+    return list(_ess_first_negative(samples))
 
 
 def within(samples):
     """
     Calculates within-chain variance.
     """
-    mu = list(map(lambda x: np.var(x, ddof=1), samples))
-    W = np.mean(mu)
+    mu = list(map(lambda x: np.var(x, ddof=1, axis=0), samples))
+    W = np.mean(mu, axis=0)
     return W
 
 
@@ -68,11 +91,11 @@ def between(samples):
     """
     Calculates between-chain variance.
     """
-    mu = list(map(lambda x: np.mean(x), samples))
-    mu_overall = np.mean(mu)
+    mu = np.array(list(map(lambda x: np.mean(x, axis=0), samples)))
+    mu_overall = np.mean(mu, axis=0)
     m = len(samples)
     t = len(samples[0])
-    return (t / (m - 1.0)) * np.sum((mu - mu_overall) ** 2)
+    return (t / (m - 1.0)) * np.sum((mu - mu_overall) ** 2, axis=0)
 
 
 def reorder(param_number, chains):
@@ -111,7 +134,199 @@ def rhat_all_params(chains):
     Calculates r-hat for all parameters in chains as per "Bayesian data
     analysis", 3rd edition, Gelman et al., 2014.
     """
-    samples_all = reorder_all_params(chains)
-    rhat_all = list(map(lambda x: rhat(x), samples_all))
-    return rhat_all
+    # Note: rhat() works on all columns of the 2d chains at once
+    return list(rhat(chains))
+
+
+#
+# Rank-normalised diagnostics
+#
+
+def _check_chains(chains):
+    """
+    Checks and returns an array of ``chains`` with shape
+    ``(n_chains, n_iterations, n_parameters)``.
+    """
+    chains = np.asarray(chains, dtype=float)
+    if chains.ndim != 3:
+        raise ValueError(
+            'Chains must be given as a 3d array, with shape (n_chains,'
+            ' n_iterations, n_parameters).')
+    if chains.shape[1] < 4:
+        raise ValueError('At least four iterations must be given.')
+    return chains
+
+
+def _split(chains):
+    """
+    Splits each chain in half, returning an array with twice the number of
+    chains. If the number of iterations is odd, the middle one is dropped.
+    """
+    n = chains.shape[1] // 2
+    return np.concatenate((chains[:, :n], chains[:, -n:]), axis=0)
+
+
+def _rank_normalise(chains):
+    """
+    Replaces the values of each parameter by the normal scores of their ranks
+    in the pooled draws from all chains (with ties given the average rank).
+    """
+    m, n, p = chains.shape
+    flat = chains.reshape((m * n, p))
+    ranks = np.empty(flat.shape)
+    for i in range(p):
+        ranks[:, i] = scipy.stats.rankdata(flat[:, i])
+    z = scipy.special.ndtri((ranks - 0.375) / (m * n + 0.25))
+    return z.reshape((m, n, p))
+
+
+def _variances(chains):
+    """
+    Returns the mean within-chain variance ``W`` and the pooled variance
+    estimate ``var+`` for each parameter.
+    """
+    m, n, p = chains.shape
+    W = np.mean(np.var(chains, axis=1, ddof=1), axis=0)
+    var_plus = W * (n - 1) / n
+    if m > 1:
+        var_plus += np.var(np.mean(chains, axis=1), axis=0, ddof=1)
+    return W, var_plus
+
+
+def _rhat(chains):
+    """
+    Returns the (potential scale reduction) rhat of each parameter, without
+    splitting the chains.
+    """
+    W, var_plus = _variances(chains)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.sqrt(var_plus / W)
+
+
+def _geyer_tau(rho):
+    """
+    Returns the integrated autocorrelation time of every column in a 2d array
+    ``rho`` of autocorrelations (starting at lag 0), truncating the sum with
+    Geyer's initial monotone sequence estimator.
+    """
+    n, p = rho.shape
 
+    # Sums of adjacent pairs, truncated at the first non-positive sum, and
+    # then made monotonically decreasing
+    pairs = rho[:n - n % 2].reshape((n // 2, 2, p)).sum(axis=1)
+    positive = np.cumprod(pairs > 0, axis=0, dtype=bool)
+    pairs = np.minimum.accumulate(pairs, axis=0) * positive
+    return -1 + 2 * np.sum(pairs, axis=0)
+
+
+def _ess(chains):
+    """
+    Returns the multi-chain effective sample size of each parameter, without
+    splitting the chains, truncating the autocorrelation sum with Geyer's
+    initial monotone sequence estimator.
+    """
+    m, n, p = chains.shape
+
+    # Autocovariance of every chain and parameter at all lags at once
+    var = np.var(chains, axis=1, keepdims=True)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        acov = autocorrelation(chains, axis=1) * var
+
+        # Combined autocorrelation estimate, shape (n, p)
+        W, var_plus = _variances(chains)
+        rho = 1 - (W - np.mean(acov, axis=0)) / var_plus
+    rho[0] = 1
+
+    # Integrated autocorrelation time, bounded from below to avoid unstable
+    # estimates for antithetic chains
+    tau = np.maximum(_geyer_tau(rho), 1 / np.log10(m * n))
+    with np.errstate(invalid='ignore'):
+        return np.where(np.isfinite(rho).all(axis=0), m * n / tau, np.nan)
+
+
+def bulk_effective_sample_size(chains):
+    """
+    Calculates the bulk effective sample size of every parameter, as defined
+    by Vehtari et al. (see :func:`rank_normalised_rhat()`).
+
+    The chains are split in half, and the draws are replaced by the normal
+    scores of their ranks, before the multi-chain effective sample size is
+    estimated. The autocorrelation is calculated using fast Fourier
+    transforms, and its sum is truncated using Geyer's initial monotone
+    sequence estimator.
+
+    ``chains`` must be an array of shape
+    ``(n_chains, n_iterations, n_parameters)``, as returned by
+    :meth:`MCMCController.run()`.
+    """
+    return _ess(_rank_normalise(_split(_check_chains(chains))))
+
+
+def monte_carlo_standard_error(chains):
+    """
+    Calculates the Monte Carlo standard error of the posterior mean of every
+    parameter, as defined by Vehtari et al. (see
+    :func:`rank_normalised_rhat()`).
+
+    This is the posterior standard deviation divided by the square root of the
+    (split-chain) effective sample size.
+
+    ``chains`` must be an array of shape
+    ``(n_chains, n_iterations, n_parameters)``, as returned by
+    :meth:`MCMCController.run()`.
+    """
+    chains = _check_chains(chains)
+    m, n, p = chains.shape
+    std = np.std(chains.reshape((m * n, p)), axis=0, ddof=1)
+    return std / np.sqrt(_ess(_split(chains)))
+
+
+def rank_normalised_rhat(chains):
+    """
+    Calculates the rank-normalised split-rhat of every parameter, as defined
+    in [1]_.
+
+    The chains are split in half, and rhat is calculated on the normal scores
+    of the ranks of the draws (which detects differences in location), and of
+    the ranks of their absolute deviations from the median (which detects
+    differences in scale). The maximum of the two is returned.
+
+    ``chains`` must be an array of shape
+    ``(n_chains, n_iterations, n_parameters)``, as returned by
+    :meth:`MCMCController.run()`.
+
+    References
+    ----------
+    .. [1] "Rank-normalization, folding, and localization: An improved R-hat
+           for assessing convergence of MCMC". Aki Vehtari, Andrew Gelman,
+           Daniel Simpson, Bob Carpenter and Paul-Christian Burkner (2021)
+           Bayesian Analysis, 16(2), pp.667-718.
+           https://doi.org/10.1214/20-BA1221
+    """
+    chains = _split(_check_chains(chains))
+    m, n, p = chains.shape
+    median = np.median(chains.reshape((m * n, p)), axis=0)
+    bulk = _rhat(_rank_normalise(chains))
+    tail = _rhat(_rank_normalise(np.abs(chains - median)))
+    return np.maximum(bulk, tail)
+
+
+def tail_effective_sample_size(chains):
+    """
+    Calculates the tail effective sample size of every parameter, as defined
+    by Vehtari et al. (see :func:`rank_normalised_rhat()`).
+
+    This is the minimum of the effective sample sizes of the 5% and 95%
+    quantile estimates, which are calculated from the (split) chains of
+    indicator variables ``x <= q``.
+
+    ``chains`` must be an array of shape
+    ``(n_chains, n_iterations, n_parameters)``, as returned by
+    :meth:`MCMCController.run()`.
+    """
+    chains = _split(_check_chains(chains))
+    m, n, p = chains.shape
+    q = np.percentile(chains.reshape((m * n, p)), [5, 95], axis=0)
+    return np.minimum(
+        _ess((chains <= q[0]).astype(float)),
+        _ess((chains <= q[1]).astype(float)))
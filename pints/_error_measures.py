@@ -37,6 +37,20 @@ class ErrorMeasure(object):
         """
         raise NotImplementedError
 
+    def evaluate_batch(self, xs):
+        """
+        Evaluates this error measure for every point in ``xs``, and returns the
+        results as a NumPy array of shape ``(n_points, )``.
+
+        The argument ``xs`` must be a sequence of points, i.e. a list of
+        vectors or an array of shape ``(n_points, n_parameters)``.
+
+        By default this method calls the error measure once for every point,
+        but subclasses can override it to evaluate all points at once (see
+        :meth:`pints.LogPDF.evaluate_batch()`).
+        """
+        return np.array([self(x) for x in xs], dtype=float)
+
     def n_parameters(self):
         """
         Returns the dimension of the parameter space this measure is defined
@@ -97,6 +111,10 @@ class ProbabilityBasedError(ErrorMeasure):
         y, dy = self._log_pdf.evaluateS1(x)
         return -y, -np.asarray(dy)
 
+    def evaluate_batch(self, xs):
+        """ See :meth:`ErrorMeasure.evaluate_batch()`. """
+        return -np.asarray(self._log_pdf.evaluate_batch(xs))
+
     def n_parameters(self):
         """ See :meth:`ErrorMeasure.n_parameters()`. """
         return self._log_pdf.n_parameters()
@@ -197,6 +215,14 @@ class SumOfErrors(ErrorMeasure):
             dtotal += w * np.asarray(b)
         return total, dtotal
 
+    def evaluate_batch(self, xs):
+        """ See :meth:`ErrorMeasure.evaluate_batch()`. """
+        xs = pints.matrix2d(xs)
+        total = np.zeros(len(xs))
+        for e, w in zip(self._errors, self._weights):
+            total += e.evaluate_batch(xs) * w
+        return total
+
     def n_parameters(self):
         """ See :meth:`ErrorMeasure.n_parameters()`. """
         return self._n_parameters
@@ -246,6 +272,14 @@ class MeanSquaredError(ProblemErrorMeasure):
                                      self._weights, axis=1)
         return e, de
 
+    def evaluate_batch(self, xs):
+        """ See :meth:`ErrorMeasure.evaluate_batch()`. """
+        xs = pints.matrix2d(xs)
+        r = self._problem.evaluate_batch(xs) - self._values
+        r = r.reshape((len(xs), self._n_times, self._n_outputs))
+        return np.sum(
+            np.sum(r**2, axis=1) * self._weights * self._ninv, axis=1)
+
 
 class RootMeanSquaredError(ProblemErrorMeasure):
     """
@@ -272,6 +306,12 @@ class RootMeanSquaredError(ProblemErrorMeasure):
         return np.sqrt(self._ninv * np.sum(
             (self._problem.evaluate(x) - self._values)**2))
 
+    def evaluate_batch(self, xs):
+        """ See :meth:`ErrorMeasure.evaluate_batch()`. """
+        xs = pints.matrix2d(xs)
+        r = self._problem.evaluate_batch(xs) - self._values
+        return np.sqrt(self._ninv * np.sum(r**2, axis=1))
+
 
 class SumOfSquaresError(ProblemErrorMeasure):
     """
@@ -310,3 +350,10 @@ class SumOfSquaresError(ProblemErrorMeasure):
         de = 2 * np.sum(np.sum((r.T * dy.T), axis=2) * self._weights, axis=1)
         return e, de
 
+    def evaluate_batch(self, xs):
+        """ See :meth:`ErrorMeasure.evaluate_batch()`. """
+        xs = pints.matrix2d(xs)
+        r = self._problem.evaluate_batch(xs) - self._values
+        r = r.reshape((len(xs), self._n_times, self._n_outputs))
+        return np.sum(np.sum(r**2, axis=1) * self._weights, axis=1)
+
@@ -13,15 +13,32 @@ from __future__ import absolute_import, division
 from __future__ import print_function, unicode_literals
 import gc
 import os
+import math
+import logging
 import sys
 import time
+import timeit
+import numbers
 import traceback
 import multiprocessing
+import multiprocessing.connection
+import numpy as np
 try:
     # Python 3
     import queue
 except ImportError:
     import Queue as queue
+try:
+    # Python 3.8 and newer
+    from multiprocessing import shared_memory
+except ImportError:     # pragma: no cover
+    shared_memory = None
+try:
+    # Python 3
+    import concurrent.futures
+    from concurrent.futures import ThreadPoolExecutor
+except ImportError:     # pragma: no cover
+    ThreadPoolExecutor = None
 
 
 def evaluate(f, x, parallel=False, args=None):
@@ -111,6 +128,212 @@ class Evaluator(object):
         raise NotImplementedError
 
 
+class AsynchronousEvaluator(Evaluator):
+    """
+    Evaluates a single-valued function object for input values submitted one
+    at a time, and returns results as soon as they become available.
+
+    Where the other evaluators block until every position in a list has been
+    evaluated, this evaluator lets methods submit new positions with
+    :meth:`submit()` while other evaluations are still running, and collect
+    finished evaluations with :meth:`wait()`. This allows methods whose
+    individual steps don't depend on each other (for example separate MCMC
+    chains) to keep all workers busy, instead of waiting for the slowest
+    evaluation at every iteration.
+
+    Evaluations are performed by a ``concurrent.futures`` executor, using
+    either worker threads (see :class:`ThreadedEvaluator`) or worker processes
+    (see :class:`ParallelEvaluator`). When processes are used, the function is
+    sent to each worker process only once.
+
+    The :meth:`evaluate()` method is also supported, so that this class
+    shares an interface with the other evaluators.
+
+    Requires Python 3.7 or newer.
+
+    Extends :class:`Evaluator`.
+
+    Parameters
+    ----------
+    function
+        The function to evaluate
+    n_workers
+        The number of workers to use. If left at the default value
+        ``n_workers=None`` the number of workers will equal the number of CPU
+        cores in the machine this is run on.
+    args
+        An optional sequence of extra arguments to ``f``. If ``args`` is
+        specified, ``f`` will be called as ``f(x, *args)``.
+    backend
+        Set to ``'processes'`` to use worker processes, or to ``'threads'`` to
+        use worker threads.
+    """
+    def __init__(
+            self, function, n_workers=None, args=None, backend='processes'):
+        super(AsynchronousEvaluator, self).__init__(function, args)
+
+        # Check futures are supported
+        if ThreadPoolExecutor is None:  # pragma: no cover
+            raise RuntimeError('The AsynchronousEvaluator requires Python 3.')
+
+        # Determine number of workers
+        if n_workers is None:
+            self._n_workers = ParallelEvaluator.cpu_count()
+        else:
+            self._n_workers = int(n_workers)
+            if self._n_workers < 1:
+                raise ValueError(
+                    'Number of workers must be an integer greater than 0 or'
+                    ' `None` to use the default value.')
+
+        # Check backend
+        if backend not in ('processes', 'threads'):
+            raise ValueError('Unknown backend "' + str(backend) + '".')
+        self._backend = backend
+
+        # Executor (created when needed), and pending evaluations, stored as
+        # a dict mapping futures to tuples (tag, position)
+        self._executor = None
+        self._pending = {}
+
+    def __del__(self):
+        # Stop workers
+        try:
+            self._stop()
+        except Exception:   # pragma: no cover
+            pass
+
+    def _evaluate(self, positions):
+        """ See :meth:`Evaluator.evaluate()`. """
+        if self._pending:
+            raise RuntimeError(
+                'Cannot call evaluate() while asynchronous evaluations are'
+                ' pending.')
+        for k, x in enumerate(positions):
+            self.submit(x, k)
+        results = [0] * len(positions)
+        while self._pending:
+            for k, x, fx in self.wait():
+                results[k] = fx
+        return results
+
+    def n_pending(self):
+        """
+        Returns the number of submitted evaluations that have not yet been
+        returned by :meth:`wait()`.
+        """
+        return len(self._pending)
+
+    def _stop(self):
+        """ Cancels all pending evaluations and stops the workers. """
+        for future in self._pending:
+            future.cancel()
+        self._pending = {}
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+    def submit(self, position, tag=None):
+        """
+        Submits a ``position`` for evaluation, and returns immediately.
+
+        The optional ``tag`` is returned along with the result by
+        :meth:`wait()`, and can be used to identify the evaluation.
+        """
+        # Start workers
+        if self._executor is None:
+            if self._backend == 'threads':
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self._n_workers)
+            else:
+                self._executor = concurrent.futures.ProcessPoolExecutor(
+                    max_workers=self._n_workers,
+                    initializer=_initialise_process,
+                    initargs=(self._function, self._args))
+
+        # Submit
+        if self._backend == 'threads':
+            future = self._executor.submit(
+                self._function, position, *self._args)
+        else:
+            future = self._executor.submit(_evaluate_in_process, position)
+        self._pending[future] = (tag, position)
+
+    def wait(self):
+        """
+        Waits until at least one of the submitted evaluations has finished,
+        and returns a list of tuples ``(tag, position, result)`` for all
+        finished evaluations, in the order they were submitted.
+
+        If an evaluation raised an exception, all pending evaluations are
+        cancelled and the exception is raised. If no evaluations are pending,
+        an empty list is returned.
+        """
+        if not self._pending:
+            return []
+        done, not_done = concurrent.futures.wait(
+            self._pending, return_when=concurrent.futures.FIRST_COMPLETED)
+
+        # Return in submission order (dicts are ordered in Python 3.7+)
+        finished = []
+        for future in list(self._pending):
+            if future in done:
+                tag, position = self._pending.pop(future)
+                try:
+                    result = future.result()
+                except (Exception, KeyboardInterrupt, SystemExit):
+                    self._stop()
+                    raise
+                finished.append((tag, position, result))
+        return finished
+
+
+class BatchEvaluator(Evaluator):
+    """
+    Evaluates a function (or callable object) for a list of input values, by
+    passing all values to the function's ``evaluate_batch`` method in a single
+    call, and returns a list containing the calculated function evaluations.
+
+    This evaluator can be used with any object that implements an
+    ``evaluate_batch`` method, for example a :class:`LogPDF` (see
+    :meth:`LogPDF.evaluate_batch()`) or an :class:`ErrorMeasure` (see
+    :meth:`ErrorMeasure.evaluate_batch()`). For functions that support
+    vectorised evaluation this replaces a Python loop over all positions with a
+    single call, which can greatly reduce the overhead of evaluating large
+    populations of cheap functions.
+
+    Runs sequentially, but shares an interface with the
+    :class:`SequentialEvaluator` and :class:`ParallelEvaluator`.
+
+    Extends :class:`Evaluator`.
+
+    Parameters
+    ----------
+    function : callable
+        The function to evaluate. Must have a method
+        ``evaluate_batch(xs)`` that takes a sequence of positions ``xs`` and
+        returns a sequence of evaluations, one for each position.
+    args : sequence
+        An optional tuple containing extra arguments to ``f``. If ``args`` is
+        specified, the batch method will be called as
+        ``f.evaluate_batch(xs, *args)``.
+    """
+    def __init__(self, function, args=None):
+        super(BatchEvaluator, self).__init__(function, args)
+
+        # Check batch method
+        self._batch_function = getattr(function, 'evaluate_batch', None)
+        if not callable(self._batch_function):
+            raise ValueError(
+                'The given function must have a callable method'
+                ' `evaluate_batch`.')
+
+    def _evaluate(self, positions):
+        if len(positions) == 0:
+            return []
+        return list(self._batch_function(positions, *self._args))
+
+
 class ParallelEvaluator(Evaluator):
     """
     Evaluates a single-valued function object for any set of input values
@@ -141,6 +364,21 @@ multiprocessing.html#all-platforms>`_ for details).
     The evaluator will keep it's subprocesses alive and running until it is
     tidied up by garbage collection.
 
+    To reduce the overhead of communicating with the worker processes,
+    positions are sent to the workers in chunks. By default, the size of each
+    chunk is chosen adaptively: Workers take chunks from a shared queue as soon
+    as they become idle, and the chunks get smaller as fewer positions remain,
+    so that workers that finish early pick up the remaining work instead of
+    waiting for a slow worker to finish a large chunk. The first chunks are
+    also made large enough to take at least ``target_chunk_time`` seconds to
+    evaluate, based on the time taken per evaluation in previous calls. A
+    fixed chunk size can be set with ``chunk_size``.
+
+    The fraction of time each worker spent evaluating the function can be
+    obtained with :meth:`utilisation()`. A low utilisation indicates that the
+    number of workers is too high for the number of positions evaluated, or
+    that communication overhead dominates.
+
     Note that while this class uses multiprocessing, it is not thread/process
     safe itself: It should not be used by more than a single thread/process at
     a time.
@@ -165,12 +403,21 @@ multiprocessing.html#all-platforms>`_ for details).
     args
         An optional sequence of extra arguments to ``f``. If ``args`` is
         specified, ``f`` will be called as ``f(x, *args)``.
+    chunk_size
+        The number of positions sent to a worker in a single task. If left at
+        the default value ``chunk_size=None`` the size of each chunk is chosen
+        adaptively.
+    target_chunk_time
+        The minimum time (in seconds) that the evaluation of a single chunk
+        should take, when the chunk size is chosen adaptively.
     """
     def __init__(
             self, function,
             n_workers=None,
             max_tasks_per_worker=500,
-            args=None):
+            args=None,
+            chunk_size=None,
+            target_chunk_time=0.005):
         super(ParallelEvaluator, self).__init__(function, args)
 
         # Determine number of workers
@@ -193,6 +440,27 @@ multiprocessing.html#all-platforms>`_ for details).
                 'Maximum tasks per worker should be at least 1 (but probably'
                 ' much greater).')
 
+        # Chunk size, or None for adaptive chunking
+        if chunk_size is None:
+            self._chunk_size = None
+        else:
+            self._chunk_size = int(chunk_size)
+            if self._chunk_size < 1:
+                raise ValueError(
+                    'Chunk size must be an integer greater than 0 or `None` to'
+                    ' use adaptive chunking.')
+        self._target_chunk_time = float(target_chunk_time)
+        if self._target_chunk_time < 0:
+            raise ValueError('Target chunk time cannot be negative.')
+
+        # Estimated time per evaluation, or None if not known
+        self._cost = None
+
+        # Time spent evaluating by each worker, and total time spent in calls
+        # to evaluate()
+        self._busy_time = [0] * self._n_workers
+        self._wall_time = 0
+
         # Queue with tasks
         self._tasks = multiprocessing.Queue()
 
@@ -227,6 +495,33 @@ multiprocessing.html#all-platforms>`_ for details).
             gc.collect()
         return cleaned
 
+    def _chunks(self, n):
+        """
+        Returns a list of tuples ``(start, stop)`` dividing ``n`` positions
+        into chunks.
+        """
+        # Fixed chunk size
+        if self._chunk_size is not None:
+            return [
+                (i, min(n, i + self._chunk_size))
+                for i in range(0, n, self._chunk_size)]
+
+        # Smallest chunk worth sending, based on time per evaluation
+        minimum = 1
+        if self._cost:
+            minimum = max(1, int(self._target_chunk_time / self._cost))
+
+        # Guided scheduling: each chunk is a fraction of the remaining work, so
+        # that chunks get smaller towards the end
+        chunks = []
+        start = 0
+        while start < n:
+            size = max(minimum, (n - start) // (2 * self._n_workers))
+            stop = min(n, start + size)
+            chunks.append((start, stop))
+            start = stop
+        return chunks
+
     @staticmethod
     def cpu_count():
         """
@@ -241,7 +536,9 @@ multiprocessing.html#all-platforms>`_ for details).
         """
         Populates (but usually repopulates) the worker pool.
         """
-        for k in range(self._n_workers - len(self._workers)):
+        used = set([w.worker_id for w in self._workers])
+        free = [i for i in range(self._n_workers) if i not in used]
+        for i in free:
             w = _Worker(
                 self._function,
                 self._args,
@@ -250,13 +547,15 @@ multiprocessing.html#all-platforms>`_ for details).
                 self._max_tasks,
                 self._errors,
                 self._error,
+                i,
             )
             self._workers.append(w)
             w.start()
 
     def _evaluate(self, positions):
         """
-        Evaluate all tasks in parallel, in batches of size self._max_tasks.
+        Evaluate all tasks in parallel, sending positions to the workers in
+        chunks.
         """
         # Ensure task and result queues are empty
         # For some reason these lines block when running on windows
@@ -269,24 +568,29 @@ multiprocessing.html#all-platforms>`_ for details).
         self._populate()
 
         # Start
+        t0 = timeit.default_timer()
         try:
 
             # Enqueue all tasks (non-blocking)
-            for k, x in enumerate(positions):
-                self._tasks.put((k, x))
+            positions = list(positions)
+            n = len(positions)
+            for start, stop in self._chunks(n):
+                self._tasks.put((start, positions[start:stop]))
 
             # Collect results (blocking)
-            n = len(positions)
             m = 0
             results = [0] * n
+            busy_time = 0
             while m < n and not self._error.is_set():
                 time.sleep(0.001)   # This is really necessary
                 # Retrieve all results
                 try:
                     while True:
-                        i, f = self._results.get(block=False)
-                        results[i] = f
-                        m += 1
+                        i, fs, worker_id, t = self._results.get(block=False)
+                        results[i:i + len(fs)] = fs
+                        m += len(fs)
+                        self._busy_time[worker_id] += t
+                        busy_time += t
                 except queue.Empty:
                     pass
 
@@ -327,6 +631,11 @@ multiprocessing.html#all-platforms>`_ for details).
                 raise Exception(
                     'Unknown exception in subprocess.')  # pragma: no cover
 
+        # Update time per evaluation and utilisation statistics
+        if n > 0:
+            self._cost = busy_time / n
+        self._wall_time += timeit.default_timer() - t0
+
         # Return results
         return results
 
@@ -371,6 +680,16 @@ multiprocessing.html#all-platforms>`_ for details).
         # Return errors
         return errors
 
+    def utilisation(self):
+        """
+        Returns a list containing, for each worker, the fraction of the time
+        spent in :meth:`evaluate()` that the worker spent evaluating the
+        function.
+        """
+        if self._wall_time == 0:
+            return [0] * self._n_workers
+        return [t / self._wall_time for t in self._busy_time]
+
 
 class SequentialEvaluator(Evaluator):
     """
@@ -400,6 +719,346 @@ class SequentialEvaluator(Evaluator):
         return scores
 
 
+class SharedMemoryEvaluator(Evaluator):
+    """
+    Evaluates a single-valued function object for any set of input values
+    given, using a pool of long-lived worker processes that exchange positions
+    and results through shared memory.
+
+    Shares an interface with the :class:`ParallelEvaluator`, and can be used as
+    a drop-in replacement for it. Where the :class:`ParallelEvaluator` sends
+    every position to the workers as a separate (pickled) message, this
+    evaluator writes all positions into a shared memory buffer, sends each
+    worker a single short message describing the block of positions it should
+    evaluate, and lets the workers write their results into a second shared
+    buffer. The main process waits for the workers' replies without polling,
+    and the worker processes are kept alive between calls to
+    :meth:`evaluate()`. This greatly reduces the overhead per evaluation, so
+    that parallelisation pays off for much cheaper functions than with the
+    :class:`ParallelEvaluator`.
+
+    Positions must be numerical, and all positions passed to a single call of
+    :meth:`evaluate()` must have the same shape. Results that are scalars are
+    passed back through shared memory; any other results (for example the
+    tuples returned by :meth:`LogPDF.evaluateS1()`) are pickled and sent back
+    to the main process.
+
+    Requires Python 3.8 or newer. The same caveats as for the
+    :class:`ParallelEvaluator` apply.
+
+    The evaluator will keep its subprocesses alive and running until it is
+    tidied up by garbage collection.
+
+    Extends :class:`Evaluator`.
+
+    Parameters
+    ----------
+    function
+        The function to evaluate
+    n_workers
+        The number of worker processes to use. If left at the default value
+        ``n_workers=None`` the number of workers will equal the number of CPU
+        cores in the machine this is run on.
+    args
+        An optional sequence of extra arguments to ``f``. If ``args`` is
+        specified, ``f`` will be called as ``f(x, *args)``.
+    """
+    def __init__(self, function, n_workers=None, args=None):
+        super(SharedMemoryEvaluator, self).__init__(function, args)
+
+        # Check shared memory is supported
+        if shared_memory is None:   # pragma: no cover
+            raise RuntimeError(
+                'The SharedMemoryEvaluator requires Python 3.8 or newer.')
+
+        # Determine number of workers
+        if n_workers is None:
+            self._n_workers = ParallelEvaluator.cpu_count()
+        else:
+            self._n_workers = int(n_workers)
+            if self._n_workers < 1:
+                raise ValueError(
+                    'Number of workers must be an integer greater than 0 or'
+                    ' `None` to use the default value.')
+
+        # Workers, and connections to each worker
+        self._workers = []
+        self._connections = []
+
+        # Shared memory blocks for positions and results
+        self._positions = None
+        self._results = None
+
+    def __del__(self):
+        # Cancel everything
+        try:
+            self._stop()
+        except Exception:
+            pass
+
+    def _allocate(self, n_bytes_positions, n_bytes_results):
+        """
+        Ensures the shared memory buffers can hold at least the given number
+        of bytes, replacing them with larger buffers if necessary.
+        """
+        def allocate(block, n_bytes):
+            if block is not None and block.size >= n_bytes:
+                return block
+            if block is not None:
+                n_bytes = max(n_bytes, 2 * block.size)
+                block.close()
+                block.unlink()
+            return shared_memory.SharedMemory(create=True, size=n_bytes)
+
+        self._positions = allocate(self._positions, n_bytes_positions)
+        self._results = allocate(self._results, n_bytes_results)
+
+    def _evaluate(self, positions):
+        """
+        Evaluate all positions in parallel, sending each worker a single block
+        of positions.
+        """
+        n = len(positions)
+        if n == 0:
+            return []
+
+        # Copy positions into shared memory
+        try:
+            xs = np.array(positions, dtype=float)
+        except (TypeError, ValueError):
+            raise ValueError(
+                'The SharedMemoryEvaluator can only evaluate positions that'
+                ' can be converted to a numerical array.')
+        self._allocate(max(1, xs.nbytes), n * 8)
+        np.ndarray(xs.shape, buffer=self._positions.buf)[:] = xs
+
+        # Ensure worker pool is running
+        self._populate()
+
+        try:
+            # Send each worker a block of positions
+            n_blocks = min(n, len(self._workers))
+            bounds = np.linspace(0, n, n_blocks + 1).astype(int)
+            waiting = {}
+            for k in range(n_blocks):
+                c = self._connections[k]
+                c.send((
+                    self._positions.name,
+                    self._results.name,
+                    xs.shape,
+                    bounds[k],
+                    bounds[k + 1],
+                ))
+                waiting[c] = k
+
+            # Collect replies (blocking)
+            objects = {}
+            errors = []
+            while waiting:
+                for c in multiprocessing.connection.wait(list(waiting)):
+                    del(waiting[c])
+                    try:
+                        reply = c.recv()
+                    except EOFError:    # pragma: no cover
+                        reply = (None, 'Worker process exited unexpectedly.')
+                    if reply[0] is None:
+                        errors.append(reply[1])
+                    else:
+                        objects.update(reply[1])
+                if errors:
+                    break
+
+        except (Exception, SystemExit, KeyboardInterrupt):  # pragma: no cover
+            # All exceptions, including Ctrl-C and user triggered exits should
+            # (1) cause all child processes to stop and (2) bubble up to the
+            # caller.
+            self._stop()
+            raise
+
+        # Error in worker processes
+        if errors:
+            self._stop()
+            raise Exception(
+                'Exception in subprocess:\n' + errors[0]
+                + '\nException in subprocess')
+
+        # Gather results
+        results = np.ndarray((n, ), buffer=self._results.buf).tolist()
+        for i, f in objects.items():
+            results[i] = f
+        return results
+
+    def _populate(self):
+        """
+        Starts the worker processes, if they are not already running.
+        """
+        while len(self._workers) < self._n_workers:
+            connection, worker_connection = multiprocessing.Pipe()
+            w = _SharedMemoryWorker(
+                self._function, self._args, worker_connection)
+            w.start()
+            worker_connection.close()
+            self._workers.append(w)
+            self._connections.append(connection)
+
+    def _stop(self):
+        """
+        Halts the workers and frees the shared memory.
+        """
+        # Ask workers to stop, and terminate any that don't
+        for c in self._connections:
+            try:
+                c.send(None)
+            except (IOError, EOFError):     # pragma: no cover
+                pass
+        for w in self._workers:
+            w.join(0.1)
+            if w.exitcode is None:
+                w.terminate()
+                w.join()
+        for c in self._connections:
+            c.close()
+        self._workers = []
+        self._connections = []
+
+        # Free shared memory
+        for block in (self._positions, self._results):
+            if block is not None:
+                block.close()
+                block.unlink()
+        self._positions = self._results = None
+
+
+class ThreadedEvaluator(Evaluator):
+    """
+    Evaluates a single-valued function object for any set of input values
+    given, using a pool of threads.
+
+    Shares an interface with the :class:`ParallelEvaluator`, and can be used as
+    a drop-in replacement for it. Because threads share memory, the function
+    does not need to be copied (pickled) for each worker, and positions and
+    results don't need to be sent between processes. However, Python's global
+    interpreter lock (GIL) only lets one thread at a time execute Python code,
+    so this evaluator only provides a speedup for functions that spend most of
+    their time in code that releases the GIL, for example in compiled
+    extensions or in solvers such as ``scipy.integrate.odeint``.
+
+    To check whether the GIL is limiting performance, the first call to
+    :meth:`evaluate()` evaluates a few positions sequentially, and uses the
+    time taken to estimate the speedup obtained when evaluating the remaining
+    positions in parallel. If the speedup is less than ``min_speedup`` a
+    warning is shown. The estimated speedup can be obtained with
+    :meth:`speedup()`.
+
+    Extends :class:`Evaluator`.
+
+    Parameters
+    ----------
+    function
+        The function to evaluate
+    n_workers
+        The number of threads to use. If left at the default value
+        ``n_workers=None`` the number of threads will equal the number of CPU
+        cores in the machine this is run on.
+    args
+        An optional sequence of extra arguments to ``f``. If ``args`` is
+        specified, ``f`` will be called as ``f(x, *args)``.
+    min_speedup
+        The speedup below which a warning is shown (see above).
+    """
+    def __init__(self, function, n_workers=None, args=None, min_speedup=1.5):
+        super(ThreadedEvaluator, self).__init__(function, args)
+
+        # Check threads are supported
+        if ThreadPoolExecutor is None:  # pragma: no cover
+            raise RuntimeError('The ThreadedEvaluator requires Python 3.')
+
+        # Determine number of workers
+        if n_workers is None:
+            self._n_workers = ParallelEvaluator.cpu_count()
+        else:
+            self._n_workers = int(n_workers)
+            if self._n_workers < 1:
+                raise ValueError(
+                    'Number of workers must be an integer greater than 0 or'
+                    ' `None` to use the default value.')
+
+        # Speedup below which a warning is shown, and measured speedup
+        self._min_speedup = float(min_speedup)
+        self._speedup = None
+
+        # Thread pool (created when needed)
+        self._executor = None
+
+    def __del__(self):
+        # Stop threads
+        try:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False)
+        except Exception:   # pragma: no cover
+            pass
+
+    def _evaluate(self, positions):
+        """
+        Evaluate all positions, in chunks handed out to a pool of threads.
+        """
+        positions = list(positions)
+        n = len(positions)
+        results = []
+
+        # On the first call, evaluate some positions sequentially, to compare
+        # with the threaded evaluation
+        measure = (self._speedup is None and self._n_workers > 1
+                   and n >= 2 * self._n_workers)
+        if measure:
+            t = timeit.default_timer()
+            results = [
+                self._function(x, *self._args)
+                for x in positions[:self._n_workers]]
+            t_sequential = timeit.default_timer() - t
+            positions = positions[self._n_workers:]
+            n = len(positions)
+
+        # Start thread pool
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self._n_workers)
+
+        # Evaluate in chunks, a few per thread to balance the load
+        t = timeit.default_timer()
+        size = max(1, int(math.ceil(n / (4 * self._n_workers))))
+        chunks = [positions[i:i + size] for i in range(0, n, size)]
+        for fs in self._executor.map(self._evaluate_chunk, chunks):
+            results.extend(fs)
+        t_parallel = timeit.default_timer() - t
+
+        # Estimate speedup, warn if the GIL is serialising the work
+        if measure:
+            self._speedup = (t_sequential / self._n_workers * n) / max(
+                t_parallel, 1e-12)
+            if self._speedup < self._min_speedup:
+                log = logging.getLogger(__name__)
+                log.warning(
+                    'ThreadedEvaluator achieved an estimated speedup of only '
+                    + str(round(self._speedup, 2)) + ' using '
+                    + str(self._n_workers) + ' threads. The evaluated'
+                    ' function may not be releasing the GIL, in which case'
+                    ' a ParallelEvaluator will give better performance.')
+
+        return results
+
+    def _evaluate_chunk(self, xs):
+        """ Evaluates the function for a list of positions. """
+        return [self._function(x, *self._args) for x in xs]
+
+    def speedup(self):
+        """
+        Returns the speedup over sequential evaluation estimated during the
+        first call to :meth:`evaluate()`, or ``None`` if no estimate has been
+        made yet.
+        """
+        return self._speedup
+
+
 #
 # Note: For Windows multiprocessing to work, the _Worker can never be a nested
 # class!
@@ -408,8 +1067,8 @@ class _Worker(multiprocessing.Process):
     """
     Worker class for use with :class:`ParallelEvaluator`.
 
-    Evaluates a single-valued function for every point in a ``tasks`` queue
-    and places the results on a ``results`` queue.
+    Evaluates a single-valued function for every chunk of points in a
+    ``tasks`` queue and places the results on a ``results`` queue.
 
     Keeps running until it's given the string "stop" as a task.
 
@@ -424,23 +1083,27 @@ class _Worker(multiprocessing.Process):
         objective function.
     tasks
         The queue to read tasks from. Tasks are stored as tuples
-        ``(i, p)`` where ``i`` is a task id and ``p`` is the
-        position to evaluate.
+        ``(i, ps)`` where ``i`` is the index of the first position in the
+        chunk and ``ps`` is a list of positions to evaluate.
     results
-        The queue to store results in. Results are stored as
-        tuples ``(i, p, r)`` where ``i`` is the task id, ``p`` is
-        the position evaluated (which can be updated by the
-        refinement method!) and ``r`` is the result at ``p``.
+        The queue to store results in. Results are stored as tuples
+        ``(i, rs, w, t)`` where ``i`` is the index of the first position in
+        the chunk, ``rs`` is a list of results, ``w`` is this worker's
+        ``worker_id``, and ``t`` is the time spent evaluating.
     max_tasks : int
-        The maximum number of tasks to perform before dying.
+        The maximum number of evaluations to perform before dying. The worker
+        only checks this number after finishing a chunk.
     errors
         A queue to store exceptions on
     error
         This flag will be set by the worker whenever it encounters an
         error.
+    worker_id : int
+        An index used to identify this worker in the results.
     """
     def __init__(
-            self, function, args, tasks, results, max_tasks, errors, error):
+            self, function, args, tasks, results, max_tasks, errors, error,
+            worker_id=0):
         super(_Worker, self).__init__()
         self.daemon = True
         self._function = function
@@ -450,6 +1113,7 @@ class _Worker(multiprocessing.Process):
         self._max_tasks = max_tasks
         self._errors = errors
         self._error = error
+        self.worker_id = worker_id
 
     def run(self):
         # Worker processes should never write to stdout or stderr.
@@ -458,10 +1122,14 @@ class _Worker(multiprocessing.Process):
         sys.stdout = open(os.devnull, 'w')
         sys.stderr = open(os.devnull, 'w')
         try:
-            for k in range(self._max_tasks):
-                i, x = self._tasks.get()
-                f = self._function(x, *self._args)
-                self._results.put((i, f))
+            k = 0
+            while k < self._max_tasks:
+                i, xs = self._tasks.get()
+                t = timeit.default_timer()
+                fs = [self._function(x, *self._args) for x in xs]
+                t = timeit.default_timer() - t
+                self._results.put((i, fs, self.worker_id, t))
+                k += len(xs)
 
                 # Check for errors in other workers
                 if self._error.is_set():
@@ -471,3 +1139,115 @@ class _Worker(multiprocessing.Process):
             self._errors.put((self.pid, traceback.format_exc()))
             self._error.set()
 
+
+class _SharedMemoryWorker(multiprocessing.Process):
+    """
+    Worker class for use with :class:`SharedMemoryEvaluator`.
+
+    Waits for messages on a ``connection``. Each message is a tuple
+    ``(positions, results, shape, start, stop)``, where ``positions`` and
+    ``results`` are the names of shared memory blocks, ``shape`` is the shape
+    of the array of positions stored in ``positions``, and ``start`` and
+    ``stop`` indicate the block of positions this worker should evaluate.
+
+    Scalar results are written into the shared ``results`` array, after which
+    a reply ``(True, objects)`` is sent, where ``objects`` is a dict mapping
+    position indices to any non-scalar results. If an error occurs, the reply
+    ``(None, trace)`` is sent instead.
+
+    Keeps running until it's given ``None`` as a message.
+
+    Extends ``multiprocessing.Process``.
+
+    Parameters
+    ----------
+    function : callable
+        The function to evaluate.
+    args : sequence
+        A (possibly empty) tuple containing extra input arguments to the
+        function.
+    connection
+        A ``multiprocessing`` connection to read tasks from and send replies
+        to.
+    """
+    def __init__(self, function, args, connection):
+        super(_SharedMemoryWorker, self).__init__()
+        self.daemon = True
+        self._function = function
+        self._args = args
+        self._connection = connection
+
+    def run(self):
+        # Worker processes should never write to stdout or stderr.
+        sys.stdout = open(os.devnull, 'w')
+        sys.stderr = open(os.devnull, 'w')
+
+        # Shared memory blocks, stored by name
+        blocks = {}
+
+        def attach(name):
+            if name not in blocks:
+                blocks[name] = shared_memory.SharedMemory(name=name)
+            return blocks[name]
+
+        try:
+            while True:
+                task = self._connection.recv()
+                if task is None:
+                    break
+
+                # Evaluate positions in this block
+                positions, results, shape, start, stop = task
+                try:
+                    xs = np.ndarray(shape, buffer=attach(positions).buf)
+                    xs = xs[start:stop].copy()
+                    fs = np.zeros(stop - start)
+                    objects = {}
+                    for i, x in enumerate(xs):
+                        f = self._function(x, *self._args)
+                        if isinstance(f, numbers.Real):
+                            fs[i] = f
+                        else:
+                            objects[start + i] = f
+                    np.ndarray(
+                        (shape[0], ), buffer=attach(results).buf
+                    )[start:stop] = fs
+                except (Exception, KeyboardInterrupt, SystemExit):
+                    self._connection.send((None, traceback.format_exc()))
+                else:
+                    self._connection.send((True, objects))
+
+                # Detach from blocks that are no longer in use
+                for name in list(blocks):
+                    if name not in (positions, results):
+                        blocks.pop(name).close()
+
+        except (IOError, EOFError):     # pragma: no cover
+            pass
+        finally:
+            for block in blocks.values():
+                try:
+                    block.close()
+                except BufferError:     # pragma: no cover
+                    pass
+
+
+#
+# Functions used by the AsynchronousEvaluator's worker processes. The function
+# to evaluate is stored once per process, so that it doesn't need to be sent
+# with every task.
+#
+_process_function = None
+_process_args = ()
+
+
+def _initialise_process(function, args):
+    """ Stores the function to evaluate in a worker process. """
+    global _process_function, _process_args
+    _process_function = function
+    _process_args = args
+
+
+def _evaluate_in_process(x):
+    """ Evaluates the stored function in a worker process. """
+    return _process_function(x, *_process_args)
@@ -71,6 +71,20 @@ class AR1LogLikelihood(pints.ProblemLogLikelihood):
         return np.sum(- self._logn - self._nt * np.log(sigma)
                       - np.sum(autocorr_error**2, axis=0) / (2 * sigma**2))
 
+    def evaluate_batch(self, xs):
+        """ See :meth:`LogPDF.evaluate_batch()`. """
+        xs = pints.matrix2d(xs)
+        m = 2 * self._no
+        parameters = xs[:, -m:]
+        rho = parameters[:, 0::2]
+        sigma = parameters[:, 1::2] * np.sqrt(1 - rho**2)
+        error = self._values - self._problem.evaluate_batch(xs[:, :-m])
+        error = error.reshape((len(xs), -1, self._no))
+        autocorr_error = error[:, 1:] - rho[:, None, :] * error[:, :-1]
+        return np.sum(- self._logn - self._nt * np.log(sigma)
+                      - np.sum(autocorr_error**2, axis=1) / (2 * sigma**2),
+                      axis=1)
+
 
 class ARMA11LogLikelihood(pints.ProblemLogLikelihood):
     r"""
@@ -137,6 +151,26 @@ class ARMA11LogLikelihood(pints.ProblemLogLikelihood):
         return np.sum(- self._logn - self._nt * np.log(sigma)
                       - np.sum(autocorr_error**2, axis=0) / (2 * sigma**2))
 
+    def evaluate_batch(self, xs):
+        """ See :meth:`LogPDF.evaluate_batch()`. """
+        xs = pints.matrix2d(xs)
+        m = 3 * self._no
+        parameters = xs[:, -m:]
+        rho = parameters[:, 0::3]
+        phi = parameters[:, 1::3]
+        sigma = parameters[:, 2::3]
+        sigma = (
+            sigma *
+            np.sqrt((1.0 - rho**2) / (1.0 + 2.0 * phi * rho + phi**2))
+        )
+        error = self._values - self._problem.evaluate_batch(xs[:, :-m])
+        error = error.reshape((len(xs), -1, self._no))
+        v = error[:, 1:] - rho[:, None, :] * error[:, :-1]
+        autocorr_error = v[:, 1:] - phi[:, None, :] * v[:, :-1]
+        return np.sum(- self._logn - self._nt * np.log(sigma)
+                      - np.sum(autocorr_error**2, axis=1) / (2 * sigma**2),
+                      axis=1)
+
 
 class GaussianIntegratedUniformLogLikelihood(pints.ProblemLogLikelihood):
     r"""
@@ -278,6 +312,34 @@ class GaussianIntegratedUniformLogLikelihood(pints.ProblemLogLikelihood):
             log_temp
         )
 
+    def evaluate_batch(self, xs):
+        """ See :meth:`LogPDF.evaluate_batch()`. """
+        xs = pints.matrix2d(xs)
+        error = self._values - self._problem.evaluate_batch(xs)
+        error = error.reshape((len(xs), self._nt, self._no))
+        sse = np.sum(error**2, axis=1)
+
+        # Calculate
+        log_temp = np.zeros(sse.shape)
+        for i, a in enumerate(self._a2):
+            if a != 0:
+                log_temp[:, i] = np.log(
+                    scipy.special.gammaincc(self._n_minus_1_over_2,
+                                            sse[:, i] / (2 * self._b2[i])) -
+                    scipy.special.gammaincc(self._n_minus_1_over_2,
+                                            sse[:, i] / (2 * a)))
+            else:
+                log_temp[:, i] = np.log(
+                    scipy.special.gammaincc(self._n_minus_1_over_2,
+                                            sse[:, i] / (2 * self._b2[i])))
+        return np.sum(
+            self._const_general -
+            self._n_minus_1_over_2 * np.log(sse) +
+            self._log_gamma +
+            log_temp,
+            axis=1
+        )
+
 
 class CauchyLogLikelihood(pints.ProblemLogLikelihood):
     r"""
@@ -338,6 +400,21 @@ class CauchyLogLikelihood(pints.ProblemLogLikelihood):
             - np.sum(np.log(1 + (error / sigma)**2), axis=0)
         )
 
+    def evaluate_batch(self, xs):
+        """ See :meth:`LogPDF.evaluate_batch()`. """
+        xs = pints.matrix2d(xs)
+        n = self._n
+        m = self._no
+        error = self._values - self._problem.evaluate_batch(xs[:, :-m])
+        error = error.reshape((len(xs), n, m))
+        sigma = xs[:, -m:]
+        return np.sum(
+            - self._n_log_pi
+            - n * np.log(sigma)
+            - np.sum(np.log(1 + (error / sigma[:, None, :])**2), axis=1),
+            axis=1
+        )
+
 
 class GaussianKnownSigmaLogLikelihood(pints.ProblemLogLikelihood):
     r"""
@@ -414,6 +491,14 @@ class GaussianKnownSigmaLogLikelihood(pints.ProblemLogLikelihood):
         # Return
         return L, dL
 
+    def evaluate_batch(self, xs):
+        """ See :meth:`LogPDF.evaluate_batch()`. """
+        xs = pints.matrix2d(xs)
+        error = self._values - self._problem.evaluate_batch(xs)
+        error = error.reshape((len(xs), self._nt, self._no))
+        return np.sum(
+            self._offset + self._multip * np.sum(error**2, axis=1), axis=1)
+
 
 class GaussianLogLikelihood(pints.ProblemLogLikelihood):
     r"""
@@ -506,6 +591,15 @@ class GaussianLogLikelihood(pints.ProblemLogLikelihood):
         # Return
         return L, dL
 
+    def evaluate_batch(self, xs):
+        """ See :meth:`LogPDF.evaluate_batch()`. """
+        xs = pints.matrix2d(xs)
+        sigma = xs[:, -self._no:]
+        error = self._values - self._problem.evaluate_batch(xs[:, :-self._no])
+        error = error.reshape((len(xs), self._nt, self._no))
+        return np.sum(- self._logn - self._nt * np.log(sigma)
+                      - np.sum(error**2, axis=1) / (2 * sigma**2), axis=1)
+
 
 class KnownNoiseLogLikelihood(GaussianKnownSigmaLogLikelihood):
     """ Deprecated alias of :class:`GaussianKnownSigmaLogLikelihood`. """
@@ -567,6 +661,10 @@ class ScaledLogLikelihood(pints.ProblemLogLikelihood):
         a, b = self._log_likelihood.evaluateS1(x)
         return self._f * a, self._f * np.asarray(b)
 
+    def evaluate_batch(self, xs):
+        """ See :meth:`LogPDF.evaluate_batch()`. """
+        return self._f * np.asarray(self._log_likelihood.evaluate_batch(xs))
+
 
 class StudentTLogLikelihood(pints.ProblemLogLikelihood):
     r"""
@@ -634,6 +732,26 @@ class StudentTLogLikelihood(pints.ProblemLogLikelihood):
             - 0.5 * (1 + nu) * np.sum(np.log(nu + (error / sigma)**2), axis=0)
         )
 
+    def evaluate_batch(self, xs):
+        """ See :meth:`LogPDF.evaluate_batch()`. """
+        xs = pints.matrix2d(xs)
+        n = self._n
+        m = 2 * self._no
+        error = self._values - self._problem.evaluate_batch(xs[:, :-m])
+        error = error.reshape((len(xs), n, self._no))
+        parameters = xs[:, -m:]
+        nu = parameters[:, 0::2]
+        sigma = parameters[:, 1::2]
+        return np.sum(
+            + 0.5 * n * nu * np.log(nu)
+            - n * np.log(sigma)
+            - n * np.log(scipy.special.beta(0.5 * nu, 0.5))
+            - 0.5 * (1 + nu) * np.sum(
+                np.log(nu[:, None, :] + (error / sigma[:, None, :])**2),
+                axis=1),
+            axis=1
+        )
+
 
 class UnknownNoiseLogLikelihood(GaussianLogLikelihood):
     """
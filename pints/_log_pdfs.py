@@ -8,7 +8,7 @@
 #
 from __future__ import absolute_import, division
 from __future__ import print_function, unicode_literals
-
+import pints
 import numpy as np
 
 
@@ -40,6 +40,23 @@ class LogPDF(object):
         """
         raise NotImplementedError
 
+    def evaluate_batch(self, xs):
+        """
+        Evaluates this LogPDF for every point in ``xs``, and returns the
+        results as a NumPy array of shape ``(n_points, )``.
+
+        The argument ``xs`` must be a sequence of points, i.e. a list of
+        vectors or an array of shape ``(n_points, n_parameters)``.
+
+        By default this method calls the LogPDF once for every point, but
+        subclasses can override it to evaluate all points at once (e.g. using
+        NumPy vector operations), which is much faster when many points need to
+        be evaluated, for example for a population of particles or walkers.
+        Overriding methods should return the same values (up to rounding
+        errors) as calling the LogPDF on each point.
+        """
+        return np.array([self(x) for x in xs], dtype=float)
+
     def n_parameters(self):
         """
         Returns the dimension of the space this :class:`LogPDF` is defined
@@ -173,6 +190,21 @@ class LogPosterior(LogPDF):
         b, db = self._log_likelihood.evaluateS1(x)
         return a + b, da + db
 
+    def evaluate_batch(self, xs):
+        """
+        See :meth:`LogPDF.evaluate_batch()`.
+
+        As with single evaluations, the :class:`LogPrior` is evaluated first,
+        and the :class:`LogPDF` is only evaluated for the points where the
+        log-prior is not ``-inf``.
+        """
+        xs = pints.matrix2d(xs)
+        values = np.array(self._log_prior.evaluate_batch(xs), dtype=float)
+        ok = values != self._minf
+        if np.any(ok):
+            values[ok] += self._log_likelihood.evaluate_batch(xs[ok])
+        return values
+
     def log_likelihood(self):
         """ Returns the :class:`LogLikelihood` used by this posterior. """
         return self._log_likelihood
@@ -259,6 +291,14 @@ class SumOfIndependentLogPDFs(LogPDF):
             dtotal += np.asarray(b)
         return total, dtotal
 
+    def evaluate_batch(self, xs):
+        """ See :meth:`LogPDF.evaluate_batch()`. """
+        xs = pints.matrix2d(xs)
+        total = np.zeros(len(xs))
+        for e in self._log_likelihoods:
+            total += e.evaluate_batch(xs)
+        return total
+
     def n_parameters(self):
         """ See :meth:`LogPDF.n_parameters()`. """
         return self._n_parameters
@@ -76,6 +76,13 @@ class BetaLogPrior(pints.LogPrior):
             return value, np.asarray([np.divide(self._a - 1., _x) - np.divide(
                 self._b - 1., 1. - _x)])
 
+    def evaluate_batch(self, xs):
+        """ See :meth:`LogPDF.evaluate_batch()`. """
+        x = pints.matrix2d(xs)[:, 0]
+        values = scipy.special.xlogy(self._a - 1.0, x) + scipy.special.xlog1py(
+            self._b - 1.0, -x) - self._log_beta
+        return np.where((x < 0.0) | (x > 1.0), -np.inf, values)
+
     def mean(self):
         """ See :meth:`LogPrior.mean()`. """
         return self._a / (self._a + self._b)
@@ -131,6 +138,12 @@ class CauchyLogPrior(pints.LogPrior):
         _x_sq = (x[0] - self._location) * (x[0] - self._location)
         return -np.log(self._pi_sig + self._pi_on_sig * _x_sq)
 
+    def evaluate_batch(self, xs):
+        """ See :meth:`LogPDF.evaluate_batch()`. """
+        _x = pints.matrix2d(xs)[:, 0]
+        _x_sq = (_x - self._location) * (_x - self._location)
+        return -np.log(self._pi_sig + self._pi_on_sig * _x_sq)
+
     def mean(self):
         """ See :meth:`LogPrior.mean()`. """
         return np.nan
@@ -202,6 +215,17 @@ class ComposedLogPrior(pints.LogPrior):
             doutput[lo:hi] = np.asarray(dp)
         return output, doutput
 
+    def evaluate_batch(self, xs):
+        """ See :meth:`LogPDF.evaluate_batch()`. """
+        xs = pints.matrix2d(xs)
+        output = np.zeros(len(xs))
+        lo = hi = 0
+        for prior in self._priors:
+            lo = hi
+            hi += prior.n_parameters()
+            output += prior.evaluate_batch(xs[:, lo:hi])
+        return output
+
     def n_parameters(self):
         """ See :meth:`LogPrior.n_parameters()`. """
         return self._n_parameters
@@ -267,6 +291,11 @@ class ExponentialLogPrior(pints.LogPrior):
         else:
             return value, np.asarray([-self._rate])
 
+    def evaluate_batch(self, xs):
+        """ See :meth:`LogPDF.evaluate_batch()`. """
+        x = pints.matrix2d(xs)[:, 0]
+        return np.where(x < 0.0, -np.inf, self._log_scale - self._rate * x)
+
     def mean(self):
         """ See :meth:`LogPrior.mean()`. """
         return 1 / self._rate
@@ -340,6 +369,13 @@ class GammaLogPrior(pints.LogPrior):
             # Use np.divide here to better handle possible v small denominators
             return value, np.asarray([np.divide(self._a - 1., _x) - self._b])
 
+    def evaluate_batch(self, xs):
+        """ See :meth:`LogPDF.evaluate_batch()`. """
+        x = pints.matrix2d(xs)[:, 0]
+        values = self._constant + scipy.special.xlogy(
+            self._a - 1., x) - self._b * x
+        return np.where(x < 0.0, -np.inf, values)
+
     def mean(self):
         """ See :meth:`LogPrior.mean()`. """
         return self._a / self._b
@@ -392,6 +428,11 @@ class GaussianLogPrior(pints.LogPrior):
         """ See :meth:`LogPDF.evaluateS1()`. """
         return self(x), self._factor2 * (self._mean - np.asarray(x))
 
+    def evaluate_batch(self, xs):
+        """ See :meth:`LogPDF.evaluate_batch()`. """
+        x = pints.matrix2d(xs)[:, 0]
+        return self._offset - self._factor * (x - self._mean)**2
+
     def mean(self):
         """ See :meth:`LogPrior.mean()`. """
         return self._mean
@@ -453,6 +494,14 @@ class HalfCauchyLogPrior(pints.LogPrior):
         else:
             return -np.inf
 
+    def evaluate_batch(self, xs):
+        """ See :meth:`LogPDF.evaluate_batch()`. """
+        xs = pints.matrix2d(xs)
+        return np.where(
+            xs[:, 0] > 0,
+            self._norm_factor + self._cauchy.evaluate_batch(xs),
+            -np.inf)
+
     def mean(self):
         """ See :meth:`LogPrior.mean()`. """
         return np.nan
@@ -535,6 +584,15 @@ class InverseGammaLogPrior(pints.LogPrior):
             return val, np.asarray(
                 [np.divide(self._b - self._ap1 * _x, _x * _x)])
 
+    def evaluate_batch(self, xs):
+        """ See :meth:`LogPDF.evaluate_batch()`. """
+        x = pints.matrix2d(xs)[:, 0]
+        ok = x > 0.0
+        values = np.full(x.shape, -np.inf)
+        values[ok] = (
+            self._k - self._ap1 * np.log(x[ok]) - np.divide(self._b, x[ok]))
+        return values
+
     def mean(self):
         """ See :meth:`LogPrior.mean()`. """
         return self._b / (self._a - 1.) if self._a > 1 else np.nan
@@ -609,6 +667,16 @@ class LogNormalLogPrior(pints.LogPrior):
             return self(x), np.asarray(
                 [self._m1onsigsq * np.divide(self._sigsqmmu + _lx, _x)])
 
+    def evaluate_batch(self, xs):
+        """ See :meth:`LogPDF.evaluate_batch()`. """
+        x = pints.matrix2d(xs)[:, 0]
+        ok = x > 0.0
+        _lx = np.log(x[ok])
+        _shift = _lx - self._log_mean
+        values = np.full(x.shape, -np.inf)
+        values[ok] = self._offset - _lx - self._1on2sigsq * _shift * _shift
+        return values
+
     def mean(self):
         """ See :meth:`LogPrior.mean()`. """
         return np.exp(self._log_mean + 0.5 * self._scale * self._scale)
@@ -671,6 +739,13 @@ class MultivariateGaussianLogPrior(pints.LogPrior):
         """ See :meth:`LogPDF.evaluateS1()`. """
         return self(x), -np.matmul(self._cov_inverse, x - self._mean)
 
+    def evaluate_batch(self, xs):
+        """ See :meth:`LogPDF.evaluate_batch()`. """
+        xs = pints.matrix2d(xs)
+        return np.log(np.atleast_1d(
+            scipy.stats.multivariate_normal.pdf(
+                xs, mean=self._mean, cov=self._cov)))
+
     def mean(self):
         """ See :meth:`LogPrior.mean()`. """
         return self._mean
@@ -768,6 +843,12 @@ class StudentTLogPrior(pints.LogPrior):
         return self(x), np.asarray([offset * self._deriv_const / (
             self._df + offset * offset * self._1_sig_sq)])
 
+    def evaluate_batch(self, xs):
+        """ See :meth:`LogPDF.evaluate_batch()`. """
+        x = pints.matrix2d(xs)[:, 0]
+        return self._samp_const + self._first * (self._log_df - np.log(
+            self._df + self._1_sig_sq * (x - self._location) ** 2))
+
     def mean(self):
         """ See :meth:`LogPrior.mean()`. """
         return self._location if self._df > 1. else np.nan
@@ -846,6 +927,17 @@ class UniformLogPrior(pints.LogPrior):
         # much...
         return self(x), np.zeros(self._n_parameters)
 
+    def evaluate_batch(self, xs):
+        """ See :meth:`LogPDF.evaluate_batch()`. """
+        xs = pints.matrix2d(xs)
+        if isinstance(self._boundaries, pints.RectangularBoundaries):
+            inside = np.logical_and(
+                np.all(xs >= self._boundaries.lower(), axis=1),
+                np.all(xs < self._boundaries.upper(), axis=1))
+        else:
+            inside = [self._boundaries.check(x) for x in xs]
+        return np.where(inside, self._value, -np.inf)
+
     def mean(self):
         """ See :meth:`LogPrior.mean()`. """
         if isinstance(self._boundaries, pints.RectangularBoundaries):
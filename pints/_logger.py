@@ -9,6 +9,7 @@
 from __future__ import absolute_import, division
 from __future__ import print_function, unicode_literals
 import sys
+import timeit
 import numpy as np
 import collections
 
@@ -34,6 +35,11 @@ class Logger(object):
         log.log(1, 1.23456)
         log.log(2, 7.8901)
 
+    By default, the log file (if set) is opened and closed every time a row is
+    logged, so that its contents are always up to date. For long runs that
+    log frequently, buffering can be enabled with :meth:`set_buffering()`. In
+    this mode the file is kept open, and rows are written in blocks. Buffered
+    rows are written when :meth:`flush()` or :meth:`close()` is called.
     """
     def __init__(self):
         super(Logger, self).__init__()
@@ -68,6 +74,21 @@ class Logger(object):
         # Buffer of data to log
         self._buffer = collections.deque()
 
+        # File buffering (disabled): maximum number of buffered lines, maximum
+        # time between writes, and buffered lines
+        self._buffer_rows = None
+        self._buffer_interval = None
+        self._file_buffer = []
+        self._last_flush = None
+
+        # Open file handle (buffered mode only), and mode to open file with
+        self._file = None
+        self._file_mode = 'w'
+
+        # Pre-compiled format for csv rows, and indices of integer fields
+        self._csv_format = None
+        self._csv_ints = None
+
     def add_counter(self, name, width=5, max_value=None, file_only=False):
         """
         Adds a field for positive integers.
@@ -312,6 +333,32 @@ class Logger(object):
         # Return self to allow for chaining
         return self
 
+    def close(self):
+        """
+        Writes any buffered rows to the log file, and closes it.
+
+        If more rows are logged after calling :meth:`close()`, the file is
+        re-opened and the new rows are appended.
+        """
+        self.flush()
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def flush(self):
+        """
+        Writes any buffered rows to the log file (see
+        :meth:`set_buffering()`).
+        """
+        self._last_flush = timeit.default_timer()
+        if self._file_buffer:
+            if self._file is None:
+                self._file = open(self._filename, self._file_mode)
+                self._file_mode = 'a'
+            self._file.write('\n'.join(self._file_buffer) + '\n')
+            self._file.flush()
+            self._file_buffer = []
+
     def log(self, *data):
         """
         Logs a new row of data.
@@ -340,30 +387,36 @@ class Logger(object):
 
         # Log in CSV format
         if self._csv_mode and self._filename is not None:
+            lines = []
 
-            mode = 'a' if self._have_logged else 'w'
-            with open(self._filename, mode) as f:
-
-                # Write names
-                if not self._have_logged:
-                    f.write(','.join(
-                        ['"' + x + '"' for x in self._field_names]) + '\n')
-
-                # Write data
-                for row in rows:
-                    line = []
-                    i = iter(row)
-                    for width, dtype, f1, f2 in self._field_formats:
-                        if dtype == _FLOAT:
-                            x = '{:.17e}'.format(next(i))
-                        elif dtype == _TIME:
-                            x = str(next(i))
-                        elif dtype == _TEXT:
-                            x = '"' + str(next(i)) + '"'
-                        else:
-                            x = str(int(next(i)))
-                        line.append(x)
-                    f.write(','.join(line) + '\n')
+            # Write names, and create a format for entire rows
+            if not self._have_logged:
+                if self._file_mode == 'w':
+                    lines.append(','.join(
+                        ['"' + x + '"' for x in self._field_names]))
+                formats = []
+                self._csv_ints = []
+                for i, field_format in enumerate(self._field_formats):
+                    dtype = field_format[1]
+                    if dtype == _FLOAT:
+                        formats.append('{:.17e}')
+                    elif dtype == _TIME:
+                        formats.append('{}')
+                    elif dtype == _TEXT:
+                        formats.append('"{}"')
+                    else:
+                        formats.append('{:d}')
+                        self._csv_ints.append(i)
+                self._csv_format = ','.join(formats)
+
+            # Write data
+            for row in rows:
+                if self._csv_ints:
+                    row = list(row)
+                    for i in self._csv_ints:
+                        row[i] = int(row[i])
+                lines.append(self._csv_format.format(*row))
+            self._write(lines)
 
             # No need to log to screen? Then skip line formatting and return
             if not self._stream:
@@ -414,19 +467,56 @@ class Logger(object):
             lines = []
             for row in formatted_rows:
                 lines.append(' '.join([x for x in row]))
-            with open(self._filename, 'a' if self._have_logged else 'w') as f:
-                f.write('\n'.join(lines) + '\n')
+            if not self._have_logged and self._file_mode == 'a':
+                # Appending: Don't write headers
+                lines = lines[1:]
+            self._write(lines)
 
         # Have logged!
         self._have_logged = True
 
-    def set_filename(self, filename=None, csv=False):
+    def set_buffering(self, rows=1000, interval=None):
+        """
+        Enables or disables buffered writing to the log file.
+
+        With buffering enabled, the log file is kept open and rows are stored
+        in memory until ``rows`` rows have been logged, or until ``interval``
+        seconds have passed since the last write (if ``interval`` is not
+        ``None``). This reduces the time spent on opening, writing, and
+        closing files when logging frequently. Buffered rows are also written
+        when :meth:`flush()` or :meth:`close()` is called.
+
+        Buffering can be disabled by setting ``rows=None``. Logging to screen
+        is never buffered.
+        """
+        if self._have_logged:
+            raise RuntimeError('Cannot configure after logging has started.')
+
+        if rows is None:
+            self._buffer_rows = self._buffer_interval = None
+            return
+
+        rows = int(rows)
+        if rows < 1:
+            raise ValueError('Number of buffered rows must be at least 1.')
+        if interval is not None:
+            interval = float(interval)
+            if interval < 0:
+                raise ValueError('Flush interval cannot be negative.')
+        self._buffer_rows = rows
+        self._buffer_interval = interval
+
+    def set_filename(self, filename=None, csv=False, append=False):
         """
         Enables logging to a file if a ``filename`` is passed in. Logging to
         file can be disabled by passing ``filename=None``.
 
         Usually, file logging happens in the same format as logging to screen.
         To obtain csv logs instead, set `csv=True`
+
+        By default, any existing file is overwritten. To add rows to an
+        existing log instead (without writing a new header), set
+        ``append=True``.
         """
         if self._have_logged:
             raise RuntimeError('Cannot configure after logging has started.')
@@ -436,6 +526,7 @@ class Logger(object):
         else:
             self._filename = str(filename)
         self._csv_mode = True if csv else False
+        self._file_mode = 'a' if append else 'w'
 
     def set_stream(self, stream=sys.stdout):
         """
@@ -464,6 +555,29 @@ class Logger(object):
         # Format and return
         return '{:>3d}:{:0>4.1f}'.format(minutes, seconds)
 
+    def _write(self, lines):
+        """
+        Writes a list of ``lines`` to the log file, or stores them in the
+        buffer if buffering is enabled.
+        """
+        # Unbuffered: open, write, and close
+        if self._buffer_rows is None:
+            with open(self._filename, self._file_mode) as f:
+                f.write('\n'.join(lines) + '\n')
+            self._file_mode = 'a'
+            return
+
+        # Buffered: write if buffer is full or interval has passed
+        self._file_buffer.extend(lines)
+        if self._last_flush is None:
+            self._last_flush = timeit.default_timer()
+        if len(self._file_buffer) >= self._buffer_rows:
+            self.flush()
+        elif self._buffer_interval is not None:
+            if timeit.default_timer() - self._last_flush \
+                    >= self._buffer_interval:
+                self.flush()
+
 
 class Loggable(object):
     """
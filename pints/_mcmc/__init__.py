@@ -8,10 +8,16 @@
 #
 from __future__ import absolute_import, division
 from __future__ import print_function, unicode_literals
+import copy
+import heapq
 import os
+import pickle
 import pints
+import pints.io
 import numpy as np
 
+from ._convergence import ConvergenceMonitor
+
 
 class MCMCSampler(pints.Loggable, pints.TunableMethod):
     """
@@ -105,6 +111,10 @@ class SingleChainMCMC(MCMCSampler):
     def ask(self):
         """
         Returns a parameter vector to evaluate the LogPDF for.
+
+        For methods that ask for batches of points (see
+        :meth:`needs_batch_evaluation()`), a sequence of parameter vectors is
+        returned instead.
         """
         raise NotImplementedError
 
@@ -130,9 +140,42 @@ class SingleChainMCMC(MCMCSampler):
         :meth:`MCMCSamper.needs_sensitivities`), ``fx`` should be a tuple
         ``(log_pdf, sensitivities)``, containing the values returned by
         :meth:`pints.LogPdf.evaluateS1()`.
+
+        For methods that ask for batches of points (see
+        :meth:`needs_batch_evaluation()`), ``fx`` should be a sequence
+        containing the evaluation of each point in the batch.
         """
         raise NotImplementedError
 
+    def iterate(self, f):
+        """
+        Performs a complete iteration of the MCMC algorithm, calling ``f`` to
+        evaluate every point specified by :meth:`ask()` (for methods that
+        require sensitivities, ``f`` should be
+        :meth:`pints.LogPDF.evaluateS1()`), and returns the next sample in the
+        chain.
+
+        For methods that require multiple evaluations per iteration (e.g. the
+        leapfrog steps of :class:`HamiltonianMCMC`), this performs all of
+        them, without returning control to the caller in between (see
+        :meth:`MCMCController.set_fused_iterations()`).
+        """
+        batch = self.needs_batch_evaluation()
+        y = None
+        while y is None:
+            if batch:
+                y = self.tell([f(x) for x in self.ask()])
+            else:
+                y = self.tell(f(self.ask()))
+        return y
+
+    def needs_batch_evaluation(self):
+        """
+        Returns ``True`` if this method's :meth:`ask()` returns a batch of
+        points, which can be evaluated in parallel, instead of a single point.
+        """
+        return False
+
     def replace(self, current, current_log_pdf, proposed=None):
         """
         Replaces the internal current position, current LogPDF, and proposed
@@ -366,6 +409,13 @@ class MCMCController(object):
         # Storing chains and evaluations in memory
         self._chains_in_memory = True
         self._evaluations_in_memory = False
+
+        # Storing chains in a memory-mapped file, the number of iterations to
+        # discard, the interval at which to store them, and their data type
+        self._memmap_filename = None
+        self._storage_burn_in = 0
+        self._storage_thinning = 1
+        self._storage_dtype = np.dtype(float)
         self._samples = None
         self._evaluations = None
 
@@ -376,8 +426,24 @@ class MCMCController(object):
         # Parallelisation
         self._parallel = False
         self._n_workers = 1
+        self._parallel_backend = 'processes'
+        self._utilisation = None
         self.set_parallel()
 
+        # Asynchronous (non-lockstep) evaluation
+        self._asynchronous = False
+
+        # Fused iterations, performed entirely by the samplers
+        self._fused = False
+
+        # Speculative prefetching: number of points to evaluate per chain
+        # (True to use the number of workers), or False if disabled
+        self._prefetch = False
+
+        # Checkpointing
+        self._checkpoint_file = None
+        self._checkpoint_interval = None
+
         #
         # Stopping criteria
         #
@@ -386,7 +452,9 @@ class MCMCController(object):
         self._max_iterations = None
         self.set_max_iterations()
 
-        # TODO: Add more stopping criteria
+        # Convergence: target effective sample size and maximum rhat
+        self._target_ess = None
+        self._max_rhat = None
 
     def chains(self):
         """
@@ -402,6 +470,24 @@ class MCMCController(object):
         # the chains, so nothing will go wrong if the user messes the array up.
         return self._samples
 
+    def _file_logger(self, filename, fields, append=False):
+        """
+        Creates and returns an object to write chains or evaluations to, with
+        one column for each entry in ``fields``. Files ending in ``.npy`` are
+        written using a :class:`pints.io.ChainWriter`, all other files are
+        written in CSV format using a :class:`pints.Logger`. If ``append`` is
+        set to ``True``, rows are added to an existing file.
+        """
+        if os.path.splitext(filename)[1].lower() == '.npy':
+            return pints.io.ChainWriter(filename, len(fields), append=append)
+        logger = pints.Logger()
+        logger.set_stream(None)
+        logger.set_filename(filename, True, append)
+        logger.set_buffering()
+        for field in fields:
+            logger.add_float(field)
+        return logger
+
     def initial_phase_iterations(self):
         """
         For methods that require an initial phase (e.g. an adaptation-free
@@ -437,6 +523,13 @@ class MCMCController(object):
         """
         return self._max_iterations
 
+    def max_rhat(self):
+        """
+        Returns the maximum rhat if this stopping criterion is set, or ``None``
+        if it is not. See :meth:`set_max_rhat()`.
+        """
+        return self._max_rhat
+
     def method_needs_initial_phase(self):
         """
         Returns true if this sampler has been created with a method that has
@@ -451,6 +544,27 @@ class MCMCController(object):
         """
         return self._n_workers if self._parallel else False
 
+    def resume(self, checkpoint_file):
+        """
+        Continues a run from a checkpoint written by :meth:`run()` (see
+        :meth:`set_checkpoint_filename()`), and returns the result.
+
+        The controller should be created and configured in the same way as
+        the one that wrote the checkpoint (e.g. by running the same script),
+        but :meth:`resume()` should be called instead of :meth:`run()`. The
+        state of the samplers, the random number generator, and any chains and
+        evaluations stored in memory are restored from the checkpoint. Any
+        files that chains, evaluations, or logs are written to are truncated
+        to their length at the time of the checkpoint, and then appended to.
+        As a result, the resumed run produces the same chains as an
+        uninterrupted run would have.
+
+        The maximum number of iterations may be increased before resuming.
+        """
+        with open(checkpoint_file, 'rb') as f:
+            checkpoint = pickle.load(f)
+        return self._run(checkpoint)
+
     def run(self):
         """
         Runs the MCMC sampler(s) and returns the result.
@@ -460,78 +574,165 @@ class MCMCController(object):
         If storing chains to memory has been disabled with
         :meth:`set_chain_storage`, then ``None`` is returned instead.
         """
+        return self._run()
+
+    def _run(self, checkpoint=None):
+        """
+        Runs the MCMC sampler(s), starting from the given ``checkpoint`` if
+        set, and returns the result.
+        """
         # Check stopping criteria
         has_stopping_criterion = False
         has_stopping_criterion |= (self._max_iterations is not None)
+        has_stopping_criterion |= (self._target_ess is not None)
+        has_stopping_criterion |= (self._max_rhat is not None)
         if not has_stopping_criterion:
             raise ValueError('At least one stopping criterion must be set.')
 
+        # Check checkpointing
+        asynchronous = self._asynchronous
+        if asynchronous and self._checkpoint_file is not None:
+            raise ValueError(
+                'Checkpointing is not supported in asynchronous mode.')
+
+        # Check fused iterations
+        fused = self._fused
+        if asynchronous and fused:
+            raise ValueError(
+                'Fused iterations are not supported in asynchronous mode.')
+
+        # Check for samplers that ask for batches of points
+        batches = self._single_chain and not fused and (
+            self._samplers[0].needs_batch_evaluation())
+        if asynchronous and batches:
+            raise ValueError(
+                'Asynchronous mode is not supported for methods that ask for'
+                ' batches of points.')
+
+        # Check prefetching
+        prefetch = self._prefetch
+        if prefetch and (asynchronous or fused):
+            raise ValueError(
+                'Prefetching is not supported in asynchronous mode or with'
+                ' fused iterations.')
+
         # Iteration and evaluation counting
         iteration = 0
         n_evaluations = 0
 
+        # Settings that must be the same when resuming from a checkpoint
+        settings = (
+            self._n_chains, self._n_parameters, self._single_chain,
+            type(self._samplers[0]).__name__, self._chains_in_memory,
+            self._evaluations_in_memory, bool(self._evaluation_files),
+            self._storage_burn_in, self._storage_thinning,
+            self._memmap_filename is not None)
+
+        # Resume from checkpoint
+        resumed_files = set()
+        if checkpoint is not None:
+            if checkpoint['settings'] != settings:
+                raise ValueError(
+                    'Unable to resume: Checkpoint was written by a controller'
+                    ' with different settings.')
+            iteration = checkpoint['iteration']
+            if (self._max_iterations is not None
+                    and iteration >= self._max_iterations):
+                raise ValueError(
+                    'Unable to resume: Checkpoint is at iteration '
+                    + str(iteration) + ', which is not below the maximum'
+                    ' number of iterations.')
+            n_evaluations = checkpoint['n_evaluations']
+            self._samplers = checkpoint['samplers']
+
+            # Truncate files to their length at the time of the checkpoint
+            for filename, size in checkpoint['files']:
+                if size is not None and os.path.isfile(filename):
+                    with open(filename, 'r+b') as f:
+                        f.truncate(size)
+                    resumed_files.add(filename)
+
         # Choose method to evaluate
         f = self._log_pdf
         if self._needs_sensitivities:
             f = f.evaluateS1
 
+        # Use at most one worker per chain, unless the samplers ask for batches
+        # of points, or points are prefetched
+        n_workers = self._n_workers
+        if not (batches or prefetch):
+            n_workers = min(n_workers, self._n_chains)
+
+        # Number of points to predict and prefetch evaluations for
+        if prefetch:
+            n_points = self._n_workers if prefetch is True else prefetch
+
         # Create evaluator object
-        if self._parallel:
-            # Use at most n_workers workers
-            n_workers = min(self._n_workers, self._n_chains)
-            evaluator = pints.ParallelEvaluator(f, n_workers=n_workers)
+        if fused:
+            # Evaluate whole iterations, with one task per chain
+            f = _FusedIteration(f)
+            if self._parallel:
+                evaluator = pints.ParallelEvaluator(f, n_workers=n_workers)
+            else:
+                evaluator = pints.SequentialEvaluator(f)
+        elif asynchronous:
+            # Use a single worker thread if parallelisation is disabled
+            backend = 'processes'
+            if self._parallel_backend == 'threads' or not self._parallel:
+                backend = 'threads'
+            evaluator = pints.AsynchronousEvaluator(
+                f, n_workers=n_workers, backend=backend)
+        elif self._parallel:
+            if self._parallel_backend == 'threads':
+                evaluator = pints.ThreadedEvaluator(f, n_workers=n_workers)
+            elif self._parallel_backend == 'shared_memory':
+                evaluator = pints.SharedMemoryEvaluator(
+                    f, n_workers=n_workers)
+            else:
+                evaluator = pints.ParallelEvaluator(f, n_workers=n_workers)
+        elif hasattr(f, 'evaluate_batch'):
+            # Evaluate all points in a single (vectorised) call
+            evaluator = pints.BatchEvaluator(f)
         else:
             evaluator = pints.SequentialEvaluator(f)
 
-        # Initial phase
-        if self._needs_initial_phase:
+        # Initial phase (the samplers' states are restored when resuming)
+        if self._needs_initial_phase and checkpoint is None:
             for sampler in self._samplers:
                 sampler.set_initial_phase(True)
 
-        # Storing evaluations to memory or disk
+        # Bayesian inference on a log-posterior? Then separate out the prior
+        # so we can calculate the loglikelihood of stored evaluations
         prior = None
-        store_evaluations = \
-            self._evaluations_in_memory or self._evaluation_files
-        if store_evaluations:
-            # Bayesian inference on a log-posterior? Then separate out the
-            # prior so we can calculate the loglikelihood
+        if self._evaluations_in_memory or self._evaluation_files:
             if isinstance(self._log_pdf, pints.LogPosterior):
                 prior = self._log_pdf.log_prior()
 
-            # Store last accepted logpdf, per chain
-            current_logpdf = np.zeros(self._n_chains)
-            current_prior = np.zeros(self._n_chains)
-
         # Write chains to disk
         chain_loggers = []
         if self._chain_files:
+            fields = ['p' + str(k) for k in range(self._n_parameters)]
             for filename in self._chain_files:
-                cl = pints.Logger()
-                cl.set_stream(None)
-                cl.set_filename(filename, True)
-                for k in range(self._n_parameters):
-                    cl.add_float('p' + str(k))
-                chain_loggers.append(cl)
+                chain_loggers.append(self._file_logger(
+                    filename, fields, filename in resumed_files))
 
         # Write evaluations to disk
         eval_loggers = []
         if self._evaluation_files:
+            if prior:
+                # Logposterior in first column, to be consistent with the
+                # non-bayesian case
+                fields = ['logposterior', 'loglikelihood', 'logprior']
+            else:
+                fields = ['logpdf']
             for filename in self._evaluation_files:
-                cl = pints.Logger()
-                cl.set_stream(None)
-                cl.set_filename(filename, True)
-                if prior:
-                    # Logposterior in first column, to be consistent with the
-                    # non-bayesian case
-                    cl.add_float('logposterior')
-                    cl.add_float('loglikelihood')
-                    cl.add_float('logprior')
-                else:
-                    cl.add_float('logpdf')
-                eval_loggers.append(cl)
+                eval_loggers.append(self._file_logger(
+                    filename, fields, filename in resumed_files))
 
         # Set up progress reporting
         next_message = 0
+        if checkpoint is not None:
+            next_message = checkpoint['next_message']
 
         # Start logging
         logging = self._log_to_screen or self._log_filename
@@ -540,10 +741,20 @@ class MCMCController(object):
                 print('Using ' + str(self._samplers[0].name()))
                 print('Generating ' + str(self._n_chains) + ' chains.')
                 if self._parallel:
+                    workers = 'processes'
+                    if self._parallel_backend == 'threads' and not fused:
+                        workers = 'threads'
                     print('Running in parallel with ' + str(n_workers) +
-                          ' worker processess.')
+                          ' worker ' + workers + '.')
                 else:
                     print('Running in sequential mode.')
+                if asynchronous:
+                    print('Running chains asynchronously.')
+                if fused:
+                    print('Running fused iterations.')
+                if prefetch:
+                    print('Prefetching ' + str(n_points)
+                          + ' points per chain.')
                 if self._chain_files:
                     print(
                         'Writing chains to ' + self._chain_files[0] + ' etc.')
@@ -557,7 +768,10 @@ class MCMCController(object):
             if not self._log_to_screen:
                 logger.set_stream(None)
             if self._log_filename:
-                logger.set_filename(self._log_filename, csv=self._log_csv)
+                logger.set_filename(
+                    self._log_filename, csv=self._log_csv,
+                    append=self._log_filename in resumed_files)
+                logger.set_buffering(interval=1)
 
             # Add fields to log
             max_iter_guess = max(self._max_iterations or 0, 10000)
@@ -568,223 +782,219 @@ class MCMCController(object):
                 sampler._log_init(logger)
             logger.add_time('Time m:s')
 
-        # Pre-allocate arrays for chain storage
-        if self._chains_in_memory:
-            # Store full chains
-            samples = np.zeros(
-                (self._n_chains, self._max_iterations, self._n_parameters))
-        else:
-            # Store only the current iteration
-            samples = np.zeros((self._n_chains, self._n_parameters))
+        # Files to close when sampling ends, and to store the length of in
+        # checkpoints
+        file_loggers = chain_loggers + eval_loggers
+        filenames = (self._chain_files or []) + (self._evaluation_files or [])
+        if logging:
+            file_loggers.append(logger)
+            if self._log_filename:
+                filenames.append(self._log_filename)
 
-        # Pre-allocate arrays for evaluation storage
-        if self._evaluations_in_memory:
-            if prior:
-                # Store posterior, likelihood, prior
-                evaluations = np.zeros(
-                    (self._n_chains, self._max_iterations, 3))
-            else:
-                # Store pdf
-                evaluations = np.zeros((self._n_chains, self._max_iterations))
+        # Monitor convergence, using the samples after the initial phase
+        monitor = None
+        check_convergence = False
+        if self._target_ess is not None or self._max_rhat is not None:
+            monitor = ConvergenceMonitor(self._n_chains, self._n_parameters)
+            if checkpoint is not None and checkpoint.get('monitor'):
+                monitor = checkpoint['monitor']
+
+        # Create storage for chains and evaluations, in memory and on disk
+        storage = _ChainStorage(
+            self, prior, monitor, chain_loggers, eval_loggers, checkpoint)
 
         # Some samplers need intermediate steps, where None is returned instead
         # of a sample. Samplers can run asynchronously, so that one returns
         # None while another returns a sample.
         # To deal with this, we maintain a list of 'active' samplers that have
-        # not reach `max_iterations` yet, and store the number of samples we
-        # have in each chain.
-        if self._single_chain:
-            active = list(range(self._n_chains))
-            n_samples = [0] * self._n_chains
+        # not reach `max_iterations` yet, and the storage counts the number of
+        # samples we have in each chain.
+        active = list(range(self._n_chains))
+        if checkpoint is not None:
+            active = checkpoint['active']
+
+        # Restore random state and time taken before the checkpoint
+        time_offset = 0
+        if checkpoint is not None:
+            np.random.set_state(checkpoint['random_state'])
+            time_offset = checkpoint['time']
+
+        # Set up checkpointing
+        if self._checkpoint_file is not None:
+            next_checkpoint = self._checkpoint_interval
+
+        # Create object to perform the evaluation step of each iteration
+        if fused:
+            step = _FusedStep(self._samplers, evaluator)
+        elif asynchronous:
+            step = _AsynchronousStep(
+                self._samplers, evaluator, self._needs_sensitivities,
+                self._initial_phase_iterations, self._max_iterations)
+        elif batches:
+            step = _BatchStep(self._samplers, evaluator)
+        elif prefetch:
+            step = _Prefetcher(
+                self._samplers, evaluator, self._needs_sensitivities,
+                n_points)
+        elif self._single_chain:
+            step = _Step(
+                self._samplers, evaluator, self._needs_sensitivities)
+        else:
+            step = _MultiChainStep(
+                self._samplers, evaluator, self._needs_sensitivities)
 
         # Start sampling
         timer = pints.Timer()
         running = True
-        while running:
-            # Initial phase
-            # Note: self._initial_phase_iterations is None when no initial
-            # phase is needed
-            if iteration == self._initial_phase_iterations:
-                for sampler in self._samplers:
-                    sampler.set_initial_phase(False)
-                if self._log_to_screen:
-                    print('Initial phase completed.')
-
-            # Get points
-            if self._single_chain:
-                xs = [self._samplers[i].ask() for i in active]
-            else:
-                xs = self._samplers[0].ask()
-
-            # Calculate logpdfs
-            fxs = evaluator.evaluate(xs)
-
-            # Update evaluation count
-            n_evaluations += len(fxs)
-
-            # Update chains
-            if self._single_chain:
-                # Single chain
-
-                # Check and update the individual chains
-                xs_iterator = iter(xs)
-                fxs_iterator = iter(fxs)
-                for i in list(active):  # new list: active may be modified
-                    x = next(xs_iterator)
-                    fx = next(fxs_iterator)
-                    y = self._samplers[i].tell(fx)
-
-                    if y is not None:
-                        # Store sample in memory
-                        if self._chains_in_memory:
-                            samples[i][n_samples[i]] = y
-                        else:
-                            samples[i] = y
-
-                        # Update current evaluations
-                        if store_evaluations:
-                            # Check if accepted, if so, update log_pdf and
-                            # prior to be logged
-                            accepted = np.all(y == x)
-                            if accepted:
-                                current_logpdf[i] = fx
-                                if prior is not None:
-                                    current_prior[i] = prior(y)
-
-                            # Calculate evaluations to log
-                            e = current_logpdf[i]
-                            if prior is not None:
-                                e = [e,
-                                     current_logpdf[i] - current_prior[i],
-                                     current_prior[i]]
-
-                        # Store evaluations in memory
-                        if self._evaluations_in_memory:
-                            evaluations[i][n_samples[i]] = e
-
-                        # Write evaluations to disk
-                        if self._evaluation_files:
-                            if prior is None:
-                                eval_loggers[i].log(e)
-                            else:
-                                eval_loggers[i].log(*e)
-
-                        # Stop adding samples if maximum number reached
-                        n_samples[i] += 1
-                        if n_samples[i] == self._max_iterations:
-                            active.remove(i)
+        intermediate_step = False
+        try:
+            while running:
+                # Initial phase
+                # Note: self._initial_phase_iterations is None when no initial
+                # phase is needed. Samplers that need intermediate steps still
+                # have the same iteration count until their next sample, so
+                # this is only done once.
+                if (iteration == self._initial_phase_iterations
+                        and not intermediate_step):
+                    step.end_initial_phase()
+                    if self._log_to_screen:
+                        print('Initial phase completed.')
+
+                # Get points, calculate logpdfs, and update the samplers
+                n, new_samples = step.run(active)
+                n_evaluations += n
+
+                # Store the new samples
+                for i, y, fy in new_samples:
+                    check_convergence |= storage.add(i, y, fy)
+
+                    # Stop adding samples if maximum number reached
+                    if storage.n_samples()[i] == self._max_iterations:
+                        active.remove(i)
 
                 # This is an intermediate step until the slowest sampler has
                 # produced a new sample since the last `iteration`.
-                intermediate_step = min(n_samples) <= iteration
-
-            else:
-                # Multi-chain methods
-
-                # Get all chains samples at once
-                ys = self._samplers[0].tell(fxs)
-                intermediate_step = ys is None
-
-                if not intermediate_step:
-                    # Store samples in memory
-                    if self._chains_in_memory:
-                        samples[:, iteration] = ys
+                intermediate_step = min(storage.n_samples()) <= iteration
+
+                # If no new samples were added, then no MCMC iteration was
+                # performed, and so the iteration count shouldn't be updated,
+                # logging shouldn't be triggered, and stopping criteria
+                # shouldn't be checked
+                if intermediate_step:
+                    continue
+
+                # Show progress
+                if logging and iteration >= next_message:
+                    # Log state
+                    logger.log(iteration, n_evaluations)
+                    for sampler in self._samplers:
+                        sampler._log_write(logger)
+                    logger.log(time_offset + timer.time())
+
+                    # Choose next logging point
+                    if iteration < self._message_warm_up:
+                        next_message = iteration + 1
                     else:
-                        samples = ys
-
-                    # Update current evaluations
-                    if store_evaluations:
-                        es = []
-                        for i, y in enumerate(ys):
-                            # Check if accepted, if so, update log_pdf and
-                            # prior to be logged
-                            accepted = np.all(xs[i] == y)
-                            if accepted:
-                                current_logpdf[i] = fxs[i]
-                                if prior is not None:
-                                    current_prior[i] = prior(ys[i])
-
-                            # Calculate evaluations to log
-                            e = current_logpdf[i]
-                            if prior is not None:
-                                e = [e,
-                                     current_logpdf[i] - current_prior[i],
-                                     current_prior[i]]
-                            es.append(e)
-
-                    # Write evaluations to memory
-                    if self._evaluations_in_memory:
-                        for i, e in enumerate(es):
-                            evaluations[i, iteration] = e
-
-                    # Write evaluations to disk
-                    if self._evaluation_files:
-                        if prior is None:
-                            for i, eval_logger in enumerate(eval_loggers):
-                                eval_logger.log(es[i])
-                        else:
-                            for i, eval_logger in enumerate(eval_loggers):
-                                eval_logger.log(*es[i])
-
-            # If no new samples were added, then no MCMC iteration was
-            # performed, and so the iteration count shouldn't be updated,
-            # logging shouldn't be triggered, and stopping criteria shouldn't
-            # be checked
-            if intermediate_step:
-                continue
-
-            # Write samples to disk
-            if self._chains_in_memory:
-                for i, chain_logger in enumerate(chain_loggers):
-                    chain_logger.log(*samples[i][iteration])
-            else:
-                for i, chain_logger in enumerate(chain_loggers):
-                    chain_logger.log(*samples[i])
-
-            # Show progress
-            if logging and iteration >= next_message:
-                # Log state
-                logger.log(iteration, n_evaluations)
-                for sampler in self._samplers:
-                    sampler._log_write(logger)
-                logger.log(timer.time())
-
-                # Choose next logging point
-                if iteration < self._message_warm_up:
-                    next_message = iteration + 1
-                else:
-                    next_message = self._message_interval * (
-                        1 + iteration // self._message_interval)
-
-            # Update iteration count
-            iteration += 1
-
-            # Check requested number of samples
-            if (self._max_iterations is not None and
-                    iteration >= self._max_iterations):
-                running = False
-                halt_message = ('Halting: Maximum number of iterations ('
-                                + str(iteration) + ') reached.')
+                        next_message = self._message_interval * (
+                            1 + iteration // self._message_interval)
+
+                # Update iteration count
+                iteration += 1
+
+                # Check requested number of samples
+                if (self._max_iterations is not None and
+                        iteration >= self._max_iterations):
+                    running = False
+                    halt_message = ('Halting: Maximum number of iterations ('
+                                    + str(iteration) + ') reached.')
+
+                # Check convergence, whenever the monitor's estimates change
+                if running and check_convergence:
+                    check_convergence = False
+                    converged = True
+                    criteria = []
+                    if self._target_ess is not None:
+                        converged &= bool(
+                            np.all(monitor.ess() >= self._target_ess))
+                        criteria.append('effective sample size >= '
+                                        + str(self._target_ess))
+                    if self._max_rhat is not None:
+                        converged &= bool(
+                            np.all(monitor.rhat() <= self._max_rhat))
+                        criteria.append('rhat <= ' + str(self._max_rhat))
+                    if converged:
+                        running = False
+                        halt_message = (
+                            'Halting: Convergence criteria ('
+                            + ', '.join(criteria) + ') met after '
+                            + str(iteration) + ' iterations.')
+
+                # Write checkpoint
+                if (running and self._checkpoint_file is not None
+                        and timer.time() >= next_checkpoint):
+
+                    # Write all output up to this point to disk
+                    for file_logger in file_loggers:
+                        file_logger.flush()
+
+                    # Gather state
+                    state = {
+                        'settings': settings,
+                        'samplers': self._samplers,
+                        'iteration': iteration,
+                        'n_evaluations': n_evaluations,
+                        'next_message': next_message,
+                        'time': time_offset + timer.time(),
+                        'random_state': np.random.get_state(),
+                        'files': [
+                            (x, os.path.getsize(x) if os.path.isfile(x)
+                             else None) for x in filenames],
+                        'active': active,
+                        'monitor': monitor,
+                    }
+                    state.update(storage.checkpoint())
+                    self._write_checkpoint(state)
+                    next_checkpoint = \
+                        timer.time() + self._checkpoint_interval
+
+        except (Exception, SystemExit, KeyboardInterrupt):
+            # Write any buffered output to disk before exiting
+            for file_logger in file_loggers:
+                file_logger.close()
+            raise
+
+        finally:
+            # Restore any global state changed by the evaluation step
+            step.close()
 
         # Log final state and show halt message
         if logging:
             logger.log(iteration, n_evaluations)
             for sampler in self._samplers:
                 sampler._log_write(logger)
-            logger.log(timer.time())
+            logger.log(time_offset + timer.time())
             if self._log_to_screen:
                 print(halt_message)
 
-        # Store generated chains in memory
+        # Write any buffered output to disk
+        for file_logger in file_loggers:
+            file_logger.close()
+
+        # Store worker utilisation
+        self._utilisation = None
+        if isinstance(evaluator, pints.ParallelEvaluator):
+            self._utilisation = evaluator.utilisation()
+
+        # Store generated chains and evaluations in memory, removing any
+        # unused storage
+        samples, evaluations = storage.result(iteration)
         if self._chains_in_memory:
             self._samples = samples
-
-        # Store evaluations in memory
         if self._evaluations_in_memory:
             self._evaluations = evaluations
 
         # Return generated chains
-        return samples if self._chains_in_memory else None
+        return samples
 
     def sampler(self):
         """
@@ -812,6 +1022,42 @@ class MCMCController(object):
         """
         return self._samplers
 
+    def set_asynchronous(self, enabled=True):
+        """
+        Enables or disables asynchronous evaluation of the chains.
+
+        By default, all chains are advanced in lockstep: at every iteration a
+        point is requested from each chain, and all points are evaluated
+        before any chain can continue. With asynchronous evaluation enabled,
+        each chain's next point is submitted for evaluation as soon as its
+        previous evaluation has finished, so that workers aren't left idle
+        waiting for the slowest evaluation. This is particularly useful for
+        samplers that need a variable number of evaluations per sample (such
+        as the slice samplers), or for functions with variable run times.
+
+        Evaluations are performed using an :class:`AsynchronousEvaluator`,
+        with the number of workers and backend set with
+        :meth:`set_parallel()`. If parallelisation is disabled, a single
+        worker thread is used.
+
+        In asynchronous mode, each chain uses its own random number generator
+        (seeded from numpy's global generator at the start of :meth:`run()`),
+        so that the generated chains do not depend on the order in which
+        evaluations finish. As a result, the chains differ from those
+        generated in lockstep mode, even if the same seed is used. The initial
+        phase (see :meth:`set_initial_phase_iterations()`) is ended separately
+        for each chain.
+
+        Asynchronous evaluation is only available for
+        :class:`SingleChainMCMC` methods.
+        """
+        enabled = bool(enabled)
+        if enabled and not self._single_chain:
+            raise ValueError(
+                'Asynchronous evaluation is only supported for single chain'
+                ' methods.')
+        self._asynchronous = enabled
+
     def set_chain_filename(self, chain_file):
         """
         Write chains to disk as they are generated.
@@ -825,6 +1071,11 @@ class MCMCController(object):
         ``chain_0.csv`` and ``chain_1.csv`` will be created. Each CSV file will
         start with a header (e.g. ``"p0","p1","p2",...``) and contain a sample
         on each subsequent line.
+
+        If ``chain_file`` ends in ``.npy``, the chains are instead written in
+        a buffered binary format (see :class:`pints.io.ChainWriter`), which is
+        much faster for long runs. These files can be read (memory-mapped)
+        with :meth:`pints.io.load_samples()`.
         """
 
         d = self._n_chains
@@ -833,7 +1084,8 @@ class MCMCController(object):
             b, e = os.path.splitext(str(chain_file))
             self._chain_files = [b + '_' + str(i) + e for i in range(d)]
 
-    def set_chain_storage(self, store_in_memory=True):
+    def set_chain_storage(self, store_in_memory=True, memmap_filename=None,
+                          burn_in=0, thinning=1, dtype=float):
         """
         Store chains in memory as they are generated.
 
@@ -841,8 +1093,112 @@ class MCMCController(object):
         generated, and returned by :meth:`run()`. This method allows this
         behaviour to be disabled, which can be useful for very large chains
         which are already stored to disk (see :meth:`set_chain_filename()`).
+
+        Chains that do not fit in memory can be stored in a binary file
+        instead, by setting a ``memmap_filename``. The chains are then
+        returned as a (read-write) :class:`numpy.memmap` of shape
+        ``(n_chains, n_iterations, n_parameters)``, which can be used like any
+        other array (e.g. by :class:`MCMCSummary` and the :mod:`pints.plot`
+        methods), but only reads the parts of the file that are accessed. In
+        the file, the samples are stored iteration by iteration, so that it
+        can be opened later with ``np.memmap(memmap_filename, dtype,
+        shape=(n_iterations, n_chains, n_parameters))``. Any existing file is
+        overwritten.
+
+        The number of samples stored can be reduced by discarding the first
+        ``burn_in`` iterations of every chain, and then storing only every
+        ``thinning``-th iteration. The samples can also be stored with a lower
+        precision, by setting ``dtype`` to e.g. ``np.float32``.
+        These options also apply to log pdfs stored in memory (see
+        :meth:`set_log_pdf_storage()`), but not to chains or log pdfs written
+        to CSV files.
         """
+        burn_in = int(burn_in)
+        if burn_in < 0:
+            raise ValueError('Burn-in cannot be negative.')
+        thinning = int(thinning)
+        if thinning < 1:
+            raise ValueError('Thinning interval must be at least 1.')
+        dtype = np.dtype(dtype)
+        if not np.issubdtype(dtype, np.floating):
+            raise ValueError(
+                'Storage data type must be a floating point type.')
+
         self._chains_in_memory = bool(store_in_memory)
+        self._memmap_filename = None
+        if memmap_filename is not None:
+            self._memmap_filename = str(memmap_filename)
+        self._storage_burn_in = burn_in
+        self._storage_thinning = thinning
+        self._storage_dtype = dtype
+
+    def set_checkpoint_filename(self, checkpoint_file, interval=300):
+        """
+        Periodically write the state of a run to disk, so that it can be
+        continued with :meth:`resume()` if it is interrupted.
+
+        If a ``checkpoint_file`` is given, the full state of the run is
+        written to this file (using ``pickle``) at the end of the first
+        iteration that occurs at least ``interval`` seconds after the previous
+        checkpoint (or after the start of the run). Each checkpoint replaces
+        the previous one, and is written to a temporary file first so that an
+        interruption while writing leaves the last checkpoint intact. To
+        disable checkpointing, set ``checkpoint_file=None``.
+
+        Any chains and evaluations stored in memory are included in the
+        checkpoint. Memory-mapped chains (see :meth:`set_chain_storage()`)
+        are not copied: they are flushed to disk, and only their filename,
+        shape, and data type are included, so that the file must be left in
+        place to resume. For very long runs, checkpoints can be kept small by
+        using memory-mapped chains, or by writing chains to disk instead (see
+        :meth:`set_chain_filename()`).
+
+        Checkpointing is not supported in asynchronous mode.
+        """
+        if checkpoint_file is None:
+            self._checkpoint_file = None
+            return
+        interval = float(interval)
+        if interval < 0:
+            raise ValueError('Checkpoint interval cannot be negative.')
+        self._checkpoint_file = str(checkpoint_file)
+        self._checkpoint_interval = interval
+
+    def set_fused_iterations(self, enabled=True):
+        """
+        Enables or disables fused iterations.
+
+        By default, every point requested by a sampler is evaluated
+        separately, so that methods needing many evaluations per iteration
+        (e.g. the leapfrog steps of :class:`HamiltonianMCMC` or
+        :class:`NoUTurnMCMC`) return control to the controller after each one.
+        With fused iterations enabled, each sampler instead receives the
+        log pdf (or :meth:`LogPDF.evaluateS1()`) and performs a whole iteration
+        at once using :meth:`SingleChainMCMC.iterate()`, which removes the
+        per-evaluation overhead of the controller.
+
+        If parallelisation is enabled (see :meth:`set_parallel()`), the
+        iterations of different chains are run in parallel, with one whole
+        iteration per task (so that methods that ask for batches of points
+        evaluate their batches sequentially), using a
+        :class:`ParallelEvaluator` (regardless of the selected backend). Each
+        task uses its own random number generator, seeded from numpy's global
+        generator, so that the generated chains do not depend on the number of
+        workers. As a result, the chains differ from those generated without
+        fused iterations, even if the same seed is used. Because of the cost
+        of sending the samplers to the worker processes and of switching
+        random states, fused iterations are mostly useful when running in
+        parallel.
+
+        Fused iterations are only available for :class:`SingleChainMCMC`
+        methods, and cannot be combined with asynchronous evaluation.
+        """
+        enabled = bool(enabled)
+        if enabled and not self._single_chain:
+            raise ValueError(
+                'Fused iterations are only supported for single chain'
+                ' methods.')
+        self._fused = enabled
 
     def set_initial_phase_iterations(self, iterations=200):
         """
@@ -900,6 +1256,9 @@ class MCMCController(object):
         be created. Each CSV file will start with a header (e.g.
         ``"logposterior","loglikelihood","logprior"``) and contain the
         evaluations for i-th accepted sample on the i-th subsequent line.
+
+        As with :meth:`set_chain_filename()`, files ending in ``.npy`` are
+        written in a buffered binary format.
         """
 
         d = self._n_chains
@@ -956,7 +1315,90 @@ class MCMCController(object):
                     'Maximum number of iterations cannot be negative.')
         self._max_iterations = iterations
 
-    def set_parallel(self, parallel=False):
+    def set_max_rhat(self, rhat=None):
+        """
+        Adds a stopping criterion, allowing the routine to halt once rhat is
+        below the given value for all parameters.
+
+        Rhat is monitored while the chains are generated, using the samples
+        after the initial phase (see :meth:`set_initial_phase_iterations()`),
+        and is calculated as in :func:`pints.rhat_all_params()`. This requires
+        at least two chains. To reduce the cost of monitoring, the criterion
+        is only checked when the estimate of the effective sample size (see
+        :meth:`set_target_ess()`) is updated, and once every chain contains at
+        least 256 samples after the initial phase.
+
+        If both this criterion and a target effective sample size are set, the
+        routine halts once both are met. The run can still be stopped earlier
+        by the maximum number of iterations (see
+        :meth:`set_max_iterations()`).
+
+        This criterion is disabled by default. To disable it after it was
+        set, use ``set_max_rhat(None)``.
+        """
+        if rhat is not None:
+            rhat = float(rhat)
+            if rhat <= 1:
+                raise ValueError('Maximum rhat must be greater than 1.')
+            if self._n_chains < 2:
+                raise ValueError(
+                    'Monitoring rhat requires at least two chains.')
+        self._max_rhat = rhat
+
+    def set_prefetching(self, n_points=True):
+        """
+        Enables or disables speculative prefetching of log pdf evaluations.
+
+        For random walk methods, the points that a chain will ask for in its
+        next iterations can be predicted: each iteration either accepts or
+        rejects its proposal, and the next proposal is generated from the
+        resulting state. With prefetching enabled, each chain's sampler (along
+        with numpy's random state) is copied to simulate these possible
+        futures, and the ``n_points`` most likely future points are evaluated
+        at once, e.g. in parallel (see :meth:`set_parallel()`). The real
+        iterations are then performed as usual, using the prefetched
+        evaluations until a point is asked for that was not predicted. The
+        likelihood of each future is estimated from the sampler's current
+        acceptance rate [1]_.
+
+        Because the real iterations are unchanged, the generated chains are
+        exactly the same as without prefetching. Predictions are most
+        accurate for a single chain (as all chains share numpy's random
+        number generator), and for low acceptance rates: with an acceptance
+        rate of 25%, the most likely future consists of rejections only.
+
+        Set ``n_points`` to an integer greater than 1 to choose the number of
+        points to evaluate for each chain, to ``True`` to use the number of
+        parallel workers, or to ``False`` or ``0`` to disable prefetching.
+
+        Prefetching is only supported for :class:`MetropolisRandomWalkMCMC`
+        and :class:`AdaptiveCovarianceMC` methods, and cannot be combined with
+        asynchronous evaluation or fused iterations.
+
+        References
+        ----------
+        .. [1] "Parallel Markov chain Monte Carlo Simulation by Pre-Fetching",
+               A. E. Brockwell (2006) Journal of Computational and Graphical
+               Statistics, 15(1), pp.246-261.
+               https://doi.org/10.1198/106186006X100579
+        """
+        if n_points is True:
+            prefetch = True
+        else:
+            prefetch = int(n_points)
+            if prefetch < 0:
+                raise ValueError(
+                    'Number of points to prefetch cannot be negative.')
+            prefetch = prefetch if prefetch > 0 else False
+        if prefetch and not (self._single_chain and isinstance(
+                self._samplers[0], (pints.MetropolisRandomWalkMCMC,
+                                    pints.AdaptiveCovarianceMC))):
+            raise ValueError(
+                'Prefetching is only supported for Metropolis random walk and'
+                ' adaptive covariance methods.')
+        self._prefetch = prefetch
+
+    def set_parallel(self, parallel=False, backend='processes'):
         """
         Enables/disables parallel evaluation.
 
@@ -966,7 +1408,19 @@ class MCMCController(object):
         than 0.
         Parallelisation can be disabled by setting ``parallel`` to ``0`` or
         ``False``.
+
+        The ``backend`` determines how parallel evaluation is performed: with
+        ``backend='processes'`` a :class:`ParallelEvaluator` is used,
+        ``backend='shared_memory'`` selects a :class:`SharedMemoryEvaluator`,
+        which has a much lower overhead per evaluation, and
+        ``backend='threads'`` selects a :class:`ThreadedEvaluator`, which can
+        be used for functions that release Python's global interpreter lock.
         """
+        if backend not in ('processes', 'shared_memory', 'threads'):
+            raise ValueError(
+                'Unknown parallel backend "' + str(backend) + '".')
+        self._parallel_backend = backend
+
         if parallel is True:
             self._parallel = True
             self._n_workers = pints.ParallelEvaluator.cpu_count()
@@ -977,6 +1431,654 @@ class MCMCController(object):
             self._parallel = False
             self._n_workers = 1
 
+    def set_target_ess(self, ess=None):
+        """
+        Adds a stopping criterion, allowing the routine to halt once the
+        effective sample size (summed over all chains) reaches the given value
+        for all parameters.
+
+        The effective sample size is monitored while the chains are generated,
+        using the samples after the initial phase (see
+        :meth:`set_initial_phase_iterations()`). It is estimated from the
+        means of batches of about ``sqrt(n)`` samples, corrected for the
+        autocorrelation between batches, which takes ``O(n_parameters)``
+        operations per sample, but is less accurate than estimates from the
+        complete chains (e.g. :func:`pints.bulk_effective_sample_size()`). To
+        avoid halting on short, strongly autocorrelated chains, the criterion
+        is only checked once every chain contains at least 256 samples after
+        the initial phase.
+
+        If both this criterion and a maximum rhat are set, the routine halts
+        once both are met. The run can still be stopped earlier by the maximum
+        number of iterations (see :meth:`set_max_iterations()`).
+
+        This criterion is disabled by default. To disable it after it was
+        set, use ``set_target_ess(None)``.
+        """
+        if ess is not None:
+            ess = float(ess)
+            if ess <= 0:
+                raise ValueError(
+                    'Target effective sample size must be greater than 0.')
+        self._target_ess = ess
+
+    def target_ess(self):
+        """
+        Returns the target effective sample size if this stopping criterion is
+        set, or ``None`` if it is not. See :meth:`set_target_ess()`.
+        """
+        return self._target_ess
+
+    def worker_utilisation(self):
+        """
+        Returns a list containing the fraction of time each worker process
+        spent evaluating during the last run (see
+        :meth:`ParallelEvaluator.utilisation()`), or ``None`` if the last run
+        did not use a :class:`ParallelEvaluator`.
+        """
+        return self._utilisation
+
+    def _write_checkpoint(self, state):
+        """
+        Writes the dict ``state`` to the checkpoint file, replacing any
+        previous checkpoint only once writing has completed.
+        """
+        temp_file = self._checkpoint_file + '.tmp'
+        with open(temp_file, 'wb') as f:
+            pickle.dump(state, f, pickle.HIGHEST_PROTOCOL)
+        try:
+            os.replace(temp_file, self._checkpoint_file)
+        except AttributeError:  # pragma: no python 3 cover
+            if os.path.isfile(self._checkpoint_file):
+                os.remove(self._checkpoint_file)
+            os.rename(temp_file, self._checkpoint_file)
+
+
+def _memmap(filename, dtype, shape, mode='r+'):
+    """
+    Opens a memory-mapped file of chains, with the given ``dtype`` and
+    ``shape = (n_chains, n_iterations, n_parameters)``.
+
+    The file stores the samples iteration by iteration, so that it can be
+    resized without moving any data. The returned array is a transposed view
+    of the memory map.
+    """
+    m, n, p = shape
+    # Note: A memory map cannot be empty, so at least one row is allocated
+    array = np.memmap(
+        filename, dtype=dtype, mode=mode, shape=(max(n, 1), m, p))
+    return array.transpose(1, 0, 2)[:, :n]
+
+
+def _n_stored(iterations, burn_in, thinning):
+    """
+    Returns the number of samples stored, out of the given number of
+    ``iterations``, after discarding ``burn_in`` and storing one sample every
+    ``thinning`` iterations.
+    """
+    return max(0, iterations - burn_in + thinning - 1) // thinning
+
+
+def _resize(array, length):
+    """
+    Returns a copy of ``array`` with its second axis (the iterations) extended
+    or truncated to ``length``, and any new entries set to zero.
+
+    Memory-mapped chains are resized in place, by resizing their file.
+    """
+    if isinstance(array, np.memmap):
+        array.flush()
+        m, n, p = array.shape
+        resized = _memmap(array.filename, array.dtype, (m, length, p))
+        if length < n:
+            with open(array.filename, 'r+b') as f:
+                f.truncate(max(length, 1) * m * p * array.dtype.itemsize)
+        return resized
+
+    shape = list(array.shape)
+    n = min(shape[1], length)
+    shape[1] = length
+    resized = np.zeros(shape, dtype=array.dtype)
+    resized[:, :n] = array[:, :n]
+    return resized
+
+
+class _FusedIteration(object):
+    """
+    Callable used by :class:`MCMCController` to perform a complete iteration
+    of a :class:`SingleChainMCMC`, in a task that can be sent to another
+    process.
+
+    Tasks are tuples ``(sampler, seed)``, where ``seed`` is used to seed the
+    random number generator during the iteration. Each call returns a tuple
+    ``(sampler, sample, log_pdf, n_evaluations)``.
+    """
+    def __init__(self, f):
+        self._f = f
+
+    def __call__(self, task):
+        sampler, seed = task
+
+        # Count evaluations
+        count = [0]
+
+        def f(x):
+            count[0] += 1
+            return self._f(x)
+
+        # Run the iteration with its own random state
+        state = np.random.get_state()
+        np.random.seed(seed)
+        try:
+            y = sampler.iterate(f)
+        finally:
+            np.random.set_state(state)
+        return sampler, y, sampler.current_log_pdf(), count[0]
+
+
+class _ChainStorage(object):
+    """
+    Stores the samples generated by an :class:`MCMCController`, and their log
+    pdfs, in memory and on disk, and passes the samples to a convergence
+    monitor.
+
+    Storage settings are read from the ``controller``. If a ``prior`` is
+    given, the log likelihood and log prior of each sample are stored along
+    with its log pdf. Samples are passed to the ``monitor`` (if set) after the
+    controller's initial phase, and written to the ``chain_loggers`` and
+    ``eval_loggers`` (one per chain, if set). If a ``checkpoint`` is given,
+    storage is restored from it.
+    """
+    def __init__(self, controller, prior=None, monitor=None,
+                 chain_loggers=None, eval_loggers=None, checkpoint=None):
+        c = controller
+        n_chains, n_parameters = c._n_chains, c._n_parameters
+        self._max_iterations = c._max_iterations
+        self._burn_in = c._storage_burn_in
+        self._thinning = c._storage_thinning
+        self._prior = prior
+        self._monitor = monitor
+        self._n_discard = c._initial_phase_iterations or 0
+        self._chain_loggers = chain_loggers or []
+        self._eval_loggers = eval_loggers or []
+        self._memmap_filename = c._memmap_filename
+        self._dtype = c._storage_dtype
+
+        # Number of samples in each chain
+        self._n_samples = [0] * n_chains
+        if checkpoint is not None:
+            self._n_samples = list(checkpoint['n_samples'])
+
+        # Number of iterations to allocate storage for: if the run can halt
+        # on convergence, storage starts small and grows as needed
+        self._capacity = self._max_iterations
+        if monitor is not None:
+            self._capacity = min(self._capacity or np.inf, 1024)
+        self._capacity = max(self._capacity, max(self._n_samples))
+        n = _n_stored(self._capacity, self._burn_in, self._thinning)
+
+        # Pre-allocate arrays for chain storage
+        self._samples = None
+        if c._chains_in_memory:
+            shape = (n_chains, n, n_parameters)
+            if self._memmap_filename is None:
+                self._samples = np.zeros(shape, dtype=self._dtype)
+            elif checkpoint is None:
+                self._samples = _memmap(
+                    self._memmap_filename, self._dtype, shape, 'w+')
+            else:
+                # Reopen the memory-mapped chains written before the
+                # checkpoint
+                filename, stored_shape, dtype = checkpoint['samples']
+                size = np.prod(stored_shape) * np.dtype(dtype).itemsize
+                if not (os.path.isfile(self._memmap_filename)
+                        and os.path.getsize(self._memmap_filename) >= size
+                        and np.dtype(self._dtype) == np.dtype(dtype)):
+                    raise ValueError(
+                        'Unable to resume: Memory-mapped chains in '
+                        + self._memmap_filename + ' do not match the'
+                        ' checkpoint.')
+                self._samples = _memmap(
+                    self._memmap_filename, self._dtype, shape, 'r+')
+
+        # Pre-allocate arrays for evaluation storage
+        self._evaluations = None
+        if c._evaluations_in_memory:
+            if prior:
+                # Store posterior, likelihood, prior
+                shape = (n_chains, n, 3)
+            else:
+                # Store pdf
+                shape = (n_chains, n)
+            self._evaluations = np.zeros(shape, dtype=self._dtype)
+
+        # Store last accepted logpdf and prior, per chain. Multi-chain methods
+        # can move points between chains (e.g. by swapping), so the prior is
+        # updated whenever a chain's point changes.
+        self._store_evaluations = (
+            self._evaluations is not None or bool(self._eval_loggers))
+        if self._store_evaluations:
+            self._current_logpdf = np.zeros(n_chains)
+            self._current_prior = np.zeros(n_chains)
+            self._current_points = np.empty((n_chains, n_parameters))
+            self._current_points.fill(np.nan)
+
+        # Restore stored chains and evaluations
+        if checkpoint is not None:
+            if self._samples is not None and self._memmap_filename is None:
+                n = checkpoint['samples'].shape[1]
+                self._samples[:, :n] = checkpoint['samples']
+            if self._evaluations is not None:
+                n = checkpoint['evaluations'].shape[1]
+                self._evaluations[:, :n] = checkpoint['evaluations']
+            if self._store_evaluations:
+                self._current_logpdf[:] = checkpoint['current_logpdf']
+                self._current_prior[:] = checkpoint['current_prior']
+                self._current_points[:] = checkpoint['current_points']
+
+    def add(self, i, y, fy=None):
+        """
+        Adds the sample ``y`` to chain ``i``, where ``fy`` is the log pdf of
+        ``y``, or ``None`` if the log pdf is unchanged since the chain's
+        previous sample.
+
+        Returns ``True`` if the convergence monitor's estimates have changed.
+        """
+        n = self._n_samples[i]
+
+        # Extend storage if needed
+        if n == self._capacity:
+            self._capacity *= 2
+            if self._max_iterations is not None:
+                self._capacity = min(self._capacity, self._max_iterations)
+            m = _n_stored(self._capacity, self._burn_in, self._thinning)
+            if self._samples is not None:
+                self._samples = _resize(self._samples, m)
+            if self._evaluations is not None:
+                self._evaluations = _resize(self._evaluations, m)
+
+        # Index to store this sample at, if stored
+        k = n - self._burn_in
+        store = k >= 0 and k % self._thinning == 0
+        k = k // self._thinning
+
+        # Store sample in memory
+        if store and self._samples is not None:
+            self._samples[i, k] = y
+
+        # Write sample to disk
+        if self._chain_loggers:
+            self._chain_loggers[i].log(*y)
+
+        if self._store_evaluations:
+            # Update log_pdf, and update prior if the chain has moved
+            if fy is not None:
+                self._current_logpdf[i] = fy
+            prior = self._prior
+            if prior is not None and np.any(y != self._current_points[i]):
+                self._current_prior[i] = prior(y)
+                self._current_points[i] = y
+
+            # Calculate evaluations to log
+            e = self._current_logpdf[i]
+            if prior is not None:
+                e = [e, e - self._current_prior[i], self._current_prior[i]]
+
+            # Store evaluations in memory
+            if store and self._evaluations is not None:
+                self._evaluations[i, k] = e
+
+            # Write evaluations to disk
+            if self._eval_loggers:
+                if prior is None:
+                    self._eval_loggers[i].log(e)
+                else:
+                    self._eval_loggers[i].log(*e)
+
+        self._n_samples[i] += 1
+
+        # Update convergence monitor
+        if self._monitor is not None and n >= self._n_discard:
+            return self._monitor.add(i, y)
+        return False
+
+    def checkpoint(self):
+        """
+        Returns a dict with the stored samples and evaluations, and any other
+        state needed to restore storage from a checkpoint.
+        """
+        n = _n_stored(max(self._n_samples), self._burn_in, self._thinning)
+        state = {'n_samples': list(self._n_samples)}
+        if self._samples is not None:
+            if self._memmap_filename is None:
+                state['samples'] = np.array(self._samples[:, :n])
+            else:
+                # Memory-mapped chains stay on disk
+                self._samples.flush()
+                m, _, p = self._samples.shape
+                state['samples'] = (
+                    self._memmap_filename, (m, n, p),
+                    np.dtype(self._dtype).str)
+        if self._evaluations is not None:
+            state['evaluations'] = self._evaluations[:, :n]
+        if self._store_evaluations:
+            state['current_logpdf'] = self._current_logpdf
+            state['current_prior'] = self._current_prior
+            state['current_points'] = self._current_points
+        return state
+
+    def n_samples(self):
+        """
+        Returns a list with the number of samples added to each chain.
+        """
+        return self._n_samples
+
+    def result(self, iterations):
+        """
+        Returns a tuple ``(samples, evaluations)`` with the samples and
+        evaluations stored in memory for the first ``iterations`` iterations,
+        where either entry is ``None`` if not stored in memory.
+        """
+        n = _n_stored(iterations, self._burn_in, self._thinning)
+        samples = self._samples
+        if isinstance(samples, np.memmap):
+            samples.flush()
+            if samples.shape[1] != n:
+                samples = _resize(samples, n)
+        elif samples is not None:
+            samples = samples[:, :n]
+        evaluations = self._evaluations
+        if evaluations is not None:
+            evaluations = evaluations[:, :n]
+        return samples, evaluations
+
+
+class _Step(object):
+    """
+    Performs the evaluation step of an :class:`MCMCController` iteration, in
+    which points are asked from the ``samplers``, evaluated with the
+    ``evaluator``, and told to the samplers. Set ``sensitivities`` to ``True``
+    if the evaluations include sensitivities.
+
+    This class asks each :class:`SingleChainMCMC` for a point at every step;
+    subclasses implement the other modes of :meth:`MCMCController.run()`.
+    """
+    def __init__(self, samplers, evaluator, sensitivities=False):
+        self._samplers = samplers
+        self._evaluator = evaluator
+        self._sensitivities = sensitivities
+
+    def close(self):
+        """
+        Restores any global state changed during the run.
+        """
+
+    def end_initial_phase(self):
+        """
+        Ends the initial phase of all samplers.
+        """
+        for sampler in self._samplers:
+            sampler.set_initial_phase(False)
+
+    def _evaluate(self, chains, xs):
+        """
+        Returns a tuple ``(fxs, n)`` containing the evaluations of the points
+        ``xs`` asked for by the samplers with indices ``chains``, and the
+        number of evaluations performed.
+        """
+        fxs = self._evaluator.evaluate(xs)
+        return fxs, len(fxs)
+
+    def _log_pdf(self, fx):
+        """
+        Returns the log pdf from an evaluation ``fx``.
+        """
+        return fx[0] if self._sensitivities else fx
+
+    def run(self, chains):
+        """
+        Performs a step for the samplers with indices ``chains``, and returns
+        a tuple ``(n, samples)`` where ``n`` is the number of evaluations
+        performed, and ``samples`` is a list of tuples ``(i, y, fy)`` for each
+        sampler ``i`` that returned a new sample ``y``. The log pdf ``fy`` is
+        ``None`` if it is unchanged since the chain's previous sample.
+        """
+        xs = [self._samplers[i].ask() for i in chains]
+        fxs, n = self._evaluate(chains, xs)
+        samples = []
+        for i, x, fx in zip(chains, xs, fxs):
+            y = self._samplers[i].tell(fx)
+            if y is not None:
+                # The log pdf changes only if the proposal was accepted
+                fy = self._log_pdf(fx) if np.all(y == x) else None
+                samples.append((i, y, fy))
+        return n, samples
+
+
+class _AsynchronousStep(_Step):
+    """
+    Runs :class:`SingleChainMCMC` samplers asynchronously, with an
+    :class:`pints.AsynchronousEvaluator` (see
+    :meth:`MCMCController.set_asynchronous()`).
+
+    Each chain uses its own random number generator state, so that the chains
+    don't depend on the order in which evaluations finish, and the initial
+    phase is ended separately for each chain, after ``n_initial`` samples.
+    Each chain's next point is submitted as soon as its previous evaluation
+    has been told to the sampler, until ``max_iterations`` is reached.
+    """
+    def __init__(self, samplers, evaluator, sensitivities, n_initial,
+                 max_iterations):
+        super(_AsynchronousStep, self).__init__(
+            samplers, evaluator, sensitivities)
+        self._n_initial = n_initial
+        self._max_iterations = max_iterations
+        self._n_samples = [0] * len(samplers)
+        self._states = [
+            np.random.RandomState(seed).get_state()
+            for seed in np.random.randint(2**31 - 1, size=len(samplers))]
+        self._global_state = np.random.get_state()
+
+        # Submit the first point of every chain
+        for i, sampler in enumerate(samplers):
+            np.random.set_state(self._states[i])
+            evaluator.submit(sampler.ask(), i)
+            self._states[i] = np.random.get_state()
+
+    def close(self):
+        """ See :meth:`_Step.close()`. """
+        np.random.set_state(self._global_state)
+
+    def end_initial_phase(self):
+        """ See :meth:`_Step.end_initial_phase()`. """
+        # Initial phase is ended separately for each chain
+
+    def run(self, chains):
+        """ See :meth:`_Step.run()`. """
+        # Collect all finished evaluations
+        finished = self._evaluator.wait()
+        samples = []
+        for i, x, fx in finished:
+            # Switch to this chain's random state
+            np.random.set_state(self._states[i])
+            sampler = self._samplers[i]
+            y = sampler.tell(fx)
+            if y is not None:
+                fy = self._log_pdf(fx) if np.all(y == x) else None
+                samples.append((i, y, fy))
+
+                # End initial phase for this chain
+                self._n_samples[i] += 1
+                if self._n_samples[i] == self._n_initial:
+                    sampler.set_initial_phase(False)
+
+            # Submit this chain's next point
+            if self._n_samples[i] != self._max_iterations:
+                self._evaluator.submit(sampler.ask(), i)
+            self._states[i] = np.random.get_state()
+        return len(finished), samples
+
+
+class _BatchStep(_Step):
+    """
+    Evaluates the batches of points asked for by :class:`SingleChainMCMC`
+    samplers that need batch evaluation, all at once.
+    """
+    def run(self, chains):
+        """ See :meth:`_Step.run()`. """
+        xs = [self._samplers[i].ask() for i in chains]
+        fxs = self._evaluator.evaluate([x for batch in xs for x in batch])
+
+        # Split evaluations into the batches of each chain
+        offsets = np.cumsum([0] + [len(batch) for batch in xs])
+        samples = []
+        for i, a, b in zip(chains, offsets, offsets[1:]):
+            y = self._samplers[i].tell(fxs[a:b])
+            if y is not None:
+                samples.append((i, y, self._samplers[i].current_log_pdf()))
+        return len(fxs), samples
+
+
+class _FusedStep(_Step):
+    """
+    Performs complete iterations of :class:`SingleChainMCMC` samplers, with
+    one task per chain (see :meth:`MCMCController.set_fused_iterations()`).
+    The ``evaluator`` must evaluate a :class:`_FusedIteration`.
+    """
+    def run(self, chains):
+        """ See :meth:`_Step.run()`. """
+        # Send each sampler with a seed for its own random number generator
+        seeds = np.random.randint(2**31 - 1, size=len(chains))
+        results = self._evaluator.evaluate(
+            [(self._samplers[i], seed) for i, seed in zip(chains, seeds)])
+
+        n = 0
+        samples = []
+        for i, (sampler, y, fy, count) in zip(chains, results):
+            # Store the updated sampler (which may have been copied to a
+            # different process)
+            self._samplers[i] = sampler
+            n += count
+            if y is not None:
+                samples.append((i, y, fy))
+        return n, samples
+
+
+class _MultiChainStep(_Step):
+    """
+    Performs the evaluation step for a :class:`MultiChainMCMC`, which asks
+    for the points of all chains at once.
+    """
+    def run(self, chains):
+        """ See :meth:`_Step.run()`. """
+        sampler = self._samplers[0]
+        xs = sampler.ask()
+        fxs = self._evaluator.evaluate(xs)
+        ys = sampler.tell(fxs)
+        if ys is None:
+            return len(fxs), []
+
+        # Points can be swapped or kept for chains other than the one they
+        # were proposed for, so use the sampler's current log pdfs if
+        # available
+        try:
+            fys = sampler.current_log_pdfs()
+        except NotImplementedError:
+            fys = [self._log_pdf(fxs[i]) if np.all(xs[i] == y) else None
+                   for i, y in enumerate(ys)]
+        return len(fxs), [(i, y, fys[i]) for i, y in enumerate(ys)]
+
+
+class _Prefetcher(_Step):
+    """
+    Predicts the points that :class:`SingleChainMCMC` samplers will ask for in
+    their next iterations, and stores their evaluations (see
+    :meth:`MCMCController.set_prefetching()`).
+    """
+
+    # Log pdf values used to force a copy of a sampler to accept or reject
+    # its proposal
+    _ACCEPT = 1e300
+    _REJECT = -1e300
+
+    def __init__(self, samplers, evaluator, sensitivities, n_points):
+        super(_Prefetcher, self).__init__(samplers, evaluator, sensitivities)
+        self._n_points = int(n_points)
+        self._caches = [{} for sampler in samplers]
+
+    def _evaluate(self, chains, xs):
+        """ See :meth:`_Step._evaluate()`. """
+        # Predict future points for chains without a stored evaluation
+        predicted = []
+        for i, x in zip(chains, xs):
+            if self._key(x) not in self._caches[i]:
+                self._caches[i] = {}
+                predicted.append((i, self._predict(self._samplers[i])))
+
+        # Evaluate all points at once
+        points = [x for i, ys in predicted for x in ys]
+        if points:
+            fys = iter(self._evaluator.evaluate(points))
+            for i, ys in predicted:
+                for y in ys:
+                    self._caches[i][self._key(y)] = next(fys)
+
+        fxs = [self._caches[i][self._key(x)] for i, x in zip(chains, xs)]
+        return fxs, len(points)
+
+    def _key(self, x):
+        """
+        Returns a hashable key for a point ``x``.
+        """
+        return np.asarray(x, dtype=float).tobytes()
+
+    def n_points(self):
+        """
+        Returns the number of points predicted (and evaluated) at once.
+        """
+        return self._n_points
+
+    def _predict(self, sampler):
+        """
+        Returns the ``n_points`` most likely points that ``sampler`` will ask
+        for, starting with the point it is currently asking for.
+        """
+        state = np.random.get_state()
+        try:
+            # Likelihood of acceptance
+            alpha = min(0.9, max(0.1, sampler.acceptance_rate()))
+
+            # Expand the tree of possible futures, most likely first. Each
+            # node is a copy of the sampler waiting for its proposal to be
+            # evaluated, along with the corresponding random state. Nodes are
+            # only created when needed, from their parent and the outcome of
+            # the parent's iteration.
+            points = []
+            keys = set()
+            tree = [(-1.0, 0, sampler, state, None)]
+            counter = 1
+            while tree and len(points) < self._n_points:
+                p, _, parent, node_state, fx = heapq.heappop(tree)
+                node = copy.deepcopy(parent)
+                np.random.set_state(node_state)
+                if fx is not None:
+                    node.tell(fx)
+                x = np.array(node.ask(), copy=True)
+                node_state = np.random.get_state()
+                if self._key(x) not in keys:
+                    keys.add(self._key(x))
+                    points.append(x)
+
+                # Add the futures where the proposal is rejected or accepted
+                futures = ((self._REJECT, 1 - alpha), (self._ACCEPT, alpha))
+                for fx, q in futures:
+                    heapq.heappush(
+                        tree, (p * q, counter, node, node_state, fx))
+                    counter += 1
+        finally:
+            np.random.set_state(state)
+        return points
+
 
 class MCMCSampling(MCMCController):
     """ Deprecated alias for :class:`MCMCController`. """
@@ -11,6 +11,8 @@ from __future__ import print_function, unicode_literals
 import pints
 import numpy as np
 
+from ._proposal import GaussianProposal
+
 
 class AdaptiveCovarianceMC(pints.SingleChainMCMC):
     """
@@ -63,6 +65,10 @@ class AdaptiveCovarianceMC(pints.SingleChainMCMC):
         self._mu = np.array(self._x0, copy=True)
         self._sigma = np.array(self._sigma0, copy=True)
 
+        # Proposal distribution with covariance sigma, storing its Cholesky
+        # factor
+        self._proposal = GaussianProposal(self._sigma)
+
         # Determines decay rate in adaptation
         self._eta = 0.6
 
@@ -105,9 +111,7 @@ class AdaptiveCovarianceMC(pints.SingleChainMCMC):
         log_ratio
             The log of the ratio proposed log pdf / current log pdf.
         """
-        dsigm = np.reshape(self._current - self._mu, (self._n_parameters, 1))
-        self._sigma = ((1 - self._gamma) * self._sigma +
-                       self._gamma * np.dot(dsigm, dsigm.T))
+        self._update_sigma(self._current - self._mu)
 
     def ask(self):
         """ See :meth:`SingleChainMCMC.ask()`. """
@@ -298,3 +302,11 @@ class AdaptiveCovarianceMC(pints.SingleChainMCMC):
         # Return current sample
         return self._current
 
+    def _update_sigma(self, x):
+        """
+        Updates the covariance matrix ``sigma`` used to generate proposals to
+        ``(1 - gamma) * sigma + gamma * x * x.T``, along with its stored
+        factorisation.
+        """
+        self._proposal.update(1 - self._gamma, self._gamma, x)
+        self._sigma = self._proposal.covariance()
@@ -0,0 +1,312 @@
+#
+# Vectorised banks of independent random walk and adaptive covariance chains
+#
+# This file is part of PINTS.
+#  Copyright (c) 2017-2019, University of Oxford.
+#  For licensing information, see the LICENSE file distributed with the PINTS
+#  software package.
+#
+from __future__ import absolute_import, division
+from __future__ import print_function, unicode_literals
+import pints
+import numpy as np
+
+from ._proposal import GaussianProposal
+
+
+class BankedMetropolisRandomWalkMCMC(pints.MultiChainMCMC):
+    """
+    Runs a "bank" of independent Metropolis random walk MCMC chains, as
+    described in :class:`MetropolisRandomWalkMCMC`, using array operations on
+    all chains at once.
+
+    Each chain behaves exactly like an independent
+    :class:`MetropolisRandomWalkMCMC` chain, but the states of all chains are
+    stored in ``(n_chains, n_parameters)`` arrays, and proposals and
+    accept/reject steps are performed for all chains at once. As a result,
+    the overhead of running hundreds of chains is similar to that of running
+    a single chain, which can make a large difference when the log pdf is
+    cheap to evaluate.
+
+    The reported acceptance rate (see :meth:`acceptance_rate()`) is an array
+    with an entry per chain, while the logged acceptance rate is the mean over
+    all chains.
+
+    Extends :class:`MultiChainMCMC`.
+    """
+
+    def __init__(self, chains, x0, sigma0=None):
+        super(BankedMetropolisRandomWalkMCMC, self).__init__(
+            chains, x0, sigma0)
+
+        # Set initial state
+        self._running = False
+
+        # Current points, their log pdfs, and the proposed points
+        self._current = None
+        self._current_log_pdfs = None
+        self._proposed = None
+
+        # Acceptance rate monitoring
+        self._iterations = 0
+        self._acceptance_count = np.zeros(self._chains)
+        self._acceptance_rate = np.zeros(self._chains)
+
+        # Proposal distribution, storing the Cholesky factor of sigma0
+        self._proposal = GaussianProposal(self._sigma0)
+
+    def acceptance_rate(self):
+        """
+        Returns the current (measured) acceptance rate of each chain.
+        """
+        return self._acceptance_rate
+
+    def _adapt(self, accepted, log_ratios):
+        """
+        Called at the end of every ``tell()`` after the first, to adapt the
+        proposal distributions.
+
+        Parameters
+        ----------
+        accepted
+            A boolean array indicating which chains accepted their proposal.
+        log_ratios
+            The log of the ratios proposed log pdf / current log pdf.
+        """
+        pass
+
+    def ask(self):
+        """ See :meth:`pints.MultiChainMCMC.ask()`. """
+        # Initialise on first call
+        if not self._running:
+            self._running = True
+            self._proposed = self._x0
+
+        # Propose new points
+        if self._proposed is None:
+            self._proposed = self._generate_proposals()
+            self._proposed.setflags(write=False)
+
+        # Return proposed points
+        return self._proposed
+
+    def current_log_pdfs(self):
+        """ See :meth:`MultiChainMCMC.current_log_pdfs()`. """
+        return self._current_log_pdfs
+
+    def _generate_proposals(self):
+        """
+        Generates and returns an array of proposed points, one for each chain.
+        """
+        return self._proposal.sample(self._current)
+
+    def _log_init(self, logger):
+        """ See :meth:`Loggable._log_init()`. """
+        logger.add_float('Accept.')
+
+    def _log_write(self, logger):
+        """ See :meth:`Loggable._log_write()`. """
+        logger.log(np.mean(self._acceptance_rate))
+
+    def name(self):
+        """ See :meth:`pints.MCMCSampler.name()`. """
+        return 'Banked Metropolis random walk MCMC'
+
+    def tell(self, fxs):
+        """ See :meth:`pints.MultiChainMCMC.tell()`. """
+        # Check if we had a proposal
+        if self._proposed is None:
+            raise RuntimeError('Tell called before proposal was set.')
+
+        # Ensure fxs is an array of floats
+        fxs = np.array(fxs, dtype=float, copy=True)
+        if fxs.shape != (self._chains, ):
+            raise ValueError(
+                'Expecting ' + str(self._chains) + ' log pdf values.')
+
+        # Increase iteration count
+        self._iterations += 1
+
+        # First points?
+        if self._current is None:
+            if not np.all(np.isfinite(fxs)):
+                raise ValueError(
+                    'Initial points for MCMC must have finite logpdf.')
+
+            # Accept
+            self._current = self._proposed
+            self._current_log_pdfs = fxs
+            self._current_log_pdfs.setflags(write=False)
+
+            # Clear proposal
+            self._proposed = None
+
+            # Return first points for chains
+            return self._current
+
+        # Accept or reject the proposals, for all chains at once
+        log_ratios = fxs - self._current_log_pdfs
+        u = np.log(np.random.uniform(0, 1, self._chains))
+        with np.errstate(invalid='ignore'):
+            accepted = np.isfinite(fxs) & (u < log_ratios)
+        self._current = np.where(
+            accepted.reshape(-1, 1), self._proposed, self._current)
+        self._current_log_pdfs = np.where(
+            accepted, fxs, self._current_log_pdfs)
+        self._current.setflags(write=False)
+        self._current_log_pdfs.setflags(write=False)
+
+        # Update acceptance rates
+        self._acceptance_count += accepted
+        self._acceptance_rate = self._acceptance_count / self._iterations
+
+        # Clear proposal
+        self._proposed = None
+
+        # Adapt proposal distributions
+        self._adapt(accepted, log_ratios)
+
+        # Return current samples
+        return self._current
+
+
+class BankedHaarioBardenetACMC(BankedMetropolisRandomWalkMCMC):
+    """
+    Runs a "bank" of independent adaptive covariance MCMC chains, as described
+    in :class:`HaarioBardenetACMC`, using array operations on all chains at
+    once.
+
+    Each chain behaves exactly like an independent
+    :class:`HaarioBardenetACMC` chain, with its own running mean, covariance
+    matrix, and scaling factor. The states of all chains are stored in arrays
+    (e.g. the covariance matrices in a ``(n_chains, n_parameters,
+    n_parameters)`` array), and proposals, accept/reject steps, and adaptation
+    are performed for all chains at once, so that the overhead of running
+    hundreds of chains is similar to that of running a single chain.
+
+    Extends :class:`BankedMetropolisRandomWalkMCMC`.
+    """
+
+    def __init__(self, chains, x0, sigma0=None):
+        super(BankedHaarioBardenetACMC, self).__init__(chains, x0, sigma0)
+
+        # Adaptive mode: disabled during initial phase
+        self._adaptive = False
+
+        # Number of adaptations, and current and initial decay rate
+        self._adaptations = 1
+        self._eta = 0.6
+        self._gamma = 1
+
+        # Target acceptance rate
+        self._target_acceptance = None
+        self.set_target_acceptance_rate()
+
+        # Running means, covariance matrices, and log scaling factors
+        self._mu = np.array(self._x0, copy=True)
+        self._sigma = np.tile(self._sigma0, (self._chains, 1, 1))
+        self._log_lambda = np.zeros(self._chains)
+
+        # Cholesky factors of the covariance matrices, updated after
+        # adaptation
+        self._factors = np.tile(self._proposal.factor(), (self._chains, 1, 1))
+
+    def _adapt(self, accepted, log_ratios):
+        """ See :meth:`BankedMetropolisRandomWalkMCMC._adapt()`. """
+        if not self._adaptive:
+            return
+
+        # Set gamma based on number of adaptive iterations
+        self._gamma = (self._adaptations + 1) ** -self._eta
+        self._adaptations += 1
+        g = self._gamma
+
+        # Update running means and covariance matrices
+        self._mu = (1 - g) * self._mu + g * self._current
+        d = self._current - self._mu
+        self._sigma = (1 - g) * self._sigma + g * (
+            d[:, :, np.newaxis] * d[:, np.newaxis, :])
+
+        # Update scaling factors
+        self._log_lambda += g * (accepted - self._target_acceptance)
+
+        # Update factors used to generate proposals
+        try:
+            self._factors = np.linalg.cholesky(self._sigma)
+        except np.linalg.LinAlgError:
+            # Not (numerically) positive definite: use clipped eigenvalues
+            w, v = np.linalg.eigh(self._sigma)
+            w = np.maximum(w, np.finfo(float).eps * np.max(w))
+            self._factors = v * np.sqrt(w)[:, np.newaxis, :]
+
+    def eta(self):
+        """
+        Returns ``eta`` which controls the rate of adaptation decay
+        ``adaptations**(-eta)``, where ``eta > 0`` to ensure asymptotic
+        ergodicity.
+        """
+        return self._eta
+
+    def _generate_proposals(self):
+        """
+        See :meth:`BankedMetropolisRandomWalkMCMC._generate_proposals()`.
+        """
+        z = self._proposal.standard_normal(self._chains)
+        z = np.einsum('cij,cj->ci', self._factors, z)
+        return self._current + z * np.exp(0.5 * self._log_lambda)[:, None]
+
+    def in_initial_phase(self):
+        """ See :meth:`pints.MCMCSampler.in_initial_phase()`. """
+        return not self._adaptive
+
+    def n_hyper_parameters(self):
+        """ See :meth:`TunableMethod.n_hyper_parameters()`. """
+        return 1
+
+    def name(self):
+        """ See :meth:`pints.MCMCSampler.name()`. """
+        return 'Banked Haario-Bardenet adaptive covariance MCMC'
+
+    def needs_initial_phase(self):
+        """ See :meth:`pints.MCMCSampler.needs_initial_phase()`. """
+        return True
+
+    def set_eta(self, eta):
+        """
+        Updates ``eta`` which controls the rate of adaptation decay
+        ``adaptations**(-eta)``, where ``eta > 0`` to ensure asymptotic
+        ergodicity.
+        """
+        if eta <= 0:
+            raise ValueError('eta should be greater than zero')
+        self._eta = eta
+
+    def set_hyper_parameters(self, x):
+        """
+        The hyper-parameter vector is ``[eta]``.
+
+        See :meth:`TunableMethod.set_hyper_parameters()`.
+        """
+        self.set_eta(x[0])
+
+    def set_initial_phase(self, initial_phase):
+        """ See :meth:`pints.MCMCSampler.set_initial_phase()`. """
+        # No adaptation during initial phase
+        self._adaptive = not bool(initial_phase)
+
+    def set_target_acceptance_rate(self, rate=0.234):
+        """
+        Sets the target acceptance rate.
+        """
+        rate = float(rate)
+        if rate <= 0:
+            raise ValueError('Target acceptance rate must be greater than 0.')
+        elif rate > 1:
+            raise ValueError('Target acceptance rate cannot exceed 1.')
+        self._target_acceptance = rate
+
+    def target_acceptance_rate(self):
+        """
+        Returns the target acceptance rate.
+        """
+        return self._target_acceptance
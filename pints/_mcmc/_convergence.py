@@ -0,0 +1,199 @@
+#
+# Online convergence monitoring for MCMC chains
+#
+# This file is part of PINTS.
+#  Copyright (c) 2017-2019, University of Oxford.
+#  For licensing information, see the LICENSE file distributed with the PINTS
+#  software package.
+#
+from __future__ import absolute_import, division
+from __future__ import print_function, unicode_literals
+import numpy as np
+
+from .._diagnostics import _geyer_tau, autocorrelation
+
+
+class ConvergenceMonitor(object):
+    """
+    Maintains streaming estimates of rhat and the effective sample size (ESS)
+    of a set of MCMC chains, as samples are added one at a time.
+
+    The mean and variance of each chain are updated using Welford's algorithm,
+    and are used to calculate rhat as in :func:`pints.rhat_all_params()`.
+
+    The ESS is estimated using batch means [1]_: each chain is divided into
+    batches of ``b`` samples, and the variance of the batch means (times
+    ``b``) estimates the variance of the chain's mean (times ``n``). For this
+    estimate to be consistent, both ``b`` and the number of batches must grow
+    with ``n``, and so the batch size is kept close to ``sqrt(n)``: whenever
+    ``2 * b`` batches are complete, adjacent batches are merged and ``b`` is
+    doubled. As a result, adding a sample takes ``O(n_parameters)`` operations
+    (amortised), and the number of stored batch means grows as ``sqrt(n)``.
+
+    While ``b`` is small compared to the autocorrelation time of a chain, its
+    batch means are themselves autocorrelated, and their variance
+    underestimates the variance of the chain's mean. To correct for this, the
+    variance of the batch means is multiplied by their integrated
+    autocorrelation time, calculated using Geyer's initial monotone sequence
+    estimator (as in :func:`pints.bulk_effective_sample_size()`).
+
+    Estimates are only returned once every chain has at least ``n_batches``
+    completed batches (i.e. about ``n_batches^2`` samples), so that short,
+    strongly autocorrelated chains are not mistaken for converged ones.
+
+    These estimates are cheap, but less accurate than those obtained from the
+    full chains, e.g. with :func:`pints.bulk_effective_sample_size()` and
+    :func:`pints.rank_normalised_rhat()`.
+
+    Parameters
+    ----------
+    n_chains : int
+        The number of chains.
+    n_parameters : int
+        The number of parameters in each sample.
+    n_batches : int
+        The minimum number of batches in every chain before estimates are
+        returned.
+
+    References
+    ----------
+    .. [1] "Batch means and spectral variance estimators in Markov chain Monte
+           Carlo". James M. Flegal and Galin L. Jones (2010) The Annals of
+           Statistics, 38(2), pp.1034-1070.
+           https://doi.org/10.1214/09-AOS735
+    """
+
+    def __init__(self, n_chains, n_parameters, n_batches=16):
+        self._n_chains = int(n_chains)
+        self._n_parameters = int(n_parameters)
+        self._n_batches = max(1, int(n_batches))
+
+        # Welford's running mean and sum of squared differences, per chain
+        shape = (self._n_chains, self._n_parameters)
+        self._n = np.zeros(self._n_chains, dtype=int)
+        self._mean = np.zeros(shape)
+        self._m2 = np.zeros(shape)
+
+        # Batch means, the current batch sizes, the number of completed
+        # batches, and the sum of the samples in each chain's current batch
+        self._batch_means = np.zeros(
+            (self._n_chains, 2 * self._n_batches, self._n_parameters))
+        self._batch_size = np.ones(self._n_chains, dtype=int)
+        self._completed = np.zeros(self._n_chains, dtype=int)
+        self._sum = np.zeros(shape)
+        self._fill = np.zeros(self._n_chains, dtype=int)
+
+    def add(self, chain, x):
+        """
+        Adds a sample ``x`` to the given ``chain``.
+
+        Returns ``True`` if this completed a batch, in which case the ESS
+        estimate was updated.
+        """
+        # Update mean and variance
+        self._n[chain] += 1
+        d = x - self._mean[chain]
+        self._mean[chain] += d / self._n[chain]
+        self._m2[chain] += d * (x - self._mean[chain])
+
+        # Update batch
+        self._sum[chain] += x
+        self._fill[chain] += 1
+        if self._fill[chain] < self._batch_size[chain]:
+            return False
+
+        # Store batch mean, extending storage if needed
+        k = self._completed[chain]
+        if k == self._batch_means.shape[1]:
+            self._batch_means = np.concatenate(
+                (self._batch_means, np.zeros(self._batch_means.shape)), axis=1)
+        self._batch_means[chain, k] = self._sum[chain] / self._fill[chain]
+        self._sum[chain] = 0
+        self._fill[chain] = 0
+        self._completed[chain] += 1
+
+        # Merge adjacent batches, and double the batch size, so that the
+        # batch size stays close to sqrt(n)
+        k = self._completed[chain]
+        if k == 2 * self._batch_size[chain]:
+            b = self._batch_means[chain]
+            b[:k // 2] = 0.5 * (b[0:k:2] + b[1:k:2])
+            self._completed[chain] = k // 2
+            self._batch_size[chain] *= 2
+        return True
+
+    def ess(self):
+        """
+        Returns the estimated ESS of each parameter, summed over all chains.
+
+        If fewer than ``n_batches`` batches have been completed in any chain,
+        an array of ``nan`` is returned.
+        """
+        if not self._ready():
+            return np.nan * np.ones(self._n_parameters)
+
+        # Estimated variance of each chain's mean, times n (averaged over
+        # chains)
+        sigma2 = np.mean([
+            b * np.var(means[:k], axis=0, ddof=1) * _tau(means[:k])
+            for b, means, k in zip(
+                self._batch_size, self._batch_means, self._completed)],
+            axis=0)
+
+        # Estimated posterior variance
+        W, var_plus = self._variances()
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return np.sum(self._n) * var_plus / sigma2
+
+    def n_samples(self):
+        """
+        Returns the number of samples added to each chain.
+        """
+        return np.array(self._n, copy=True)
+
+    def _ready(self):
+        """
+        Returns ``True`` if every chain has at least ``n_batches`` completed
+        batches.
+        """
+        return np.min(self._completed) >= self._n_batches and np.all(
+            self._n > 1)
+
+    def rhat(self):
+        """
+        Returns the current value of rhat for each parameter (which requires
+        at least two chains).
+
+        If fewer than ``n_batches`` batches have been completed in any chain,
+        an array of ``nan`` is returned.
+        """
+        if self._n_chains < 2 or not self._ready():
+            return np.nan * np.ones(self._n_parameters)
+        W, var_plus = self._variances()
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return np.sqrt(var_plus / W)
+
+    def _variances(self):
+        """
+        Returns the mean within-chain variance ``W``, and the estimate of the
+        posterior variance ``var+ = (n - 1) / n * W + B / n``, where ``B`` is
+        the between-chain variance.
+        """
+        n = np.mean(self._n)
+        W = np.mean(self._m2 / (self._n[:, None] - 1), axis=0)
+        var_plus = W * (n - 1) / n
+        if self._n_chains > 1:
+            var_plus += np.var(self._mean, axis=0, ddof=1)
+        return W, var_plus
+
+
+def _tau(x):
+    """
+    Returns the integrated autocorrelation time of every column in a 2d array
+    ``x``, truncated using Geyer's initial monotone sequence estimator, and
+    bounded from below by 1.
+    """
+    with np.errstate(invalid='ignore'):
+        rho = autocorrelation(x, axis=0)
+    rho[0] = 1
+    return np.maximum(1, _geyer_tau(rho))
@@ -0,0 +1,135 @@
+#
+# Streaming quantile estimates using t-digests
+#
+# This file is part of PINTS.
+#  Copyright (c) 2017-2019, University of Oxford.
+#  For licensing information, see the LICENSE file distributed with the PINTS
+#  software package.
+#
+from __future__ import absolute_import, division
+from __future__ import print_function, unicode_literals
+import numpy as np
+
+
+class TDigest(object):
+    """
+    Estimates quantiles of a stream of samples, using a "merging" t-digest
+    for every parameter [1]_.
+
+    Each digest stores the samples as a set of centroids (means with
+    weights). Samples are added in blocks, and whenever the number of
+    centroids of a parameter exceeds ``5 * compression`` they are sorted and
+    merged: centroids are grouped using the scale function
+    ``k(q) = compression / (2 pi) * asin(2 q - 1)``, so that groups near the
+    tails of the distribution (``q`` close to 0 or 1) contain very few samples,
+    while groups near the median contain about ``pi / compression`` of the
+    total weight. Each group is replaced by a single centroid.
+
+    As long as fewer than ``5 * compression`` samples have been added, all
+    samples are stored, and quantiles are calculated exactly (using the same
+    linear interpolation as :func:`numpy.percentile()`).
+
+    Parameters
+    ----------
+    n_parameters : int
+        The number of parameters in each sample.
+    compression : int
+        The compression factor ``delta``, which controls the number of
+        centroids used (about ``delta / 2``) after merging.
+
+    References
+    ----------
+    .. [1] "Computing extremely accurate quantiles using t-digests".
+           Ted Dunning and Otmar Ertl (2019) arXiv.
+           https://arxiv.org/abs/1902.04023
+    """
+
+    def __init__(self, n_parameters, compression=1000):
+        self._n_parameters = int(n_parameters)
+        self._compression = int(compression)
+        if self._compression < 1:
+            raise ValueError('Compression must be at least 1.')
+
+        # Centroids of each parameter
+        self._means = [np.zeros(0)] * self._n_parameters
+        self._weights = [np.zeros(0)] * self._n_parameters
+
+        # Number of samples, and the minimum and maximum of each parameter
+        self._count = 0
+        self._min = np.inf * np.ones(self._n_parameters)
+        self._max = -np.inf * np.ones(self._n_parameters)
+
+    def add(self, samples):
+        """
+        Adds a 2d array of ``samples`` (with one sample per row).
+        """
+        samples = np.asarray(samples, dtype=float)
+        samples = samples.reshape((-1, self._n_parameters))
+        if len(samples) == 0:
+            return
+        self._count += len(samples)
+        self._min = np.minimum(self._min, np.min(samples, axis=0))
+        self._max = np.maximum(self._max, np.max(samples, axis=0))
+
+        ones = np.ones(len(samples))
+        for i in range(self._n_parameters):
+            means = np.concatenate((self._means[i], samples[:, i]))
+            weights = np.concatenate((self._weights[i], ones))
+            if len(means) > 5 * self._compression:
+                means, weights = self._merge(means, weights)
+            self._means[i] = means
+            self._weights[i] = weights
+
+    def count(self):
+        """
+        Returns the number of samples added.
+        """
+        return self._count
+
+    def _merge(self, means, weights):
+        """
+        Merges the given centroids, and returns the new (sorted) centroids.
+        """
+        order = np.argsort(means, kind='mergesort')
+        means = means[order]
+        weights = weights[order]
+
+        # Assign centroids to groups, based on the scale function evaluated at
+        # the quantile of the centroid's centre
+        cumulative = np.cumsum(weights)
+        q = (cumulative - 0.5 * weights) / cumulative[-1]
+        k = self._compression / (2 * np.pi) * np.arcsin(2 * q - 1)
+        groups = np.floor(k).astype(int)
+        groups -= groups[0]
+
+        # Replace each group by a single centroid
+        w = np.bincount(groups, weights=weights)
+        m = np.bincount(groups, weights=weights * means)
+        used = w > 0
+        return m[used] / w[used], w[used]
+
+    def quantiles(self, q):
+        """
+        Returns the estimated quantiles ``q`` (a sequence of values between 0
+        and 1) of every parameter, as an array of shape
+        ``(len(q), n_parameters)``.
+        """
+        q = np.asarray(q, dtype=float)
+        if self._count == 0:
+            raise ValueError('Unable to estimate quantiles: no samples added.')
+
+        n = self._count
+        result = np.zeros((len(q), self._n_parameters))
+        for i in range(self._n_parameters):
+            order = np.argsort(self._means[i], kind='mergesort')
+            means = self._means[i][order]
+            weights = self._weights[i][order]
+
+            # Position of each centroid's centre, in the sorted samples
+            centres = np.cumsum(weights) - weights + 0.5 * (weights - 1)
+
+            # Interpolate, using the minimum and maximum at the ends
+            x = np.concatenate(([0], centres, [n - 1]))
+            y = np.concatenate(([self._min[i]], means, [self._max[i]]))
+            result[:, i] = np.interp(q * (n - 1), x, y)
+        return result
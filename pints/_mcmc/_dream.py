@@ -120,45 +120,46 @@ class DreamMCMC(pints.MultiChainMCMC):
         # Propose new points
         # Note: Initialise sets the proposal for the very first step
         if self._proposed is None:
-
-            self._proposed = np.array(self._current, copy=True)
-
-            for j in range(self._chains):
-
-                # Select initial proposal for chain j
-                delta = int(np.random.choice(self._delta_max, 1)[0] + 1)
-                if self._p_g < np.random.rand():
-                    gamma = 2.38 / np.sqrt(2 * delta * self._n_parameters)
-                else:
-                    gamma = 1.0
-
-                e = self._b_star * self._mu
-                e = np.random.uniform(-e, e)
-
-                dX = 0
-                for k in range(0, delta):
-                    r1, r2 = self._draw(j)
-                    dX += (1 + e) * gamma * (
-                        self._current[r1] - self._current[r2])
-
-                self._proposed[j] += dX + np.random.normal(
-                    loc=0, scale=np.abs(self._b * self._mu),
-                    size=self._n_parameters)
-
-                # Set crossover probability
-                if self._constant_crossover:
-                    CR = self._CR
-                else:
-                    # Select CR from multinomial distribution
-                    self._m[j] = np.nonzero(
-                        np.random.multinomial(self._nCR, self._p))[0][0]
-                    CR = (self._m[j] + 1) / self._nCR
-                    self._L[self._m[j]] += 1
-
-                # Randomly set elements of proposal to back original
-                for d in range(self._n_parameters):
-                    if 1 - CR > np.random.rand():
-                        self._proposed[j][d] = self._current[j][d]
+            n, d = self._chains, self._n_parameters
+
+            # Select number of difference terms for each chain, and gamma
+            delta = np.random.randint(1, self._delta_max + 1, size=n)
+            gamma = np.where(
+                self._p_g < np.random.rand(n),
+                2.38 / np.sqrt(2 * delta * d), 1.0)
+
+            # Draw e ~ U(-b* mu, b* mu) for each chain
+            e = self._b_star * self._mu
+            e = np.random.uniform(-e, e, size=(n, d))
+
+            # Sum the differences between delta pairs of other chains, using
+            # the first delta of delta_max pairs drawn for each chain
+            r1, r2 = self._draw(self._delta_max)
+            used = np.arange(self._delta_max) < delta.reshape(n, 1)
+            dX = np.sum((self._current[r1] - self._current[r2])
+                        * used[:, :, np.newaxis], axis=1)
+            dX *= (1 + e) * gamma.reshape(n, 1)
+
+            self._proposed = self._current + dX + np.random.normal(
+                loc=0, scale=np.abs(self._b * self._mu), size=(n, d))
+
+            # Set crossover probability
+            if self._constant_crossover:
+                CR = self._CR
+            else:
+                # Select CR from multinomial distribution: each chain gets
+                # the lowest index drawn in nCR trials (where, as in
+                # np.random.multinomial, the last probability is 1 minus the
+                # sum of the others)
+                p = np.cumsum(self._p[:-1])
+                self._m = np.min(np.searchsorted(
+                    p, np.random.rand(n, self._nCR), side='right'), axis=1)
+                CR = ((self._m + 1) / self._nCR).reshape(n, 1)
+                self._L += np.bincount(self._m, minlength=self._nCR)
+
+            # Randomly set elements of proposal to back original
+            keep = 1 - CR > np.random.rand(n, d)
+            self._proposed[keep] = self._current[keep]
 
             # Set as read only
             self._proposed.setflags(write=False)
@@ -194,7 +195,7 @@ class DreamMCMC(pints.MultiChainMCMC):
         self._delta = np.zeros(self._nCR)
 
         # Create empty array of m indices
-        self._m = [0] * self._chains
+        self._m = np.zeros(self._chains, dtype=int)
 
         # Iteration tracking for running variance
         # See: https://www.johndcook.com/blog/standard_deviation/
@@ -290,10 +291,10 @@ class DreamMCMC(pints.MultiChainMCMC):
 
                 # Update CR distribution
                 delta = (next - self._current)**2
-                for j in range(self._chains):
-                    for d in range(0, self._n_parameters):
-                        self._delta[self._m[j]] += (
-                            delta[j][d] / max(self._variance[j][d], 1e-11))
+                delta = np.sum(
+                    delta / np.maximum(self._variance, 1e-11), axis=1)
+                self._delta += np.bincount(
+                    self._m, weights=delta, minlength=self._nCR)
 
                 self._p = self._iterations * self._chains * self._delta
                 d1 = self._L * np.sum(self._delta)
@@ -351,13 +352,25 @@ class DreamMCMC(pints.MultiChainMCMC):
         """
         return self._delta_max
 
-    def _draw(self, i):
+    def _draw(self, k):
         """
-        Select 2 random chains, not including chain i.
+        Selects ``k`` pairs of distinct random chains for each chain ``i``,
+        not including chain ``i``, and returns two arrays ``r1`` and ``r2`` of
+        shape ``(n_chains, k)``.
         """
-        r1, r2 = np.random.choice(self._chains, 2, replace=False)
-        while(r1 == i or r2 == i or r1 == r2):
-            r1, r2 = np.random.choice(self._chains, 2, replace=False)
+        n = self._chains
+        i = np.arange(n).reshape(n, 1)
+
+        # Draw r1 uniformly from the chains other than i
+        r1 = np.random.randint(0, n - 1, size=(n, k))
+        r1 += r1 >= i
+
+        # Draw r2 uniformly from the chains other than i and r1, by skipping
+        # over both in increasing order
+        r2 = np.random.randint(0, n - 2, size=(n, k))
+        a, b = np.minimum(i, r1), np.maximum(i, r1)
+        r2 += r2 >= a
+        r2 += r2 >= b
         return r1, r2
 
     def n_hyper_parameters(self):
@@ -14,13 +14,17 @@ import numpy as np
 
 class EmceeHammerMCMC(pints.MultiChainMCMC):
     """
-    Uses the differential evolution algorithm "emcee: the MCMC hammer",
-    described in Algorithm 2 in [1]_.
+    Uses the differential evolution algorithm "emcee: the MCMC hammer", using
+    the parallel stretch move described in Algorithm 3 in [1]_.
 
-    For ``k`` in ``1:N``:
+    The walkers (chains) are split into two halves, ``S(0)`` and ``S(1)``.
+    Each iteration, the walkers in ``S(0)`` are updated using the current
+    positions of the walkers in ``S(1)``, after which the walkers in ``S(1)``
+    are updated using the new positions of the walkers in ``S(0)``. To update
+    the walkers in a half ``S(i)``, for all ``k`` in ``S(i)`` at once:
 
-    - Draw a walker ``X_j`` at random from the "complementary ensemble" (the
-      group of chains not including ``k``) without replacement.
+    - Draw a walker ``X_j`` at random from the "complementary ensemble"
+      ``S(1 - i)``.
 
     - Sample ``z ~ g(z)``, (see below).
 
@@ -32,9 +36,15 @@ class EmceeHammerMCMC(pints.MultiChainMCMC):
 
     - If ``r <= q``, set ``X_k(t + 1)`` equal to ``Y``, if not use ``X_k(t)``.
 
-    Here, ``N`` is the number of chains (or walkers), and ``g(z)`` is
-    proportional to ``1 / sqrt(z)`` if ``z`` is in  ``[1 / a, a]`` or to 0,
-    otherwise (where ``a`` is a parameter with default value ``2``).
+    Here, ``N`` is the number of parameters, and ``g(z)`` is proportional to
+    ``1 / sqrt(z)`` if ``z`` is in  ``[1 / a, a]`` or to 0, otherwise (where
+    ``a`` is a parameter with default value ``2``).
+
+    Because the proposals for all walkers in a half are independent of each
+    other, :meth:`ask()` returns them as a single batch, which can be
+    evaluated in parallel (see :meth:`MCMCController.set_parallel()`). As a
+    result, each iteration requires two calls to :meth:`ask()` and
+    :meth:`tell()`, and the first call to :meth:`tell()` returns ``None``.
 
     References
     ----------
@@ -57,10 +67,14 @@ class EmceeHammerMCMC(pints.MultiChainMCMC):
         self._current = None
         self._current_log_pdfs = None
 
-        # Single proposed point!
-        #TODO: Update this class to algorithm 3
+        # Proposed points, for the walkers in one half of the ensemble
         self._proposed = None
 
+        # The two halves of the ensemble, and the half currently updated
+        h = self._chains // 2
+        self._halves = (np.arange(h), np.arange(h, self._chains))
+        self._half = 0
+
         # Scale parameter (see docstring above)
         self._a = None
         self.set_scale(2.0)
@@ -74,28 +88,18 @@ class EmceeHammerMCMC(pints.MultiChainMCMC):
         # Propose new points
         if self._proposed is None:
 
-            # Cycle through chains
-            #TODO Do this without lists TODO
-            if len(self._remaining) == 0:
-                self._remaining = np.arange(self._chains)
-            self._k = self._remaining[0]
-            self._remaining = np.delete(self._remaining, 0)
-
-            # Pick j from the complementary ensemble
-            j = np.random.randint(self._chains - 1)
-            if j >= self._k:
-                j += 1
-            x_j = self._current[j]
-            x_k = self._current[self._k]
+            # Pick a walker j from the complementary ensemble, for every
+            # walker k in the half being updated
+            active = self._halves[self._half]
+            other = self._halves[1 - self._half]
+            js = other[np.random.randint(len(other), size=len(active))]
+            x_j = self._current[js]
+            x_k = self._current[active]
 
             # sample Z from g[z] = (1/sqrt(Z)), if Z in [1/a, a], 0 otherwise
-            r = np.random.rand()
+            r = np.random.rand(len(active))
             self._z = ((1 + r * (self._a - 1))**2) / self._a
-            self._proposed = x_j + self._z * (x_k - x_j)
-
-            # Ensure proposed is array of samples (with length 1)
-            #TODO Switch to algorithm 3
-            self._proposed = np.array([self._proposed])
+            self._proposed = x_j + self._z.reshape(-1, 1) * (x_k - x_j)
 
         # Set as read only
         self._proposed.setflags(write=False)
@@ -119,8 +123,8 @@ class EmceeHammerMCMC(pints.MultiChainMCMC):
         self._current_log_pdfs = None
         self._proposed = self._x0
 
-        # a range
-        self._remaining = np.arange(self._chains)
+        # Start by updating the first half
+        self._half = 0
 
         # Update sampler state
         self._running = True
@@ -156,19 +160,18 @@ class EmceeHammerMCMC(pints.MultiChainMCMC):
             # Return first samples for chains
             return self._current
 
-        # Perform iteration
-        next = np.array(self._current, copy=True)
-        next_log_pdfs = np.array(self._current_log_pdfs, copy=True)
-
-        # Update the selected chain
-        #TODO Switch to algorithm 3, doing 2 sets of chains per iteration
-        r_log = np.log(np.random.rand())
+        # Update the walkers in the current half
+        active = self._halves[self._half]
+        r_log = np.log(np.random.rand(len(active)))
         q = (
-            (self._chains - 1) * np.log(self._z)
-            + proposed_log_pdf - self._current_log_pdfs[self._k])
-        if q >= r_log:
-            next[self._k] = self._proposed[0]
-            next_log_pdfs[self._k] = proposed_log_pdf
+            (self._n_parameters - 1) * np.log(self._z)
+            + proposed_log_pdf - self._current_log_pdfs[active])
+        accepted = q >= r_log
+        if np.any(accepted):
+            next = np.array(self._current, copy=True)
+            next_log_pdfs = np.array(self._current_log_pdfs, copy=True)
+            next[active[accepted]] = self._proposed[accepted]
+            next_log_pdfs[active[accepted]] = proposed_log_pdf[accepted]
             self._current = next
             self._current_log_pdfs = next_log_pdfs
             self._current_log_pdfs.setflags(write=False)
@@ -176,6 +179,11 @@ class EmceeHammerMCMC(pints.MultiChainMCMC):
         # Clear proposal
         self._proposed = None
 
+        # Switch halves, and only return samples once both have been updated
+        self._half = 1 - self._half
+        if self._half == 1:
+            return None
+
         # Return samples to add to chains
         self._current.setflags(write=False)
         return self._current
@@ -70,8 +70,8 @@ class HaarioACMC(pints.AdaptiveCovarianceMC):
 
     def _generate_proposal(self):
         """ See :meth:`AdaptiveCovarianceMC._generate_proposal()`. """
-        return np.random.multivariate_normal(
-            self._current, self._sigma * np.exp(self._log_lambda))
+        return self._proposal.sample(
+            self._current, np.exp(self._log_lambda))
 
     def name(self):
         """ See :meth:`pints.MCMCSampler.name()`. """
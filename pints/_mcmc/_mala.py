@@ -10,7 +10,8 @@ from __future__ import absolute_import, division
 from __future__ import print_function, unicode_literals
 import pints
 import numpy as np
-import scipy.stats
+
+from ._proposal import GaussianProposal
 
 
 class MALAMCMC(pints.SingleChainMCMC):
@@ -102,6 +103,9 @@ class MALAMCMC(pints.SingleChainMCMC):
         self._iterations = 0
         self._acceptance = 0
 
+        # Proposal distribution, with covariance epsilon^2 (see set_epsilon)
+        self._proposal = None
+
         # Step size
         self._forward_mu = None
         self._backward_mu = None
@@ -147,6 +151,7 @@ class MALAMCMC(pints.SingleChainMCMC):
                 if element <= 0:
                     raise ValueError('Elements of epsilon must exceed 0.')
             self._epsilon = np.array(epsilon)
+        self._proposal = GaussianProposal(self._epsilon**2)
 
     def epsilon(self):
         """
@@ -175,14 +180,9 @@ class MALAMCMC(pints.SingleChainMCMC):
             self._forward_mu = self._current + (self._epsilon**2 / 2.0) * (
                 self._current_gradient)
 
-            self._proposed = np.random.multivariate_normal(
-                self._forward_mu,
-                self._epsilon**2 * np.diag(np.ones(self._n_parameters)))
-
-            self._forward_q = scipy.stats.multivariate_normal.logpdf(
-                self._proposed, self._forward_mu,
-                self._epsilon**2 * np.diag(np.ones(self._n_parameters))
-            )
+            self._proposed = self._proposal.sample(self._forward_mu)
+            self._forward_q = self._proposal.log_pdf(
+                self._proposed, self._forward_mu)
 
             # Set as read-only
             self._proposed.setflags(write=False)
@@ -232,9 +232,8 @@ class MALAMCMC(pints.SingleChainMCMC):
         proposed_gradient = log_gradient
         self._backward_mu = self._proposed + (
             0.5 * self._epsilon**2 * proposed_gradient)
-        self._backward_q = scipy.stats.multivariate_normal.logpdf(
-            self._current, self._backward_mu,
-            self._epsilon**2 * (np.diag(np.ones(self._n_parameters))))
+        self._backward_q = self._proposal.log_pdf(
+            self._current, self._backward_mu)
         alpha = fx + self._backward_q - (
             self._current_log_pdf + self._forward_q)
 
@@ -0,0 +1,261 @@
+#
+# Adaptive (inverse) mass matrix for Hamiltonian MCMC methods
+#
+# This file is part of PINTS.
+#  Copyright (c) 2017-2019, University of Oxford.
+#  For licensing information, see the LICENSE file distributed with the PINTS
+#  software package.
+#
+from __future__ import absolute_import, division
+from __future__ import print_function, unicode_literals
+import pints
+import numpy as np
+
+
+class MassMatrix(object):
+    r"""
+    Stores the inverse mass matrix ``M^-1`` used by Hamiltonian MCMC methods,
+    and adapts it during the methods' initial phase.
+
+    The matrix is stored as a factor ``T`` such that ``T T^T = M^-1``, which
+    is either a vector (for a diagonal matrix) or a lower triangular matrix.
+    Hamiltonian dynamics with inverse mass matrix ``M^-1`` are then simulated
+    in transformed coordinates, so that the leapfrog steps become
+
+    .. math::
+        p &\leftarrow p - (\epsilon / 2) T^T \nabla U(q)\\
+        q &\leftarrow q + \epsilon T \nabla K(p)
+
+    where the momentum ``p`` and kinetic energy ``K`` are defined using an
+    identity mass matrix.
+
+    Adaptation uses a windowed scheme, similar to that used by Stan: after an
+    initial buffer of iterations, in which the sampler can reach the typical
+    set, the covariance of the samples in each window is estimated and used as
+    the new inverse mass matrix. Each window is twice the size of the previous
+    one. The estimates are shrunk towards their diagonal to regularise them.
+
+    Parameters
+    ----------
+    factor
+        The initial factor ``T``, as a vector or a lower triangular matrix.
+    """
+
+    def __init__(self, factor):
+        self.set_factor(factor)
+
+        # Adaptation mode, and window sizes
+        self._adaptation = 'diagonal'
+        self._initial_buffer = 75
+        self._initial_window = 25
+        self._reset_windows()
+
+    def adapt(self, x):
+        """
+        Adds a sample ``x`` to the current adaptation window, and updates the
+        inverse mass matrix if this completes the window.
+
+        Returns ``True`` if the inverse mass matrix was updated.
+        """
+        if self._adaptation is None:
+            return False
+
+        # Skip initial buffer
+        self._iterations += 1
+        if self._iterations <= self._initial_buffer:
+            return False
+
+        # Update running mean and (co)variance (Welford's algorithm)
+        self._n += 1
+        d = x - self._mean
+        self._mean += d / self._n
+        if self._adaptation == 'dense':
+            self._m2 += np.outer(d, x - self._mean)
+        else:
+            self._m2 += d * (x - self._mean)
+        if self._n < self._window:
+            return False
+
+        # Estimate covariance, and shrink towards its diagonal
+        n = self._n
+        sigma = self._m2 / (n - 1)
+        w = n / (n + 5)
+        if self._adaptation == 'dense':
+            sigma = w * sigma + (1 - w) * 1e-3 * np.diag(np.diag(sigma))
+            try:
+                factor = np.linalg.cholesky(sigma)
+            except np.linalg.LinAlgError:
+                factor = None
+        else:
+            sigma = (w + (1 - w) * 1e-3) * sigma
+            factor = np.sqrt(sigma)
+
+        # Start next window, twice the size of the current one
+        self._window *= 2
+        self._n = 0
+        self._mean = np.zeros(len(x))
+        self._m2 = np.zeros(self._m2.shape)
+
+        # Update factor, unless the estimate is degenerate
+        if factor is None or not np.all(np.isfinite(factor)) or np.any(
+                np.diag(np.atleast_2d(factor)) <= 0):
+            return False
+        self._factor = factor
+        return True
+
+    def adaptation(self):
+        """
+        Returns the type of adaptation used (``'diagonal'``, ``'dense'``, or
+        ``None``).
+        """
+        return self._adaptation
+
+    def dot(self, v):
+        """
+        Returns ``T v``.
+        """
+        if self._factor.ndim == 1:
+            return self._factor * v
+        return np.dot(self._factor, v)
+
+    def dot_transpose(self, v):
+        """
+        Returns ``T^T v``.
+        """
+        if self._factor.ndim == 1:
+            return self._factor * v
+        return np.dot(self._factor.T, v)
+
+    def factor(self):
+        """
+        Returns the current factor ``T``.
+        """
+        return self._factor
+
+    def inverse_mass_matrix(self):
+        """
+        Returns the current inverse mass matrix ``M^-1 = T T^T``.
+        """
+        if self._factor.ndim == 1:
+            return np.diag(self._factor**2)
+        return np.dot(self._factor, self._factor.T)
+
+    def scales(self):
+        """
+        Returns the square root of the diagonal of ``M^-1``, i.e. the scale of
+        each parameter in the transformed coordinates.
+        """
+        if self._factor.ndim == 1:
+            return np.abs(self._factor)
+        return np.sqrt(np.sum(self._factor**2, axis=1))
+
+    def _reset_windows(self):
+        """
+        Restarts adaptation, with the initial buffer and window sizes.
+        """
+        self._iterations = 0
+        self._window = self._initial_window
+        self._n = 0
+        self._mean = 0
+        self._m2 = 0
+
+    def set_adaptation(self, adaptation='diagonal'):
+        """
+        Sets the type of adaptation to use: ``'diagonal'`` to adapt a diagonal
+        inverse mass matrix, ``'dense'`` to adapt a full matrix, or ``None``
+        to disable adaptation. Changing the type restarts the adaptation.
+        """
+        if adaptation not in ('diagonal', 'dense', None):
+            raise ValueError(
+                'Mass matrix adaptation must be \'diagonal\', \'dense\', or'
+                ' None.')
+        self._adaptation = adaptation
+        self._reset_windows()
+
+    def set_factor(self, factor):
+        """
+        Sets the factor ``T``, as a vector (for a diagonal inverse mass matrix)
+        or a lower triangular matrix.
+        """
+        factor = np.array(factor, dtype=float, copy=True)
+        if factor.ndim not in (1, 2):
+            raise ValueError(
+                'Mass matrix factor must be a vector or a matrix.')
+        self._factor = factor
+
+
+class AdaptiveMassMatrixMCMC(pints.SingleChainMCMC):
+    """
+    Base class for single chain Hamiltonian MCMC methods that adapt their
+    inverse mass matrix ``M^-1`` during the initial phase (see
+    :meth:`MCMCController.set_initial_phase_iterations()`).
+
+    Subclasses perform their leapfrog steps in coordinates transformed by the
+    :class:`MassMatrix` stored in ``self._mass_matrix``, and pass each new
+    sample to :meth:`_adapt_mass_matrix()`. Adaptation of a diagonal matrix is
+    enabled by default, and can be changed or disabled with
+    :meth:`set_mass_matrix_adaptation()`.
+
+    Extends :class:`SingleChainMCMC`.
+    """
+
+    def __init__(self, x0, sigma0=None):
+        super(AdaptiveMassMatrixMCMC, self).__init__(x0, sigma0)
+
+        # Inverse mass matrix, adapted during the initial phase
+        self._initial_phase = True
+        self._mass_matrix = MassMatrix(np.ones(self._n_parameters))
+
+    def _adapt_mass_matrix(self, x):
+        """
+        Adds the sample ``x`` to the mass matrix adaptation if in the initial
+        phase, and returns ``True`` if ``M^-1`` was updated.
+        """
+        if self._initial_phase:
+            return self._mass_matrix.adapt(x)
+        return False
+
+    def in_initial_phase(self):
+        """ See :meth:`pints.MCMCSampler.in_initial_phase()`. """
+        return self._initial_phase
+
+    def inverse_mass_matrix(self):
+        """
+        Returns the current inverse mass matrix ``M^-1``.
+        """
+        return self._mass_matrix.inverse_mass_matrix()
+
+    def mass_matrix_adaptation(self):
+        """
+        Returns the type of mass matrix adaptation performed during the
+        initial phase (``'diagonal'``, ``'dense'``, or ``None``).
+        """
+        return self._mass_matrix.adaptation()
+
+    def needs_initial_phase(self):
+        """ See :meth:`pints.MCMCSampler.needs_initial_phase()`. """
+        return True
+
+    def set_initial_phase(self, initial_phase):
+        """
+        See :meth:`pints.MCMCSampler.set_initial_phase()`.
+
+        During the initial phase, the inverse mass matrix is adapted (see
+        :meth:`set_mass_matrix_adaptation()`).
+        """
+        self._initial_phase = bool(initial_phase)
+
+    def set_mass_matrix_adaptation(self, adaptation='diagonal'):
+        """
+        Sets the type of adaptation of the inverse mass matrix ``M^-1``
+        performed during the initial phase: ``'diagonal'`` (the default) to
+        adapt a diagonal matrix, ``'dense'`` to adapt a full matrix, or
+        ``None`` to disable adaptation.
+
+        Adaptation happens in windows: after an initial buffer of 75
+        iterations, the covariance of the samples in windows of 25, 50, 100,
+        etc. iterations is used to update ``M^-1`` at the end of each window.
+        Each update replaces the previous ``M^-1``, including its initial
+        value.
+        """
+        self._mass_matrix.set_adaptation(adaptation)
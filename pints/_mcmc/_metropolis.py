@@ -11,6 +11,8 @@ from __future__ import print_function, unicode_literals
 import pints
 import numpy as np
 
+from ._proposal import GaussianProposal
+
 
 class MetropolisRandomWalkMCMC(pints.SingleChainMCMC):
     """
@@ -41,6 +43,9 @@ class MetropolisRandomWalkMCMC(pints.SingleChainMCMC):
         self._current_log_pdf = None
         self._proposed = None
 
+        # Proposal distribution, storing the Cholesky factor of sigma0
+        self._proposal = GaussianProposal(self._sigma0)
+
     def acceptance_rate(self):
         """
         Returns the current (measured) acceptance rate.
@@ -58,8 +63,7 @@ class MetropolisRandomWalkMCMC(pints.SingleChainMCMC):
             # Note: Gaussian distribution is symmetric
             #  N(x|y, sigma) = N(y|x, sigma) so that we can drop the proposal
             #  distribution term from the acceptance criterion
-            self._proposed = np.random.multivariate_normal(
-                self._current, self._sigma0)
+            self._proposed = self._proposal.sample(self._current)
 
             # Set as read-only
             self._proposed.setflags(write=False)
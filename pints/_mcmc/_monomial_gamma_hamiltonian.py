@@ -13,8 +13,10 @@ import numpy as np
 from scipy import integrate
 from scipy import interpolate
 
+from ._mass_matrix import AdaptiveMassMatrixMCMC
 
-class MonomialGammaHamiltonianMCMC(pints.SingleChainMCMC):
+
+class MonomialGammaHamiltonianMCMC(AdaptiveMassMatrixMCMC):
     r"""
     Implements Monomial Gamma HMC as described in [1]_ - a generalisation
     of HMC as described in [2]_ - involving a non-physical kinetic energy term.
@@ -65,6 +67,14 @@ class MonomialGammaHamiltonianMCMC(pints.SingleChainMCMC):
     In particular, the algorithm we implement follows eqs. (4.14)-(4.16) in
     [2]_, since we allow different epsilon according to dimension.
 
+    As in :class:`HamiltonianMCMC`, an inverse mass matrix ``M^-1`` is
+    adapted to the covariance of the samples during the initial phase by
+    default (see :meth:`MCMCController.set_initial_phase_iterations()` and
+    :meth:`set_mass_matrix_adaptation()`), replacing the initial step sizes
+    set with :meth:`set_leapfrog_step_size()`. It is applied by performing
+    the leapfrog steps in coordinates transformed by a factor ``T`` with
+    ``T T^T = M^-1``.
+
     Extends :class:`SingleChainMCMC`.
 
     References
@@ -105,9 +115,9 @@ class MonomialGammaHamiltonianMCMC(pints.SingleChainMCMC):
         # Default number of leapfrog iterations
         self._n_frog_iterations = 20
 
-        # Default integration step size for leapfrog algorithm
+        # Default integration step size for leapfrog algorithm, and initial
+        # step size in each dimension (the factor of the inverse mass matrix)
         self._epsilon = 0.1
-        self._step_size = None
         self.set_leapfrog_step_size(np.diag(self._sigma0))
 
         # Divergence checking
@@ -168,12 +178,12 @@ class MonomialGammaHamiltonianMCMC(pints.SingleChainMCMC):
             self._momentum = np.array(self._current_momentum, copy=True)
 
             # Perform a half-step before starting iteration 0 below
-            self._momentum -= self._scaled_epsilon * self._gradient * 0.5
+            self._momentum -= 0.5 * self._epsilon * (
+                self._mass_matrix.dot_transpose(self._gradient))
 
         # Perform a leapfrog step for the position
-        self._position += self._scaled_epsilon * (
-            self._K_deriv(self._momentum, self._a, self._c, self._m)
-        )
+        self._position += self._epsilon * self._mass_matrix.dot(
+            self._K_deriv(self._momentum, self._a, self._c, self._m))
 
         # Ask for the pdf and gradient of the current leapfrog position
         # Using this, the leapfrog step for the momentum is performed in tell()
@@ -280,9 +290,13 @@ class MonomialGammaHamiltonianMCMC(pints.SingleChainMCMC):
 
     def leapfrog_step_size(self):
         """
-        Returns the step size for the leapfrog algorithm.
+        Returns the step size for the leapfrog algorithm in each dimension.
+
+        This is the step size currently in use, i.e. the square root of the
+        diagonal of :meth:`inverse_mass_matrix()`, which is adapted during the
+        initial phase.
         """
-        return self._step_size
+        return self._mass_matrix.scales()
 
     def _log_init(self, logger):
         """ See :meth:`Loggable._log_init()`. """
@@ -327,7 +341,7 @@ class MonomialGammaHamiltonianMCMC(pints.SingleChainMCMC):
         """
         Returns scaled epsilon used in leapfrog algorithm.
         """
-        return self._scaled_epsilon
+        return self._epsilon * self._mass_matrix.scales()
 
     def set_a(self, a):
         """
@@ -353,7 +367,6 @@ class MonomialGammaHamiltonianMCMC(pints.SingleChainMCMC):
         if epsilon <= 0:
             raise ValueError('epsilon must be positive for leapfrog algorithm')
         self._epsilon = epsilon
-        self._set_scaled_epsilon()
 
     def set_hamiltonian_threshold(self, hamiltonian_threshold):
         """
@@ -389,7 +402,13 @@ class MonomialGammaHamiltonianMCMC(pints.SingleChainMCMC):
 
     def set_leapfrog_step_size(self, step_size):
         """
-        Sets the step size for the leapfrog algorithm.
+        Sets the step size for the leapfrog algorithm, either as a scalar or
+        with one value per dimension.
+
+        This sets the inverse mass matrix ``M^-1`` to a diagonal matrix with
+        the squared step sizes on its diagonal. Unless mass matrix adaptation
+        is disabled (see :meth:`set_mass_matrix_adaptation()`), this is only
+        the initial value, which is replaced during the initial phase.
         """
         a = np.atleast_1d(step_size)
         if len(a[a < 0]) > 0:
@@ -404,8 +423,7 @@ class MonomialGammaHamiltonianMCMC(pints.SingleChainMCMC):
                 'Step size should either be of length 1 or equal to the' +
                 'number of parameters'
             )
-        self._step_size = step_size
-        self._set_scaled_epsilon()
+        self._mass_matrix.set_factor(step_size)
 
     def set_mass(self, m):
         """
@@ -415,14 +433,6 @@ class MonomialGammaHamiltonianMCMC(pints.SingleChainMCMC):
             raise ValueError("Mass must be positive")
         self._m = m
 
-    def _set_scaled_epsilon(self):
-        """
-        Rescales epsilon along the dimensions of step_size.
-        """
-        self._scaled_epsilon = np.zeros(self._n_parameters)
-        for i in range(self._n_parameters):
-            self._scaled_epsilon[i] = self._epsilon * self._step_size[i]
-
     def tell(self, reply):
         """ See :meth:`pints.SingleChainMCMC.tell()`. """
         if not self._ready_for_tell:
@@ -471,13 +481,15 @@ class MonomialGammaHamiltonianMCMC(pints.SingleChainMCMC):
 
         # Not the last iteration? Then perform a leapfrog step and return
         if self._frog_iteration < self._n_frog_iterations:
-            self._momentum -= self._scaled_epsilon * self._gradient
+            self._momentum -= self._epsilon * (
+                self._mass_matrix.dot_transpose(self._gradient))
 
             # Return None to indicate there is no new sample for the chain
             return None
 
         # Final leapfrog iteration: only do half a step
-        self._momentum -= self._scaled_epsilon * self._gradient * 0.5
+        self._momentum -= 0.5 * self._epsilon * (
+            self._mass_matrix.dot_transpose(self._gradient))
 
         # Before starting accept/reject procedure, check if the leapfrog
         # procedure has led to a finite momentum and logpdf. If not, reject.
@@ -508,6 +520,7 @@ class MonomialGammaHamiltonianMCMC(pints.SingleChainMCMC):
                 self._mcmc_acceptance = (
                     (self._mcmc_iteration * self._mcmc_acceptance + accept) /
                     (self._mcmc_iteration + 1))
+                self._adapt_mass_matrix(self._current)
                 self._current.setflags(write=False)
                 return self._current
 
@@ -535,5 +548,8 @@ class MonomialGammaHamiltonianMCMC(pints.SingleChainMCMC):
             (self._mcmc_iteration * self._mcmc_acceptance + accept) /
             (self._mcmc_iteration + 1))
 
+        # Adapt inverse mass matrix during the initial phase
+        self._adapt_mass_matrix(self._current)
+
         # Return current position as next sample in the chain
         return self._current
@@ -0,0 +1,318 @@
+#
+# Multiple-try Metropolis MCMC
+#
+# This file is part of PINTS.
+#  Copyright (c) 2017-2019, University of Oxford.
+#  For licensing information, see the LICENSE file distributed with the PINTS
+#  software package.
+#
+from __future__ import absolute_import, division
+from __future__ import print_function, unicode_literals
+import pints
+import numpy as np
+from scipy.special import logsumexp
+
+from ._proposal import GaussianProposal
+
+
+class MultipleTryMCMC(pints.SingleChainMCMC):
+    """
+    Multiple-try Metropolis MCMC, as described in [1]_, using a multivariate
+    Gaussian proposal distribution.
+
+    Each iteration proposes ``K`` candidate points at once, so that they can
+    be evaluated in parallel (see :meth:`needs_batch_evaluation()`). This
+    allows multiple cores to be used to improve the mixing of a single chain.
+
+    In its default (random walk) form, each iteration consists of the
+    following steps:
+
+    1. Draw ``K`` candidates ``y_1, ..., y_K`` from ``N(x, sigma0)``, where
+    ``x`` is the current point, and evaluate them.
+
+    2. Select a candidate ``y = y_j`` with probability proportional to
+    ``p(y_j)``.
+
+    3. Draw ``K - 1`` reference points ``x*_1, ..., x*_{K-1}`` from
+    ``N(y, sigma0)``, evaluate them, and set ``x*_K = x``.
+
+    4. Accept ``y`` with probability
+
+    ``min(1, (p(y_1) + ... + p(y_K)) / (p(x*_1) + ... + p(x*_K)))``
+
+    Each iteration therefore asks for two batches of points: ``K`` candidates
+    and ``K - 1`` reference points.
+
+    If independent proposals are enabled (see
+    :meth:`set_independent_proposals()`), the candidates are instead drawn
+    from a fixed distribution ``q = N(x0, sigma0)``, which should cover the
+    target distribution. Using the weights ``w(y) = p(y) / q(y)``, a candidate
+    ``y_j`` is selected with probability proportional to ``w(y_j)``, and
+    accepted with probability [2]_
+
+    ``min(1, W / (W - w(y_j) + w(x)))``
+
+    where ``W = w(y_1) + ... + w(y_K)``. No reference points are needed, so
+    that each iteration asks for a single batch of ``K`` points.
+
+    Extends :class:`SingleChainMCMC`.
+
+    References
+    ----------
+    .. [1] "The Multiple-Try Method and Local Optimization in Metropolis
+           Sampling". Jun S. Liu, Faming Liang and Wing Hung Wong (2000)
+           Journal of the American Statistical Association, 95(449),
+           pp.121-134.
+           https://doi.org/10.1080/01621459.2000.10473908
+
+    .. [2] "A review of multiple try MCMC algorithms for signal processing".
+           Luca Martino (2018) Digital Signal Processing, 75, pp.134-152.
+           https://doi.org/10.1016/j.dsp.2018.01.004
+    """
+
+    def __init__(self, x0, sigma0=None):
+        super(MultipleTryMCMC, self).__init__(x0, sigma0)
+
+        # Set initial state
+        self._running = False
+
+        # Current point and its log pdf
+        self._current = None
+        self._current_log_pdf = None
+
+        # Proposed batch of points, and the selected candidate and its log pdf
+        self._proposed = None
+        self._candidate = None
+        self._candidate_log_pdf = None
+
+        # Log of the summed candidate weights, while waiting for the reference
+        # points to be evaluated
+        self._log_sum = None
+
+        # Proposal distribution, storing the Cholesky factor of sigma0
+        self._proposal = GaussianProposal(self._sigma0)
+
+        # Default settings
+        self._n_tries = 4
+        self._independent = False
+
+    def acceptance_rate(self):
+        """
+        Returns the current (measured) acceptance rate.
+        """
+        return self._acceptance
+
+    def ask(self):
+        """ See :meth:`SingleChainMCMC.ask()`. """
+        # Initialise on first call
+        if not self._running:
+            self._initialise()
+
+        # Propose new candidates
+        if self._proposed is None:
+            if self._independent:
+                mean = np.tile(self._x0, (self._n_tries, 1))
+            else:
+                mean = np.tile(self._current, (self._n_tries, 1))
+            self._proposed = self._proposal.sample(mean)
+
+            # Set as read-only
+            self._proposed.setflags(write=False)
+
+        # Return proposed points
+        return self._proposed
+
+    def _accept(self, log_ratio):
+        """
+        Accepts the selected candidate with probability ``exp(log_ratio)``,
+        updates the acceptance rate, and returns the current point.
+        """
+        accepted = 0
+        if np.isfinite(log_ratio):
+            u = np.log(np.random.uniform(0, 1))
+            if u < log_ratio:
+                accepted = 1
+                self._current = self._candidate
+                self._current_log_pdf = self._candidate_log_pdf
+
+        # Clear proposal and candidate
+        self._proposed = None
+        self._candidate = self._candidate_log_pdf = self._log_sum = None
+
+        # Update acceptance rate (only used for output!)
+        self._acceptance = ((self._iterations * self._acceptance + accepted) /
+                            (self._iterations + 1))
+
+        # Increase iteration count
+        self._iterations += 1
+
+        # Return new point for chain
+        return self._current
+
+    def current_log_pdf(self):
+        """ See :meth:`SingleChainMCMC.current_log_pdf()`. """
+        return self._current_log_pdf
+
+    def independent_proposals(self):
+        """
+        Returns ``True`` if candidates are drawn independently of the current
+        point (see :meth:`set_independent_proposals()`).
+        """
+        return self._independent
+
+    def _initialise(self):
+        """
+        Initialises the routine before the first iteration.
+        """
+        if self._running:
+            raise RuntimeError('Already initialised.')
+
+        # Propose x0 as first point (in a batch of one)
+        self._current = None
+        self._current_log_pdf = None
+        self._proposed = np.array([self._x0])
+        self._proposed.setflags(write=False)
+
+        # Acceptance rate monitoring
+        self._iterations = 0
+        self._acceptance = 0
+
+        # Update sampler state
+        self._running = True
+
+    def _log_init(self, logger):
+        """ See :meth:`Loggable._log_init()`. """
+        logger.add_float('Accept.')
+
+    def _log_write(self, logger):
+        """ See :meth:`Loggable._log_write()`. """
+        logger.log(self._acceptance)
+
+    def _log_weights(self, xs, fxs):
+        """
+        Returns the log weights of points ``xs`` with log pdfs ``fxs``, with
+        non-finite weights replaced by ``-inf``.
+        """
+        w = np.array(fxs, dtype=float)
+        if self._independent:
+            w -= np.array([self._proposal.log_pdf(x, self._x0) for x in xs])
+        w[~np.isfinite(w)] = -np.inf
+        return w
+
+    def n_hyper_parameters(self):
+        """ See :meth:`TunableMethod.n_hyper_parameters()`. """
+        return 1
+
+    def n_tries(self):
+        """
+        Returns the number of candidates proposed at each iteration.
+        """
+        return self._n_tries
+
+    def name(self):
+        """ See :meth:`pints.MCMCSampler.name()`. """
+        return 'Multiple-try Metropolis MCMC'
+
+    def needs_batch_evaluation(self):
+        """ See :meth:`SingleChainMCMC.needs_batch_evaluation()`. """
+        return True
+
+    def set_hyper_parameters(self, x):
+        """
+        The hyper-parameter vector is ``[n_tries]``.
+
+        See :meth:`TunableMethod.set_hyper_parameters()`.
+        """
+        self.set_n_tries(x[0])
+
+    def set_independent_proposals(self, enabled=True):
+        """
+        Enables or disables independent proposals, in which candidates are
+        drawn from ``N(x0, sigma0)`` instead of from a distribution centered
+        on the current point.
+        """
+        if self._running:
+            raise RuntimeError(
+                'Proposal type cannot be changed during run.')
+        self._independent = bool(enabled)
+
+    def set_n_tries(self, n_tries):
+        """
+        Sets the number of candidates proposed (and evaluated in parallel) at
+        each iteration.
+        """
+        n_tries = int(n_tries)
+        if n_tries < 1:
+            raise ValueError('Number of tries must be at least 1.')
+        self._n_tries = n_tries
+
+    def tell(self, fx):
+        """ See :meth:`pints.SingleChainMCMC.tell()`. """
+        # Check if we had a proposal
+        if self._proposed is None:
+            raise RuntimeError('Tell called before proposal was set.')
+
+        # Ensure fx is an array of floats
+        fx = np.array(fx, dtype=float, copy=True).reshape((-1, ))
+        if len(fx) != len(self._proposed):
+            raise ValueError(
+                'Expecting ' + str(len(self._proposed)) + ' log pdf values.')
+
+        # First point?
+        if self._current is None:
+            if not np.isfinite(fx[0]):
+                raise ValueError(
+                    'Initial point for MCMC must have finite log_pdf.')
+
+            # Accept
+            self._current = self._x0
+            self._current_log_pdf = fx[0]
+
+            # Increase iteration count
+            self._iterations += 1
+
+            # Clear proposal
+            self._proposed = None
+
+            # Return first point for chain
+            return self._current
+
+        # Reference points evaluated? Then accept or reject the candidate
+        if self._candidate is not None:
+            w = np.concatenate((fx, [self._current_log_pdf]))
+            w[~np.isfinite(w)] = -np.inf
+            return self._accept(self._log_sum - logsumexp(w))
+
+        # Calculate log weights of the candidates
+        w = self._log_weights(self._proposed, fx)
+        if not np.any(np.isfinite(w)):
+            # Reject if no candidate has a finite weight
+            return self._accept(-np.inf)
+        log_sum = logsumexp(w)
+
+        # Select a candidate
+        j = np.random.choice(len(w), p=np.exp(w - log_sum))
+        self._candidate = np.array(self._proposed[j], copy=True)
+        self._candidate.setflags(write=False)
+        self._candidate_log_pdf = fx[j]
+
+        # Independent proposals: accept or reject immediately
+        if self._independent:
+            w_x = self._log_weights([self._current], [self._current_log_pdf])
+            if self._n_tries == 1:
+                log_rest = w_x[0]
+            else:
+                log_rest = logsumexp(
+                    np.concatenate((np.delete(w, j), w_x)))
+            return self._accept(log_sum - log_rest)
+
+        # Random walk with a single try: this reduces to Metropolis
+        if self._n_tries == 1:
+            return self._accept(fx[j] - self._current_log_pdf)
+
+        # Propose reference points around the selected candidate
+        self._log_sum = log_sum
+        self._proposed = self._proposal.sample(
+            np.tile(self._candidate, (self._n_tries - 1, 1)))
+        self._proposed.setflags(write=False)
+        return None
@@ -0,0 +1,622 @@
+#
+# No-U-Turn sampler with dual averaging step size adaptation
+#
+# This file is part of PINTS.
+#  Copyright (c) 2017-2019, University of Oxford.
+#  For licensing information, see the LICENSE file distributed with the PINTS
+#  software package.
+#
+from __future__ import absolute_import, division
+from __future__ import print_function, unicode_literals
+import pints
+import numpy as np
+
+from ._mass_matrix import AdaptiveMassMatrixMCMC
+from ._proposal import GaussianProposal
+
+
+class NoUTurnMCMC(AdaptiveMassMatrixMCMC):
+    r"""
+    Implements the No-U-Turn Sampler (NUTS) with dual averaging, as described
+    in Algorithm 6 in [1]_.
+
+    Like :class:`HamiltonianMCMC`, NUTS uses leapfrog integration of
+    Hamilton's equations to propose new points, but instead of a fixed number
+    of leapfrog steps it builds a trajectory by repeatedly doubling its length
+    (forwards or backwards in time, chosen at random), until the trajectory
+    starts to turn back on itself, i.e. until
+
+    .. math::
+        (q^+ - q^-) \cdot M^{-1} p^- < 0 \quad \text{or} \quad
+        (q^+ - q^-) \cdot M^{-1} p^+ < 0,
+
+    for the end points ``(q^-, p^-)`` and ``(q^+, p^+)`` of any subtree of
+    the trajectory. The next sample is chosen from the points along the
+    trajectory, so that detailed balance is preserved.
+
+    The leapfrog step size ``epsilon`` is tuned using dual averaging while
+    the sampler is in its initial phase (see
+    :meth:`MCMCController.set_initial_phase_iterations()`), so that the mean
+    acceptance statistic of the points in each trajectory approaches the
+    target set with :meth:`set_target_acceptance_rate()`. After the initial
+    phase, the step size is fixed to its (dual) average. If no step size is
+    set, a starting value is found using the heuristic in Algorithm 4 of
+    [1]_.
+
+    The inverse mass matrix ``M^-1`` is initially a diagonal matrix with the
+    diagonal of ``sigma0``, and is adapted during the initial phase (see
+    :meth:`set_mass_matrix_adaptation()`). Each time it is updated, dual
+    averaging is restarted from a new heuristic step size. As in
+    :class:`HamiltonianMCMC`, ``M^-1`` is applied by performing the leapfrog
+    steps in coordinates transformed by a factor ``T`` with
+    ``T T^T = M^-1``.
+
+    Each iteration is performed as a state machine, which asks for one
+    leapfrog position at a time. All of its state is stored in plain
+    attributes, so that a sampler can be pickled (e.g. when checkpointing, see
+    :meth:`MCMCController.set_checkpoint_filename()`) in the middle of a
+    trajectory.
+
+    The tree depth of each iteration (where ``2**depth - 1`` is the number of
+    gradient evaluations used) and the number of divergent iterations (in
+    which the change in the Hamiltonian exceeded the
+    :meth:`hamiltonian_threshold()`) are logged.
+
+    Extends :class:`SingleChainMCMC`.
+
+    References
+    ----------
+    .. [1] "The No-U-Turn Sampler: Adaptively Setting Path Lengths in
+           Hamiltonian Monte Carlo". Matthew D. Hoffman and Andrew Gelman,
+           2014, Journal of Machine Learning Research.
+    """
+    def __init__(self, x0, sigma0=None):
+        super(NoUTurnMCMC, self).__init__(x0, sigma0)
+
+        # Set initial state
+        self._running = False
+        self._ready_for_tell = False
+
+        # Current point in the Markov chain
+        self._current = None
+        self._current_log_pdf = None
+        self._current_gradient = None
+
+        # Stage of the current iteration (None, 'epsilon' while searching for
+        # a step size, or 'trajectory' while building the trajectory), and its
+        # last proposal
+        self._stage = None
+        self._proposed = None
+
+        # State of the step size search: the initial momentum, trial step size,
+        # direction of change, and number of steps
+        self._r0 = None
+        self._epsilon_trial = None
+        self._epsilon_direction = None
+        self._epsilon_steps = 0
+
+        # State of the trajectory: the step size, the Hamiltonian at the start
+        # and the slice variable, the end points as (position, momentum,
+        # gradient) tuples, the current sample as a (position, log pdf,
+        # gradient) tuple, the number of valid points, the depth, and the
+        # statistics of the trajectory
+        self._step_size = None
+        self._h0 = None
+        self._log_u = None
+        self._minus = self._plus = None
+        self._sample = None
+        self._n_valid = 0
+        self._tree_depth = 0
+        self._alpha = 0
+        self._n_alpha = 0
+        self._diverged = False
+
+        # State of the subtree being built: its direction, the stack of
+        # completed subtrees, the number of leaves, and the leapfrog position,
+        # momentum, and gradient
+        self._direction = None
+        self._stack = None
+        self._n_leaves = 0
+        self._theta = self._r = self._gradient = None
+
+        # Initial inverse mass matrix, and distribution to sample
+        # (transformed) momentum from
+        self._mass_matrix.set_factor(np.sqrt(np.diag(self._sigma0)))
+        self._momentum_distribution = GaussianProposal(
+            np.ones(self._n_parameters))
+
+        # Iterations, acceptance monitoring, and tree depth
+        self._mcmc_iteration = 0
+        self._mcmc_acceptance = 0
+        self._depth = 0
+
+        # Maximum tree depth
+        self._max_depth = 10
+
+        # Leapfrog step size, and whether to (re)initialise it using a
+        # heuristic on the next iteration
+        self._epsilon = None
+        self._find_epsilon = True
+
+        # Dual averaging settings and state
+        self._target_acceptance = None
+        self.set_target_acceptance_rate()
+        self._gamma = 0.05
+        self._kappa = 0.75
+        self._t0 = 10
+        self._reset_dual_averaging()
+
+        # Divergence checking
+        self._divergent = np.asarray([], dtype='int')
+        self._hamiltonian_threshold = 10**3
+
+    def _adapt_step_size(self, accept_stat):
+        """
+        Performs a single dual averaging step (see eq. 6 in [1]), updating the
+        step size using the mean acceptance statistic of the last trajectory.
+        """
+        if self._mu is None:
+            self._mu = np.log(10 * self._epsilon)
+        self._adaptations += 1
+        m = self._adaptations
+        w = 1 / (m + self._t0)
+        self._h_bar = (1 - w) * self._h_bar + w * (
+            self._target_acceptance - accept_stat)
+        log_epsilon = self._mu - np.sqrt(m) / self._gamma * self._h_bar
+        w = m ** -self._kappa
+        self._log_epsilon_bar = w * log_epsilon + (1 - w) * (
+            self._log_epsilon_bar)
+        self._epsilon = np.exp(log_epsilon)
+
+    def ask(self):
+        """ See :meth:`SingleChainMCMC.ask()`. """
+        # Check ask/tell pattern
+        if self._ready_for_tell:
+            raise RuntimeError('Ask() called when expecting call to tell().')
+
+        # Initialise on first call
+        if not self._running:
+            self._running = True
+
+        # Very first iteration
+        if self._current is None:
+
+            # Ask for the pdf and gradient of x0
+            self._ready_for_tell = True
+            return np.array(self._x0, copy=True)
+
+        # Start a new iteration
+        if self._proposed is None:
+            if self._find_epsilon:
+                self._proposed = self._start_epsilon_search()
+            else:
+                self._proposed = self._start_trajectory()
+
+        # Ask for the pdf and gradient of the next leapfrog position
+        self._ready_for_tell = True
+        return np.array(self._proposed, copy=True)
+
+    def _continue_epsilon_search(self, fx, gradient):
+        """
+        Continues the search for a reasonable step size, given the log pdf and
+        gradient of the last leapfrog position, and returns the next point to
+        evaluate.
+
+        Starting from the current step size (or 1 if not set), the step size
+        is doubled or halved until the acceptance probability of a single
+        leapfrog step crosses 0.5 (see Algorithm 4 in [1]). Once found, a
+        trajectory is started.
+        """
+        epsilon = self._epsilon_trial
+        r = self._r + 0.5 * epsilon * self._mass_matrix.dot_transpose(gradient)
+        log_ratio = self._h0 - self._hamiltonian(fx, r)
+
+        # Choose direction on first step, then double or halve the step size
+        # until the acceptance probability crosses 0.5
+        a = self._epsilon_direction
+        done = False
+        if a is None:
+            a = self._epsilon_direction = 1 if log_ratio > np.log(0.5) else -1
+        elif a * log_ratio <= -a * np.log(2):
+            done = True
+        if not done:
+            self._epsilon_trial *= 2.0**a
+            self._epsilon_steps += 1
+            done = self._epsilon_steps == 100
+        if not done:
+            return self._epsilon_leapfrog()
+
+        self._epsilon = self._epsilon_trial
+        self._find_epsilon = False
+        return self._start_trajectory()
+
+    def _continue_trajectory(self, fx, gradient):
+        """
+        Completes the current leapfrog step, given the log pdf and gradient of
+        its position, adds it to the trajectory, and returns the next point to
+        evaluate (or ``None`` if the iteration has finished).
+
+        The trajectory is built iteratively rather than recursively: each
+        subtree is built leaf by leaf, maintaining a stack of completed
+        subtrees that are merged as soon as two of them have equal size.
+        """
+        v = self._direction
+        self._gradient = gradient
+        self._r = self._r + 0.5 * v * self._step_size * (
+            self._mass_matrix.dot_transpose(gradient))
+        theta, r = self._theta, self._r
+        h = self._hamiltonian(fx, r)
+
+        # Update acceptance statistic
+        self._alpha += min(1, np.exp(self._h0 - h))
+        self._n_alpha += 1
+
+        # Check for divergence
+        if -h <= self._log_u - self._hamiltonian_threshold:
+            self._diverged = True
+            return self._end_subtree(False)
+
+        # Add leaf, and merge subtrees of equal size. Each subtree on the
+        # stack is stored as [size, first, last, sample, n], where first and
+        # last are (position, momentum) tuples.
+        stack = self._stack
+        edge = (theta, r)
+        stack.append(
+            [1, edge, edge, (theta, fx, gradient), int(self._log_u <= -h)])
+        while len(stack) > 1 and stack[-1][0] == stack[-2][0]:
+            outer = stack.pop()
+            inner = stack.pop()
+            n_subtree = inner[4] + outer[4]
+            if n_subtree > 0 and (
+                    np.random.uniform(0, 1) < outer[4] / n_subtree):
+                inner[3] = outer[3]
+            if self._u_turn(v, inner[1], outer[2]):
+                return self._end_subtree(False)
+            stack.append([
+                inner[0] + outer[0], inner[1], outer[2], inner[3], n_subtree])
+
+        # Continue the subtree until it has 2**depth leaves
+        self._n_leaves += 1
+        if self._n_leaves < 2**self._tree_depth:
+            return self._leapfrog()
+        return self._end_subtree(True)
+
+    def current_log_pdf(self):
+        """ See :meth:`SingleChainMCMC.current_log_pdf()`. """
+        return self._current_log_pdf
+
+    def divergent_iterations(self):
+        """
+        Returns the iteration number of any divergent iterations.
+        """
+        return self._divergent
+
+    def _end_subtree(self, ok):
+        """
+        Adds the completed subtree to the trajectory if ``ok`` is ``True``
+        (i.e. if it did not diverge or make a U-turn), and then either starts
+        a new subtree and returns the first point to evaluate, or finishes the
+        iteration and returns ``None``.
+        """
+        s = False
+        if ok:
+            size, first, last, subtree_sample, n_subtree = self._stack[0]
+            if np.random.uniform(0, 1) < n_subtree / self._n_valid:
+                self._sample = subtree_sample
+            self._n_valid += n_subtree
+            if self._direction == 1:
+                self._plus = (self._theta, self._r, self._gradient)
+            else:
+                self._minus = (self._theta, self._r, self._gradient)
+            s = not self._u_turn(1, self._minus[:2], self._plus[:2])
+        self._tree_depth += 1
+        self._stack = None
+
+        if s and self._tree_depth < self._max_depth:
+            return self._start_subtree()
+        self._finish_iteration()
+        return None
+
+    def _epsilon_leapfrog(self):
+        """
+        Performs the first half of a single leapfrog step from the current
+        point, using the trial step size, and returns the new position.
+        """
+        epsilon = self._epsilon_trial
+        metric = self._mass_matrix
+        self._r = self._r0 + 0.5 * epsilon * metric.dot_transpose(
+            self._current_gradient)
+        return self._current + epsilon * metric.dot(self._r)
+
+    def _finish_iteration(self):
+        """
+        Stores the sample chosen from the trajectory as the current point,
+        updates the statistics, and performs adaptation.
+        """
+        self._current, self._current_log_pdf, self._current_gradient = (
+            self._sample)
+        self._current.setflags(write=False)
+
+        # Update statistics
+        self._depth = self._tree_depth
+        accept_stat = self._alpha / self._n_alpha
+        self._mcmc_acceptance = (
+            (self._mcmc_iteration * self._mcmc_acceptance + accept_stat) /
+            (self._mcmc_iteration + 1))
+        if self._diverged:
+            self._divergent = np.append(self._divergent, self._mcmc_iteration)
+        self._mcmc_iteration += 1
+
+        # Clear trajectory
+        self._stage = None
+        self._minus = self._plus = self._sample = None
+        self._theta = self._r = self._gradient = None
+
+        # Adapt step size and inverse mass matrix. After each update of the
+        # inverse mass matrix, the step size is re-initialised and dual
+        # averaging is restarted.
+        if self._initial_phase:
+            self._adapt_step_size(accept_stat)
+            if self._adapt_mass_matrix(self._current):
+                self._find_epsilon = True
+                self._reset_dual_averaging()
+
+    def _hamiltonian(self, fx, r):
+        """
+        Returns the Hamiltonian for a point with log pdf ``fx`` and momentum
+        ``r``, or ``inf`` if either is not finite.
+        """
+        h = self._kinetic_energy(r) - fx
+        return h if np.isfinite(h) else np.inf
+
+    def hamiltonian_threshold(self):
+        """
+        Returns threshold difference in Hamiltonian value from the start of
+        an iteration to any point in its trajectory which determines whether
+        an iteration is divergent.
+        """
+        return self._hamiltonian_threshold
+
+    def _kinetic_energy(self, r):
+        """
+        Returns the kinetic energy for (transformed) momentum ``r``.
+        """
+        return 0.5 * np.dot(r, r)
+
+    def leapfrog_step_size(self):
+        """
+        Returns the current step size for the leapfrog algorithm, or ``None``
+        if no step size has been set or determined yet.
+        """
+        return self._epsilon
+
+    def _leapfrog(self):
+        """
+        Performs the first half of a leapfrog step along the current subtree,
+        and returns the new position.
+        """
+        v = self._direction * self._step_size
+        metric = self._mass_matrix
+        self._r = self._r + 0.5 * v * metric.dot_transpose(self._gradient)
+        self._theta = self._theta + v * metric.dot(self._r)
+        return self._theta
+
+    def _log_init(self, logger):
+        """ See :meth:`Loggable._log_init()`. """
+        logger.add_float('Accept.')
+        logger.add_int('Depth', width=5)
+        logger.add_int('Div.', width=5)
+
+    def _log_write(self, logger):
+        """ See :meth:`Loggable._log_write()`. """
+        logger.log(self._mcmc_acceptance)
+        logger.log(self._depth)
+        logger.log(len(self._divergent))
+
+    def max_tree_depth(self):
+        """
+        Returns the maximum tree depth, which limits the number of gradient
+        evaluations per iteration to ``2**max_tree_depth - 1``.
+        """
+        return self._max_depth
+
+    def n_hyper_parameters(self):
+        """ See :meth:`TunableMethod.n_hyper_parameters()`. """
+        return 1
+
+    def name(self):
+        """ See :meth:`pints.MCMCSampler.name()`. """
+        return 'No-U-Turn MCMC'
+
+    def needs_sensitivities(self):
+        """ See :meth:`pints.MCMCSampler.needs_sensitivities()`. """
+        return True
+
+    def _reset_dual_averaging(self):
+        """
+        Resets the state of the dual averaging step size adaptation.
+        """
+        self._adaptations = 0
+        self._mu = None
+        self._h_bar = 0
+        self._log_epsilon_bar = 0
+
+    def set_hamiltonian_threshold(self, hamiltonian_threshold):
+        """
+        Sets threshold difference in Hamiltonian value from the start of an
+        iteration to any point in its trajectory which determines whether an
+        iteration is divergent.
+        """
+        if hamiltonian_threshold < 0:
+            raise ValueError('Threshold for divergent iterations must be ' +
+                             'non-negative.')
+        self._hamiltonian_threshold = hamiltonian_threshold
+
+    def set_hyper_parameters(self, x):
+        """
+        The hyper-parameter vector is ``[target_acceptance_rate]``.
+
+        See :meth:`TunableMethod.set_hyper_parameters()`.
+        """
+        self.set_target_acceptance_rate(x[0])
+
+    def set_initial_phase(self, initial_phase):
+        """
+        See :meth:`pints.MCMCSampler.set_initial_phase()`.
+
+        During the initial phase, the step size is adapted using dual
+        averaging, and the inverse mass matrix is adapted (see
+        :meth:`set_mass_matrix_adaptation()`). At the end of the initial
+        phase, the step size is fixed to its dual average.
+        """
+        initial_phase = bool(initial_phase)
+        if self._initial_phase and not initial_phase:
+            if self._adaptations > 0:
+                self._epsilon = np.exp(self._log_epsilon_bar)
+        super(NoUTurnMCMC, self).set_initial_phase(initial_phase)
+
+    def set_leapfrog_step_size(self, step_size):
+        """
+        Sets the (initial) step size for the leapfrog algorithm. If set to
+        ``None``, a step size is chosen heuristically on the first iteration.
+        """
+        if step_size is not None:
+            step_size = float(step_size)
+            if step_size <= 0:
+                raise ValueError(
+                    'Step size for leapfrog algorithm must be greater than'
+                    ' zero.')
+        self._epsilon = step_size
+        self._find_epsilon = step_size is None
+        self._reset_dual_averaging()
+
+    def set_max_tree_depth(self, depth):
+        """
+        Sets the maximum tree depth, which limits the number of gradient
+        evaluations per iteration to ``2**depth - 1``.
+        """
+        depth = int(depth)
+        if depth < 1:
+            raise ValueError('Maximum tree depth must be at least 1.')
+        self._max_depth = depth
+
+    def set_target_acceptance_rate(self, rate=0.8):
+        """
+        Sets the target mean acceptance statistic used when adapting the step
+        size.
+        """
+        rate = float(rate)
+        if rate <= 0:
+            raise ValueError('Target acceptance rate must be greater than 0.')
+        elif rate >= 1:
+            raise ValueError('Target acceptance rate must be less than 1.')
+        self._target_acceptance = rate
+
+    def _start_epsilon_search(self):
+        """
+        Starts the search for a reasonable step size, and returns the first
+        point to evaluate.
+        """
+        self._stage = 'epsilon'
+        self._r0 = self._momentum_distribution.standard_normal()
+        self._h0 = self._kinetic_energy(self._r0) - self._current_log_pdf
+        self._epsilon_trial = 1 if self._epsilon is None else self._epsilon
+        self._epsilon_direction = None
+        self._epsilon_steps = 0
+        return self._epsilon_leapfrog()
+
+    def _start_subtree(self):
+        """
+        Starts a new subtree with ``2**depth`` leaves, in a random direction,
+        and returns the first point to evaluate.
+        """
+        self._direction = 1 if np.random.uniform(0, 1) < 0.5 else -1
+        self._theta, self._r, self._gradient = (
+            self._plus if self._direction == 1 else self._minus)
+        self._stack = []
+        self._n_leaves = 0
+        return self._leapfrog()
+
+    def _start_trajectory(self):
+        """
+        Samples a momentum and slice variable, starts a new trajectory from the
+        current point, and returns the first point to evaluate.
+        """
+        self._stage = 'trajectory'
+        self._step_size = self._epsilon
+        r0 = self._momentum_distribution.standard_normal()
+        self._h0 = self._kinetic_energy(r0) - self._current_log_pdf
+        self._log_u = -self._h0 + np.log(np.random.uniform(0, 1))
+
+        self._minus = self._plus = (self._current, r0, self._current_gradient)
+        self._sample = (
+            self._current, self._current_log_pdf, self._current_gradient)
+        self._n_valid = 1
+        self._tree_depth = 0
+        self._alpha = 0
+        self._n_alpha = 0
+        self._diverged = False
+        return self._start_subtree()
+
+    def target_acceptance_rate(self):
+        """
+        Returns the target mean acceptance statistic used when adapting the
+        step size.
+        """
+        return self._target_acceptance
+
+    def tell(self, reply):
+        """ See :meth:`pints.SingleChainMCMC.tell()`. """
+        if not self._ready_for_tell:
+            raise RuntimeError('Tell called before proposal was set.')
+        self._ready_for_tell = False
+
+        # Unpack reply
+        fx, gradient = reply
+
+        # Check reply, copy gradient
+        fx = float(fx)
+        gradient = pints.vector(gradient)
+        assert(gradient.shape == (self._n_parameters, ))
+
+        # Very first call
+        if self._current is None:
+
+            # Check first point is somewhere sensible
+            if not np.isfinite(fx):
+                raise ValueError(
+                    'Initial point for MCMC must have finite logpdf.')
+
+            # Set current sample, log pdf, and gradient
+            self._current = self._x0
+            self._current_log_pdf = fx
+            self._current_gradient = gradient
+
+            # Mark current as read-only, so it can be safely returned
+            self._current.setflags(write=False)
+
+            # Return first point in chain
+            return self._current
+
+        # Continue the current iteration
+        if self._stage == 'epsilon':
+            self._proposed = self._continue_epsilon_search(fx, gradient)
+        else:
+            self._proposed = self._continue_trajectory(fx, gradient)
+
+        # Iteration finished: return the new sample
+        if self._proposed is None:
+            return self._current
+
+        # Return None to indicate there is no new sample for the chain
+        return None
+
+    def _u_turn(self, v, first, last):
+        """
+        Returns ``True`` if the trajectory between the ``(position,
+        momentum)`` tuples ``first`` and ``last``, built in direction ``v``,
+        has started to turn back on itself.
+        """
+        delta = v * (last[0] - first[0])
+        return (np.dot(delta, self._mass_matrix.dot(first[1])) < 0
+                or np.dot(delta, self._mass_matrix.dot(last[1])) < 0)
@@ -0,0 +1,378 @@
+#
+# Parallel tempering MCMC
+#
+# This file is part of PINTS.
+#  Copyright (c) 2017-2019, University of Oxford.
+#  For licensing information, see the LICENSE file distributed with the PINTS
+#  software package.
+#
+from __future__ import absolute_import, division
+from __future__ import print_function, unicode_literals
+import pints
+import numpy as np
+
+
+class ParallelTemperingMCMC(pints.MultiChainMCMC):
+    """
+    Creates chains of samples from a target distribution and from a ladder of
+    tempered versions of it, using parallel tempering [1]_.
+
+    Like :class:`PopulationMCMC`, each chain ``i`` samples from a tempered
+    distribution ``p_i = p(theta|data) ^ (1 - T_i)``, where ``T_i`` is a
+    tempering parameter in ``[0, 1)``, and ``T_0 = 0``. Unlike
+    :class:`PopulationMCMC`, every chain is updated at every iteration, so
+    that the proposals for all temperatures can be evaluated in parallel.
+
+    Each iteration consists of the following steps:
+
+    1. Mutation: each chain ``i`` proposes a new point, using a Markov kernel
+    that admits ``p_i`` as its invariant distribution (an
+    :class:`HaarioBardenetACMC`). All proposals are evaluated as a batch.
+
+    2. Exchange: pairs of chains at adjacent temperatures swap their current
+    points with probability ``min(1, A)``, where
+
+    ``A = p_i(x_j) * p_j(x_i) / (p_i(x_i) * p_j(x_j))``
+
+    with ``j = i + 1``. To allow all swaps to be performed at once, the pairs
+    ``(0, 1), (2, 3), ...`` are considered at even iterations, and the pairs
+    ``(1, 2), (3, 4), ...`` at odd iterations [2]_.
+
+    During the initial phase, the temperature schedule can be adapted so that
+    the swap acceptance rates of all pairs of chains become equal, using the
+    method described in [3]_: the temperatures ``1 / (1 - T_i)`` of the first
+    and last chains are kept fixed, while the gaps between the logarithms of
+    adjacent temperatures are grown or shrunk (multiplicatively) towards equal
+    swap acceptance rates, at a rate that decays over time. The schedule is
+    kept fixed after the initial phase.
+
+    The number of chains equals the number of temperatures. The samples from
+    the target distribution are stored in chain 0, while the other chains
+    contain samples from the tempered distributions.
+
+    Extends :class:`MultiChainMCMC`.
+
+    References
+    ----------
+    .. [1] "Parallel tempering: Theory, applications, and new perspectives",
+           David J. Earl and Michael W. Deem,
+           Physical Chemistry Chemical Physics, 2005.
+           https://doi.org/10.1039/B509983H
+
+    .. [2] "Non-reversible parallel tempering: a scalable highly parallel MCMC
+           scheme", Saifuddin Syed, Alexandre Bouchard-Cote, George
+           Deligiannidis and Arnaud Doucet, arXiv, 2019.
+           https://arxiv.org/abs/1905.02939
+
+    .. [3] "Dynamic temperature selection for parallel tempering in Markov
+           chain Monte Carlo simulations", W. D. Vousden, W. M. Farr and
+           I. Mandel, Monthly Notices of the Royal Astronomical Society, 2016.
+           https://doi.org/10.1093/mnras/stv2422
+    """
+
+    def __init__(self, chains, x0, sigma0=None):
+        super(ParallelTemperingMCMC, self).__init__(chains, x0, sigma0)
+
+        # Check number of chains
+        if self._chains < 2:
+            raise ValueError(
+                'Parallel tempering requires at least two chains.')
+
+        # Set initial state
+        self._running = False
+
+        # Current points, and the log pdfs of those points (_not_ the tempered
+        # versions!)
+        self._current = None
+        self._current_log_pdfs = None
+
+        # Proposed points
+        self._proposed = None
+
+        # Inner samplers, one per temperature
+        self._samplers = None
+
+        #
+        # Default settings
+        #
+        self._method = pints.HaarioBardenetACMC
+        self._in_initial_phase = True
+
+        # Temperature schedule
+        self._schedule = None
+        self.set_temperature_schedule()
+
+        # Schedule adaptation, and its decay: the adaptation rate at iteration
+        # t is proportional to lag / (t + lag)
+        self._adaptive_schedule = True
+        self._adaptation_rate = 0.3
+        self._adaptation_lag = 100
+
+        # Swap acceptance rate monitoring
+        self._iterations = 0
+        self._swaps_attempted = np.zeros(self._chains - 1)
+        self._swaps_accepted = np.zeros(self._chains - 1)
+
+    def _adapt_schedule(self, log_ratios):
+        """
+        Adapts the temperature schedule, given the log acceptance ratios of
+        swaps between all pairs of adjacent chains.
+        """
+        # Swap acceptance probabilities (with non-finite ratios rejected)
+        with np.errstate(over='ignore'):
+            a = np.minimum(1, np.exp(log_ratios))
+        a[~np.isfinite(log_ratios)] = 0
+
+        # Update the gaps between the logs of the temperatures, increasing gaps
+        # with a higher than average acceptance rate
+        log_temperatures = -np.log(1 - self._schedule)
+        gaps = np.diff(log_temperatures)
+        rate = self._adaptation_rate * self._adaptation_lag / (
+            self._iterations + self._adaptation_lag)
+        gaps = np.exp(np.log(gaps) + rate * (a - np.mean(a)))
+
+        # Rescale so that the first and last temperatures are unchanged
+        gaps *= log_temperatures[-1] / np.sum(gaps)
+        schedule = 1 - np.exp(-np.concatenate(([0], np.cumsum(gaps))))
+        schedule[0] = 0
+        self._schedule = schedule
+        self._schedule.setflags(write=False)
+
+        # Update the tempered log pdfs of the inner samplers
+        for i, sampler in enumerate(self._samplers):
+            sampler.replace(
+                self._current[i], self._tempered(i, self._current_log_pdfs[i]))
+
+    def adaptive_temperature_schedule(self):
+        """
+        Returns ``True`` if the temperature schedule is adapted during the
+        initial phase.
+        """
+        return self._adaptive_schedule
+
+    def ask(self):
+        """ See :meth:`pints.MultiChainMCMC.ask()`. """
+        # Initialise on first call
+        if not self._running:
+            self._initialise()
+
+        # Propose new points
+        if self._proposed is None:
+            self._proposed = np.array([s.ask() for s in self._samplers])
+            self._proposed.setflags(write=False)
+
+        # Return proposed points
+        return self._proposed
+
+    def current_log_pdfs(self):
+        """ See :meth:`MultiChainMCMC.current_log_pdfs()`. """
+        return self._current_log_pdfs
+
+    def in_initial_phase(self):
+        """ See :meth:`pints.MCMCSampler.in_initial_phase()`. """
+        return self._in_initial_phase
+
+    def _initialise(self):
+        """
+        Initialises the routine before the first iteration.
+        """
+        if self._running:
+            raise RuntimeError('Already initialised.')
+
+        # Create inner samplers
+        self._samplers = [
+            self._method(x, self._sigma0) for x in self._x0]
+        for sampler in self._samplers:
+            sampler.set_initial_phase(self._in_initial_phase)
+
+        # Propose initial points
+        self._current = None
+        self._current_log_pdfs = None
+        self._proposed = self._x0
+
+        # Ask all inner samplers for their first point (should be x0, so
+        # ignore!)
+        for sampler in self._samplers:
+            sampler.ask()
+
+        # Update sampler state
+        self._running = True
+
+    def _log_init(self, logger):
+        """ See :meth:`Loggable._log_init()`. """
+        logger.add_float('Swap')
+
+    def _log_write(self, logger):
+        """ See :meth:`Loggable._log_write()`. """
+        logger.log(np.mean(self.swap_acceptance_rates()))
+
+    def name(self):
+        """ See :meth:`pints.MCMCSampler.name()`. """
+        return 'Parallel tempering MCMC'
+
+    def needs_initial_phase(self):
+        """ See :meth:`pints.MCMCSampler.needs_initial_phase()`. """
+        return True
+
+    def set_adaptive_temperature_schedule(self, enabled=True):
+        """
+        Enables or disables adaptation of the temperature schedule during the
+        initial phase.
+        """
+        self._adaptive_schedule = bool(enabled)
+
+    def set_initial_phase(self, phase):
+        """
+        See :meth:`pints.MCMCSampler.set_initial_phase()`.
+
+        Ending the initial phase also resets the measured swap acceptance
+        rates, so that they reflect the final temperature schedule.
+        """
+        phase = bool(phase)
+        if self._in_initial_phase and not phase:
+            self._swaps_attempted[:] = 0
+            self._swaps_accepted[:] = 0
+        self._in_initial_phase = phase
+        if self._running:
+            for sampler in self._samplers:
+                sampler.set_initial_phase(self._in_initial_phase)
+
+    def set_temperature_schedule(self, schedule=None):
+        """
+        Sets the temperature schedule, as a sequence containing a tempering
+        parameter ``T_i`` for each chain.
+
+        The first temperature must be 0, and the temperatures must be strictly
+        increasing and less than 1. If no schedule is given, a schedule is
+        used in which ``1 - T_i`` decreases geometrically from 1 to 0.05.
+        """
+        if self._running:
+            raise RuntimeError(
+                'Temperature schedule cannot be changed during run.')
+
+        if schedule is None:
+            # Set default schedule
+            schedule = 1 - 0.05**np.linspace(0, 1, self._chains)
+        else:
+            # Set to custom schedule
+            schedule = pints.vector(schedule)
+            if len(schedule) != self._chains:
+                raise ValueError(
+                    'A schedule must contain a temperature for each chain.')
+            if schedule[0] != 0:
+                raise ValueError(
+                    'First element of temperature schedule must be 0.')
+            if np.any(np.diff(schedule) <= 0):
+                raise ValueError('Temperatures must be strictly increasing.')
+            if schedule[-1] >= 1:
+                raise ValueError('Temperatures must be less than 1.')
+
+        # Store
+        self._schedule = np.array(schedule, copy=True)
+        self._schedule.setflags(write=False)
+
+    def swap_acceptance_rates(self):
+        """
+        Returns the measured acceptance rates of swaps between each pair of
+        chains at adjacent temperatures.
+        """
+        return self._swaps_accepted / np.maximum(1, self._swaps_attempted)
+
+    def tell(self, fxs):
+        """ See :meth:`pints.MultiChainMCMC.tell()`. """
+        # Check if we had a proposal
+        if self._proposed is None:
+            raise RuntimeError('Tell called before proposal was set.')
+
+        # Ensure fxs is an array of floats
+        fxs = np.array(fxs, dtype=float, copy=True)
+        if fxs.shape != (self._chains, ):
+            raise ValueError(
+                'Expecting ' + str(self._chains) + ' log pdf values.')
+
+        # First points?
+        if self._current is None:
+            if not np.all(np.isfinite(fxs)):
+                raise ValueError(
+                    'Initial points for MCMC must have finite logpdf.')
+
+            # Pass to inner samplers (ignore returned x0)
+            for i, sampler in enumerate(self._samplers):
+                sampler.tell(self._tempered(i, fxs[i]))
+
+            # Always accept
+            self._current = np.array(self._x0, copy=True)
+            self._current_log_pdfs = fxs
+
+            # Clear proposal
+            self._proposed = None
+
+            # Return first points
+            return self._return_current()
+
+        # Perform mutation step (update all chains)
+        current = np.array(self._current, copy=True)
+        f = np.array(self._current_log_pdfs, copy=True)
+        for i, sampler in enumerate(self._samplers):
+            sample = sampler.tell(self._tempered(i, fxs[i]))
+            if np.all(sample == self._proposed[i]):
+                current[i] = sample
+                f[i] = fxs[i]
+        self._current = current
+        self._current_log_pdfs = f
+
+        # Clear proposal
+        self._proposed = None
+
+        # Calculate log acceptance ratios for swaps between adjacent chains
+        with np.errstate(invalid='ignore'):
+            log_ratios = np.diff(self._schedule) * np.diff(f)
+
+        # Adapt temperature schedule
+        self._iterations += 1
+        if self._in_initial_phase and self._adaptive_schedule:
+            self._adapt_schedule(log_ratios)
+            with np.errstate(invalid='ignore'):
+                log_ratios = np.diff(self._schedule) * np.diff(f)
+
+        # Perform exchange step, for every other pair of chains
+        pairs = np.arange(self._iterations % 2, self._chains - 1, 2)
+        u = np.log(np.random.uniform(0, 1, len(pairs)))
+        with np.errstate(invalid='ignore'):
+            accepted = np.isfinite(log_ratios[pairs]) & (
+                u < log_ratios[pairs])
+        self._swaps_attempted[pairs] += 1
+        self._swaps_accepted[pairs] += accepted
+
+        # Swap points, and update inner samplers
+        for i in pairs[accepted]:
+            j = i + 1
+            current[[i, j]] = current[[j, i]]
+            f[[i, j]] = f[[j, i]]
+            for k in (i, j):
+                self._samplers[k].replace(current[k], self._tempered(k, f[k]))
+
+        # Return current points
+        return self._return_current()
+
+    def _return_current(self):
+        """
+        Returns a read-only copy of the current points.
+        """
+        current = np.array(self._current, copy=True)
+        current.setflags(write=False)
+        return current
+
+    def _tempered(self, i, fx):
+        """
+        Returns the tempered log pdf ``fx * (1 - T_i)`` used by chain ``i``.
+        """
+        return fx * (1 - self._schedule[i])
+
+    def temperature_schedule(self):
+        """
+        Returns the temperature schedule used in the tempering algorithm. Each
+        temperature ``T`` pertains to particular chain whose stationary
+        distribution is ``p(theta|data) ^ (1 - T)``.
+        """
+        return self._schedule
@@ -21,7 +21,10 @@ class PopulationMCMC(pints.SingleChainMCMC):
 
     This method uses several chains internally, but only a single one is
     updated per iteration, and only a single one is returned at the end, hence
-    this method is classified here as a single chain MCMC method.
+    this method is classified here as a single chain MCMC method. For a
+    multi-chain method in which all tempered chains are updated (and
+    evaluated in parallel) at every iteration, see
+    :class:`ParallelTemperingMCMC`.
 
     The algorithm goes through the following steps (after initialising ``N``
     internal chains):
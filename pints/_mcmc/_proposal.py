@@ -0,0 +1,229 @@
+#
+# Gaussian proposal distribution with a cached factorisation
+#
+# This file is part of PINTS.
+#  Copyright (c) 2017-2019, University of Oxford.
+#  For licensing information, see the LICENSE file distributed with the PINTS
+#  software package.
+#
+from __future__ import absolute_import, division
+from __future__ import print_function, unicode_literals
+import numpy as np
+import scipy.linalg
+
+
+class GaussianProposal(object):
+    """
+    Draws samples from, and evaluates the log pdf of, a multivariate normal
+    distribution ``N(mean, scale * sigma)``, using a stored factorisation of
+    the covariance matrix ``sigma``.
+
+    Unlike ``np.random.multivariate_normal``, which factorises the covariance
+    matrix on every call, the Cholesky factor of ``sigma`` is computed once,
+    and only updated when ``sigma`` changes. Rank-one changes (as made by
+    adaptive covariance methods) can be applied with :meth:`update()`. Changes
+    to ``scale`` require no factorisation at all. Standard normal variates are
+    drawn from ``np.random`` in blocks of ``block_size`` vectors.
+
+    Parameters
+    ----------
+    sigma
+        A symmetric positive definite covariance matrix, or a vector of
+        variances to specify a diagonal covariance matrix.
+    block_size
+        The number of standard normal vectors to draw at a time. If not set,
+        a size is chosen based on the number of dimensions.
+    """
+
+    # Dimension above which rank-one updates of the Cholesky factor are faster
+    # than a full (LAPACK) factorisation
+    _RANK_ONE_THRESHOLD = 400
+
+    def __init__(self, sigma, block_size=None):
+        sigma = np.array(sigma, copy=True, dtype=float)
+        if sigma.ndim not in (1, 2):
+            raise ValueError(
+                'Covariance must be given as a matrix or a vector.')
+        self._n = len(sigma)
+
+        if block_size is None:
+            block_size = max(10, 2**14 // self._n)
+        block_size = int(block_size)
+        if block_size < 1:
+            raise ValueError('Block size must be at least 1.')
+        self._block_size = block_size
+        self._block = None
+        self._index = block_size
+
+        self.set_covariance(sigma)
+
+    def covariance(self):
+        """
+        Returns the covariance matrix ``sigma``.
+        """
+        if self._diagonal:
+            return np.diag(self._sigma)
+        return self._sigma
+
+    def _factorise(self):
+        """
+        Factorises the full covariance matrix ``sigma`` as ``U.T * U``, using
+        a Cholesky factorisation if possible, or an eigendecomposition if not.
+        """
+        try:
+            self._u = np.ascontiguousarray(
+                np.linalg.cholesky(self._sigma).T)
+            self._triangular = True
+        except np.linalg.LinAlgError:
+            # Not (numerically) positive definite: use clipped eigenvalues
+            w, v = np.linalg.eigh(self._sigma)
+            w = np.maximum(w, np.finfo(float).eps * max(np.max(w), 1))
+            self._u = np.sqrt(w).reshape(-1, 1) * v.T
+            self._triangular = False
+
+        # Log of the determinant of sigma
+        if self._triangular:
+            self._log_det = 2 * np.sum(np.log(np.abs(np.diag(self._u))))
+        else:
+            self._log_det = np.sum(np.log(w))
+
+    def factor(self):
+        """
+        Returns a matrix ``L`` such that ``L * L.T = sigma``. If ``sigma`` is
+        positive definite, this is its lower triangular Cholesky factor.
+        """
+        if self._diagonal:
+            return np.diag(self._u)
+        return self._u.T
+
+    def log_pdf(self, x, mean, scale=1):
+        """
+        Returns the log pdf of ``N(mean, scale * sigma)`` at ``x``.
+        """
+        d = np.asarray(x) - mean
+        if self._diagonal:
+            y = d / self._u
+        elif self._triangular:
+            y = scipy.linalg.solve_triangular(
+                self._u, d, trans='T', check_finite=False)
+        else:
+            y = np.linalg.solve(self._u.T, d)
+        return -0.5 * (
+            np.dot(y, y) / scale + self._log_det
+            + self._n * np.log(2 * np.pi * scale))
+
+    def n_parameters(self):
+        """
+        Returns the dimension of this distribution.
+        """
+        return self._n
+
+    def _next_block(self):
+        """
+        Draws a new block of standard normal variates.
+        """
+        self._block = np.random.standard_normal((self._block_size, self._n))
+        self._index = 0
+
+    def sample(self, mean, scale=1):
+        """
+        Draws and returns a sample from ``N(mean, scale * sigma)``.
+
+        If ``mean`` is a 2d array, a sample is drawn for each row, and
+        ``scale`` can be given as a scalar or as a vector with an entry for
+        each row.
+        """
+        mean = np.asarray(mean)
+        if mean.ndim == 2:
+            z = self.standard_normal(len(mean))
+            scale = np.reshape(scale, (-1, 1))
+        else:
+            z = self.standard_normal()
+        if self._diagonal:
+            z *= self._u
+        else:
+            z = np.dot(z, self._u)
+        if np.any(scale != 1):
+            z *= np.sqrt(scale)
+        return mean + z
+
+    def set_covariance(self, sigma):
+        """
+        Changes the covariance matrix ``sigma`` (given as a matrix, or as a
+        vector of variances), and recalculates its factorisation.
+        """
+        sigma = np.array(sigma, copy=True, dtype=float)
+        if sigma.shape not in ((self._n, ), (self._n, self._n)):
+            raise ValueError(
+                'Covariance must have shape (' + str(self._n) + ', ) or ('
+                + str(self._n) + ', ' + str(self._n) + ').')
+        self._sigma = sigma
+        self._diagonal = sigma.ndim == 1
+        if self._diagonal:
+            if np.any(sigma <= 0):
+                raise ValueError('Variances must be positive.')
+            self._u = np.sqrt(sigma)
+            self._triangular = True
+            self._log_det = np.sum(np.log(sigma))
+        else:
+            self._factorise()
+
+    def standard_normal(self, n=None):
+        """
+        Returns a vector of independent standard normal variates, taken from
+        a pre-generated block. If ``n`` is set, an array of ``n`` such vectors
+        is returned instead.
+        """
+        if n is None:
+            if self._index == self._block_size:
+                self._next_block()
+            z = np.array(self._block[self._index])
+            self._index += 1
+            return z
+
+        z = np.empty((n, self._n))
+        i = 0
+        while i < n:
+            if self._index == self._block_size:
+                self._next_block()
+            k = min(n - i, self._block_size - self._index)
+            z[i:i + k] = self._block[self._index:self._index + k]
+            self._index += k
+            i += k
+        return z
+
+    def update(self, a, b, x):
+        """
+        Changes the covariance matrix to ``a * sigma + b * x * x.T``, where
+        ``a`` and ``b`` are positive scalars and ``x`` is a vector.
+
+        For large dimensions, the Cholesky factor is updated in ``O(n^2)``
+        operations, instead of being recalculated in ``O(n^3)`` operations.
+        """
+        x = np.asarray(x, dtype=float)
+        if self._diagonal:
+            self._sigma = np.diag(self._sigma)
+            self._diagonal = False
+            self._factorise()
+        self._sigma *= a
+        self._sigma += b * np.outer(x, x)
+
+        if self._n < self._RANK_ONE_THRESHOLD or not self._triangular:
+            self._factorise()
+            return
+
+        # Rank-one update of the upper triangular factor U, with
+        # a * U.T * U + b * x * x.T = U'.T * U'
+        u = self._u
+        u *= np.sqrt(a)
+        x = x * np.sqrt(b)
+        for k in range(self._n):
+            r = np.hypot(u[k, k], x[k])
+            c = r / u[k, k]
+            s = x[k] / u[k, k]
+            u[k, k] = r
+            u[k, k + 1:] += s * x[k + 1:]
+            u[k, k + 1:] /= c
+            x[k + 1:] *= c
+            x[k + 1:] -= s * u[k, k + 1:]
+        self._log_det = 2 * np.sum(np.log(np.abs(np.diag(u))))
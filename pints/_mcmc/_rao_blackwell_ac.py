@@ -72,14 +72,11 @@ class RaoBlackwellACMC(pints.AdaptiveCovarianceMC):
         """
         acceptance_prob = np.exp(log_ratio) if log_ratio < 0 else 1
         X_bar = acceptance_prob * self._Y + (1 - acceptance_prob) * self._X
-        dsigm = np.reshape(X_bar - self._mu, (self._n_parameters, 1))
-        self._sigma = ((1 - self._gamma) * self._sigma +
-                       self._gamma * np.dot(dsigm, dsigm.T))
+        self._update_sigma(X_bar - self._mu)
 
     def _generate_proposal(self):
         """ See :meth:`AdaptiveCovarianceMC._generate_proposal()`. """
-        return np.random.multivariate_normal(
-            self._current, self._lambda * self._sigma)
+        return self._proposal.sample(self._current, self._lambda)
 
     def name(self):
         """ See :meth:`pints.MCMCSampler.name()`. """
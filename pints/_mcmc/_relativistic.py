@@ -11,8 +11,11 @@ from __future__ import print_function, unicode_literals
 import pints
 import numpy as np
 
+from ._mass_matrix import AdaptiveMassMatrixMCMC
+from ._proposal import GaussianProposal
 
-class RelativisticMCMC(pints.SingleChainMCMC):
+
+class RelativisticMCMC(AdaptiveMassMatrixMCMC):
     r"""
     Implements Relativistic Monte Carlo as described in [1]_.
 
@@ -57,6 +60,14 @@ class RelativisticMCMC(pints.SingleChainMCMC):
     In particular, the algorithm we implement follows eqs. in section 2.1 of
     [1]_.
 
+    As in :class:`HamiltonianMCMC`, an inverse mass matrix ``M^-1`` is
+    adapted to the covariance of the samples during the initial phase by
+    default (see :meth:`MCMCController.set_initial_phase_iterations()` and
+    :meth:`set_mass_matrix_adaptation()`), replacing the initial step sizes
+    set with :meth:`set_leapfrog_step_size()`. It is applied by performing
+    the leapfrog steps in coordinates transformed by a factor ``T`` with
+    ``T T^T = M^-1``.
+
     Extends :class:`SingleChainMCMC`.
 
     References
@@ -83,6 +94,10 @@ class RelativisticMCMC(pints.SingleChainMCMC):
         self._position = None       # Aka q in the chapter
         self._gradient = None       # Aka grad_U(q) in the chapter
 
+        # Distribution to sample momentum from (using identity covariance)
+        self._momentum_distribution = GaussianProposal(
+            np.ones(self._n_parameters))
+
         # Iterations, acceptance monitoring, and leapfrog iterations
         self._mcmc_iteration = 0
         self._mcmc_acceptance = 0
@@ -91,9 +106,10 @@ class RelativisticMCMC(pints.SingleChainMCMC):
         # Default number of leapfrog iterations
         self._n_frog_iterations = 20
 
-        # Default integration step size for leapfrog algorithm
+        # Default integration step size for leapfrog algorithm, mass and speed
+        # of light, and initial step size in each dimension (the factor of the
+        # inverse mass matrix)
         self._epsilon = 0.1
-        self._step_size = None
         self._mass = 1
         self._c = 10
         self.set_leapfrog_step_size(np.diag(self._sigma0))
@@ -137,8 +153,8 @@ class RelativisticMCMC(pints.SingleChainMCMC):
         if self._frog_iteration == 0:
 
             # Sample random momentum for current point using identity cov
-            self._current_momentum = np.random.multivariate_normal(
-                np.zeros(self._n_parameters), np.eye(self._n_parameters))
+            self._current_momentum = \
+                self._momentum_distribution.standard_normal()
 
             # First leapfrog position is the current sample in the chain
             self._position = np.array(self._current, copy=True)
@@ -146,13 +162,14 @@ class RelativisticMCMC(pints.SingleChainMCMC):
             self._momentum = np.array(self._current_momentum, copy=True)
 
             # Perform a half-step before starting iteration 0 below
-            self._momentum -= self._scaled_epsilon * self._gradient * 0.5
+            self._momentum -= 0.5 * self._epsilon * (
+                self._mass_matrix.dot_transpose(self._gradient))
 
         # Perform a leapfrog step for the position
         squared = np.sum(np.array(self._momentum)**2)
         relativistic_mass = self._mass * np.sqrt(squared / self._mc2 + 1)
-        self._position += (
-            self._scaled_epsilon * self._momentum / relativistic_mass)
+        self._position += self._epsilon * self._mass_matrix.dot(
+            self._momentum / relativistic_mass)
 
         # Ask for the pdf and gradient of the current leapfrog position
         # Using this, the leapfrog step for the momentum is performed in tell()
@@ -190,9 +207,13 @@ class RelativisticMCMC(pints.SingleChainMCMC):
 
     def leapfrog_step_size(self):
         """
-        Returns the step size for the leapfrog algorithm.
+        Returns the step size for the leapfrog algorithm in each dimension.
+
+        This is the step size currently in use, i.e. the square root of the
+        diagonal of :meth:`inverse_mass_matrix()`, which is adapted during the
+        initial phase.
         """
-        return self._step_size
+        return self._mass_matrix.scales()
 
     def _log_init(self, logger):
         """ See :meth:`Loggable._log_init()`. """
@@ -229,15 +250,7 @@ class RelativisticMCMC(pints.SingleChainMCMC):
         """
         Returns scaled epsilon used in leapfrog algorithm
         """
-        return self._scaled_epsilon
-
-    def _set_scaled_epsilon(self):
-        """
-        Rescales epsilon along the dimensions of step_size
-        """
-        self._scaled_epsilon = np.zeros(self._n_parameters)
-        for i in range(self._n_parameters):
-            self._scaled_epsilon[i] = self._epsilon * self._step_size[i]
+        return self._epsilon * self._mass_matrix.scales()
 
     def set_epsilon(self, epsilon):
         """
@@ -247,7 +260,6 @@ class RelativisticMCMC(pints.SingleChainMCMC):
         if epsilon <= 0:
             raise ValueError('epsilon must be positive for leapfrog algorithm')
         self._epsilon = epsilon
-        self._set_scaled_epsilon()
 
     def set_hamiltonian_threshold(self, hamiltonian_threshold):
         """
@@ -282,7 +294,13 @@ class RelativisticMCMC(pints.SingleChainMCMC):
 
     def set_leapfrog_step_size(self, step_size):
         """
-        Sets the step size for the leapfrog algorithm.
+        Sets the step size for the leapfrog algorithm, either as a scalar or
+        with one value per dimension.
+
+        This sets the inverse mass matrix ``M^-1`` to a diagonal matrix with
+        the squared step sizes on its diagonal. Unless mass matrix adaptation
+        is disabled (see :meth:`set_mass_matrix_adaptation()`), this is only
+        the initial value, which is replaced during the initial phase.
         """
         a = np.atleast_1d(step_size)
         if len(a[a < 0]) > 0:
@@ -297,8 +315,7 @@ class RelativisticMCMC(pints.SingleChainMCMC):
                 'Step size should either be of length 1 or equal to the' +
                 'number of parameters'
             )
-        self._step_size = step_size
-        self._set_scaled_epsilon()
+        self._mass_matrix.set_factor(step_size)
 
     def set_mass(self, mass):
         """ Sets scalar mass. """
@@ -366,13 +383,15 @@ class RelativisticMCMC(pints.SingleChainMCMC):
 
         # Not the last iteration? Then perform a leapfrog step and return
         if self._frog_iteration < self._n_frog_iterations:
-            self._momentum -= self._scaled_epsilon * self._gradient
+            self._momentum -= self._epsilon * (
+                self._mass_matrix.dot_transpose(self._gradient))
 
             # Return None to indicate there is no new sample for the chain
             return None
 
         # Final leapfrog iteration: only do half a step
-        self._momentum -= self._scaled_epsilon * self._gradient * 0.5
+        self._momentum -= 0.5 * self._epsilon * (
+            self._mass_matrix.dot_transpose(self._gradient))
 
         # Before starting accept/reject procedure, check if the leapfrog
         # procedure has led to a finite momentum and logpdf. If not, reject.
@@ -402,6 +421,7 @@ class RelativisticMCMC(pints.SingleChainMCMC):
                 self._mcmc_acceptance = (
                     (self._mcmc_iteration * self._mcmc_acceptance + accept) /
                     (self._mcmc_iteration + 1))
+                self._adapt_mass_matrix(self._current)
                 self._current.setflags(write=False)
                 return self._current
 
@@ -429,5 +449,8 @@ class RelativisticMCMC(pints.SingleChainMCMC):
             (self._mcmc_iteration * self._mcmc_acceptance + accept) /
             (self._mcmc_iteration + 1))
 
+        # Adapt inverse mass matrix during the initial phase
+        self._adapt_mass_matrix(self._current)
+
         # Return current position as next sample in the chain
         return self._current
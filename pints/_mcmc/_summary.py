@@ -12,8 +12,11 @@ from __future__ import print_function, unicode_literals
 import logging
 import numpy as np
 import pints
+import pints.io
 from tabulate import tabulate
 
+from ._digest import TDigest
+
 
 class MCMCSummary(object):
     """
@@ -24,14 +27,36 @@ class MCMCSummary(object):
     effective sample size and (if running time is supplied) effective samples
     per second.
 
+    Each statistic is calculated when it is first requested, and then cached.
+    The chains are read in blocks of ``chunk_size`` iterations, so that chains
+    that do not fit in memory (e.g. chains stored in a :class:`numpy.memmap`,
+    see :meth:`MCMCController.set_chain_storage()`, or in binary files) can be
+    summarised. All statistics that have not been calculated yet are obtained
+    in a single pass through the chains when :meth:`summary()` is called, or
+    when the summary is printed.
+
+    The mean, standard deviation and rhat are calculated by combining the
+    moments of each block, and the autocorrelations needed for the effective
+    sample size are calculated with a fast Fourier transform of each block
+    (and the lagged samples of the previous block). If all chains are
+    ordinary in-memory numpy arrays, the quantiles are calculated exactly
+    using :func:`numpy.percentile`. For memory-mapped chains and chains read
+    from files they are estimated using a t-digest (which is exact for up to
+    5000 samples, and very accurate beyond that), so that the chains never
+    need to be loaded into memory at once.
+
     Parameters
     ----------
     chains
-        An array or list of chains returned by an MCMC sampler.
+        An array or list of chains returned by an MCMC sampler, or a list of
+        filenames of chains written by :class:`MCMCController` (see
+        :meth:`pints.io.load_samples()`).
     time : float
         The time taken for the run, in seconds (optional).
     parameter_names : sequence
         A list of parameter names (optional).
+    chunk_size : int
+        The number of iterations to read from a chain at a time (optional).
 
     References
     ----------
@@ -41,7 +66,14 @@ class MCMCSummary(object):
            2014.
     """
 
-    def __init__(self, chains, time=None, parameter_names=None):
+    def __init__(
+            self, chains, time=None, parameter_names=None, chunk_size=10000):
+
+        # Load chains from disk, if filenames were given
+        from_files = len(chains) > 0 and all([
+            isinstance(x, (type(''), type(b''))) for x in chains])
+        if from_files:
+            chains = [pints.io.load_samples(x) for x in chains]
 
         # Store unmodified chains
         # Note: For performance reasons we're not copying the chains, or
@@ -50,6 +82,24 @@ class MCMCSummary(object):
         # sync with the summary.
         self._chains = chains
         self._chains_unmodified = chains
+        if len(chains) < 1:
+            raise ValueError('At least one chain must be given.')
+
+        # Get number of parameters
+        self._n_parameters = chains[0].shape[1]
+        for chain in chains:
+            if np.ndim(chain) != 2 or chain.shape[1] != self._n_parameters:
+                raise ValueError(
+                    'All chains must be 2d arrays with the same number of'
+                    ' parameters.')
+
+        # Calculate exact quantiles for chains that are already in memory
+        self._exact_quantiles = not from_files and all([
+            isinstance(x, np.ndarray) and not isinstance(x, np.memmap)
+            for x in chains])
+
+        # Segments (chain, start, end) to use when calculating rhat
+        self._segments = [(i, 0, len(x)) for i, x in enumerate(chains)]
 
         # Deal with special case where only one chain is provided
         if len(chains) == 1:
@@ -61,14 +111,8 @@ class MCMCSummary(object):
                 ' one chain')
 
             # Split chain in half, analyse both
-            shapes = chains[0].shape
-            half = int(shapes[0] / 2)
-            first = chains[0][0:half, :]
-            second = chains[0][half:, :]
-            self._chains = [first, second]
-
-        # Get number of parameters
-        self._n_parameters = chains[0].shape[1]
+            half = int(len(chains[0]) / 2)
+            self._segments = [(0, 0, half), (0, half, len(chains[0]))]
 
         # Check time, if supplied
         if time is not None and float(time) <= 0:
@@ -85,19 +129,20 @@ class MCMCSummary(object):
                 'sampled parameters')
         self._parameter_names = parameter_names
 
-        # Initialise
+        # Check chunk size
+        self._chunk_size = int(chunk_size)
+        if self._chunk_size < 1:
+            raise ValueError('Chunk size must be at least 1.')
+
+        # Initialise (statistics are calculated when first needed)
         self._ess = None
-        self._ess_per_second = None
         self._mean = None
         self._quantiles = None
         self._rhat = None
         self._std = None
-        self._summary_list = []
+        self._summary_list = None
         self._summary_str = None
 
-        # Create summary
-        self._make_summary()
-
     def __str__(self):
         """
         Prints posterior summaries for all parameters to the console, including
@@ -114,7 +159,7 @@ class MCMCSummary(object):
                 headers.append('ess per sec.')
 
             self._summary_str = tabulate(
-                self._summary_list,
+                self.summary(),
                 headers=headers,
                 numalign='left',
                 floatfmt='.2f',
@@ -122,6 +167,95 @@ class MCMCSummary(object):
 
         return self._summary_str
 
+    def _blocks(self):
+        """
+        Yields tuples ``(segment, block)``, where ``block`` is a 2d array with
+        the next (at most ``chunk_size``) samples of the given ``segment``.
+        Concatenating all blocks gives the stacked chains.
+        """
+        for segment, (chain, start, end) in enumerate(self._segments):
+            for i in range(start, end, self._chunk_size):
+                j = min(i + self._chunk_size, end)
+                yield segment, np.asarray(
+                    self._chains[chain][i:j], dtype=float)
+
+    def _calculate(self, moments=False, quantiles=False, ess=False):
+        """
+        Calculates the requested statistics in a single pass through the
+        chains.
+        """
+        n_segments = len(self._segments)
+        n_parameters = self._n_parameters
+        n_total = sum([end - start for chain, start, end in self._segments])
+        if n_total < 2:
+            raise ValueError('At least two samples must be given.')
+
+        # Count, mean, and sum of squared deviations of each segment
+        if moments:
+            counts = np.zeros(n_segments)
+            means = np.zeros((n_segments, n_parameters))
+            m2s = np.zeros((n_segments, n_parameters))
+
+        # Streaming quantile estimates, for chains not in memory
+        digest = None
+        if quantiles and not self._exact_quantiles:
+            digest = TDigest(n_parameters)
+
+        # Lagged products for the autocorrelation, up to a maximum lag
+        if ess:
+            acf = _Autocorrelation(n_parameters, min(n_total - 1, 1000))
+
+        for segment, block in self._blocks():
+            if moments:
+                # Merge the moments of this block with those of the segment
+                n = len(block)
+                mean = np.mean(block, axis=0)
+                m2 = np.sum((block - mean)**2, axis=0)
+                n0 = counts[segment]
+                delta = mean - means[segment]
+                counts[segment] += n
+                means[segment] += delta * n / counts[segment]
+                m2s[segment] += m2 + delta**2 * n0 * n / counts[segment]
+            if digest is not None:
+                digest.add(block)
+            if ess:
+                acf.add(block)
+
+        if moments:
+            # Posterior mean and standard deviation, from all segments
+            self._mean = np.sum(counts[:, None] * means, axis=0) / n_total
+            m2 = np.sum(m2s, axis=0) + np.sum(
+                counts[:, None] * (means - self._mean)**2, axis=0)
+            self._std = np.sqrt(m2 / n_total)
+
+            # Rhat, as in pints.rhat()
+            t = counts[0]
+            W = np.mean(m2s / (counts[:, None] - 1), axis=0)
+            B = t / (n_segments - 1.0) * np.sum(
+                (means - np.mean(means, axis=0))**2, axis=0)
+            self._rhat = np.sqrt((W + (1.0 / t) * (B - W)) / W)
+
+        if digest is not None:
+            self._quantiles = digest.quantiles(
+                [0.025, 0.25, 0.5, 0.75, 0.975])
+        elif quantiles:
+            self._quantiles = np.percentile(
+                np.concatenate(self._chains), [2.5, 25, 50, 75, 97.5], axis=0)
+
+        if ess:
+            # Use the autocorrelation up to its first negative value, and
+            # calculate more lags if this was not reached
+            while True:
+                rho = acf.autocorrelation()
+                positive = np.cumprod(rho >= 0, axis=0, dtype=bool)
+                if acf.max_lag() == n_total - 1 or not np.any(positive[-1]):
+                    break
+                acf = _Autocorrelation(
+                    n_parameters, min(n_total - 1, 4 * acf.max_lag()))
+                for segment, block in self._blocks():
+                    acf.add(block)
+            self._ess = n_total / (1 + 2 * np.sum(rho * positive, axis=0))
+
     def chains(self):
         """
         Returns posterior samples from all chains separately.
@@ -132,6 +266,8 @@ class MCMCSummary(object):
         """
         Return the effective sample size for each parameter as defined in [2]_.
         """
+        if self._ess is None:
+            self._calculate(ess=True)
         return self._ess
 
     def ess_per_second(self):
@@ -142,57 +278,24 @@ class MCMCSummary(object):
         This is only defined if a run time was passed in at construction time,
         if no run time is known ``None`` is returned.
         """
-        return self._ess_per_second
-
-    def _make_summary(self):
-        """
-        Calculates posterior summaries for all parameters.
-        """
-        stacked = np.vstack(self._chains)
-
-        # Mean, std and quantiles
-        self._mean = np.mean(stacked, axis=0)
-        self._std = np.std(stacked, axis=0)
-        self._quantiles = np.percentile(
-            stacked, [2.5, 25, 50, 75, 97.5], axis=0)
-
-        # Rhat
-        self._rhat = pints.rhat_all_params(self._chains)
-
-        # Effective sample size
-        self._ess = pints.effective_sample_size(stacked)
-        if self._time is not None:
-            self._ess_per_second = np.array(self._ess) / self._time
-
-        # Create
-        for i in range(0, self._n_parameters):
-            row = [
-                self._parameter_names[i],
-                self._mean[i],
-                self._std[i],
-                self._quantiles[0, i],
-                self._quantiles[1, i],
-                self._quantiles[2, i],
-                self._quantiles[3, i],
-                self._quantiles[4, i],
-                self._rhat[i],
-                self._ess[i],
-            ]
-            if self._time is not None:
-                row.append(self._ess_per_second[i])
-
-            self._summary_list.append(row)
+        if self._time is None:
+            return None
+        return self.ess() / self._time
 
     def mean(self):
         """
         Return the posterior means of all parameters.
         """
+        if self._mean is None:
+            self._calculate(moments=True)
         return self._mean
 
     def quantiles(self):
         """
         Return the 2.5%, 25%, 50%, 75% and 97.5% posterior quantiles.
         """
+        if self._quantiles is None:
+            self._calculate(quantiles=True)
         return self._quantiles
 
     def rhat(self):
@@ -201,12 +304,16 @@ class MCMCSummary(object):
         chain is used, the chain is split into two halves and rhat is
         calculated using these two parts.
         """
+        if self._rhat is None:
+            self._calculate(moments=True)
         return self._rhat
 
     def std(self):
         """
         Return the posterior standard deviation of all parameters.
         """
+        if self._std is None:
+            self._calculate(moments=True)
         return self._std
 
     def summary(self):
@@ -215,6 +322,33 @@ class MCMCSummary(object):
         deviation, the 2.5%, 25%, 50%, 75% and 97.5% posterior quantiles,
         rhat, effective sample size (ess) and ess per second of run time.
         """
+        if self._summary_list is None:
+            # Calculate all remaining statistics in a single pass
+            self._calculate(
+                moments=self._mean is None,
+                quantiles=self._quantiles is None,
+                ess=self._ess is None)
+
+            ess_per_second = self.ess_per_second()
+            self._summary_list = []
+            for i in range(0, self._n_parameters):
+                row = [
+                    self._parameter_names[i],
+                    self._mean[i],
+                    self._std[i],
+                    self._quantiles[0, i],
+                    self._quantiles[1, i],
+                    self._quantiles[2, i],
+                    self._quantiles[3, i],
+                    self._quantiles[4, i],
+                    self._rhat[i],
+                    self._ess[i],
+                ]
+                if self._time is not None:
+                    row.append(ess_per_second[i])
+
+                self._summary_list.append(row)
+
         return list(self._summary_list)
 
     def time(self):
@@ -222,3 +356,82 @@ class MCMCSummary(object):
         Return the run time taken for sampling.
         """
         return self._time
+
+
+class _Autocorrelation(object):
+    """
+    Calculates the autocorrelation of a stream of samples, up to a maximum
+    lag, using a fast Fourier transform of each block of samples that is
+    added (together with the last ``max_lag`` samples of the previous blocks).
+
+    To avoid a loss of precision, the first sample is subtracted from all
+    samples before their products are accumulated.
+    """
+
+    def __init__(self, n_parameters, max_lag):
+        self._max_lag = int(max_lag)
+
+        # Reference point, number of samples, and their sum
+        self._reference = None
+        self._n = 0
+        self._sum = np.zeros(n_parameters)
+
+        # Sums of the lagged products, the first samples and the last samples
+        self._products = np.zeros((self._max_lag + 1, n_parameters))
+        self._head = np.zeros((0, n_parameters))
+        self._tail = np.zeros((0, n_parameters))
+
+    def add(self, block):
+        """
+        Adds a 2d array of samples (with one sample per row).
+        """
+        if len(block) == 0:
+            return
+        if self._reference is None:
+            self._reference = np.array(block[0])
+        block = block - self._reference
+        self._n += len(block)
+        self._sum += np.sum(block, axis=0)
+
+        # Add products of the block with the (lagged) preceding samples
+        k = len(self._tail)
+        x = np.concatenate((self._tail, block))
+        y = np.array(x)
+        y[:k] = 0
+        size = 1 << int(len(x) + self._max_lag).bit_length()
+        fx = np.fft.rfft(x, n=size, axis=0)
+        fy = np.fft.rfft(y, n=size, axis=0)
+        products = np.fft.irfft(fy * np.conjugate(fx), n=size, axis=0)
+        self._products += products[:self._max_lag + 1]
+
+        # Store first and last samples
+        if len(self._head) < self._max_lag:
+            self._head = np.concatenate(
+                (self._head, block[:self._max_lag - len(self._head)]))
+        self._tail = x[-self._max_lag:] if self._max_lag > 0 else x[:0]
+
+    def autocorrelation(self):
+        """
+        Returns the autocorrelation at lags ``0, 1, ..., max_lag``.
+        """
+        n = self._n
+        mean = self._sum / n
+        lags = np.arange(self._max_lag + 1)[:, None]
+
+        # Sums of the first and last k samples, for every lag k
+        zero = np.zeros((1, len(mean)))
+        first = np.concatenate((zero, np.cumsum(self._head, axis=0)))
+        last = np.concatenate((zero, np.cumsum(self._tail[::-1], axis=0)))
+
+        # Autocovariance (times n) at each lag
+        acov = (self._products
+                - mean * (2 * self._sum - first - last)
+                + (n - lags) * mean**2)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return acov / acov[0]
+
+    def max_lag(self):
+        """
+        Returns the maximum lag.
+        """
+        return self._max_lag
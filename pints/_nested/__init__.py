@@ -281,6 +281,7 @@ class NestedController(object):
         # By default do serial evaluation
         self._parallel = False
         self._n_workers = 1
+        self._parallel_backend = 'processes'
         self.set_parallel()
 
         # Parameters common to all routines
@@ -294,7 +295,7 @@ class NestedController(object):
         self._marginal_log_likelihood_threshold = 0.5
 
         # Initial marginal difference
-        self._diff = np.float('-Inf')
+        self._diff = -float('inf')
 
         # By default use ellipsoidal sampling
         if method is None:
@@ -372,8 +373,17 @@ class NestedController(object):
         if self._parallel:
             # Use at most n_workers workers
             n_workers = self._n_workers
-            evaluator = pints.ParallelEvaluator(
-                f, n_workers=n_workers)
+            if self._parallel_backend == 'threads':
+                evaluator = pints.ThreadedEvaluator(f, n_workers=n_workers)
+            elif self._parallel_backend == 'shared_memory':
+                evaluator = pints.SharedMemoryEvaluator(
+                    f, n_workers=n_workers)
+            else:
+                evaluator = pints.ParallelEvaluator(
+                    f, n_workers=n_workers)
+        elif hasattr(f, 'evaluate_batch'):
+            # Evaluate all points in a single (vectorised) call
+            evaluator = pints.BatchEvaluator(f)
         else:
             evaluator = pints.SequentialEvaluator(f)
         return evaluator
@@ -416,12 +426,19 @@ class NestedController(object):
         """
         Generates initial active points.
         """
-        m_initial = self._log_prior.sample(self._n_active_points)
-        v_fx = np.zeros(self._n_active_points)
-        for i in range(0, self._n_active_points):
-            # Calculate likelihood
-            v_fx[i] = self._evaluator.evaluate([m_initial[i, :]])[0]
-            self._sampler._n_evals += 1
+        n = self._n_active_points
+        m_initial = self._log_prior.sample(n)
+        v_fx = np.zeros(n)
+        i = 0
+        while i < n:
+            # Calculate likelihoods for all points up to the next logging
+            # point in a single call to the evaluator
+            j = n
+            if self._logging:
+                j = min(n, max(i, self._next_message) + 1)
+            v_fx[i:j] = self._evaluator.evaluate(m_initial[i:j])
+            self._sampler._n_evals += j - i
+            i = j - 1
 
             # Show progress
             if self._logging and i >= self._next_message:
@@ -433,6 +450,7 @@ class NestedController(object):
                 if i > self._message_warm_up:
                     self._next_message = self._message_interval * (
                         1 + i // self._message_interval)
+            i += 1
         self._next_message = 0
         return v_fx, m_initial
 
@@ -716,7 +734,7 @@ class NestedController(object):
             raise ValueError('Convergence threshold must be positive.')
         self._marginal_log_likelihood_threshold = threshold
 
-    def set_parallel(self, parallel=False):
+    def set_parallel(self, parallel=False, backend='processes'):
         """
         Enables/disables parallel evaluation.
 
@@ -726,7 +744,19 @@ class NestedController(object):
         than 0.
         Parallelisation can be disabled by setting ``parallel`` to ``0`` or
         ``False``.
+
+        The ``backend`` determines how parallel evaluation is performed: with
+        ``backend='processes'`` a :class:`ParallelEvaluator` is used,
+        ``backend='shared_memory'`` selects a :class:`SharedMemoryEvaluator`,
+        which has a much lower overhead per evaluation, and
+        ``backend='threads'`` selects a :class:`ThreadedEvaluator`, which can
+        be used for functions that release Python's global interpreter lock.
         """
+        if backend not in ('processes', 'shared_memory', 'threads'):
+            raise ValueError(
+                'Unknown parallel backend "' + str(backend) + '".')
+        self._parallel_backend = backend
+
         if parallel is True:
             self._parallel = True
             self._n_workers = pints.ParallelEvaluator.cpu_count()
@@ -136,12 +136,59 @@ class Optimiser(pints.Loggable, pints.TunableMethod):
                 raise ValueError(
                     'Initial standard deviations must be greater than zero.')
 
+        # Positions handed out by the default ask_one() implementation
+        self._one_xs = None
+        self._one_fs = None
+        self._one_next = 0
+
     def ask(self):
         """
         Returns a list of positions in the search space to evaluate.
         """
         raise NotImplementedError
 
+    def ask_one(self):
+        """
+        Returns a tuple ``(tag, x)`` containing a single position ``x`` to
+        evaluate, and a ``tag`` that should be passed back to
+        :meth:`tell_one()` along with the evaluation at ``x``. If no new
+        position can be returned until more evaluations have been passed to
+        :meth:`tell_one()`, ``None`` is returned instead.
+
+        Together with :meth:`tell_one()`, this method provides an asynchronous
+        alternative to :meth:`ask()` and :meth:`tell()`, in which evaluations
+        can be passed back one at a time and in any order. This allows a fixed
+        number of evaluations to be kept in progress, instead of waiting for
+        all evaluations requested by :meth:`ask()` to finish.
+
+        The default implementation hands out the positions returned by
+        :meth:`ask()` one at a time, and calls :meth:`tell()` once all of them
+        have been evaluated. Optimisers that can update their state after
+        every evaluation (for example :class:`PSO`, :class:`XNES`, and
+        :class:`SNES`) override this method to provide a "steady-state"
+        version of their algorithm.
+
+        Calls to :meth:`ask_one()` and :meth:`tell_one()` should not be mixed
+        with calls to :meth:`ask()` and :meth:`tell()`.
+        """
+        # Get new points
+        if self._one_xs is None:
+            xs = self.ask()
+            while len(xs) == 0:     # pragma: no cover
+                self.tell([])
+                xs = self.ask()
+            self._one_xs = xs
+            self._one_fs = [None] * len(xs)
+            self._one_next = 0
+
+        # All points handed out? Then wait for tell_one()
+        if self._one_next == len(self._one_xs):
+            return None
+
+        i = self._one_next
+        self._one_next += 1
+        return i, self._one_xs[i]
+
     def fbest(self):
         """
         Returns the objective function evaluated at the current best position.
@@ -175,6 +222,25 @@ class Optimiser(pints.Loggable, pints.TunableMethod):
         """
         raise NotImplementedError
 
+    def tell_one(self, tag, fx):
+        """
+        Passes in the evaluation ``fx`` of a single position previously
+        returned by :meth:`ask_one()` along with the given ``tag``.
+
+        See :meth:`ask_one()` for details.
+        """
+        if (self._one_fs is None or not 0 <= tag < self._one_next
+                or self._one_fs[tag] is not None):
+            raise ValueError('Unknown tag passed to tell_one().')
+        self._one_fs[tag] = fx
+
+        # All points evaluated? Then perform an iteration
+        if self._one_next == len(self._one_xs):
+            if not any([f is None for f in self._one_fs]):
+                fs = self._one_fs
+                self._one_xs = self._one_fs = None
+                self.tell(fs)
+
     def xbest(self):
         """
         Returns the current best position.
@@ -332,8 +398,13 @@ class OptimisationController(object):
         # Parallelisation
         self._parallel = False
         self._n_workers = 1
+        self._parallel_backend = 'processes'
+        self._utilisation = None
         self.set_parallel()
 
+        # Asynchronous (steady-state) evaluation
+        self._asynchronous = False
+
         #
         # Stopping criteria
         #
@@ -421,7 +492,23 @@ class OptimisationController(object):
         unchanged_iterations = 0
 
         # Create evaluator object
-        if self._parallel:
+        asynchronous = self._asynchronous
+        if asynchronous:
+            # Keep n_workers evaluations in progress. Use a single worker
+            # thread if parallelisation is disabled.
+            n_workers = self._n_workers
+            backend = 'processes'
+            if self._parallel_backend == 'threads' or not self._parallel:
+                backend = 'threads'
+            evaluator = pints.AsynchronousEvaluator(
+                self._function, n_workers=n_workers, backend=backend)
+
+            # Count an iteration for every population_size evaluations
+            n_per_iteration = 1
+            if isinstance(self._optimiser, PopulationBasedOptimiser):
+                n_per_iteration = self._optimiser.population_size()
+
+        elif self._parallel:
             # Get number of workers
             n_workers = self._n_workers
 
@@ -429,8 +516,18 @@ class OptimisationController(object):
             # particles!
             if isinstance(self._optimiser, PopulationBasedOptimiser):
                 n_workers = min(n_workers, self._optimiser.population_size())
-            evaluator = pints.ParallelEvaluator(
-                self._function, n_workers=n_workers)
+            if self._parallel_backend == 'threads':
+                evaluator = pints.ThreadedEvaluator(
+                    self._function, n_workers=n_workers)
+            elif self._parallel_backend == 'shared_memory':
+                evaluator = pints.SharedMemoryEvaluator(
+                    self._function, n_workers=n_workers)
+            else:
+                evaluator = pints.ParallelEvaluator(
+                    self._function, n_workers=n_workers)
+        elif hasattr(self._function, 'evaluate_batch'):
+            # Evaluate the whole population in a single (vectorised) call
+            evaluator = pints.BatchEvaluator(self._function)
         else:
             evaluator = pints.SequentialEvaluator(self._function)
 
@@ -458,10 +555,15 @@ class OptimisationController(object):
 
                 # Show parallelisation
                 if self._parallel:
+                    workers = 'processes'
+                    if self._parallel_backend == 'threads':
+                        workers = 'threads'
                     print('Running in parallel with ' + str(n_workers) +
-                          ' worker processes.')
+                          ' worker ' + workers + '.')
                 else:
                     print('Running in sequential mode.')
+                if asynchronous:
+                    print('Running asynchronously.')
 
             # Show population size
             pop_size = 1
@@ -476,6 +578,7 @@ class OptimisationController(object):
                 logger.set_stream(None)
             if self._log_filename:
                 logger.set_filename(self._log_filename, csv=self._log_csv)
+                logger.set_buffering(interval=1)
 
             # Add fields to log
             max_iter_guess = max(self._max_iterations or 0, 10000)
@@ -491,14 +594,25 @@ class OptimisationController(object):
         running = True
         try:
             while running:
-                # Get points
-                xs = self._optimiser.ask()
+                if asynchronous:
+                    # Keep n_workers evaluations in progress, and pass back
+                    # results as they become available
+                    fs = []
+                    while len(fs) < n_per_iteration:
+                        self._submit(evaluator, n_workers)
+                        for tag, x, fx in evaluator.wait():
+                            self._optimiser.tell_one(tag, fx)
+                            fs.append(fx)
 
-                # Calculate scores
-                fs = evaluator.evaluate(xs)
+                else:
+                    # Get points
+                    xs = self._optimiser.ask()
+
+                    # Calculate scores
+                    fs = evaluator.evaluate(xs)
 
-                # Perform iteration
-                self._optimiser.tell(fs)
+                    # Perform iteration
+                    self._optimiser.tell(fs)
 
                 # Check if new best found
                 fnew = self._optimiser.fbest()
@@ -579,7 +693,22 @@ class OptimisationController(object):
             for p in self._optimiser.xbest():
                 print(pints.strfloat(p))
             print('-' * 40)
+
+            # Write any buffered output to disk
+            if logging:
+                logger.close()
             raise
+
+        # Pass back results of evaluations still in progress, so that the
+        # optimiser isn't left waiting for them
+        if asynchronous:
+            while evaluator.n_pending():
+                for tag, x, fx in evaluator.wait():
+                    self._optimiser.tell_one(tag, fx)
+                    evaluations += 1
+            evaluator._stop()
+            fbest = min(fbest, self._optimiser.fbest())
+            fbest_user = fbest if self._minimising else -fbest
         time_taken = timer.time()
 
         # Log final values and show halt message
@@ -587,9 +716,15 @@ class OptimisationController(object):
             logger.log(iteration, evaluations, fbest_user)
             self._optimiser._log_write(logger)
             logger.log(time_taken)
+            logger.close()
             if self._log_to_screen:
                 print(halt_message)
 
+        # Store worker utilisation
+        self._utilisation = None
+        if isinstance(evaluator, pints.ParallelEvaluator):
+            self._utilisation = evaluator.utilisation()
+
         # Save post-run statistics
         self._evaluations = evaluations
         self._iterations = iteration
@@ -598,6 +733,32 @@ class OptimisationController(object):
         # Return best position and score
         return self._optimiser.xbest(), fbest_user
 
+    def set_asynchronous(self, enabled=True):
+        """
+        Enables or disables asynchronous (steady-state) evaluation.
+
+        By default, the optimiser is asked for a list of points (e.g. a whole
+        population), and all points are evaluated before the optimiser can
+        continue. With asynchronous evaluation enabled, a fixed number of
+        evaluations is kept in progress at all times (equal to the number of
+        workers set with :meth:`set_parallel()`), and results are passed back
+        to the optimiser one at a time, in the order they finish (see
+        :meth:`Optimiser.ask_one()` and :meth:`Optimiser.tell_one()`). This
+        avoids idle workers when evaluation times vary.
+
+        Evaluations are performed using an :class:`AsynchronousEvaluator`. If
+        parallelisation is disabled, a single worker thread is used. In
+        asynchronous mode, every ``population_size`` evaluations are counted
+        as one iteration.
+
+        Optimisers that can update their state after every evaluation (e.g.
+        :class:`PSO`, :class:`XNES`, :class:`SNES`) provide steady-state
+        versions of their algorithms. Other optimisers (e.g. :class:`CMAES`)
+        still update once a whole population has been evaluated, so that
+        workers may become idle at the end of each iteration.
+        """
+        self._asynchronous = bool(enabled)
+
     def set_log_interval(self, iters=20, warm_up=3):
         """
         Changes the frequency with which messages are logged.
@@ -677,7 +838,7 @@ class OptimisationController(object):
         self._max_unchanged_iterations = iterations
         self._min_significant_change = threshold
 
-    def set_parallel(self, parallel=False):
+    def set_parallel(self, parallel=False, backend='processes'):
         """
         Enables/disables parallel evaluation.
 
@@ -687,7 +848,19 @@ class OptimisationController(object):
         than 0.
         Parallelisation can be disabled by setting ``parallel`` to ``0`` or
         ``False``.
+
+        The ``backend`` determines how parallel evaluation is performed: with
+        ``backend='processes'`` a :class:`ParallelEvaluator` is used,
+        ``backend='shared_memory'`` selects a :class:`SharedMemoryEvaluator`,
+        which has a much lower overhead per evaluation, and
+        ``backend='threads'`` selects a :class:`ThreadedEvaluator`, which can
+        be used for functions that release Python's global interpreter lock.
         """
+        if backend not in ('processes', 'shared_memory', 'threads'):
+            raise ValueError(
+                'Unknown parallel backend "' + str(backend) + '".')
+        self._parallel_backend = backend
+
         if parallel is True:
             self._parallel = True
             self._n_workers = pints.ParallelEvaluator.cpu_count()
@@ -712,6 +885,20 @@ class OptimisationController(object):
         else:
             self._threshold = float(threshold)
 
+    def _submit(self, evaluator, n):
+        """
+        Asks the optimiser for new points and submits them to the given
+        asynchronous ``evaluator``, until ``n`` evaluations are in progress or
+        the optimiser has no more points to give.
+        """
+        while evaluator.n_pending() < n:
+            task = self._optimiser.ask_one()
+            if task is None:
+                break
+            evaluator.submit(task[1], task[0])
+        if evaluator.n_pending() == 0:  # pragma: no cover
+            raise RuntimeError('Optimiser did not return any points.')
+
     def threshold(self):
         """
         Returns the threshold stopping criterion, or ``None`` if no threshold
@@ -726,6 +913,15 @@ class OptimisationController(object):
         """
         return self._time
 
+    def worker_utilisation(self):
+        """
+        Returns a list containing the fraction of time each worker process
+        spent evaluating during the last run (see
+        :meth:`ParallelEvaluator.utilisation()`), or ``None`` if the last run
+        did not use a :class:`ParallelEvaluator`.
+        """
+        return self._utilisation
+
 
 class Optimisation(OptimisationController):
     """ Deprecated alias for :class:`OptimisationController`. """
@@ -65,6 +65,10 @@ class PSO(pints.PopulationBasedOptimiser):
                     v[i,j] += al * (p[i,j] - x[i,j]) + ag * (pg[i,j]  - x[i,j])
                     x[i,j] += v[i,j]
 
+    When used via :meth:`ask_one()` and :meth:`tell_one()`, an asynchronous
+    version of PSO [2]_ is run, in which each particle is moved as soon as its
+    evaluation is passed back, using the best global position found so far.
+
     Extends :class:`PopulationBasedOptimiser`.
 
     References
@@ -72,6 +76,11 @@ class PSO(pints.PopulationBasedOptimiser):
     .. [1] Kennedy, Eberhart (1995) Particle Swarm Optimization.
            IEEE International Conference on Neural Networks
            https://doi.org/10.1109/ICNN.1995.488968
+
+    .. [2] Koh, George, Haftka, Fregly (2006) Parallel asynchronous particle
+           swarm optimization. International Journal for Numerical Methods in
+           Engineering.
+           https://doi.org/10.1002/nme.1646
     """
 
     def __init__(self, x0, sigma0=None, boundaries=None):
@@ -99,6 +108,25 @@ class PSO(pints.PopulationBasedOptimiser):
         # Return points
         return self._user_xs
 
+    def ask_one(self):
+        """ See :meth:`Optimiser.ask_one()`. """
+        # Initialise on first call
+        if not self._running:
+            self._initialise()
+
+        # Return the position of the next particle that isn't being evaluated
+        while self._idle:
+            i = self._idle.pop(0)
+            x = self._xs[i]
+            if self._manual_boundaries and not self._boundaries.check(x):
+                # Out of bounds: Move on without evaluating
+                self._update_particle(i, float('inf'))
+                self._idle.append(i)
+                continue
+            self._busy.add(i)
+            return i, np.array(x, copy=True)
+        return None
+
     def fbest(self):
         """ See :meth:`Optimiser.fbest()`. """
         if self._running:
@@ -147,6 +175,11 @@ class PSO(pints.PopulationBasedOptimiser):
         self._fg = float('inf')
         self._pg = self._xs[0]
 
+        # Particles waiting to be evaluated, and particles being evaluated (for
+        # use with ask_one() and tell_one())
+        self._idle = list(range(self._population_size))
+        self._busy = set()
+
         # Create boundary transform, or use manual boundary checking
         self._manual_boundaries = False
         self._boundary_transform = None
@@ -251,28 +284,7 @@ class PSO(pints.PopulationBasedOptimiser):
 
         # Update particles
         for i in range(self._population_size):
-
-            # Update best local position and score
-            if fx[i] < self._fl[i]:
-                self._fl[i] = fx[i]
-                self._pl[i] = np.array(self._xs[i], copy=True)
-
-            # Calculate "velocity"
-            al = np.random.uniform(0, self._almax, self._n_parameters)
-            ag = np.random.uniform(0, self._agmax, self._n_parameters)
-            self._vs[i] += (
-                al * (self._pl[i] - self._xs[i]) +
-                ag * (self._pg - self._xs[i]))
-
-            # Reduce speed if going too fast, as indicated by going out of
-            # bounds.
-            # This is not in the original algorithm but seems to work well
-            if self._boundaries is not None:
-                if not self._boundaries.check(self._xs[i] + self._vs[i]):
-                    self._vs[i] *= 0.5
-
-            # Update position
-            self._xs[i] += self._vs[i]
+            self._update_particle(i, fx[i])
 
         # Create safe xs to pass to user
         if self._boundary_transform is not None:
@@ -295,6 +307,51 @@ class PSO(pints.PopulationBasedOptimiser):
             self._fg = self._fl[i]
             self._pg = np.array(self._pl[i], copy=True)
 
+    def tell_one(self, tag, fx):
+        """ See :meth:`Optimiser.tell_one()`. """
+        i = tag
+        if not (self._running and i in self._busy):
+            raise ValueError('Unknown tag passed to tell_one().')
+        self._busy.remove(i)
+
+        # Move particle, using current global best
+        self._update_particle(i, fx)
+        if self._boundary_transform is not None:
+            self._xs[i] = self._boundary_transform(self._xs[i])
+        self._idle.append(i)
+
+        # Update global best score
+        if self._fl[i] < self._fg:
+            self._fg = self._fl[i]
+            self._pg = np.array(self._pl[i], copy=True)
+
+    def _update_particle(self, i, fx):
+        """
+        Updates the local best of particle ``i`` using its score ``fx``, and
+        then updates its velocity and position.
+        """
+        # Update best local position and score
+        if fx < self._fl[i]:
+            self._fl[i] = fx
+            self._pl[i] = np.array(self._xs[i], copy=True)
+
+        # Calculate "velocity"
+        al = np.random.uniform(0, self._almax, self._n_parameters)
+        ag = np.random.uniform(0, self._agmax, self._n_parameters)
+        self._vs[i] += (
+            al * (self._pl[i] - self._xs[i]) +
+            ag * (self._pg - self._xs[i]))
+
+        # Reduce speed if going too fast, as indicated by going out of
+        # bounds.
+        # This is not in the original algorithm but seems to work well
+        if self._boundaries is not None:
+            if not self._boundaries.check(self._xs[i] + self._vs[i]):
+                self._vs[i] *= 0.5
+
+        # Update position
+        self._xs[i] += self._vs[i]
+
     def xbest(self):
         """ See :meth:`Optimiser.xbest()`. """
         if self._running:
@@ -26,6 +26,19 @@ class SNES(pints.PopulationBasedOptimiser):
     It treats each dimension separately, making it suitable for higher
     dimensions.
 
+    When used via :meth:`ask_one()` and :meth:`tell_one()`, a steady-state
+    version of SNES is run, in which new points are sampled from the current
+    search distribution whenever a point is requested, and the distribution is
+    updated each time ``population_size`` new evaluations have been passed
+    back. Points sampled from an earlier distribution are treated as if they
+    were sampled from the current one (using their normalised samples), which
+    keeps the update stable when many evaluations are in progress. With
+    manual (non-rectangular) boundaries, points outside the boundaries are
+    scored as ``inf`` without being evaluated, and a new point is sampled;
+    if ``population_size`` points in a row fall outside the boundaries, the
+    last one is returned anyway (and a warning is logged), so that the search
+    distribution can still be updated using finite scores.
+
     Extends :class:`PopulationBasedOptimiser`.
 
     References
@@ -85,6 +98,39 @@ class SNES(pints.PopulationBasedOptimiser):
         self._user_xs.setflags(write=False)
         return self._user_xs
 
+    def ask_one(self):
+        """ See :meth:`Optimiser.ask_one()`. """
+        # Initialise on first call
+        if not self._running:
+            self._initialise()
+
+        for i in range(self._population_size):
+            # Sample from current distribution
+            z = np.random.normal(0, 1, self._n_parameters)
+            x = self._mu + self._sigmas * z
+
+            # Create safe x to pass to user
+            user_x = x
+            if self._boundary_transform is not None:
+                user_x = self._boundary_transform(x)
+            tag = self._n_asked
+            self._n_asked += 1
+            self._pending[tag] = (z, user_x)
+
+            # Manual boundaries? Then don't evaluate points out of bounds,
+            # unless a whole population has been rejected
+            if (not self._manual_boundaries
+                    or self._boundaries.check(user_x)):
+                break
+            if i + 1 < self._population_size:
+                self.tell_one(tag, float('inf'))
+        else:
+            self._logger.warning(
+                'All points requested by SNES are outside the boundaries:'
+                ' returning an out of bounds point.')
+
+        return tag, np.array(user_x, copy=True)
+
     def fbest(self):
         """ See :meth:`Optimiser.fbest()`. """
         return self._fbest
@@ -125,6 +171,13 @@ class SNES(pints.PopulationBasedOptimiser):
         # Initial square root of covariance matrix
         self._sigmas = np.array(self._sigma0, copy=True)
 
+        # Points requested with ask_one() (stored as a dict mapping tags to
+        # normalised samples and transformed points), and points evaluated
+        # since the last update (for use with ask_one() and tell_one())
+        self._pending = {}
+        self._evaluated = []
+        self._n_asked = 0
+
         # Update optimiser state
         self._running = True
 
@@ -152,16 +205,8 @@ class SNES(pints.PopulationBasedOptimiser):
             fx = np.ones((self._population_size, )) * float('inf')
             fx[self._user_ids] = user_fx
 
-        # Order the normalized samples according to the scores
-        order = np.argsort(fx)
-        self._ss = self._ss[order]
-
-        # Update center
-        self._mu += self._eta_mu * self._sigmas * np.dot(self._us, self._ss)
-
-        # Update variances
-        self._sigmas *= np.exp(
-            0.5 * self._eta_sigmas * np.dot(self._us, self._ss**2 - 1))
+        # Update search distribution
+        order = self._update(self._ss, fx)
 
         # Update xbest and fbest
         # Note: The stored values are based on particles, not on the mean of
@@ -173,6 +218,44 @@ class SNES(pints.PopulationBasedOptimiser):
             self._xbest = self._xs[order[0]]
             self._fbest = fx[order[0]]
 
+    def tell_one(self, tag, fx):
+        """ See :meth:`Optimiser.tell_one()`. """
+        try:
+            z, user_x = self._pending.pop(tag)
+        except (AttributeError, KeyError, TypeError):
+            raise ValueError('Unknown tag passed to tell_one().')
+        self._evaluated.append((z, fx))
+
+        # Update xbest and fbest
+        if fx < self._fbest:
+            self._xbest = user_x
+            self._fbest = fx
+
+        # Update search distribution, using the most recent evaluations
+        if len(self._evaluated) == self._population_size:
+            zs = np.array([e[0] for e in self._evaluated])
+            fs = np.array([e[1] for e in self._evaluated])
+            self._evaluated = []
+            self._update(zs, fs)
+
+    def _update(self, ss, fx):
+        """
+        Updates the search distribution using the normalised samples ``ss``
+        and their scores ``fx``, and returns the order of the samples.
+        """
+        # Order the normalized samples according to the scores
+        order = np.argsort(fx)
+        ss = ss[order]
+
+        # Update center
+        self._mu += self._eta_mu * self._sigmas * np.dot(self._us, ss)
+
+        # Update variances
+        self._sigmas *= np.exp(
+            0.5 * self._eta_sigmas * np.dot(self._us, ss**2 - 1))
+
+        return order
+
     def xbest(self):
         """ See :meth:`Optimiser.xbest()`. """
         return self._xbest
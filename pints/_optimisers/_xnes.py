@@ -24,6 +24,19 @@ class XNES(pints.PopulationBasedOptimiser):
     xNES stands for Exponential Natural Evolution Strategy, and is
     designed for non-linear derivative-free optimization problems [1]_.
 
+    When used via :meth:`ask_one()` and :meth:`tell_one()`, a steady-state
+    version of xNES is run, in which new points are sampled from the current
+    search distribution whenever a point is requested, and the distribution is
+    updated each time ``population_size`` new evaluations have been passed
+    back. Points sampled from an earlier distribution are treated as if they
+    were sampled from the current one (using their normalised samples), which
+    keeps the update stable when many evaluations are in progress. With
+    manual (non-rectangular) boundaries, points outside the boundaries are
+    scored as ``inf`` without being evaluated, and a new point is sampled;
+    if ``population_size`` points in a row fall outside the boundaries, the
+    last one is returned anyway (and a warning is logged), so that the search
+    distribution can still be updated using finite scores.
+
     Extends :class:`PopulationBasedOptimiser`.
 
     References
@@ -84,6 +97,39 @@ class XNES(pints.PopulationBasedOptimiser):
         self._user_xs.setflags(write=False)
         return self._user_xs
 
+    def ask_one(self):
+        """ See :meth:`Optimiser.ask_one()`. """
+        # Initialise on first call
+        if not self._running:
+            self._initialise()
+
+        for i in range(self._population_size):
+            # Sample from current distribution
+            z = np.random.normal(0, 1, self._n_parameters)
+            x = self._mu + np.dot(self._A, z)
+
+            # Create safe x to pass to user
+            user_x = x
+            if self._boundary_transform is not None:
+                user_x = self._boundary_transform(x)
+            tag = self._n_asked
+            self._n_asked += 1
+            self._pending[tag] = (z, user_x)
+
+            # Manual boundaries? Then don't evaluate points out of bounds,
+            # unless a whole population has been rejected
+            if (not self._manual_boundaries
+                    or self._boundaries.check(user_x)):
+                break
+            if i + 1 < self._population_size:
+                self.tell_one(tag, float('inf'))
+        else:
+            self._logger.warning(
+                'All points requested by XNES are outside the boundaries:'
+                ' returning an out of bounds point.')
+
+        return tag, np.array(user_x, copy=True)
+
     def fbest(self):
         """ See :meth:`Optimiser.fbest()`. """
         return self._fbest
@@ -127,6 +173,13 @@ class XNES(pints.PopulationBasedOptimiser):
         # Identity matrix of appropriate size
         self._I = np.eye(d)
 
+        # Points requested with ask_one() (stored as a dict mapping tags to
+        # normalised samples and transformed points), and points evaluated
+        # since the last update (for use with ask_one() and tell_one())
+        self._pending = {}
+        self._evaluated = []
+        self._n_asked = 0
+
         # Update optimiser state
         self._running = True
 
@@ -154,13 +207,8 @@ class XNES(pints.PopulationBasedOptimiser):
             fx = np.ones((self._population_size, )) * float('inf')
             fx[self._user_ids] = user_fx
 
-        # Order the normalized samples according to the scores
-        order = np.argsort(fx)
-        self._zs = self._zs[order]
-
-        # Update center
-        Gd = np.dot(self._us, self._zs)
-        self._mu += self._eta_mu * np.dot(self._A, Gd)
+        # Update search distribution
+        order = self._update(self._zs, fx)
 
         # Update xbest and fbest
         # Note: The stored values are based on particles, not on the mean of
@@ -172,12 +220,47 @@ class XNES(pints.PopulationBasedOptimiser):
             self._xbest = self._xs[order[0]]
             self._fbest = fx[order[0]]
 
+    def tell_one(self, tag, fx):
+        """ See :meth:`Optimiser.tell_one()`. """
+        try:
+            z, user_x = self._pending.pop(tag)
+        except (AttributeError, KeyError, TypeError):
+            raise ValueError('Unknown tag passed to tell_one().')
+        self._evaluated.append((z, fx))
+
+        # Update xbest and fbest
+        if fx < self._fbest:
+            self._xbest = user_x
+            self._fbest = fx
+
+        # Update search distribution, using the most recent evaluations
+        if len(self._evaluated) == self._population_size:
+            zs = np.array([e[0] for e in self._evaluated])
+            fs = np.array([e[1] for e in self._evaluated])
+            self._evaluated = []
+            self._update(zs, fs)
+
+    def _update(self, zs, fx):
+        """
+        Updates the search distribution using the normalised samples ``zs``
+        and their scores ``fx``, and returns the order of the samples.
+        """
+        # Order the normalized samples according to the scores
+        order = np.argsort(fx)
+        zs = zs[order]
+
+        # Update center
+        Gd = np.dot(self._us, zs)
+        self._mu += self._eta_mu * np.dot(self._A, Gd)
+
         # Update root of covariance matrix
         Gm = np.dot(
-            np.array([np.outer(z, z).T - self._I for z in self._zs]).T,
+            np.array([np.outer(z, z).T - self._I for z in zs]).T,
             self._us)
         self._A *= scipy.linalg.expm(np.dot(0.5 * self._eta_A, Gm))
 
+        return order
+
     def xbest(self):
         """ See :meth:`Optimiser.xbest()`. """
         return self._xbest
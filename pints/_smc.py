@@ -0,0 +1,504 @@
+#
+# Adaptive tempered sequential Monte Carlo
+#
+# This file is part of PINTS.
+#  Copyright (c) 2017-2019, University of Oxford.
+#  For licensing information, see the LICENSE file distributed with the PINTS
+#  software package.
+#
+from __future__ import absolute_import, division
+from __future__ import print_function, unicode_literals
+import pints
+import numpy as np
+
+from scipy.special import logsumexp
+
+from ._mcmc._proposal import GaussianProposal
+
+
+class SMCController(object):
+    """
+    Samples from a posterior distribution using adaptive tempered sequential
+    Monte Carlo (SMC) [1]_ [2]_, and estimates the marginal likelihood.
+
+    A population of ``N`` particles is drawn from the prior, and moved
+    through a sequence of tempered distributions
+
+    ``p_t(x) ~ p(x) * L(x)^beta_t``
+
+    where ``p(x)`` is the prior, ``L(x)`` is the likelihood, and the
+    "temperatures" ``0 = beta_0 < beta_1 < ... < beta_T = 1`` are chosen
+    adaptively. Each stage consists of the following steps:
+
+    1. Choose the next temperature ``beta_t`` (using bisection), so that the
+       conditional effective sample size (CESS) [2]_ of the incremental
+       weights ``L(x)^(beta_t - beta_{t-1})`` equals a fraction of ``N`` (see
+       :meth:`set_target_cess()`).
+
+    2. Reweight the particles, and update the estimate of the marginal
+       likelihood ``log(Z)`` with the log of the weighted mean of the
+       incremental weights.
+
+    3. If the effective sample size (ESS) of the weights drops below a
+       fraction of ``N`` (see :meth:`set_resampling_threshold()`), resample
+       the particles using systematic resampling.
+
+    4. Rejuvenate the particles by applying a number of random walk
+       Metropolis steps targeting ``p_t`` (see :meth:`set_n_mcmc_steps()`),
+       with a Gaussian proposal whose covariance is the weighted covariance of
+       the particles, times ``2.38^2 / d``. This factor is adapted after
+       every stage, to give an acceptance rate close to 0.234.
+
+    At every step, the log-likelihoods of the whole population are
+    calculated in a single call to an :class:`Evaluator`, so that SMC can make
+    full use of parallel (see :meth:`set_parallel()`) or vectorised (see
+    :meth:`LogPDF.evaluate_batch()`) evaluation. The log-prior is evaluated
+    first, using :meth:`LogPrior.evaluate_batch()`, and the log-likelihood is
+    only evaluated for points within the support of the prior.
+
+    Parameters
+    ----------
+    log_likelihood : pints.LogPDF
+        A :class:`LogPDF` function that evaluates points in the parameter
+        space.
+    log_prior : pints.LogPrior
+        A :class:`LogPrior` function on the same parameter space, that can be
+        sampled from.
+
+    References
+    ----------
+    .. [1] "Sequential Monte Carlo samplers". Pierre Del Moral, Arnaud Doucet
+           and Ajay Jasra (2006) Journal of the Royal Statistical Society:
+           Series B, 68(3), pp.411-436.
+           https://doi.org/10.1111/j.1467-9868.2006.00553.x
+
+    .. [2] "Toward Automatic Model Comparison: An Adaptive Sequential Monte
+           Carlo Approach". Yan Zhou, Adam M. Johansen and John A.D. Aston
+           (2016) Journal of Computational and Graphical Statistics, 25(3),
+           pp.701-726.
+           https://doi.org/10.1080/10618600.2015.1060885
+    """
+
+    # Target acceptance rate for the rejuvenation steps
+    _TARGET_ACCEPTANCE = 0.234
+
+    def __init__(self, log_likelihood, log_prior):
+
+        # Store log_likelihood and log_prior
+        if not isinstance(log_likelihood, pints.LogPDF):
+            raise ValueError(
+                'Given log_likelihood must extend pints.LogLikelihood')
+        self._log_likelihood = log_likelihood
+
+        if not isinstance(log_prior, pints.LogPrior):
+            raise ValueError('Given log_prior must extend pints.LogPrior')
+        self._log_prior = log_prior
+
+        # Get dimension
+        self._n_parameters = self._log_likelihood.n_parameters()
+        if self._n_parameters != self._log_prior.n_parameters():
+            raise ValueError(
+                'Given log_likelihood and log_prior must have same number of'
+                ' parameters.')
+
+        # Logging
+        self._log_to_screen = True
+        self._log_filename = None
+        self._log_csv = False
+
+        # By default do serial evaluation
+        self._parallel = False
+        self._n_workers = 1
+        self._parallel_backend = 'processes'
+        self.set_parallel()
+
+        # Default settings
+        self._n_particles = 1000
+        self._n_mcmc_steps = 5
+        self._resampling_threshold = 0.5
+        self._target_cess = 0.9
+
+        # Results
+        self._log_z = None
+        self._samples = None
+        self._temperatures = None
+
+    def _evaluate(self, xs):
+        """
+        Evaluates the log-prior and log-likelihood of all points in ``xs``,
+        and returns a tuple ``(log_prior, log_likelihood)``. Non-finite
+        log-likelihoods, and the log-likelihoods of points outside the
+        support of the prior, are set to ``-inf``.
+        """
+        log_prior = np.array(self._log_prior.evaluate_batch(xs), dtype=float)
+        log_likelihood = -np.inf * np.ones(len(xs))
+        ok = np.isfinite(log_prior)
+        if np.any(ok):
+            log_likelihood[ok] = self._evaluator.evaluate(xs[ok])
+            self._n_evaluations += np.count_nonzero(ok)
+        log_likelihood[~np.isfinite(log_likelihood)] = -np.inf
+        return log_prior, log_likelihood
+
+    def _initialise_evaluator(self, f):
+        """
+        Initialises parallel runners, if desired.
+        """
+        # Create evaluator object
+        if self._parallel:
+            # Use at most n_workers workers
+            n_workers = self._n_workers
+            if self._parallel_backend == 'threads':
+                evaluator = pints.ThreadedEvaluator(f, n_workers=n_workers)
+            elif self._parallel_backend == 'shared_memory':
+                evaluator = pints.SharedMemoryEvaluator(
+                    f, n_workers=n_workers)
+            else:
+                evaluator = pints.ParallelEvaluator(
+                    f, n_workers=n_workers)
+        elif hasattr(f, 'evaluate_batch'):
+            # Evaluate all points in a single (vectorised) call
+            evaluator = pints.BatchEvaluator(f)
+        else:
+            evaluator = pints.SequentialEvaluator(f)
+        return evaluator
+
+    def _initialise_logger(self):
+        """
+        Initialises logger.
+        """
+        self._logger = None
+        if not (self._log_to_screen or self._log_filename):
+            return
+
+        if self._log_to_screen:
+            # Show current settings
+            print('Running adaptive tempered SMC')
+            print('Number of particles: ' + str(self._n_particles))
+            print('Rejuvenation steps per stage: ' + str(self._n_mcmc_steps))
+
+        # Set up logger
+        self._logger = pints.Logger()
+        if not self._log_to_screen:
+            self._logger.set_stream(None)
+        if self._log_filename:
+            self._logger.set_filename(self._log_filename, csv=self._log_csv)
+
+        # Add fields to log
+        self._logger.add_counter('Stage', max_value=1000)
+        self._logger.add_counter(
+            'Eval.', max_value=1000 * self._n_particles * self._n_mcmc_steps)
+        self._logger.add_float('Temperature')
+        self._logger.add_float('ESS')
+        self._logger.add_float('log(Z)')
+        self._logger.add_float('Accept.')
+        self._logger.add_time('Time m:s')
+
+    def marginal_log_likelihood(self):
+        """
+        Returns the estimate of the marginal log likelihood obtained in the
+        last run, or ``None`` if no run has been performed.
+        """
+        return self._log_z
+
+    def n_mcmc_steps(self):
+        """
+        Returns the number of random walk Metropolis steps used to rejuvenate
+        the particles after every stage.
+        """
+        return self._n_mcmc_steps
+
+    def n_particles(self):
+        """
+        Returns the number of particles used.
+        """
+        return self._n_particles
+
+    def _next_temperature(self, beta, log_w, log_likelihood):
+        """
+        Returns the next temperature, chosen so that the CESS of the
+        incremental weights is ``target_cess`` times its maximum value.
+        """
+        finite = np.isfinite(log_likelihood)
+
+        def log_cess(delta):
+            with np.errstate(invalid='ignore'):
+                log_inc = np.where(finite, delta * log_likelihood, -np.inf)
+            return (2 * logsumexp(log_w + log_inc)
+                    - logsumexp(log_w + 2 * log_inc))
+
+        # Particles with a log-likelihood of -inf are given weight zero by any
+        # increase in temperature: measure CESS relative to the remainder
+        target = np.log(self._target_cess) + log_cess(0)
+
+        # Go straight to the posterior if possible
+        lower, upper = 0, 1 - beta
+        if log_cess(upper) >= target:
+            return 1
+
+        # Bisect, to a relative tolerance
+        for i in range(100):
+            delta = 0.5 * (lower + upper)
+            if log_cess(delta) >= target:
+                lower = delta
+            else:
+                upper = delta
+            if upper - lower < 1e-6 * upper:
+                break
+        return beta + upper
+
+    def parallel(self):
+        """
+        Returns the number of parallel worker processes this routine will be
+        run on, or ``False`` if parallelisation is disabled.
+        """
+        return self._n_workers if self._parallel else False
+
+    def _rejuvenate(self, x, log_prior, log_likelihood, beta, log_w):
+        """
+        Applies ``n_mcmc_steps`` random walk Metropolis steps targeting the
+        tempered distribution at ``beta`` to all particles (in place), and
+        returns the acceptance rate.
+        """
+        if self._n_mcmc_steps == 0:
+            return 0
+
+        # Update proposal covariance using the weighted particles
+        w = np.exp(log_w - logsumexp(log_w))
+        mean = np.dot(w, x)
+        sigma = np.dot((x - mean).T * w, x - mean)
+        self._proposal.set_covariance(sigma)
+        scale = self._scale * 2.38**2 / self._n_parameters
+
+        # Current tempered log pdfs
+        log_pdf = _tempered(log_prior, log_likelihood, beta)
+
+        accepted = 0
+        for i in range(self._n_mcmc_steps):
+            y = self._proposal.sample(x, scale)
+            y_log_prior, y_log_likelihood = self._evaluate(y)
+            y_log_pdf = _tempered(y_log_prior, y_log_likelihood, beta)
+
+            # Accept or reject every particle
+            u = np.log(np.random.uniform(0, 1, size=len(x)))
+            with np.errstate(invalid='ignore'):
+                accept = u < y_log_pdf - log_pdf
+            x[accept] = y[accept]
+            log_prior[accept] = y_log_prior[accept]
+            log_likelihood[accept] = y_log_likelihood[accept]
+            log_pdf[accept] = y_log_pdf[accept]
+            accepted += np.count_nonzero(accept)
+
+        # Adapt scale factor for the next stage
+        rate = accepted / (self._n_mcmc_steps * len(x))
+        self._scale *= np.exp(rate - self._TARGET_ACCEPTANCE)
+        return rate
+
+    def resampling_threshold(self):
+        """
+        Returns the fraction of the number of particles below which the ESS
+        must drop to trigger resampling.
+        """
+        return self._resampling_threshold
+
+    def run(self):
+        """
+        Runs the SMC routine, and returns an array of ``n_particles``
+        (equally weighted) samples from the posterior.
+
+        The estimated marginal log likelihood can then be obtained with
+        :meth:`marginal_log_likelihood()`.
+        """
+        n = self._n_particles
+        d = self._n_parameters
+
+        # Set up evaluation, proposal, and progress reporting
+        self._evaluator = self._initialise_evaluator(self._log_likelihood)
+        self._n_evaluations = 0
+        self._proposal = GaussianProposal(np.ones(d))
+        self._scale = 1
+        self._initialise_logger()
+        timer = pints.Timer()
+
+        # Draw initial particles from the prior, and evaluate them all at once
+        x = np.array(self._log_prior.sample(n), dtype=float).reshape((n, d))
+        log_prior, log_likelihood = self._evaluate(x)
+        if not np.any(np.isfinite(log_likelihood)):
+            raise ValueError(
+                'None of the initial particles has a finite log-likelihood.')
+
+        # Normalised log weights, temperature, and marginal log likelihood
+        log_w = -np.log(n) * np.ones(n)
+        beta = 0
+        log_z = 0
+        temperatures = [beta]
+        if self._logger:
+            self._logger.log(0, self._n_evaluations, beta, n, log_z, 1,
+                             timer.time())
+
+        # Move through tempered distributions
+        while beta < 1:
+            # Reweight using the incremental weights
+            new_beta = self._next_temperature(beta, log_w, log_likelihood)
+            log_inc = _tempered(0, log_likelihood, new_beta - beta)
+            log_z += logsumexp(log_w + log_inc)
+            log_w += log_inc
+            log_w -= logsumexp(log_w)
+            beta = new_beta
+            temperatures.append(beta)
+
+            # Resample if the ESS is too low
+            ess = np.exp(-logsumexp(2 * log_w))
+            if ess < self._resampling_threshold * n:
+                i = _systematic_resample(np.exp(log_w), n)
+                x = x[i]
+                log_prior = log_prior[i]
+                log_likelihood = log_likelihood[i]
+                log_w = -np.log(n) * np.ones(n)
+
+            # Rejuvenate
+            rate = self._rejuvenate(x, log_prior, log_likelihood, beta, log_w)
+
+            if self._logger:
+                self._logger.log(len(temperatures) - 1, self._n_evaluations,
+                                 beta, ess, log_z, rate, timer.time())
+
+        # Return equally weighted samples
+        if np.any(log_w != log_w[0]):
+            x = x[_systematic_resample(np.exp(log_w), n)]
+        self._samples = x
+        self._log_z = log_z
+        self._temperatures = np.array(temperatures)
+        return self._samples
+
+    def set_log_to_file(self, filename=None, csv=False):
+        """
+        Enables logging to file when a filename is passed in, disables it if
+        ``filename`` is ``False`` or ``None``.
+
+        The argument ``csv`` can be set to ``True`` to write the file in comma
+        separated value (CSV) format. By default, the file contents will be
+        similar to the output on screen.
+        """
+        if filename:
+            self._log_filename = str(filename)
+            self._log_csv = True if csv else False
+        else:
+            self._log_filename = None
+            self._log_csv = False
+
+    def set_log_to_screen(self, enabled):
+        """
+        Enables or disables logging to screen.
+        """
+        self._log_to_screen = True if enabled else False
+
+    def set_n_mcmc_steps(self, n_steps):
+        """
+        Sets the number of random walk Metropolis steps used to rejuvenate
+        the particles after every stage. Each step requires the evaluation of
+        a new population of ``n_particles`` points.
+        """
+        n_steps = int(n_steps)
+        if n_steps < 0:
+            raise ValueError('Number of MCMC steps cannot be negative.')
+        self._n_mcmc_steps = n_steps
+
+    def set_n_particles(self, n_particles):
+        """
+        Sets the number of particles to use.
+        """
+        n_particles = int(n_particles)
+        if n_particles < 2:
+            raise ValueError('Number of particles must be at least 2.')
+        self._n_particles = n_particles
+
+    def set_parallel(self, parallel=False, backend='processes'):
+        """
+        Enables/disables parallel evaluation.
+
+        If ``parallel=True``, the method will run using a number of worker
+        processes equal to the detected cpu core count. The number of workers
+        can be set explicitly by setting ``parallel`` to an integer greater
+        than 0.
+        Parallelisation can be disabled by setting ``parallel`` to ``0`` or
+        ``False``.
+
+        The ``backend`` determines how parallel evaluation is performed, as
+        in :meth:`NestedController.set_parallel()`.
+        """
+        if backend not in ('processes', 'shared_memory', 'threads'):
+            raise ValueError(
+                'Unknown parallel backend "' + str(backend) + '".')
+        self._parallel_backend = backend
+
+        if parallel is True:
+            self._parallel = True
+            self._n_workers = pints.ParallelEvaluator.cpu_count()
+        elif parallel >= 1:
+            self._parallel = True
+            self._n_workers = int(parallel)
+        else:
+            self._parallel = False
+            self._n_workers = 1
+
+    def set_resampling_threshold(self, threshold):
+        """
+        Sets the threshold for resampling: the particles are resampled
+        whenever the ESS drops below ``threshold * n_particles``. Setting a
+        threshold of 1 resamples at every stage.
+        """
+        threshold = float(threshold)
+        if threshold <= 0 or threshold > 1:
+            raise ValueError(
+                'Resampling threshold must be greater than 0 and at most 1.')
+        self._resampling_threshold = threshold
+
+    def set_target_cess(self, ratio):
+        """
+        Sets the ratio ``0 < ratio < 1`` used to choose the next temperature:
+        each new temperature is chosen so that the conditional effective
+        sample size of the incremental weights is ``ratio * n_particles``.
+
+        Higher values lead to more, smaller, stages, while lower values lead
+        to fewer stages, but a noisier estimate of the marginal likelihood.
+        """
+        ratio = float(ratio)
+        if ratio <= 0 or ratio >= 1:
+            raise ValueError('Target CESS ratio must be between 0 and 1.')
+        self._target_cess = ratio
+
+    def target_cess(self):
+        """
+        Returns the ratio used to choose the next temperature (see
+        :meth:`set_target_cess()`).
+        """
+        return self._target_cess
+
+    def temperatures(self):
+        """
+        Returns the sequence of temperatures ``beta_t`` used in the last run,
+        or ``None`` if no run has been performed.
+        """
+        return self._temperatures
+
+
+def _systematic_resample(w, n):
+    """
+    Draws ``n`` indices from a set of normalised weights ``w`` using
+    systematic resampling.
+    """
+    c = np.cumsum(w)
+    c[-1] = 1
+    u = (np.random.uniform(0, 1) + np.arange(n)) / n
+    return np.searchsorted(c, u)
+
+
+def _tempered(log_prior, log_likelihood, beta):
+    """
+    Returns ``log_prior + beta * log_likelihood``, where points with a
+    log-likelihood of ``-inf`` are given the value ``-inf`` (also if
+    ``beta = 0``).
+    """
+    finite = np.isfinite(log_likelihood)
+    with np.errstate(invalid='ignore'):
+        return np.where(finite, log_prior + beta * log_likelihood, -np.inf)
@@ -10,7 +10,275 @@ from __future__ import absolute_import, division
 from __future__ import print_function, unicode_literals
 
 
-def load_samples(filename, n=None):
+class ChainWriter(object):
+    """
+    Writes samples (or other rows of floats) to a binary file, as they are
+    generated.
+
+    Rows are stored in a buffer in memory, and written to disk in blocks of
+    ``buffer_size`` rows (or when :meth:`flush()` or :meth:`close()` is
+    called). This is much faster than writing each row to a CSV file, and
+    creates much smaller files.
+
+    Files are stored in the NumPy ``.npy`` format, so that they can be read
+    with :meth:`load_samples()` or ``numpy.load()``. The header of each file
+    is given a fixed size, and is updated after every block has been written
+    to disk. As a result, a file always contains a valid array with all rows
+    written up to the last flush, even if the writing process is interrupted.
+
+    Example::
+
+        with pints.io.ChainWriter('chain.npy', 3) as w:
+            for sample in samples:
+                w.log(*sample)
+
+    Parameters
+    ----------
+    filename
+        The path to write to.
+    n_columns
+        The number of values in each row.
+    buffer_size
+        The number of rows to store in memory before writing to disk.
+    append
+        Set to ``True`` to append to an existing file written by a
+        ``ChainWriter``, instead of overwriting it. Any rows written after the
+        last flush of the existing file, and any incomplete rows (e.g. if the
+        file was truncated), are discarded.
+    """
+
+    # Fixed size of the .npy header, in bytes (a multiple of 64, and large
+    # enough to store any shape that fits in 64 bits)
+    _HEADER_SIZE = 128
+
+    def __init__(self, filename, n_columns, buffer_size=1000, append=False):
+        import numpy as np
+        import os
+
+        self._filename = str(filename)
+
+        n_columns = int(n_columns)
+        if n_columns < 1:
+            raise ValueError('Number of columns must be at least 1.')
+        self._n_columns = n_columns
+
+        buffer_size = int(buffer_size)
+        if buffer_size < 1:
+            raise ValueError('Buffer size must be at least 1.')
+        self._buffer = np.zeros((buffer_size, n_columns))
+        self._n_buffered = 0
+
+        # Open file, and write header
+        self._n_rows = 0
+        if append and os.path.isfile(self._filename):
+            self._file = open(self._filename, 'r+b')
+            shape = _read_npy_shape(self._file)
+            if (shape is None or self._file.tell() != self._HEADER_SIZE
+                    or len(shape) != 2):
+                self._file.close()
+                raise ValueError(
+                    'Unable to append to ' + self._filename + ': File was'
+                    ' not written by a ChainWriter.')
+            if shape[1] != n_columns:
+                self._file.close()
+                raise ValueError(
+                    'Unable to append to ' + self._filename + ': File has '
+                    + str(shape[1]) + ' columns, expecting '
+                    + str(n_columns) + '.')
+            # Use the number of rows in the header, or the number of complete
+            # rows in the file if it was truncated
+            self._file.seek(0, os.SEEK_END)
+            n_stored = (self._file.tell() - self._HEADER_SIZE) // (
+                8 * n_columns)
+            self._n_rows = min(shape[0], n_stored)
+            self._file.seek(self._HEADER_SIZE + self._n_rows * n_columns * 8)
+            self._file.truncate()
+        else:
+            self._file = open(self._filename, 'w+b')
+        self._write_header()
+
+    def __del__(self):
+        try:
+            self.close()
+        except Exception:   # pragma: no cover
+            pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        """
+        Writes any buffered rows to disk, and closes the file.
+        """
+        if self._file is not None:
+            self.flush()
+            self._file.close()
+            self._file = None
+
+    def flush(self):
+        """
+        Writes any buffered rows to disk, and updates the file header.
+        """
+        import os
+
+        if self._file is None:
+            raise RuntimeError('Unable to write: File has been closed.')
+        if self._n_buffered:
+            # Write data first, then update the header, so that the header
+            # never refers to rows that haven't been written yet.
+            self._file.seek(0, os.SEEK_END)
+            self._file.write(
+                self._buffer[:self._n_buffered].astype('<f8').tobytes())
+            self._n_rows += self._n_buffered
+            self._n_buffered = 0
+            self._file.flush()
+            self._write_header()
+
+    def log(self, *values):
+        """
+        Adds a single row, containing the given ``values``.
+
+        This method has the same signature as :meth:`pints.Logger.log()`, so
+        that a ``ChainWriter`` can be used where a logger would be.
+        """
+        if len(values) != self._n_columns:
+            raise ValueError(
+                'Expecting ' + str(self._n_columns) + ' values, got '
+                + str(len(values)) + '.')
+        if self._file is None:
+            raise RuntimeError('Unable to write: File has been closed.')
+        self._buffer[self._n_buffered] = values
+        self._n_buffered += 1
+        if self._n_buffered == len(self._buffer):
+            self.flush()
+
+    def n_rows(self):
+        """
+        Returns the number of rows written so far (including any rows that
+        are still buffered).
+        """
+        return self._n_rows + self._n_buffered
+
+    def write(self, rows):
+        """
+        Adds a sequence of ``rows`` (e.g. a 2d array).
+        """
+        import numpy as np
+        import os
+
+        rows = np.asarray(rows, dtype=float)
+        if rows.ndim != 2 or rows.shape[1] != self._n_columns:
+            raise ValueError(
+                'Rows must be given as a 2d array with '
+                + str(self._n_columns) + ' columns.')
+        if self._file is None:
+            raise RuntimeError('Unable to write: File has been closed.')
+        self.flush()
+        if len(rows) > 0:
+            self._file.seek(0, os.SEEK_END)
+            self._file.write(rows.astype('<f8').tobytes())
+            self._n_rows += len(rows)
+            self._file.flush()
+            self._write_header()
+
+    def _write_header(self):
+        """ Writes or updates the .npy header. """
+        import struct
+
+        header = "{'descr': '<f8', 'fortran_order': False, 'shape': (" \
+            + str(self._n_rows) + ', ' + str(self._n_columns) + '), }'
+        n = self._HEADER_SIZE - 10 - 1
+        header = header.ljust(n).encode('latin1') + b'\n'
+        self._file.seek(0)
+        self._file.write(
+            b'\x93NUMPY\x01\x00' + struct.pack('<H', n + 1) + header)
+        self._file.flush()
+
+
+def _is_npy(filename):
+    """
+    Returns ``True`` if the given file is stored in the NumPy ``.npy`` format.
+    """
+    with open(filename, 'rb') as f:
+        return f.read(6) == b'\x93NUMPY'
+
+
+def _read_npy_shape(f):
+    """
+    Reads the header of the ``.npy`` file opened as ``f``, and returns the
+    shape of the stored array, or ``None`` if the file is not a 1.0 format
+    ``.npy`` file containing little-endian doubles. After reading, the file
+    position is at the end of the header.
+    """
+    import ast
+    import struct
+
+    f.seek(0)
+    head = f.read(10)
+    if len(head) < 10 or head[:8] != b'\x93NUMPY\x01\x00':
+        return None
+    n = struct.unpack('<H', head[8:])[0]
+    try:
+        header = ast.literal_eval(f.read(n).decode('latin1'))
+        if header['descr'] != '<f8' or header['fortran_order']:
+            return None
+        return tuple(header['shape'])
+    except (KeyError, SyntaxError, TypeError, ValueError):
+        return None
+
+
+def _load(filename, columns=None, burn_in=0, thinning=1):
+    """
+    Loads samples from a single CSV or binary file, see
+    :meth:`load_samples()`.
+    """
+    import itertools
+    import numpy as np
+    import warnings
+
+    # Binary files: return a view of a memory-mapped array
+    if _is_npy(filename):
+        try:
+            samples = np.load(filename, mmap_mode='r')
+        except ValueError:
+            # Empty arrays can't be memory-mapped
+            samples = np.load(filename)
+        samples = samples[burn_in::thinning]
+        if columns is not None:
+            samples = samples[:, columns]
+        return samples
+
+    # CSV files: skip the header and burn-in, and pass only the selected rows
+    # to NumPy's (compiled) text parser
+    with warnings.catch_warnings():
+        # Don't warn about files without samples
+        warnings.simplefilter('ignore', UserWarning)
+        if thinning == 1:
+            # Let NumPy read the file directly (fastest)
+            samples = np.loadtxt(
+                filename, delimiter=',', skiprows=1 + burn_in,
+                usecols=columns, ndmin=2, dtype=float)
+        else:
+            with open(filename, 'r') as f:
+                rows = itertools.islice(f, 1 + burn_in, None, thinning)
+                samples = np.loadtxt(
+                    rows, delimiter=',', usecols=columns, ndmin=2,
+                    dtype=float)
+    if samples.size == 0:
+        with open(filename, 'r') as f:
+            n_columns = len(next(f, '').split(','))
+        if columns is not None:
+            n_columns = len(columns)
+        samples = samples.reshape((0, n_columns))
+    return samples
+
+
+def load_samples(
+        filename, n=None, columns=None, burn_in=0, thinning=1,
+        parallel=False):
     """
     Loads samples from the given ``filename`` and returns a 2d numpy array
     containing them.
@@ -20,24 +288,53 @@ def load_samples(filename, n=None):
     become ``test_0.csv``, ``test_1.csv``, ..., ``test_n.csv``. In this case
     a list of 2d numpy arrays is returned.
 
-    Assumes the first line in each file is a header.
+    Files can be in CSV format, in which case the first line in each file is
+    assumed to be a header, or in the binary ``.npy`` format written by
+    :class:`ChainWriter` (and by :meth:`save_samples()` if a filename ending
+    in ``.npy`` is given). Binary files are memory-mapped rather than read
+    into memory, and are returned as read-only ``numpy.memmap`` arrays.
+
+    Parts of each file can be selected using the optional arguments below.
+    Rows that are not selected are skipped without being parsed (for CSV
+    files) or read from disk (for binary files).
+
+    Parameters
+    ----------
+    filename
+        The file to load, or the filename to derive ``n`` filenames from.
+    n
+        The number of files to load, or ``None`` to load a single file.
+    columns
+        An optional sequence of column indices to load.
+    burn_in
+        The number of rows to discard at the start of each file.
+    thinning
+        Only every ``thinning``-th row (after the burn-in) is loaded.
+    parallel
+        Set to ``True`` to load multiple CSV files in parallel, using a
+        :class:`pints.ParallelEvaluator` with (at most) one process per file.
+        The number of processes can be set explicitly by passing an integer
+        greater than 0.
 
     See also :meth:`save_samples()`.
     """
-    import numpy as np
     import os
+    import pints
 
-    # Define data loading method
-    def load(filename):
-        with open(filename, 'r') as f:
-            lines = iter(f)
-            next(lines)  # Skip header
-            return np.asarray(
-                [[float(x) for x in line.split(',')] for line in lines])
+    # Check arguments
+    if columns is not None:
+        columns = [int(x) for x in columns]
+    burn_in = int(burn_in)
+    if burn_in < 0:
+        raise ValueError('Burn-in cannot be negative.')
+    thinning = int(thinning)
+    if thinning < 1:
+        raise ValueError('Thinning must be at least 1.')
+    args = (columns, burn_in, thinning)
 
     # Load from filename directly
     if n is None:
-        return load(filename)
+        return _load(filename, *args)
 
     # Load from systematically named files
     n = int(n)
@@ -55,8 +352,16 @@ def load_samples(filename, n=None):
             except NameError:   # pragma: no python 3 cover
                 raise IOError('File not found: ' + filename)
 
+    # Load CSV files in parallel (binary files are memory-mapped instead)
+    if parallel is True:
+        parallel = min(n, pints.ParallelEvaluator.cpu_count())
+    if parallel > 1 and not _is_npy(filenames[0]):
+        evaluator = pints.ParallelEvaluator(
+            _load, n_workers=min(n, int(parallel)), args=args)
+        return evaluator.evaluate(filenames)
+
     # Load and return
-    return [load(filename) for filename in filenames]
+    return [_load(filename, *args) for filename in filenames]
 
 
 def save_samples(filename, *sample_lists):
@@ -72,11 +377,15 @@ def save_samples(filename, *sample_lists):
     ``save_samples('test.csv', samples_0, samples_1)`` will store the samples
     from ``samples_0`` to ``test_0.csv`` and ``samples_1`` to ``test_1.csv``.
 
+    If ``filename`` ends in ``.npy``, the samples are stored in the binary
+    format used by :class:`ChainWriter`. Otherwise, they are stored in CSV
+    format, using the maximum precision format of :meth:`pints.strfloat()`
+    (so that the samples can be loaded without loss of precision).
+
     See also: :meth:`load_samples()`.
     """
     import numpy as np
     import os
-    import pints
 
     # Get filenames
     k = len(sample_lists)
@@ -99,12 +408,21 @@ def save_samples(filename, *sample_lists):
         raise ValueError(
             'Samples must be given as 2d arrays (e.g. lists of lists).')
 
-    # Store
-    filename = iter(filenames)
+    # Store in binary format
+    if os.path.splitext(filename)[1].lower() == '.npy':
+        for filename, samples in zip(filenames, sample_lists):
+            with ChainWriter(filename, shape[1]) as w:
+                w.write(samples)
+        return
+
+    # Store, formatting entire rows at once (using the same format as
+    # pints.strfloat), and writing in blocks
     header = ','.join(['"p' + str(j) + '"' for j in range(shape[1])])
-    for samples in sample_lists:
-        with open(next(filename), 'w') as f:
+    row = ','.join(['% .17e'] * shape[1])
+    block = 10000
+    for filename, samples in zip(filenames, sample_lists):
+        with open(filename, 'w') as f:
             f.write(header + '\n')
-            for sample in samples:
-                f.write(','.join([pints.strfloat(x) for x in sample]) + '\n')
-
+            for i in range(0, len(samples), block):
+                rows = samples[i:i + block].tolist()
+                f.write('\n'.join([row % tuple(x) for x in rows]) + '\n')
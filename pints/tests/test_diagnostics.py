@@ -33,6 +33,14 @@ class TestDiagnostics(unittest.TestCase):
         for i in range(0, len(x)):
             self.assertAlmostEqual(y[i], y_true[i])
 
+        # Multi-dimensional arrays are handled along the given axis
+        x = np.random.normal(size=(3, 50, 2))
+        y = pints._diagnostics.autocorrelation(x, axis=1)
+        self.assertEqual(y.shape, x.shape)
+        z = np.correlate(x[2, :, 1] - np.mean(x[2, :, 1]),
+                         x[2, :, 1] - np.mean(x[2, :, 1]), mode='full')[49:]
+        self.assertTrue(np.allclose(y[2, :, 1], z / z[0]))
+
     def test_autocorrelation_negative(self):
         # Tests autocorrelation_negative yields the correct result
         # under both possibilities
@@ -131,6 +139,67 @@ class TestDiagnostics(unittest.TestCase):
         d = np.array(y) - np.array([1.0246953961614296, 1.3219816558533388])
         self.assertLess(np.linalg.norm(d), 0.01)
 
+        # Chains of unequal length, as used for a split odd-length chain
+        self.assertTrue(np.allclose(
+            pints._diagnostics.rhat_all_params([x[0], x[1][:3]]),
+            [pints._diagnostics.rhat([x[0][:, i], x[1][:3, i]])
+             for i in range(2)]))
+
+    def test_geyer_tau(self):
+        # Tests the truncated autocorrelation time, used by both the
+        # multi-chain ess and the streaming convergence monitor
+
+        # Exact AR(1) autocorrelation: tau = (1 + a) / (1 - a)
+        a = 0.8
+        rho = (a**np.arange(1000)).reshape((1000, 1))
+        tau = pints._diagnostics._geyer_tau(np.hstack((rho, rho**2)))
+        self.assertTrue(np.allclose(tau, [9, (1 + a**2) / (1 - a**2)]))
+
+        # The sum is truncated at the first non-positive pair
+        rho = np.array([[1, 0.5, 0.2, -0.3, 0.4, 0.4]]).T
+        self.assertAlmostEqual(pints._diagnostics._geyer_tau(rho)[0], 2)
+
+    def test_rank_normalised_diagnostics(self):
+        # Tests rank-normalised rhat, bulk and tail ess, and mcse
+
+        # Independent samples: ess close to the number of samples
+        np.random.seed(1)
+        x = np.random.normal(size=(4, 1000, 2))
+        for ess in (pints.bulk_effective_sample_size(x),
+                    pints.tail_effective_sample_size(x)):
+            self.assertEqual(ess.shape, (2, ))
+            self.assertTrue(np.all(np.abs(ess - 4000) < 400))
+        rhat = pints.rank_normalised_rhat(x)
+        self.assertTrue(np.all(np.abs(rhat - 1) < 0.01))
+        mcse = pints.monte_carlo_standard_error(x)
+        self.assertTrue(np.all(np.abs(mcse - 1 / np.sqrt(4000)) < 0.002))
+
+        # AR(1) chains: ess close to n / tau, with tau = (1 + a) / (1 - a)
+        a = 0.8
+        y = np.random.normal(size=(4, 5000, 2))
+        for t in range(1, 5000):
+            y[:, t] += a * y[:, t - 1]
+        ess = pints.bulk_effective_sample_size(y)
+        self.assertTrue(np.all(np.abs(ess / (20000.0 / 9) - 1) < 0.15))
+
+        # A chain with a different location or scale gives a large rhat
+        y[0] += 5
+        self.assertTrue(np.all(pints.rank_normalised_rhat(y) > 1.05))
+        y[0] = 5 * (y[0] - 5)
+        self.assertTrue(np.all(pints.rank_normalised_rhat(y) > 1.05))
+
+        # A single chain that drifts is detected by splitting
+        z = x[:1] + np.linspace(0, 1, 1000).reshape((1, 1000, 1))
+        self.assertTrue(np.all(pints.rank_normalised_rhat(z) > 1.05))
+        self.assertTrue(np.all(pints.rank_normalised_rhat(z[:, :999]) > 1.05))
+
+        # Bad calls
+        self.assertRaisesRegex(
+            ValueError, '3d array', pints.bulk_effective_sample_size, x[0])
+        self.assertRaisesRegex(
+            ValueError, 'At least four', pints.rank_normalised_rhat,
+            x[:, :3])
+
 
 if __name__ == '__main__':
     print('Add -v for more debug output')
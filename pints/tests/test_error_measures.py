@@ -103,6 +103,41 @@ class TestErrorMeasures(unittest.TestCase):
     def __init__(self, name):
         super(TestErrorMeasures, self).__init__(name)
 
+    def test_evaluate_batch(self):
+        """ Tests batch evaluation of error measures. """
+
+        # Single output
+        model = pints.toy.LogisticModel()
+        times = np.linspace(0, 100, 20)
+        values = model.simulate([0.1, 50], times)
+        values += np.linspace(-1, 1, len(times))
+        p1 = pints.SingleOutputProblem(model, times, values)
+
+        # Multi-output
+        model = pints.toy.ConstantModel(2)
+        times = np.arange(1, 6)
+        values = np.arange(10).reshape((5, 2))
+        p2 = pints.MultiOutputProblem(model, times, values)
+
+        xs = np.array([[0.1, 50], [0.11, 48], [0.2, 30]])
+        errors = [
+            pints.MeanSquaredError(p1),
+            pints.MeanSquaredError(p2, weights=[1, 2]),
+            pints.RootMeanSquaredError(p1),
+            pints.SumOfSquaresError(p1),
+            pints.SumOfSquaresError(p2, weights=[3, 1]),
+            pints.SumOfErrors(
+                [pints.MeanSquaredError(p1), pints.SumOfSquaresError(p1)],
+                [1, 2]),
+            pints.ProbabilityBasedError(pints.GaussianLogPrior(1, 3)),
+        ]
+        for e in errors:
+            ys = xs[:, :e.n_parameters()]
+            fs = e.evaluate_batch(ys)
+            self.assertEqual(fs.shape, (len(ys), ))
+            for y, f in zip(ys, fs):
+                self.assertAlmostEqual(f, e(y))
+
     def test_mean_squared_error_single(self):
         """ Tests :class:`pints.MeanSquaredError` with a single output. """
 
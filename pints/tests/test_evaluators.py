@@ -8,6 +8,7 @@
 #  software package.
 #
 import pints
+import pints.toy
 import unittest
 import numpy as np
 
@@ -62,6 +63,88 @@ class TestEvaluators(unittest.TestCase):
         # Args must be a sequence
         self.assertRaises(ValueError, pints.SequentialEvaluator, f_args, 1)
 
+    def test_asynchronous(self):
+
+        # Create test data
+        xs = np.random.normal(0, 10, 100)
+        ys = [f(x) for x in xs]
+
+        for backend in ('threads', 'processes'):
+            # Test evaluate method
+            e = pints.AsynchronousEvaluator(f, n_workers=2, backend=backend)
+            self.assertTrue(np.all(ys == e.evaluate(xs)))
+            self.assertEqual(e.evaluate([]), [])
+
+            # Test submitting and waiting
+            self.assertEqual(e.wait(), [])
+            e.submit(3, 'a')
+            e.submit(4)
+            self.assertEqual(e.n_pending(), 2)
+            results = []
+            while e.n_pending():
+                results.extend(e.wait())
+            self.assertEqual(len(results), 2)
+            self.assertIn(('a', 3, 9), results)
+            self.assertIn((None, 4, 16), results)
+
+            # Can't call evaluate while submissions are pending
+            e.submit(3)
+            self.assertRaisesRegex(RuntimeError, 'pending', e.evaluate, [1])
+            e.wait()
+
+            # Test args
+            e = pints.AsynchronousEvaluator(f_args, 2, [10, 20], backend)
+            self.assertEqual(e.evaluate([1, 2]), [31, 32])
+
+            # Exceptions are passed on, and cancel pending evaluations
+            e = pints.AsynchronousEvaluator(
+                ioerror_on_five, n_workers=1, backend=backend)
+            self.assertRaises(IOError, e.evaluate, [5, 2, 1])
+            self.assertEqual(e.n_pending(), 0)
+            self.assertEqual(e.evaluate([1, 2]), [1, 2])
+
+        # Function must be callable
+        self.assertRaises(ValueError, pints.AsynchronousEvaluator, 3)
+
+        # Argument must be sequence
+        self.assertRaises(ValueError, e.evaluate, 1)
+
+        # Args must be a sequence
+        self.assertRaises(
+            ValueError, pints.AsynchronousEvaluator, f_args, args=1)
+
+        # n-workers must be >0
+        self.assertRaises(ValueError, pints.AsynchronousEvaluator, f, 0)
+
+        # Backend must be known
+        self.assertRaisesRegex(
+            ValueError, 'Unknown backend', pints.AsynchronousEvaluator, f,
+            backend='fibers')
+
+    def test_batch(self):
+
+        # Create test data
+        log_pdf = pints.GaussianLogPrior(3, 2)
+        xs = np.random.normal(0, 10, (100, 1))
+        ys = [log_pdf(x) for x in xs]
+
+        # Test batch evaluator
+        e = pints.BatchEvaluator(log_pdf)
+        fs = e.evaluate(xs)
+        self.assertIsInstance(fs, list)
+        self.assertTrue(np.allclose(ys, fs))
+        self.assertEqual(e.evaluate([]), [])
+
+        # Function must have a batch method
+        self.assertRaises(ValueError, pints.BatchEvaluator, f)
+
+        # Argument must be sequence
+        self.assertRaises(ValueError, e.evaluate, 1)
+
+        # Test args
+        e = pints.BatchEvaluator(BatchArgs(), [10, 20])
+        self.assertEqual(e.evaluate([1, 2]), [31, 32])
+
     def test_parallel(self):
 
         # Create test data
@@ -91,6 +174,12 @@ class TestEvaluators(unittest.TestCase):
         # max tasks must be >0
         self.assertRaises(ValueError, pints.ParallelEvaluator, f, 1, 0)
 
+        # Chunk size must be >0, target time can't be negative
+        self.assertRaises(
+            ValueError, pints.ParallelEvaluator, f, chunk_size=0)
+        self.assertRaises(
+            ValueError, pints.ParallelEvaluator, f, target_chunk_time=-1)
+
         # Exceptions in called method should trigger halt, cause new exception
         e = pints.ParallelEvaluator(ioerror_on_five, n_workers=2)
         self.assertRaisesRegex(
@@ -103,6 +192,189 @@ class TestEvaluators(unittest.TestCase):
             Exception, 'Exception in subprocess', e.evaluate, [1, 2, 4])
         e.evaluate([1, 2])
 
+    def test_parallel_chunks(self):
+
+        # Adaptive chunks cover all positions, and get smaller
+        e = pints.ParallelEvaluator(f, n_workers=2)
+        chunks = e._chunks(100)
+        self.assertEqual(chunks[0][0], 0)
+        self.assertEqual(chunks[-1][1], 100)
+        for a, b in zip(chunks[:-1], chunks[1:]):
+            self.assertEqual(a[1], b[0])
+            self.assertGreaterEqual(a[1] - a[0], b[1] - b[0])
+        self.assertEqual(chunks[0], (0, 25))
+        self.assertEqual(chunks[-1], (99, 100))
+        self.assertEqual(e._chunks(0), [])
+
+        # Cheap functions get a minimum chunk size
+        e._cost = 1e-4
+        chunks = e._chunks(100)
+        self.assertEqual(chunks, [(0, 50), (50, 100)])
+
+        # Fixed chunk size
+        e = pints.ParallelEvaluator(f, n_workers=2, chunk_size=40)
+        self.assertEqual(e._chunks(100), [(0, 40), (40, 80), (80, 100)])
+
+        # Results are in the right order, utilisation is reported
+        self.assertEqual(e.utilisation(), [0, 0])
+        for chunk_size in (None, 1, 7, 1000):
+            e = pints.ParallelEvaluator(
+                f, n_workers=2, chunk_size=chunk_size)
+            xs = np.random.normal(0, 10, 100)
+            ys = [f(x) for x in xs]
+            self.assertTrue(np.all(ys == e.evaluate(xs)))
+            self.assertTrue(np.all(ys == e.evaluate(xs)))
+            u = e.utilisation()
+            self.assertEqual(len(u), 2)
+            self.assertTrue(np.all(np.array(u) >= 0))
+            self.assertTrue(np.all(np.array(u) <= 1))
+        self.assertIsNotNone(e._cost)
+
+    def test_shared_memory(self):
+
+        # Create test data
+        xs = np.random.normal(0, 10, 100)
+        ys = [f(x) for x in xs]
+
+        # Test shared memory evaluator
+        e = pints.SharedMemoryEvaluator(f, n_workers=3)
+        self.assertTrue(np.all(ys == e.evaluate(xs)))
+        self.assertEqual(e.evaluate([]), [])
+
+        # Workers stay alive between calls, buffers grow as needed
+        workers = list(e._workers)
+        xs = np.random.normal(0, 10, 1000)
+        ys = [f(x) for x in xs]
+        self.assertTrue(np.all(ys == e.evaluate(xs)))
+        self.assertEqual(workers, e._workers)
+
+        # Fewer positions than workers
+        self.assertEqual(e.evaluate([3]), [9])
+
+        # Non-scalar results are returned as well
+        log_pdf = pints.toy.GaussianLogPDF([1, 2], [3, 4])
+        e = pints.SharedMemoryEvaluator(log_pdf.evaluateS1, n_workers=2)
+        xs = [[1, 2], [3, 4], [5, 6]]
+        for x, (fx, dfx) in zip(xs, e.evaluate(xs)):
+            fy, dfy = log_pdf.evaluateS1(x)
+            self.assertEqual(fx, fy)
+            self.assertTrue(np.all(dfx == dfy))
+
+        # Function must be callable
+        self.assertRaises(ValueError, pints.SharedMemoryEvaluator, 3)
+
+        # Argument must be sequence
+        self.assertRaises(ValueError, e.evaluate, 1)
+
+        # Positions must be numerical
+        self.assertRaises(ValueError, e.evaluate, ['a', 'b'])
+
+        # Test args
+        e = pints.SharedMemoryEvaluator(f_args, 2, [10, 20])
+        self.assertEqual(e.evaluate([1, 2]), [31, 32])
+
+        # Args must be a sequence
+        self.assertRaises(
+            ValueError, pints.SharedMemoryEvaluator, f_args, args=1)
+
+        # n-workers must be >0
+        self.assertRaises(ValueError, pints.SharedMemoryEvaluator, f, 0)
+
+        # Exceptions in called method should trigger halt, cause new exception
+        e = pints.SharedMemoryEvaluator(ioerror_on_five, n_workers=2)
+        self.assertRaisesRegex(
+            Exception, 'Exception in subprocess', e.evaluate, [1, 2, 5])
+        self.assertEqual(e.evaluate([1, 2]), [1, 2])
+
+        # System exit
+        e = pints.SharedMemoryEvaluator(system_exit_on_four, n_workers=2)
+        self.assertRaisesRegex(
+            Exception, 'Exception in subprocess', e.evaluate, [1, 2, 4])
+        self.assertEqual(e.evaluate([1, 2]), [1, 2])
+
+    def test_shared_memory_worker(self):
+        """
+        Manual test of shared memory worker, since cover doesn't pick up on its
+        run method.
+        """
+        from pints._evaluation import _SharedMemoryWorker as Worker
+        import multiprocessing
+        from multiprocessing import shared_memory
+
+        positions = shared_memory.SharedMemory(create=True, size=3 * 8)
+        results = shared_memory.SharedMemory(create=True, size=3 * 8)
+        try:
+            np.ndarray((3, ), buffer=positions.buf)[:] = [1, 2, 30]
+            task = (positions.name, results.name, (3, ))
+
+            # Evaluate two blocks, then stop
+            connection, worker_connection = multiprocessing.Pipe()
+            connection.send(task + (0, 1))
+            connection.send(task + (1, 2))
+            connection.send(None)
+            w = Worker(interrupt_on_30, (), worker_connection)
+            w.run()
+            self.assertEqual(connection.recv(), (True, {}))
+            self.assertEqual(connection.recv(), (True, {}))
+            fs = np.ndarray((3, ), buffer=results.buf)
+            self.assertEqual(list(fs[:2]), [2, 4])
+            del(fs)
+
+            # Errors are caught and reported
+            connection.send(task + (1, 3))
+            connection.send(None)
+            w.run()
+            reply = connection.recv()
+            self.assertIsNone(reply[0])
+            self.assertIn('KeyboardInterrupt', reply[1])
+        finally:
+            positions.close()
+            positions.unlink()
+            results.close()
+            results.unlink()
+
+    def test_threaded(self):
+
+        # Create test data
+        xs = np.random.normal(0, 10, 100)
+        ys = [f(x) for x in xs]
+
+        # Test threaded evaluator
+        e = pints.ThreadedEvaluator(f, n_workers=3, min_speedup=0)
+        self.assertIsNone(e.speedup())
+        self.assertTrue(np.all(ys == e.evaluate(xs)))
+        self.assertGreater(e.speedup(), 0)
+        self.assertTrue(np.all(ys == e.evaluate(xs)))
+        self.assertEqual(e.evaluate([]), [])
+        self.assertEqual(e.evaluate([3]), [9])
+
+        # Function must be callable
+        self.assertRaises(ValueError, pints.ThreadedEvaluator, 3)
+
+        # Argument must be sequence
+        self.assertRaises(ValueError, e.evaluate, 1)
+
+        # Test args
+        e = pints.ThreadedEvaluator(f_args, 2, [10, 20])
+        self.assertEqual(e.evaluate([1, 2]), [31, 32])
+
+        # Args must be a sequence
+        self.assertRaises(ValueError, pints.ThreadedEvaluator, f_args, args=1)
+
+        # n-workers must be >0
+        self.assertRaises(ValueError, pints.ThreadedEvaluator, f, 0)
+
+        # Warning if speedup is too low
+        e = pints.ThreadedEvaluator(f, n_workers=2, min_speedup=1e9)
+        with self.assertLogs('pints', level='WARNING') as c:
+            self.assertTrue(np.all(ys == e.evaluate(xs)))
+        self.assertIn('GIL', c.output[0])
+
+        # Exceptions are passed on
+        e = pints.ThreadedEvaluator(ioerror_on_five, n_workers=2)
+        self.assertRaises(IOError, e.evaluate, [1, 2, 5])
+        self.assertEqual(e.evaluate([1, 2]), [1, 2])
+
     def test_worker(self):
         """
         Manual test of worker, since cover doesn't pick up on its run method.
@@ -115,35 +387,39 @@ class TestEvaluators(unittest.TestCase):
         results = multiprocessing.Queue()
         errors = multiprocessing.Queue()
         error = multiprocessing.Event()
-        tasks.put((0, 1))
-        tasks.put((1, 2))
-        tasks.put((2, 3))
+        tasks.put((0, [1]))
+        tasks.put((1, [2, 3]))
+        tasks.put((3, [4]))
         max_tasks = 3
 
         w = Worker(
-            interrupt_on_30, (), tasks, results, max_tasks, errors, error)
+            interrupt_on_30, (), tasks, results, max_tasks, errors, error, 1)
         w.run()
 
-        self.assertEqual(results.get(timeout=0.01), (0, 2))
-        self.assertEqual(results.get(timeout=0.01), (1, 4))
-        self.assertEqual(results.get(timeout=0.01), (2, 6))
+        # Worker stops after evaluating max_tasks positions
+        i, fs, worker_id, t = results.get(timeout=0.01)
+        self.assertEqual((i, fs, worker_id), (0, [2], 1))
+        self.assertGreaterEqual(t, 0)
+        i, fs, worker_id, t = results.get(timeout=0.01)
+        self.assertEqual((i, fs, worker_id), (1, [4, 6], 1))
         self.assertTrue(results.empty())
+        self.assertEqual(tasks.get(timeout=0.01), (3, [4]))
 
         # Test worker stops if error flag is set
         tasks = multiprocessing.Queue()
         results = multiprocessing.Queue()
         errors = multiprocessing.Queue()
         error = multiprocessing.Event()
-        tasks.put((0, 1))
-        tasks.put((1, 2))
-        tasks.put((2, 3))
+        tasks.put((0, [1]))
+        tasks.put((1, [2]))
+        tasks.put((2, [3]))
         error.set()
 
         w = Worker(
             interrupt_on_30, (), tasks, results, max_tasks, errors, error)
         w.run()
 
-        self.assertEqual(results.get(timeout=0.01), (0, 2))
+        self.assertEqual(results.get(timeout=0.01)[:3], (0, [2], 0))
         self.assertTrue(results.empty())
 
         # Tests worker catches, stores and halts on exception
@@ -151,15 +427,15 @@ class TestEvaluators(unittest.TestCase):
         results = multiprocessing.Queue()
         errors = multiprocessing.Queue()
         error = multiprocessing.Event()
-        tasks.put((0, 1))
-        tasks.put((1, 30))
-        tasks.put((2, 3))
+        tasks.put((0, [1]))
+        tasks.put((1, [30]))
+        tasks.put((2, [3]))
 
         w = Worker(
             interrupt_on_30, (), tasks, results, max_tasks, errors, error)
         w.run()
 
-        self.assertEqual(results.get(timeout=0.01), (0, 2))
+        self.assertEqual(results.get(timeout=0.01)[:3], (0, [2], 0))
         self.assertTrue(results.empty())
         self.assertTrue(error.is_set())
         #self.assertFalse(errors.empty())   # Fails on travis!
@@ -178,6 +454,15 @@ def f_args(x, y, z):
     return x + y + z
 
 
+class BatchArgs(object):
+    """ Callable with a batch method that takes extra arguments. """
+    def __call__(self, x, y, z):
+        return x + y + z
+
+    def evaluate_batch(self, xs, y, z):
+        return np.asarray(xs) + y + z
+
+
 def ioerror_on_five(x):
     if x == 5:
         raise IOError
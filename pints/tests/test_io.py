@@ -103,6 +103,153 @@ class TestIO(unittest.TestCase):
                 self.assertRaises(
                     IOError, pints.io.load_samples, filename, 10)
 
+    def test_load_selection(self):
+        # Tests loading parts of files, and loading in parallel.
+
+        m = 30  # 30 samples
+        n = 4   # 4 parameters
+        chains = [np.random.uniform(size=(m, n)) for i in range(3)]
+
+        # Extreme values must be stored and loaded exactly
+        chains[0][0] = [1.234567890987654321e-300, -np.pi, 1e300, 0]
+        chains[0][1] = [np.nextafter(1, 2), -np.nextafter(0, 1), 1 / 3, 7]
+
+        with TemporaryDirectory() as d:
+            for ext in ('.csv', '.npy'):
+                filename = d.path('chain' + ext)
+                pints.io.save_samples(filename, *chains)
+
+                # Full, with or without parallelisation
+                for parallel in (False, True, 2):
+                    test = pints.io.load_samples(
+                        filename, 3, parallel=parallel)
+                    for chain, x in zip(chains, test):
+                        self.assertTrue(np.all(chain == x))
+
+                # Columns, burn-in, and thinning
+                test = pints.io.load_samples(
+                    filename, 3, columns=[3, 1], burn_in=5, thinning=4,
+                    parallel=True)
+                for chain, x in zip(chains, test):
+                    self.assertTrue(np.all(chain[5::4][:, [3, 1]] == x))
+                test = pints.io.load_samples(filename, 3, burn_in=7)
+                for chain, x in zip(chains, test):
+                    self.assertTrue(np.all(chain[7:] == x))
+                x = pints.io.load_samples(d.path('chain_0' + ext), thinning=2)
+                self.assertTrue(np.all(chains[0][::2] == x))
+
+                # Burn-in longer than chain
+                x = pints.io.load_samples(d.path('chain_1' + ext), burn_in=m)
+                self.assertEqual(x.shape, (0, n))
+                x = pints.io.load_samples(
+                    d.path('chain_1' + ext), columns=[0], burn_in=m)
+                self.assertEqual(x.shape, (0, 1))
+                del(test, x)
+
+            # Invalid arguments
+            self.assertRaisesRegex(
+                ValueError, 'negative', pints.io.load_samples, filename,
+                burn_in=-1)
+            self.assertRaisesRegex(
+                ValueError, 'Thinning', pints.io.load_samples, filename,
+                thinning=0)
+
+    def test_load_save_binary(self):
+        # Tests saving and loading samples in binary format.
+
+        m = 10  # 10 samples
+        n = 5   # 5 parameters
+        chain0 = np.random.uniform(size=(m, n))
+        chain1 = np.random.uniform(size=(m, n))
+        with TemporaryDirectory() as d:
+            # Single chain
+            filename = d.path('test.npy')
+            pints.io.save_samples(filename, chain0)
+            test0 = pints.io.load_samples(filename)
+            self.assertIsInstance(test0, np.memmap)
+            self.assertEqual(chain0.shape, test0.shape)
+            self.assertTrue(np.all(chain0 == test0))
+            self.assertTrue(np.all(chain0 == np.load(filename)))
+            del(test0)
+
+            # Multiple chains
+            filename = d.path('multi.npy')
+            pints.io.save_samples(filename, chain0, chain1)
+            test0, test1 = pints.io.load_samples(filename, 2)
+            self.assertTrue(np.all(chain0 == test0))
+            self.assertTrue(np.all(chain1 == test1))
+            del(test0, test1)
+
+            # Empty file
+            filename = d.path('empty.npy')
+            pints.io.ChainWriter(filename, 3).close()
+            self.assertEqual(pints.io.load_samples(filename).shape, (0, 3))
+
+    def test_chain_writer(self):
+        # Tests writing samples with a ChainWriter.
+
+        chain = np.random.uniform(size=(25, 3))
+        with TemporaryDirectory() as d:
+            filename = d.path('chain.npy')
+            w = pints.io.ChainWriter(filename, 3, buffer_size=10)
+            for row in chain[:15]:
+                w.log(*row)
+            self.assertEqual(w.n_rows(), 15)
+
+            # Only complete blocks have been written so far
+            self.assertTrue(np.all(np.load(filename) == chain[:10]))
+            w.flush()
+            self.assertTrue(np.all(np.load(filename) == chain[:15]))
+            w.close()
+            w.close()
+            self.assertRaisesRegex(RuntimeError, 'closed', w.log, 1, 2, 3)
+            self.assertRaisesRegex(RuntimeError, 'closed', w.flush)
+            self.assertRaisesRegex(RuntimeError, 'closed', w.write, chain)
+
+            # Partially written blocks are ignored
+            with open(filename, 'ab') as f:
+                f.write(b'12345')
+            self.assertTrue(np.all(np.load(filename) == chain[:15]))
+
+            # Append, discarding partial blocks
+            with pints.io.ChainWriter(filename, 3, append=True) as w:
+                self.assertEqual(w.n_rows(), 15)
+                w.write(chain[15:])
+            self.assertTrue(np.all(np.load(filename) == chain))
+
+            # Append to a file truncated after its header was written
+            with open(filename, 'r+b') as f:
+                f.truncate(os.path.getsize(filename) - 8 * 3 * 5)
+            with pints.io.ChainWriter(filename, 3, append=True) as w:
+                self.assertEqual(w.n_rows(), 20)
+                w.write(chain[20:])
+            self.assertTrue(np.all(np.load(filename) == chain))
+
+            # Append to non-existent file
+            filename2 = d.path('chain2.npy')
+            with pints.io.ChainWriter(filename2, 3, append=True) as w:
+                w.write(chain)
+            self.assertTrue(np.all(np.load(filename2) == chain))
+
+            # Invalid appends
+            self.assertRaisesRegex(
+                ValueError, 'has 3 columns',
+                pints.io.ChainWriter, filename, 2, append=True)
+            np.save(filename2, chain.astype(np.float32))
+            self.assertRaisesRegex(
+                ValueError, 'not written by a ChainWriter',
+                pints.io.ChainWriter, filename2, 3, append=True)
+
+            # Invalid arguments
+            self.assertRaisesRegex(
+                ValueError, 'columns', pints.io.ChainWriter, filename, 0)
+            self.assertRaisesRegex(
+                ValueError, 'Buffer size', pints.io.ChainWriter, filename, 3,
+                0)
+            with pints.io.ChainWriter(filename, 3) as w:
+                self.assertRaisesRegex(ValueError, 'Expecting 3', w.log, 1)
+                self.assertRaisesRegex(ValueError, '3 columns', w.write, [1])
+
 
 if __name__ == '__main__':
     print('Add -v for more debug output')
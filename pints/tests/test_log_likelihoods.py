@@ -695,6 +695,70 @@ class TestLogLikelihood(unittest.TestCase):
                                          0.0, 0.9, 2.0]),
             -214.17034137601107)
 
+    def test_evaluate_batch(self):
+        # Batch evaluation gives the same result as individual evaluations
+
+        # Single output
+        model = pints.toy.LogisticModel()
+        times = np.linspace(0, 100, 20)
+        values = model.simulate([0.1, 50], times)
+        values += np.random.normal(0, 1, values.shape)
+        problem = pints.SingleOutputProblem(model, times, values)
+        xs = np.array([[0.1, 50], [0.11, 48], [0.2, 30]])
+        s1 = np.array([[1.2], [0.8], [3]])
+        s2 = np.array([[0.3, 1.2], [-0.1, 0.8], [0.5, 3]])
+        s3 = np.array([[0.3, 0.1, 1.2], [-0.1, 0.2, 0.8], [0.5, 0, 3]])
+        tests = [
+            (pints.AR1LogLikelihood(problem), np.hstack((xs, s2))),
+            (pints.ARMA11LogLikelihood(problem), np.hstack((xs, s3))),
+            (pints.CauchyLogLikelihood(problem), np.hstack((xs, s1))),
+            (pints.GaussianIntegratedUniformLogLikelihood(problem, 0, 100),
+             xs),
+            (pints.GaussianIntegratedUniformLogLikelihood(problem, 0.1, 100),
+             xs),
+            (pints.GaussianKnownSigmaLogLikelihood(problem, 1.5), xs),
+            (pints.GaussianLogLikelihood(problem), np.hstack((xs, s1))),
+            (pints.ScaledLogLikelihood(pints.GaussianLogLikelihood(problem)),
+             np.hstack((xs, s1))),
+            (pints.StudentTLogLikelihood(problem), np.hstack((xs, s2 + 1))),
+        ]
+
+        # Multi-output
+        model = pints.toy.ConstantModel(2)
+        times = np.arange(1, 6)
+        values = np.random.normal(0, 1, (5, 2))
+        problem = pints.MultiOutputProblem(model, times, values)
+        xs = np.array([[0.1, -0.2], [0.3, 0.1]])
+        s1 = np.array([[1.2, 0.5], [0.8, 2]])
+        s2 = np.array([[0.3, 1.2, 0.2, 0.5], [-0.1, 0.8, 0.4, 2]])
+        s3 = np.array([
+            [0.3, 0.1, 1.2, 0.2, 0.4, 0.5], [-0.1, 0.2, 0.8, 0.4, 0.1, 2]])
+        tests += [
+            (pints.AR1LogLikelihood(problem), np.hstack((xs, s2))),
+            (pints.ARMA11LogLikelihood(problem), np.hstack((xs, s3))),
+            (pints.CauchyLogLikelihood(problem), np.hstack((xs, s1))),
+            (pints.GaussianIntegratedUniformLogLikelihood(
+                problem, [0, 0.1], 100), xs),
+            (pints.GaussianKnownSigmaLogLikelihood(problem, [1.5, 3]), xs),
+            (pints.GaussianLogLikelihood(problem), np.hstack((xs, s1))),
+            (pints.StudentTLogLikelihood(problem), np.hstack((xs, s2 + 1))),
+        ]
+
+        for f, ys in tests:
+            fs = f.evaluate_batch(ys)
+            self.assertEqual(fs.shape, (len(ys), ))
+            for y, fy in zip(ys, fs):
+                self.assertAlmostEqual(fy, f(y))
+
+        # Sum of independent log pdfs
+        f = pints.SumOfIndependentLogPDFs([
+            pints.GaussianLogLikelihood(problem),
+            pints.CauchyLogLikelihood(problem)])
+        xs = np.hstack((xs, s1))
+        fs = f.evaluate_batch(xs)
+        for x, fx in zip(xs, fs):
+            self.assertAlmostEqual(fx, f(x))
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -52,6 +52,17 @@ class Testlog_posterior(unittest.TestCase):
         y2, dy2 = log_likelihood.evaluateS1(x)
         self.assertTrue(np.all(dy == dy1 + dy2))
 
+        # Test batch evaluation
+        log_prior = pints.UniformLogPrior([0, 0], [1, 1000])
+        log_posterior = pints.LogPosterior(log_likelihood, log_prior)
+        xs = [[0.014, 501], [-1, 500], [0.015, 499], [0.5, 2000]]
+        fs = log_posterior.evaluate_batch(xs)
+        self.assertEqual(fs.shape, (4, ))
+        for x, f in zip(xs, fs):
+            self.assertAlmostEqual(f, log_posterior(x))
+        self.assertEqual(fs[1], -float('inf'))
+        self.assertEqual(fs[3], -float('inf'))
+
         # Test getting the prior and likelihood back again
         self.assertIs(log_posterior.log_prior(), log_prior)
         self.assertIs(log_posterior.log_likelihood(), log_likelihood)
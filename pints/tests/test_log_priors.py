@@ -894,6 +894,47 @@ class TestPrior(unittest.TestCase):
         self.assertTrue(
             np.linalg.norm(x.mean(axis=0) - 0.5 * (upper + lower)) < 0.1)
 
+    def test_evaluate_batch(self):
+        # Batch evaluation gives the same result as individual evaluations
+        xs = np.array([-1, 0, 1e-3, 0.2, 0.5, 0.999, 1, 3, 7.5]).reshape(9, 1)
+        priors = [
+            pints.BetaLogPrior(2, 3),
+            pints.CauchyLogPrior(1, 2),
+            pints.ExponentialLogPrior(0.5),
+            pints.GammaLogPrior(2, 1.5),
+            pints.GaussianLogPrior(1, 3),
+            pints.HalfCauchyLogPrior(1, 2),
+            pints.InverseGammaLogPrior(3, 2),
+            pints.LogNormalLogPrior(0.5, 2),
+            pints.StudentTLogPrior(1, 3, 2),
+            pints.UniformLogPrior([0], [1]),
+            pints.UniformLogPrior(
+                pints.LogPDFBoundaries(pints.ExponentialLogPrior(1))),
+            pints.MultivariateGaussianLogPrior([1], [[2]]),
+        ]
+        for p in priors:
+            fs = p.evaluate_batch(xs)
+            self.assertEqual(fs.shape, (len(xs), ))
+            for x, f in zip(xs, fs):
+                self.assertAlmostEqual(f, p(x))
+
+        # Multi-dimensional priors
+        xs = np.linspace(-1, 3, 60).reshape(20, 3)
+        xs[::2] = xs[::-2, ::-1]
+        priors = [
+            pints.ComposedLogPrior(
+                pints.GaussianLogPrior(1, 2),
+                pints.UniformLogPrior([0, -1], [2, 2])),
+            pints.MultivariateGaussianLogPrior(
+                [1, 0, 2], [[2, 0.5, 0], [0.5, 1, 0], [0, 0, 3]]),
+            pints.UniformLogPrior([0, -1, 0], [2, 2, 2.5]),
+        ]
+        for p in priors:
+            fs = p.evaluate_batch(xs)
+            self.assertEqual(fs.shape, (len(xs), ))
+            for x, f in zip(xs, fs):
+                self.assertAlmostEqual(f, p(x))
+
 
 if __name__ == '__main__':
     unittest.main()
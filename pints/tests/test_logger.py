@@ -295,6 +295,111 @@ class TestLogger(unittest.TestCase):
         self.assertOutput(expected=out2, returned=c.text()[1])
         self.assertOutput(expected=out3, returned=out)
 
+    def test_buffering(self):
+        # Tests buffered writing to file.
+
+        def make(filename, csv):
+            log = pints.Logger()
+            log.set_filename(filename, csv=csv)
+            log.set_stream(None)
+            log.set_buffering(3)
+            log.add_counter('#', width=2)
+            log.add_float('Lat.', width=1)
+            log.add_long_float('Number', file_only=True)
+            log.add_int('Val', width=4)
+            log.add_counter('Count', max_value=12345)
+            log.add_time('Time')
+            log.add_string('Q', 3)
+            return log
+
+        for csv, expected in ((True, out4), (False, out3)):
+            with TemporaryDirectory() as d:
+                filename = d.path('test.csv')
+                log = make(filename, csv)
+
+                # Header and first two rows fill the buffer
+                log.log(*data[:14])
+                with open(filename, 'r') as f:
+                    out = f.read()
+                self.assertOutput(
+                    expected=''.join(expected.splitlines(True)[:3]),
+                    returned=out)
+
+                # Remaining rows are written on close
+                log.log(*data[14:])
+                log.close()
+                with open(filename, 'r') as f:
+                    out = f.read()
+                self.assertOutput(expected=expected, returned=out)
+
+                # Writing after closing appends
+                log.log(*data[:7])
+                log.flush()
+                with open(filename, 'r') as f:
+                    out = f.read()
+                self.assertOutput(
+                    expected=expected + expected.splitlines(True)[1],
+                    returned=out)
+                log.close()
+
+        # Interval-based flushing
+        with TemporaryDirectory() as d:
+            filename = d.path('test.csv')
+            log = make(filename, True)
+            log.set_buffering(1000, 0)
+            log.log(*data[:7])
+            with open(filename, 'r') as f:
+                out = f.read()
+            self.assertOutput(
+                expected=''.join(out4.splitlines(True)[:2]), returned=out)
+            log.close()
+
+        # Disabling buffering
+        with TemporaryDirectory() as d:
+            filename = d.path('test.csv')
+            log = make(filename, True)
+            log.set_buffering(None)
+            log.log(*data[:7])
+            with open(filename, 'r') as f:
+                out = f.read()
+            self.assertOutput(
+                expected=''.join(out4.splitlines(True)[:2]), returned=out)
+
+        # Invalid settings
+        log = pints.Logger()
+        self.assertRaisesRegex(ValueError, 'at least 1', log.set_buffering, 0)
+        self.assertRaisesRegex(
+            ValueError, 'negative', log.set_buffering, 10, -1)
+        log.add_counter('#')
+        with StreamCapture():
+            log.log(1)
+        self.assertRaisesRegex(
+            RuntimeError, 'after logging has started', log.set_buffering)
+
+    def test_append(self):
+        # Tests appending to an existing file.
+
+        for csv, expected in ((True, out4), (False, out3)):
+            with TemporaryDirectory() as d:
+                filename = d.path('test.csv')
+                for i, append in enumerate((False, True)):
+                    log = pints.Logger()
+                    log.set_filename(filename, csv=csv, append=append)
+                    log.set_stream(None)
+                    log.add_counter('#', width=2)
+                    log.add_float('Lat.', width=1)
+                    log.add_long_float('Number', file_only=True)
+                    log.add_int('Val', width=4)
+                    log.add_counter('Count', max_value=12345)
+                    log.add_time('Time')
+                    log.add_string('Q', 3)
+                    log.log(*data[i * 7:i * 7 + 7])
+                with open(filename, 'r') as f:
+                    out = f.read()
+                self.assertOutput(
+                    expected=''.join(expected.splitlines(True)[:3]),
+                    returned=out)
+
     def assertOutput(self, expected, returned):
         """
         Checks if 2 strings are equal.
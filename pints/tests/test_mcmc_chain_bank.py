@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+#
+# Tests the vectorised chain bank MCMC methods.
+#
+# This file is part of PINTS.
+#  Copyright (c) 2017-2019, University of Oxford.
+#  For licensing information, see the LICENSE file distributed with the PINTS
+#  software package.
+#
+import unittest
+import numpy as np
+
+import pints
+import pints.toy as toy
+
+from shared import StreamCapture
+
+# Consistent unit testing in Python 2 and 3
+try:
+    unittest.TestCase.assertRaisesRegex
+except AttributeError:
+    unittest.TestCase.assertRaisesRegex = unittest.TestCase.assertRaisesRegexp
+
+
+class TestChainBankMCMC(unittest.TestCase):
+    """
+    Tests the BankedMetropolisRandomWalkMCMC and BankedHaarioBardenetACMC
+    classes.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        """ Prepare a problem for testing. """
+        cls.log_pdf = toy.GaussianLogPDF([1, 2, 3], [1, 2, 3])
+        cls.x0 = [0.5, 1, 2]
+
+    def test_equivalence(self):
+        # Test a bank with a single chain matches the single chain method
+
+        methods = (
+            (pints.MetropolisRandomWalkMCMC,
+             pints.BankedMetropolisRandomWalkMCMC),
+            (pints.HaarioBardenetACMC, pints.BankedHaarioBardenetACMC),
+        )
+        for single, bank in methods:
+            chains = []
+            for method in (single, bank):
+                np.random.seed(3)
+                mcmc = pints.MCMCController(
+                    self.log_pdf, 1, [self.x0], method=method)
+                mcmc.set_max_iterations(300)
+                mcmc.set_log_to_screen(False)
+                if mcmc.method_needs_initial_phase():
+                    mcmc.set_initial_phase_iterations(100)
+                chains.append(mcmc.run())
+            self.assertTrue(np.allclose(chains[0], chains[1]))
+
+    def test_sampling(self):
+        # Test sampling from a gaussian with many chains
+
+        np.random.seed(1)
+        n = 50
+        x0 = np.random.uniform(-1, 1, size=(n, 3)) + [1, 2, 3]
+        for method in (pints.BankedMetropolisRandomWalkMCMC,
+                       pints.BankedHaarioBardenetACMC):
+            mcmc = pints.MCMCController(
+                self.log_pdf, n, x0, sigma0=[1, 2, 3], method=method)
+            mcmc.set_max_iterations(600)
+            mcmc.set_log_to_screen(False)
+            mcmc.set_log_pdf_storage(True)
+            chains = mcmc.run()
+            self.assertEqual(chains.shape, (n, 600, 3))
+
+            # Check stored evaluations
+            evals = mcmc.log_pdfs()
+            for i in (0, 10, 599):
+                self.assertEqual(
+                    evals[7, i], self.log_pdf(chains[7, i]))
+
+            samples = chains[:, 200:].reshape(-1, 3)
+            mean = np.mean(samples, axis=0)
+            var = np.var(samples, axis=0)
+            self.assertTrue(np.all(np.abs(mean - [1, 2, 3]) < 0.1))
+            self.assertTrue(np.all(np.abs(var - [1, 2, 3]) < 0.3))
+
+            rates = mcmc.samplers()[0].acceptance_rate()
+            self.assertEqual(rates.shape, (n, ))
+            self.assertTrue(np.all(rates > 0))
+
+    def test_flow(self):
+        # Test the ask-and-tell flow
+
+        x0 = [self.x0] * 4
+        for method in (pints.BankedMetropolisRandomWalkMCMC,
+                       pints.BankedHaarioBardenetACMC):
+            mcmc = method(4, x0)
+
+            # Tell without ask
+            self.assertRaisesRegex(
+                RuntimeError, 'before proposal', mcmc.tell, [1] * 4)
+
+            # Initial proposal is x0
+            self.assertTrue(mcmc.ask() is mcmc._x0)
+            self.assertRaisesRegex(
+                ValueError, 'Expecting 4', mcmc.tell, [1] * 3)
+            self.assertRaisesRegex(
+                ValueError, 'finite', mcmc.tell, [1, 1, 1, -np.inf])
+            ys = mcmc.tell([self.log_pdf(x) for x in x0])
+            self.assertTrue(np.all(ys == x0))
+            self.assertTrue(np.all(
+                mcmc.current_log_pdfs() == self.log_pdf(self.x0)))
+
+            # Repeated asks return the same points
+            xs = mcmc.ask()
+            self.assertTrue(xs is mcmc.ask())
+            self.assertEqual(xs.shape, (4, 3))
+
+            # Infinite log pdfs are never accepted
+            fxs = [self.log_pdf(x) for x in xs]
+            fxs[0] = -np.inf
+            fxs[1] = np.nan
+            ys = mcmc.tell(fxs)
+            self.assertTrue(np.all(ys[:2] == x0[:2]))
+            self.assertTrue(np.all(mcmc.acceptance_rate()[:2] == 0))
+            self.assertRaises(RuntimeError, mcmc.tell, fxs)
+
+    def test_adaptation(self):
+        # Test the adaptation settings
+
+        mcmc = pints.BankedHaarioBardenetACMC(3, [self.x0] * 3)
+        self.assertTrue(mcmc.needs_initial_phase())
+        mcmc.set_initial_phase(True)
+        self.assertTrue(mcmc.in_initial_phase())
+        mcmc.set_initial_phase(False)
+        self.assertFalse(mcmc.in_initial_phase())
+
+        self.assertEqual(mcmc.n_hyper_parameters(), 1)
+        mcmc.set_hyper_parameters([0.5])
+        self.assertEqual(mcmc.eta(), 0.5)
+        self.assertRaisesRegex(
+            ValueError, 'greater than zero', mcmc.set_eta, 0)
+
+        mcmc.set_target_acceptance_rate(0.5)
+        self.assertEqual(mcmc.target_acceptance_rate(), 0.5)
+        self.assertRaisesRegex(
+            ValueError, 'greater than 0', mcmc.set_target_acceptance_rate, 0)
+        self.assertRaisesRegex(
+            ValueError, 'cannot exceed 1', mcmc.set_target_acceptance_rate, 2)
+
+        # Covariance matrices are adapted independently
+        np.random.seed(1)
+        for i in range(100):
+            mcmc.tell([self.log_pdf(x) for x in mcmc.ask()])
+        self.assertFalse(np.all(mcmc._sigma[0] == mcmc._sigma[1]))
+
+    def test_logging(self):
+        # Test logging includes name and mean acceptance rate
+
+        x0 = [self.x0] * 3
+        for method in (pints.BankedMetropolisRandomWalkMCMC,
+                       pints.BankedHaarioBardenetACMC):
+            mcmc = pints.MCMCController(self.log_pdf, 3, x0, method=method)
+            mcmc.set_max_iterations(5)
+            with StreamCapture() as c:
+                mcmc.run()
+            text = c.text()
+            self.assertIn(mcmc.samplers()[0].name(), text)
+            self.assertIn('Accept.', text)
+            self.assertEqual(text.splitlines()[3].split()[-3], 'Accept.')
+
+
+if __name__ == '__main__':
+    unittest.main()
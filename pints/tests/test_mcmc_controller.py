@@ -10,6 +10,8 @@
 from __future__ import absolute_import, division
 from __future__ import print_function, unicode_literals
 import os
+import pickle
+import time
 import pints
 import pints.io
 import pints.toy
@@ -33,21 +35,21 @@ LOG_SCREEN = [
     'Running in sequential mode.',
     'Iter. Eval. Accept.   Accept.   Accept.   Time m:s',
     '0     3      0         0         0          0:00.0',
-    '1     6      0         0         0.5        0:00.0',
-    '2     9      0         0         0.333      0:00.0',
-    '3     12     0         0         0.5        0:00.0',
+    '1     6      0         0         0          0:00.0',
+    '2     9      0         0         0          0:00.0',
+    '3     12     0         0         0          0:00.0',
     'Initial phase completed.',
-    '10    30     0.1       0.1       0.2        0:00.0',
+    '10    30     0.1       0.1       0.1        0:00.0',
     'Halting: Maximum number of iterations (10) reached.',
 ]
 
 LOG_FILE = [
     'Iter. Eval. Accept.   Accept.   Accept.   Time m:s',
     '0     3      0         0         0          0:00.0',
-    '1     6      0         0         0.5        0:00.0',
-    '2     9      0         0         0.333      0:00.0',
-    '3     12     0         0         0.5        0:00.0',
-    '10    30     0.1       0.1       0.2        0:00.0',
+    '1     6      0         0         0          0:00.0',
+    '2     9      0         0         0          0:00.0',
+    '3     12     0         0         0          0:00.0',
+    '10    30     0.1       0.1       0.1        0:00.0',
 ]
 
 
@@ -284,6 +286,78 @@ class TestMCMCController(unittest.TestCase):
         self.assertRaisesRegex(
             ValueError, 'At least one stopping criterion', mcmc.run)
 
+        # Test setting convergence criteria
+        self.assertIsNone(mcmc.target_ess())
+        self.assertIsNone(mcmc.max_rhat())
+        mcmc.set_target_ess(100)
+        self.assertEqual(mcmc.target_ess(), 100)
+        self.assertRaisesRegex(
+            ValueError, 'greater than 0', mcmc.set_target_ess, 0)
+        self.assertRaisesRegex(
+            ValueError, 'two chains', mcmc.set_max_rhat, 1.1)
+        mcmc.set_target_ess(None)
+        self.assertIsNone(mcmc.target_ess())
+
+    def test_convergence_stopping(self):
+        # Test halting on a target ess and maximum rhat.
+
+        np.random.seed(1)
+        log_pdf = pints.toy.GaussianLogPDF([1, 2], [1, 4])
+        xs = [[1.5, 2.5], [0.5, 1], [1, 3]]
+        mcmc = pints.MCMCController(log_pdf, 3, xs)
+        mcmc.set_max_iterations(None)
+        mcmc.set_target_ess(500)
+        mcmc.set_max_rhat(1.01)
+        mcmc.set_log_pdf_storage(True)
+        self.assertEqual(mcmc.max_rhat(), 1.01)
+        self.assertRaisesRegex(
+            ValueError, 'greater than 1', mcmc.set_max_rhat, 1)
+        with StreamCapture() as c:
+            chains = mcmc.run()
+        self.assertIn('Convergence criteria', c.text())
+
+        # Storage was extended beyond its initial size, and then trimmed
+        n = chains.shape[1]
+        self.assertGreater(n, 1024)
+        self.assertEqual(chains.shape, (3, n, 2))
+        self.assertEqual(mcmc.log_pdfs().shape, (3, n))
+        self.assertTrue(np.all(chains[:, -1] != 0))
+        self.assertTrue(np.all(mcmc.log_pdfs()[:, -1] != 0))
+
+        # The criteria are met after the initial phase
+        chains = chains[:, 200:]
+        self.assertTrue(np.all(pints.bulk_effective_sample_size(chains) > 400))
+        self.assertTrue(np.all(pints.rank_normalised_rhat(chains) < 1.02))
+
+        # Maximum iterations can still halt the run
+        mcmc.set_max_iterations(300)
+        mcmc.set_log_to_screen(False)
+        self.assertEqual(mcmc.run().shape, (3, 300, 2))
+
+        # Multi-chain methods, without an initial phase
+        mcmc = pints.MCMCController(
+            log_pdf, 3, xs, method=pints.DifferentialEvolutionMCMC)
+        mcmc.set_max_iterations(None)
+        mcmc.set_max_rhat(1.05)
+        mcmc.set_log_to_screen(False)
+        chains = mcmc.run()
+        self.assertLess(chains.shape[1], 1024)
+        self.assertTrue(np.all(
+            pints.rhat_all_params(chains) <= np.array(1.05)))
+
+        # Strongly autocorrelated chains don't halt early
+        np.random.seed(1)
+        mcmc = pints.MCMCController(
+            pints.toy.GaussianLogPDF([0], [1]), 4,
+            [[0.1], [-0.1], [0.2], [-0.2]], sigma0=[0.01],
+            method=pints.MetropolisRandomWalkMCMC)
+        mcmc.set_max_iterations(None)
+        mcmc.set_target_ess(100)
+        mcmc.set_log_to_screen(False)
+        chains = mcmc.run()
+        self.assertGreater(chains.shape[1], 5000)
+        self.assertGreater(pints.bulk_effective_sample_size(chains)[0], 50)
+
     def test_parallel(self):
         # Test running MCMC with parallisation.
 
@@ -302,6 +376,7 @@ class TestMCMCController(unittest.TestCase):
 
         # Test with auto-detected number of worker processes
         self.assertFalse(mcmc.parallel())
+        self.assertIsNone(mcmc.worker_utilisation())
         mcmc.set_parallel(True)
         self.assertTrue(mcmc.parallel())
         chains = mcmc.run()
@@ -317,10 +392,212 @@ class TestMCMCController(unittest.TestCase):
         with StreamCapture() as c:
             chains = mcmc.run()
         self.assertIn('with 2 worker', c.text())
+        self.assertEqual(len(mcmc.worker_utilisation()), 2)
         self.assertEqual(chains.shape[0], nchains)
         self.assertEqual(chains.shape[1], niterations)
         self.assertEqual(chains.shape[2], nparameters)
 
+        # Test with shared memory backend
+        mcmc.set_parallel(2, backend='shared_memory')
+        mcmc.set_log_to_screen(False)
+        chains = mcmc.run()
+        self.assertEqual(chains.shape[0], nchains)
+        self.assertEqual(chains.shape[1], niterations)
+        self.assertEqual(chains.shape[2], nparameters)
+
+        # Test with threads backend
+        mcmc.set_parallel(2, backend='threads')
+        mcmc.set_log_to_screen(True)
+        with StreamCapture() as c:
+            chains = mcmc.run()
+        self.assertIn('with 2 worker threads', c.text())
+        self.assertEqual(chains.shape[0], nchains)
+        self.assertEqual(chains.shape[1], niterations)
+        self.assertEqual(chains.shape[2], nparameters)
+
+        # Unknown backend
+        self.assertRaisesRegex(
+            ValueError, 'Unknown parallel backend', mcmc.set_parallel, 2,
+            backend='carrier pigeons')
+
+    def test_asynchronous(self):
+        # Test running chains asynchronously
+
+        x0 = [[0.1, 0.2], [-1, 0], [1, 1], [0, 0]]
+        log_pdf = SlowLogPDF(pints.toy.GaussianLogPDF([0, 0], [1, 2]))
+
+        def run(method, n_workers, backend='threads'):
+            np.random.seed(1)
+            mcmc = pints.MCMCController(log_pdf, 4, x0, method=method)
+            mcmc.set_max_iterations(20)
+            if method is pints.SliceStepoutMCMC:
+                for sampler in mcmc.samplers():
+                    sampler.set_width(10)
+            mcmc.set_log_to_screen(False)
+            mcmc.set_parallel(n_workers, backend=backend)
+            mcmc.set_asynchronous(True)
+            if method is pints.HaarioBardenetACMC:
+                mcmc.set_initial_phase_iterations(10)
+            return mcmc.run()
+
+        # Results don't depend on the order in which evaluations finish
+        for method in (pints.SliceStepoutMCMC, pints.HaarioBardenetACMC):
+            chains1 = run(method, 3)
+            chains2 = run(method, False)
+            self.assertEqual(chains1.shape, (4, 20, 2))
+            self.assertTrue(np.all(chains1 == chains2))
+
+        # Worker processes
+        chains3 = run(pints.HaarioBardenetACMC, 2, 'processes')
+        self.assertTrue(np.all(chains1 == chains3))
+
+        # The global random state is restored, also after an error
+        class FailingLogPDF(pints.toy.GaussianLogPDF):
+            def __call__(self, x):
+                if x[0] > 0.5:
+                    raise ValueError('Evaluation failed')
+                return super(FailingLogPDF, self).__call__(x)
+
+        def random_after_run(log_pdf):
+            np.random.seed(1)
+            mcmc = pints.MCMCController(log_pdf, 4, x0)
+            mcmc.set_max_iterations(5)
+            mcmc.set_log_to_screen(False)
+            mcmc.set_asynchronous()
+            try:
+                mcmc.run()
+            except ValueError:
+                pass
+            return np.random.rand()
+
+        r = random_after_run(pints.toy.GaussianLogPDF([0, 0], [1, 2]))
+        self.assertEqual(
+            random_after_run(FailingLogPDF([0, 0], [1, 2])), r)
+
+        # Log to screen
+        mcmc = pints.MCMCController(
+            log_pdf, 4, x0, method=pints.SliceStepoutMCMC)
+        mcmc.set_max_iterations(5)
+        mcmc.set_asynchronous()
+        with StreamCapture() as c:
+            mcmc.run()
+        self.assertIn('Running chains asynchronously.', c.text())
+        mcmc.set_asynchronous(False)
+        with StreamCapture() as c:
+            mcmc.run()
+        self.assertNotIn('asynchronously', c.text())
+
+        # Multi-chain methods are not supported
+        mcmc = pints.MCMCController(
+            log_pdf, 4, x0, method=pints.DifferentialEvolutionMCMC)
+        self.assertRaisesRegex(
+            ValueError, 'only supported for single chain',
+            mcmc.set_asynchronous)
+        mcmc.set_asynchronous(False)
+
+    def test_fused_iterations(self):
+        # Test running whole iterations inside the samplers
+
+        x0 = [[0.1, 0.2], [-1, 0], [1, 1]]
+        log_pdf = pints.toy.GaussianLogPDF([0, 0], [1, 2])
+
+        def run(method, n_workers):
+            np.random.seed(1)
+            mcmc = pints.MCMCController(log_pdf, 3, x0, method=method)
+            mcmc.set_max_iterations(20)
+            mcmc.set_log_to_screen(False)
+            mcmc.set_parallel(n_workers)
+            mcmc.set_fused_iterations(True)
+            mcmc.set_log_pdf_storage(True)
+            return mcmc.run(), mcmc.log_pdfs()
+
+        # Results don't depend on the number of workers, and the stored log
+        # pdfs match the chains
+        for method in (pints.HamiltonianMCMC, pints.NoUTurnMCMC,
+                       pints.SliceStepoutMCMC):
+            chains1, fxs1 = run(method, False)
+            chains2, fxs2 = run(method, 2)
+            self.assertEqual(chains1.shape, (3, 20, 2))
+            self.assertTrue(np.all(chains1 == chains2))
+            self.assertTrue(np.all(fxs1 == fxs2))
+            for chain, fxs in zip(chains1, fxs1):
+                self.assertTrue(np.allclose(
+                    fxs, [log_pdf(x) for x in chain]))
+
+        # Log to screen
+        mcmc = pints.MCMCController(
+            log_pdf, 3, x0, method=pints.HamiltonianMCMC)
+        mcmc.set_max_iterations(5)
+        mcmc.set_fused_iterations()
+        mcmc.set_parallel(2, backend='threads')
+        with StreamCapture() as c:
+            mcmc.run()
+        self.assertIn('Running fused iterations.', c.text())
+        self.assertIn('with 2 worker processes', c.text())
+
+        # Not compatible with asynchronous mode
+        mcmc.set_asynchronous()
+        self.assertRaisesRegex(ValueError, 'asynchronous', mcmc.run)
+
+        # Multi-chain methods are not supported
+        mcmc = pints.MCMCController(
+            log_pdf, 3, x0, method=pints.DifferentialEvolutionMCMC)
+        self.assertRaisesRegex(
+            ValueError, 'only supported for single chain',
+            mcmc.set_fused_iterations)
+        mcmc.set_fused_iterations(False)
+
+    def test_prefetching(self):
+        # Test speculative prefetching gives the same chains
+
+        x0 = [[0.1, 0.2], [-1, 0]]
+        log_pdf = pints.toy.GaussianLogPDF([0, 0], [1, 2])
+
+        def run(method, n_chains, prefetch, parallel=False):
+            np.random.seed(1)
+            mcmc = pints.MCMCController(
+                log_pdf, n_chains, x0[:n_chains], sigma0=[4, 8],
+                method=method)
+            mcmc.set_max_iterations(100)
+            if method is pints.HaarioBardenetACMC:
+                mcmc.set_initial_phase_iterations(20)
+            mcmc.set_log_to_screen(False)
+            mcmc.set_parallel(parallel)
+            mcmc.set_prefetching(prefetch)
+            return mcmc.run()
+
+        for method in (pints.MetropolisRandomWalkMCMC,
+                       pints.HaarioBardenetACMC):
+            for n_chains in (1, 2):
+                chains = run(method, n_chains, False)
+                self.assertTrue(np.all(chains == run(method, n_chains, 6)))
+            chains = run(method, 1, False)
+            self.assertTrue(np.all(chains == run(method, 1, True, 2)))
+
+        # Log to screen
+        mcmc = pints.MCMCController(
+            log_pdf, 1, x0[:1], method=pints.MetropolisRandomWalkMCMC)
+        mcmc.set_max_iterations(5)
+        mcmc.set_prefetching(4)
+        with StreamCapture() as c:
+            mcmc.run()
+        self.assertIn('Prefetching 4 points per chain.', c.text())
+
+        # Not compatible with asynchronous mode
+        mcmc.set_asynchronous()
+        self.assertRaisesRegex(ValueError, 'Prefetching', mcmc.run)
+
+        # Invalid settings and methods
+        self.assertRaisesRegex(
+            ValueError, 'negative', mcmc.set_prefetching, -1)
+        mcmc.set_prefetching(0)
+        self.assertFalse(mcmc._prefetch)
+        mcmc = pints.MCMCController(
+            log_pdf, 1, x0[:1], method=pints.HamiltonianMCMC)
+        self.assertRaisesRegex(
+            ValueError, 'only supported', mcmc.set_prefetching)
+        mcmc.set_prefetching(False)
+
     def test_logging(self):
         # Test logging functions
 
@@ -479,6 +756,19 @@ class TestMCMCController(unittest.TestCase):
             likelihoods = [self.log_likelihood(x) for x in chain]
             self.assertTrue(np.all(evals[i] == likelihoods))
 
+        # Test with a method that uses sensitivities
+        mcmc = pints.MCMCController(
+            self.log_posterior, n_chains, xs, method=pints.HamiltonianMCMC)
+        mcmc.set_max_iterations(n_iterations)
+        mcmc.set_log_to_screen(False)
+        mcmc.set_log_pdf_storage(True)
+        chains = mcmc.run()
+        evals = mcmc.log_pdfs()
+        self.assertEqual(evals.shape, (n_chains, n_iterations, 3))
+        for i, chain in enumerate(chains):
+            posteriors = [self.log_posterior(x) for x in chain]
+            self.assertTrue(np.allclose(evals[i, :, 0], posteriors))
+
         # Test disabling again
         mcmc = pints.MCMCController(self.log_posterior, n_chains, xs)
         mcmc.set_max_iterations(n_iterations)
@@ -1096,6 +1386,315 @@ class TestMCMCControllerLogging(unittest.TestCase):
             self.assertIn('Writing evaluations to', text)
             self.assertIn('evals_0.csv', text)
 
+    def test_writing_after_error(self):
+        # Test buffered output is written to disk if a run is interrupted.
+
+        class FailingLogPDF(pints.LogPDF):
+            def __init__(self, log_pdf, n):
+                self._log_pdf = log_pdf
+                self._n = n
+
+            def n_parameters(self):
+                return self._log_pdf.n_parameters()
+
+            def __call__(self, x):
+                self._n -= 1
+                if self._n < 0:
+                    raise ValueError('Failing on purpose.')
+                return self._log_pdf(x)
+
+        log_pdf = FailingLogPDF(self.log_posterior, 3 * 30)
+        mcmc = pints.MCMCController(log_pdf, self.nchains, self.xs)
+        mcmc.set_max_iterations(100)
+        mcmc.set_log_to_screen(False)
+        with TemporaryDirectory() as d:
+            cpath = d.path('chain.csv')
+            lpath = d.path('log.csv')
+            mcmc.set_chain_filename(cpath)
+            mcmc.set_log_to_file(lpath, csv=True)
+            with StreamCapture():
+                self.assertRaisesRegex(ValueError, 'on purpose', mcmc.run)
+            import pints.io as io
+            chains = io.load_samples(cpath, self.nchains)
+            self.assertEqual(len(chains[0]), 30)
+            with open(lpath, 'r') as f:
+                self.assertEqual(len(f.readlines()), 1 + 5)
+
+    def test_checkpoint_resume(self):
+        # Test resuming an interrupted run from a checkpoint
+
+        class FailingLogPDF(pints.LogPDF):
+            def __init__(self, log_pdf, n):
+                self._log_pdf = log_pdf
+                self._n = n
+
+            def n_parameters(self):
+                return self._log_pdf.n_parameters()
+
+            def __call__(self, x):
+                self._n -= 1
+                if self._n < 0:
+                    raise ValueError('Failing on purpose.')
+                return self._log_pdf(x)
+
+            def evaluateS1(self, x):
+                self._n -= 1
+                if self._n < 0:
+                    raise ValueError('Failing on purpose.')
+                return self._log_pdf.evaluateS1(x)
+
+        def controller(log_likelihood, method, d):
+            log_posterior = pints.LogPosterior(log_likelihood, self.log_prior)
+            mcmc = pints.MCMCController(
+                log_posterior, self.nchains, self.xs, method=method)
+            mcmc.set_initial_phase_iterations(10)
+            mcmc.set_max_iterations(40)
+            mcmc.set_log_pdf_storage(True)
+            mcmc.set_log_to_screen(False)
+            mcmc.set_chain_filename(d.path('chain.csv'))
+            mcmc.set_log_pdf_filename(d.path('evals.npy'))
+            return mcmc
+
+        for method in (pints.HaarioBardenetACMC, pints.DreamMCMC):
+            with TemporaryDirectory() as d:
+                # Uninterrupted run
+                np.random.seed(1)
+                mcmc = controller(self.log_likelihood, method, d)
+                chains1 = mcmc.run()
+                evals1 = mcmc.log_pdfs()
+                files1 = pints.io.load_samples(d.path('chain.csv'), 3)
+                evals_file1 = pints.io.load_samples(d.path('evals_0.npy'))
+
+                # Interrupted run, checkpointing every iteration
+                np.random.seed(1)
+                path = d.path('checkpoint.pickle')
+                failing = FailingLogPDF(self.log_likelihood, 3 * 25 + 1)
+                mcmc = controller(failing, method, d)
+                mcmc.set_checkpoint_filename(path, interval=0)
+                self.assertRaisesRegex(ValueError, 'on purpose', mcmc.run)
+                self.assertTrue(os.path.isfile(path))
+
+                # Resumed run
+                np.random.seed(123)
+                mcmc = controller(self.log_likelihood, method, d)
+                chains2 = mcmc.resume(path)
+                evals2 = mcmc.log_pdfs()
+                files2 = pints.io.load_samples(d.path('chain.csv'), 3)
+                evals_file2 = pints.io.load_samples(d.path('evals_0.npy'))
+
+            self.assertTrue(np.all(chains1 == chains2))
+            self.assertTrue(np.all(evals1 == evals2))
+            self.assertEqual(evals_file1.shape, (40, 3))
+            self.assertTrue(np.all(evals_file1 == evals_file2))
+            for chain1, chain2 in zip(files1, files2):
+                self.assertEqual(chain1.shape, (40, 3))
+                self.assertTrue(np.all(chain1 == chain2))
+
+        # Samplers with sensitivities, checkpointed while some chains are in
+        # the middle of a NUTS trajectory
+        with TemporaryDirectory() as d:
+            np.random.seed(1)
+            mcmc = controller(self.log_likelihood, pints.NoUTurnMCMC, d)
+            mcmc.set_log_pdf_storage(False)
+            mcmc.set_log_pdf_filename(None)
+            chains1 = mcmc.run()
+            files1 = pints.io.load_samples(d.path('chain.csv'), 3)
+
+            np.random.seed(1)
+            path = d.path('checkpoint.pickle')
+            failing = FailingLogPDF(self.log_likelihood, 301)
+            mcmc = controller(failing, pints.NoUTurnMCMC, d)
+            mcmc.set_log_pdf_storage(False)
+            mcmc.set_log_pdf_filename(None)
+            mcmc.set_checkpoint_filename(path, interval=0)
+            self.assertRaisesRegex(ValueError, 'on purpose', mcmc.run)
+
+            np.random.seed(123)
+            mcmc = controller(self.log_likelihood, pints.NoUTurnMCMC, d)
+            mcmc.set_log_pdf_storage(False)
+            mcmc.set_log_pdf_filename(None)
+            chains2 = mcmc.resume(path)
+            files2 = pints.io.load_samples(d.path('chain.csv'), 3)
+
+        self.assertTrue(np.all(chains1 == chains2))
+        for chain1, chain2 in zip(files1, files2):
+            self.assertEqual(chain1.shape, (40, 3))
+            self.assertTrue(np.all(chain1 == chain2))
+
+        # Memory-mapped chains are not copied into the checkpoint
+        with TemporaryDirectory() as d:
+            memmap = d.path('chains.bin')
+            np.random.seed(1)
+            mcmc = controller(self.log_likelihood, None, d)
+            mcmc.set_chain_storage(memmap_filename=memmap)
+            chains1 = np.array(mcmc.run())
+
+            np.random.seed(1)
+            path = d.path('checkpoint.pickle')
+            failing = FailingLogPDF(self.log_likelihood, 3 * 25 + 1)
+            mcmc = controller(failing, None, d)
+            mcmc.set_chain_storage(memmap_filename=memmap)
+            mcmc.set_checkpoint_filename(path, interval=0)
+            self.assertRaisesRegex(ValueError, 'on purpose', mcmc.run)
+            with open(path, 'rb') as f:
+                samples = pickle.load(f)['samples']
+            filename, shape, dtype = samples
+            self.assertEqual(filename, memmap)
+            self.assertEqual(dtype, np.dtype(float).str)
+            self.assertEqual(shape[::2], (3, 3))
+            self.assertLess(shape[1], 40)
+
+            # Resume from the chains on disk
+            np.random.seed(123)
+            mcmc = controller(self.log_likelihood, None, d)
+            mcmc.set_chain_storage(memmap_filename=memmap)
+            chains2 = mcmc.resume(path)
+            self.assertIsInstance(chains2, np.memmap)
+            self.assertTrue(np.all(chains1 == chains2))
+            del(chains2)
+
+            # The memory-mapped file must match the checkpoint
+            with open(memmap, 'r+b') as f:
+                f.truncate(8)
+            mcmc = controller(self.log_likelihood, None, d)
+            mcmc.set_chain_storage(memmap_filename=memmap)
+            self.assertRaisesRegex(
+                ValueError, 'do not match', mcmc.resume, path)
+
+        # Settings must match
+        with TemporaryDirectory() as d:
+            path = d.path('checkpoint.pickle')
+            mcmc = controller(self.log_likelihood, None, d)
+            mcmc.set_checkpoint_filename(path, interval=0)
+            mcmc.set_max_iterations(5)
+            mcmc.run()
+            mcmc = controller(self.log_likelihood, pints.DreamMCMC, d)
+            self.assertRaisesRegex(
+                ValueError, 'different settings', mcmc.resume, path)
+            mcmc = controller(self.log_likelihood, None, d)
+            mcmc.set_max_iterations(4)
+            self.assertRaisesRegex(
+                ValueError, 'not below the maximum', mcmc.resume, path)
+
+        # Invalid settings
+        mcmc = pints.MCMCController(
+            self.log_posterior, 1, [self.real_parameters])
+        self.assertRaisesRegex(
+            ValueError, 'negative', mcmc.set_checkpoint_filename, 'x', -1)
+        mcmc.set_checkpoint_filename('x')
+        mcmc.set_checkpoint_filename(None)
+        mcmc.set_checkpoint_filename('x')
+        mcmc.set_asynchronous()
+        mcmc.set_max_iterations(10)
+        self.assertRaisesRegex(ValueError, 'asynchronous', mcmc.run)
+
+    def test_writing_binary(self):
+        # Test writing chains, likelihoods, and priors to binary files.
+
+        import pints.io as io
+        for method in (pints.HaarioBardenetACMC, pints.DreamMCMC):
+            mcmc = pints.MCMCController(
+                self.log_posterior, self.nchains, self.xs, method=method)
+            mcmc.set_initial_phase_iterations(5)
+            mcmc.set_max_iterations(20)
+            mcmc.set_log_to_screen(False)
+
+            with TemporaryDirectory() as d:
+                cpath = d.path('chain.npy')
+                epath = d.path('evals.npy')
+                mcmc.set_chain_filename(cpath)
+                mcmc.set_log_pdf_filename(epath)
+                chains1 = mcmc.run()
+                self.assertTrue(os.path.exists(d.path('chain_0.npy')))
+                self.assertTrue(os.path.exists(d.path('evals_2.npy')))
+
+                # Test chain files contain the correct values
+                chains2 = io.load_samples(cpath, self.nchains)
+                self.assertIsInstance(chains2[0], np.memmap)
+                self.assertTrue(np.all(chains1 == np.array(chains2)))
+
+                # Test eval files contain the correct values
+                evals2 = np.array(io.load_samples(epath, self.nchains))
+                self.assertEqual(evals2.shape, (self.nchains, 20, 3))
+                for chain, evals in zip(chains1, evals2):
+                    logpdfs = [self.log_posterior(x) for x in chain]
+                    self.assertTrue(np.all(evals[:, 0] == logpdfs))
+                del(chains2)
+
+    def test_chain_storage_options(self):
+        # Test memory-mapped, thinned, burnt-in and downcast chain storage.
+
+        def run(method, **kwargs):
+            np.random.seed(1)
+            mcmc = pints.MCMCController(
+                self.log_posterior, self.nchains, self.xs, method=method)
+            mcmc.set_max_iterations(25)
+            mcmc.set_log_to_screen(False)
+            mcmc.set_log_pdf_storage(True)
+            mcmc.set_chain_storage(**kwargs)
+            return mcmc.run(), mcmc.log_pdfs()
+
+        for method in (pints.HaarioBardenetACMC, pints.DreamMCMC):
+            # Reference run, storing all samples
+            chains, log_pdfs = run(method)
+
+            # Thinned and burnt-in storage
+            chains1, log_pdfs1 = run(
+                method, burn_in=4, thinning=3, dtype=np.float32)
+            self.assertEqual(chains1.dtype, np.float32)
+            self.assertEqual(chains1.shape, (self.nchains, 7, 3))
+            self.assertTrue(np.all(
+                chains1 == chains[:, 4::3].astype(np.float32)))
+            self.assertTrue(np.all(
+                log_pdfs1 == log_pdfs[:, 4::3].astype(np.float32)))
+
+            # Memory-mapped storage
+            with TemporaryDirectory() as d:
+                path = d.path('chains.bin')
+                chains2, log_pdfs2 = run(
+                    method, memmap_filename=path, thinning=2)
+                self.assertIsInstance(chains2, np.memmap)
+                self.assertEqual(chains2.shape, (self.nchains, 13, 3))
+                self.assertTrue(np.all(chains2 == chains[:, ::2]))
+                self.assertTrue(np.all(log_pdfs2 == log_pdfs[:, ::2]))
+
+                # The file can be re-opened
+                chains3 = np.memmap(path, dtype=float, mode='r')
+                chains3 = chains3.reshape((13, self.nchains, 3))
+                self.assertTrue(np.all(chains3.transpose(1, 0, 2) == chains2))
+
+                # The summary can be calculated
+                summary = pints.MCMCSummary(chains2)
+                self.assertTrue(np.allclose(
+                    summary.mean(), np.mean(chains[:, ::2], axis=(0, 1))))
+                del(chains2, chains3, summary)
+
+        # Memory-mapped storage that grows and shrinks
+        np.random.seed(1)
+        log_pdf = pints.toy.GaussianLogPDF([1, 2], [1, 4])
+        mcmc = pints.MCMCController(log_pdf, 3, [[1, 2], [0, 1], [2, 3]])
+        mcmc.set_max_iterations(None)
+        mcmc.set_target_ess(2000)
+        mcmc.set_log_to_screen(False)
+        with TemporaryDirectory() as d:
+            path = d.path('chains.bin')
+            mcmc.set_chain_storage(memmap_filename=path, burn_in=1000)
+            chains = mcmc.run()
+            n = chains.shape[1]
+            self.assertGreater(n, 1024)
+            self.assertTrue(np.all(chains[:, -1] != 0))
+            self.assertEqual(os.path.getsize(path), chains.nbytes)
+            del(chains)
+
+        # Bad settings
+        self.assertRaisesRegex(
+            ValueError, 'negative', mcmc.set_chain_storage, burn_in=-1)
+        self.assertRaisesRegex(
+            ValueError, 'at least 1', mcmc.set_chain_storage, thinning=0)
+        self.assertRaisesRegex(
+            ValueError, 'floating point', mcmc.set_chain_storage,
+            dtype=int)
+
     def test_disabling_disk_storage(self):
         # Test if storage can be enabled and then disabled again.
         mcmc = pints.MCMCController(self.log_posterior, self.nchains, self.xs)
@@ -1523,6 +2122,22 @@ class TestMCMCControllerMultiChainStorage(unittest.TestCase):
         self.assertTrue(np.all(log_pdfs1 == log_pdfs2))
 
 
+class SlowLogPDF(pints.LogPDF):
+    """
+    Wraps a LogPDF, adding a delay that varies with the position (this must
+    not use numpy's random number generator).
+    """
+    def __init__(self, log_pdf):
+        self._log_pdf = log_pdf
+
+    def n_parameters(self):
+        return self._log_pdf.n_parameters()
+
+    def __call__(self, x):
+        time.sleep(0.0002 * (int(abs(x[0]) * 1000) % 3))
+        return self._log_pdf(x)
+
+
 if __name__ == '__main__':
     print('Add -v for more debug output')
     import sys
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+#
+# Tests the online convergence monitor used by the MCMC controller.
+#
+# This file is part of PINTS.
+#  Copyright (c) 2017-2019, University of Oxford.
+#  For licensing information, see the LICENSE file distributed with the PINTS
+#  software package.
+#
+import unittest
+import numpy as np
+
+import pints
+from pints._mcmc._convergence import ConvergenceMonitor
+
+
+class TestConvergenceMonitor(unittest.TestCase):
+    """
+    Tests the ConvergenceMonitor class.
+    """
+
+    def test_rhat(self):
+        # Test rhat equals the value calculated from the full chains
+
+        np.random.seed(1)
+        chains = np.random.normal(size=(3, 100, 2))
+        chains[0] += 0.5
+        m = ConvergenceMonitor(3, 2, n_batches=4)
+        self.assertTrue(np.all(np.isnan(m.rhat())))
+        for j in range(100):
+            for i in range(3):
+                m.add(i, chains[i, j])
+        self.assertTrue(np.allclose(
+            m.rhat(), pints.rhat_all_params(chains)))
+        self.assertTrue(np.all(m.n_samples() == 100))
+
+        # Single chain
+        m = ConvergenceMonitor(1, 2, n_batches=4)
+        for x in chains[0]:
+            m.add(0, x)
+        self.assertTrue(np.all(np.isnan(m.rhat())))
+
+    def test_batches(self):
+        # Test batch sizes double, so that they stay close to sqrt(n)
+
+        m = ConvergenceMonitor(1, 1, n_batches=4)
+        completed = [m.add(0, np.array([i])) for i in range(24)]
+        self.assertEqual(
+            [i for i, c in enumerate(completed) if c],
+            [0, 1, 3, 5, 7, 11, 15, 19, 23])
+        self.assertEqual(m._batch_size[0], 4)
+        self.assertEqual(m._completed[0], 6)
+        self.assertTrue(np.all(
+            m._batch_means[0, :6, 0] == [1.5, 5.5, 9.5, 13.5, 17.5, 21.5]))
+
+        # Estimates are returned once there are n_batches batches
+        m = ConvergenceMonitor(2, 1, n_batches=4)
+        for i in range(15):
+            m.add(0, np.array([i]))
+            m.add(1, np.array([-i]))
+            self.assertTrue(np.all(np.isnan(m.ess())))
+            self.assertTrue(np.all(np.isnan(m.rhat())))
+        m.add(0, np.array([15]))
+        m.add(1, np.array([-15]))
+        self.assertFalse(np.any(np.isnan(m.ess())))
+        self.assertFalse(np.any(np.isnan(m.rhat())))
+
+        # Storage for batch means is extended as needed
+        m = ConvergenceMonitor(1, 1, n_batches=1)
+        for i in range(10000):
+            m.add(0, np.array([i]))
+        self.assertEqual(m._batch_size[0], 128)
+        self.assertGreater(m._batch_means.shape[1], 2)
+
+    def test_ess(self):
+        # Test the ess estimate for independent and autocorrelated chains
+
+        np.random.seed(1)
+        m = ConvergenceMonitor(2, 2)
+        self.assertTrue(np.all(np.isnan(m.ess())))
+        for j in range(5000):
+            for i in range(2):
+                m.add(i, np.random.normal(size=2))
+        self.assertTrue(np.all(np.abs(m.ess() / 10000 - 1) < 0.3))
+
+        # AR(1) chains, with ess = n / tau, where tau = (1 + a) / (1 - a)
+        a = 0.8
+        m = ConvergenceMonitor(2, 2)
+        x = np.zeros((2, 2))
+        for j in range(20000):
+            for i in range(2):
+                x[i] = a * x[i] + np.random.normal(size=2)
+                m.add(i, x[i])
+        self.assertTrue(np.all(np.abs(m.ess() / (40000.0 / 9) - 1) < 0.3))
+
+    def test_ess_strongly_autocorrelated(self):
+        # Test the ess of short, strongly autocorrelated chains is not
+        # overestimated
+
+        # AR(1) chains with a = 0.99, so that tau = 199
+        np.random.seed(1)
+        a = 0.99
+        m = ConvergenceMonitor(4, 1)
+        x = np.zeros((4, 1))
+        first = None
+        for j in range(20000):
+            for i in range(4):
+                x[i] = a * x[i] + np.random.normal(size=1)
+                m.add(i, x[i])
+            if j < 255:
+                self.assertTrue(np.all(np.isnan(m.ess())))
+            elif first is None and j % 50 == 0 and m.ess()[0] >= 400:
+                first = j + 1
+
+        # A target of 400 is not reached until the true ess is at least half
+        # of that
+        self.assertIsNotNone(first)
+        self.assertGreater(4 * first / 199.0, 200)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+#
+# Tests the t-digest used to estimate quantiles in MCMC summaries.
+#
+# This file is part of PINTS.
+#  Copyright (c) 2017-2019, University of Oxford.
+#  For licensing information, see the LICENSE file distributed with the PINTS
+#  software package.
+#
+import unittest
+import numpy as np
+
+from pints._mcmc._digest import TDigest
+
+# Consistent unit testing in Python 2 and 3
+try:
+    unittest.TestCase.assertRaisesRegex
+except AttributeError:
+    unittest.TestCase.assertRaisesRegex = unittest.TestCase.assertRaisesRegexp
+
+
+class TestTDigest(unittest.TestCase):
+    """
+    Tests the TDigest class.
+    """
+
+    def test_exact(self):
+        # Test quantiles are exact for small numbers of samples
+
+        np.random.seed(1)
+        x = np.random.normal(size=(1000, 3))
+        d = TDigest(3)
+        self.assertRaisesRegex(ValueError, 'no samples', d.quantiles, [0.5])
+        d.add(x[:10])
+        d.add(x[10:])
+        self.assertEqual(d.count(), 1000)
+        q = [0, 0.025, 0.5, 0.9, 1]
+        self.assertTrue(np.allclose(
+            d.quantiles(q), np.percentile(x, 100 * np.array(q), axis=0)))
+
+    def test_compression(self):
+        # Test the number of centroids is bounded, and quantiles are accurate
+
+        np.random.seed(1)
+        x = np.random.standard_t(3, size=(200000, 2))
+        d = TDigest(2)
+        for i in range(0, len(x), 5000):
+            d.add(x[i:i + 5000])
+        self.assertTrue(all([len(m) <= 5000 + 5000 for m in d._means]))
+
+        q = [0, 0.001, 0.025, 0.25, 0.5, 0.75, 0.975, 0.999, 1]
+        p = np.percentile(x, 100 * np.array(q), axis=0)
+        self.assertTrue(np.all(np.abs(d.quantiles(q) - p) < 0.05))
+
+        # Extreme quantiles are the minimum and maximum
+        self.assertTrue(np.all(d.quantiles([0, 1]) == p[[0, -1]]))
+
+        self.assertRaisesRegex(ValueError, 'at least 1', TDigest, 1, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
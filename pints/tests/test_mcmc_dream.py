@@ -160,6 +160,43 @@ class TestDreamMCMC(unittest.TestCase):
         mcmc.ask()
         self.assertRaises(ValueError, mcmc.tell, float('-inf'))
 
+    def test_proposals(self):
+        """
+        Tests the array-based selection of chain pairs and crossover indices.
+        """
+        np.random.seed(1)
+        n = 5
+        x0 = [self.real_parameters] * n
+        mcmc = pints.DreamMCMC(n, x0)
+
+        # Pairs of chains are distinct, exclude the current chain, and are
+        # drawn uniformly
+        r1, r2 = mcmc._draw(2000)
+        self.assertEqual(r1.shape, (n, 2000))
+        self.assertTrue(np.all(r1 != r2))
+        i = np.arange(n).reshape(n, 1)
+        self.assertTrue(np.all((r1 != i) & (r2 != i)))
+        counts = np.zeros((n, n, n))
+        np.add.at(counts, (np.repeat(i, 2000, axis=1), r1, r2), 1)
+        counts = counts[counts > 0]
+        self.assertEqual(len(counts), n * (n - 1) * (n - 2))
+        self.assertLess(np.max(np.abs(counts * 12 / 2000.0 - 1)), 0.3)
+
+        # Crossover indices use the lowest of nCR draws, and are counted
+        mcmc.ask()
+        mcmc.tell([self.log_posterior(x) for x in x0])
+        mcmc._p = np.array([0.2, 0.3, 0.5])
+        ms = []
+        for j in range(1000):
+            mcmc._proposed = None
+            mcmc.ask()
+            ms.append(mcmc._m)
+        f = np.bincount(np.concatenate(ms), minlength=3) / (n * 1000.0)
+        expected = [1 - 0.8**3, 0.8**3 - 0.5**3, 0.5**3]
+        self.assertTrue(np.allclose(f, expected, atol=0.03))
+        self.assertTrue(np.all(mcmc._L == np.bincount(
+            np.concatenate(ms), minlength=3)))
+
     def test_set_hyper_parameters(self):
         """
         Tests the hyper-parameter interface for this optimiser.
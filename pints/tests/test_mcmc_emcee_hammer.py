@@ -78,13 +78,24 @@ class TestEmceeHammerMCMC(unittest.TestCase):
             xs = mcmc.ask()
             fxs = [self.log_posterior(x) for x in xs]
             samples = mcmc.tell(fxs)
+
+            # Half the walkers are updated at a time, so a new sample is
+            # returned every second tell
+            if i == 0 or i % 2 == 0:
+                self.assertIsNotNone(samples)
+            else:
+                self.assertIsNone(samples)
+                continue
             if i >= 50:
                 chains.append(samples)
-            if np.all(samples == xs):
+            if i == 0:
+                self.assertEqual(len(xs), 4)
                 self.assertTrue(np.all(mcmc.current_log_pdfs() == fxs))
+            else:
+                self.assertEqual(len(xs), 2)
 
         chains = np.array(chains)
-        self.assertEqual(chains.shape[0], 50)
+        self.assertEqual(chains.shape[0], 25)
         self.assertEqual(chains.shape[1], len(x0s))
         self.assertEqual(chains.shape[2], len(x0s[0]))
 
@@ -120,8 +131,8 @@ class TestEmceeHammerMCMC(unittest.TestCase):
             self.assertTrue(x is mcmc.ask())
 
         # Repeated tells should fail
-        mcmc.tell([1])
-        self.assertRaises(RuntimeError, mcmc.tell, [1])
+        mcmc.tell(np.ones(len(x)))
+        self.assertRaises(RuntimeError, mcmc.tell, np.ones(len(x)))
 
         # Bad starting point
         mcmc = pints.EmceeHammerMCMC(n, x0)
@@ -160,6 +171,42 @@ class TestEmceeHammerMCMC(unittest.TestCase):
         text = c.text()
         self.assertIn('Emcee Hammer MCMC', text)
 
+    def test_controller(self):
+        # Test running with a controller, storing evaluations
+
+        x0 = [self.real_parameters * f for f in (1.01, 0.99, 1.02, 0.98, 1)]
+        mcmc = pints.MCMCController(
+            self.log_posterior, 5, x0, method=pints.EmceeHammerMCMC)
+        mcmc.set_max_iterations(20)
+        mcmc.set_log_to_screen(False)
+        mcmc.set_log_pdf_storage(True)
+        chains = mcmc.run()
+        evals = mcmc.log_pdfs()
+        self.assertEqual(chains.shape, (5, 20, 3))
+        self.assertEqual(evals.shape, (5, 20, 3))
+        for chain, e in zip(chains, evals):
+            for x, fx in zip(chain, e):
+                self.assertEqual(fx[0], self.log_posterior(x))
+                self.assertEqual(fx[1], self.log_likelihood(x))
+                self.assertEqual(fx[2], self.log_prior(x))
+
+    def test_gaussian(self):
+        # Test sampling from a gaussian
+
+        np.random.seed(1)
+        log_pdf = toy.GaussianLogPDF([1, 2], [1, 4])
+        x0 = np.random.uniform(-1, 1, size=(10, 2)) + [1, 2]
+        mcmc = pints.MCMCController(
+            log_pdf, 10, x0, method=pints.EmceeHammerMCMC)
+        mcmc.set_max_iterations(2000)
+        mcmc.set_log_to_screen(False)
+        chains = mcmc.run()
+        samples = chains[:, 500:].reshape(-1, 2)
+        mean = np.mean(samples, axis=0)
+        var = np.var(samples, axis=0)
+        self.assertTrue(np.all(np.abs(mean - [1, 2]) < 0.2))
+        self.assertTrue(np.all(np.abs(var - [1, 4]) < 0.5))
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+#
+# Tests the adaptive mass matrix used by Hamiltonian MCMC methods.
+#
+# This file is part of PINTS.
+#  Copyright (c) 2017-2019, University of Oxford.
+#  For licensing information, see the LICENSE file distributed with the PINTS
+#  software package.
+#
+import unittest
+import numpy as np
+
+import pints
+import pints.toy
+
+from pints._mcmc._mass_matrix import AdaptiveMassMatrixMCMC, MassMatrix
+
+# Consistent unit testing in Python 2 and 3
+try:
+    unittest.TestCase.assertRaisesRegex
+except AttributeError:
+    unittest.TestCase.assertRaisesRegex = unittest.TestCase.assertRaisesRegexp
+
+
+class TestMassMatrix(unittest.TestCase):
+    """
+    Tests the MassMatrix class.
+    """
+
+    def test_factor(self):
+        # Test products with the factor and the inverse mass matrix
+
+        v = np.array([1, 2])
+        m = MassMatrix([2, 3])
+        self.assertTrue(np.all(m.dot(v) == [2, 6]))
+        self.assertTrue(np.all(m.dot_transpose(v) == [2, 6]))
+        self.assertTrue(np.all(m.inverse_mass_matrix() == np.diag([4, 9])))
+        self.assertTrue(np.all(m.scales() == [2, 3]))
+
+        factor = np.array([[2, 0], [1, 3]])
+        m.set_factor(factor)
+        self.assertTrue(np.all(m.factor() == factor))
+        self.assertTrue(np.all(m.dot(v) == np.dot(factor, v)))
+        self.assertTrue(np.all(m.dot_transpose(v) == np.dot(factor.T, v)))
+        self.assertTrue(np.all(
+            m.inverse_mass_matrix() == np.dot(factor, factor.T)))
+        self.assertTrue(np.allclose(m.scales(), [2, np.sqrt(10)]))
+
+        self.assertRaisesRegex(
+            ValueError, 'vector or a matrix', m.set_factor, 1)
+
+    def test_windows(self):
+        # Test updates happen at the end of each window
+
+        np.random.seed(1)
+        m = MassMatrix([1, 1])
+        self.assertEqual(m.adaptation(), 'diagonal')
+        updates = [i for i in range(400) if m.adapt(np.random.normal(
+            size=2))]
+        self.assertEqual(updates, [99, 149, 249])
+
+        # No adaptation
+        m.set_adaptation(None)
+        self.assertIsNone(m.adaptation())
+        self.assertFalse(any(m.adapt(np.ones(2)) for i in range(200)))
+        self.assertRaisesRegex(
+            ValueError, 'diagonal', m.set_adaptation, 'full')
+
+    def test_estimates(self):
+        # Test diagonal and dense estimates of the covariance
+
+        np.random.seed(1)
+        sigma = np.array([[1e-4, 5e-3], [5e-3, 1]])
+        xs = np.random.multivariate_normal([1, 2], sigma, size=10000)
+
+        m = MassMatrix([1, 1])
+        m._initial_buffer = 0
+        m._initial_window = 10000
+        m._reset_windows()
+        for x in xs[:-1]:
+            self.assertFalse(m.adapt(x))
+        self.assertTrue(m.adapt(xs[-1]))
+        self.assertEqual(m.factor().shape, (2, ))
+        self.assertTrue(np.allclose(
+            m.inverse_mass_matrix(), np.diag(np.diag(sigma)), rtol=0.05))
+
+        m.set_adaptation('dense')
+        for x in xs:
+            m.adapt(x)
+        self.assertEqual(m.factor().shape, (2, 2))
+        self.assertTrue(np.allclose(
+            m.inverse_mass_matrix(), sigma, rtol=0.05, atol=1e-6))
+
+
+class TestAdaptiveMassMatrixMCMC(unittest.TestCase):
+    """
+    Tests the mass matrix adaptation shared by Hamiltonian MCMC methods.
+    """
+
+    def test_adaptation(self):
+        # Test the inverse mass matrix is adapted during the initial phase
+
+        np.random.seed(1)
+        log_pdf = pints.toy.GaussianLogPDF([1, 1000], [1e-4, 1e2])
+        mcmc = pints.MCMCController(
+            log_pdf, 1, [[1, 1000]], sigma0=[1e-2, 10],
+            method=pints.HamiltonianMCMC)
+        mcmc.set_max_iterations(260)
+        mcmc.set_initial_phase_iterations(250)
+        mcmc.set_log_to_screen(False)
+        mcmc.run()
+
+        # Variance estimates are within a factor of 3
+        sampler = mcmc.samplers()[0]
+        self.assertFalse(sampler.in_initial_phase())
+        variances = np.diag(sampler.inverse_mass_matrix())
+        ratio = variances / [1e-4, 1e2]
+        self.assertTrue(np.all(ratio > 0.3) and np.all(ratio < 3))
+
+        # The step sizes in use are reported
+        self.assertTrue(np.allclose(
+            sampler.leapfrog_step_size(), np.sqrt(variances)))
+        self.assertTrue(np.allclose(
+            sampler.scaled_epsilon(),
+            sampler.epsilon() * np.sqrt(variances)))
+
+    def test_settings(self):
+        # Test the adaptation settings of all Hamiltonian methods
+
+        x0 = [1, 1000]
+        for method in (pints.HamiltonianMCMC, pints.RelativisticMCMC,
+                       pints.MonomialGammaHamiltonianMCMC, pints.NoUTurnMCMC):
+            sampler = method(x0, [1e-2, 10])
+            self.assertIsInstance(sampler, AdaptiveMassMatrixMCMC)
+            self.assertTrue(sampler.needs_initial_phase())
+            self.assertTrue(sampler.in_initial_phase())
+            sampler.set_initial_phase(False)
+            self.assertFalse(sampler.in_initial_phase())
+
+            self.assertEqual(sampler.mass_matrix_adaptation(), 'diagonal')
+            sampler.set_mass_matrix_adaptation('dense')
+            self.assertEqual(sampler.mass_matrix_adaptation(), 'dense')
+            sampler.set_mass_matrix_adaptation(None)
+            self.assertIsNone(sampler.mass_matrix_adaptation())
+            self.assertRaisesRegex(
+                ValueError, 'diagonal', sampler.set_mass_matrix_adaptation,
+                'full')
+
+        # Without adaptation, the initial step sizes are kept
+        np.random.seed(1)
+        sampler = pints.HamiltonianMCMC(x0, [1e-2, 10])
+        self.assertTrue(np.all(
+            sampler.inverse_mass_matrix() == np.diag([1e-4, 100])))
+        sampler.set_mass_matrix_adaptation(None)
+        log_pdf = pints.toy.GaussianLogPDF(x0, [1e-4, 1e2])
+        for i in range(300):
+            sampler.tell(log_pdf.evaluateS1(sampler.ask()))
+        self.assertTrue(np.all(sampler.leapfrog_step_size() == [1e-2, 10]))
+
+
+if __name__ == '__main__':
+    unittest.main()
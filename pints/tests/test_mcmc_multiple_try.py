@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+#
+# Tests the multiple-try Metropolis MCMC routine.
+#
+# This file is part of PINTS.
+#  Copyright (c) 2017-2019, University of Oxford.
+#  For licensing information, see the LICENSE file distributed with the PINTS
+#  software package.
+#
+import unittest
+import numpy as np
+
+import pints
+import pints.toy
+
+from shared import StreamCapture
+
+# Consistent unit testing in Python 2 and 3
+try:
+    unittest.TestCase.assertRaisesRegex
+except AttributeError:
+    unittest.TestCase.assertRaisesRegex = unittest.TestCase.assertRaisesRegexp
+
+
+class TestMultipleTryMCMC(unittest.TestCase):
+    """
+    Tests the multiple-try Metropolis MCMC routine.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        """ Prepare a problem for testing. """
+        cls.log_pdf = pints.toy.GaussianLogPDF([1, 2, 3], [1, 4, 9])
+        cls.x0 = np.array([1.5, 2.5, 2])
+        cls.sigma0 = [1, 4, 9]
+
+    def test_method(self):
+        # Test the ask-and-tell interface directly
+
+        np.random.seed(1)
+        mcmc = pints.MultipleTryMCMC(self.x0, self.sigma0)
+        self.assertTrue(mcmc.needs_batch_evaluation())
+        mcmc.set_n_tries(5)
+
+        # First batch contains only x0
+        xs = mcmc.ask()
+        self.assertEqual(xs.shape, (1, 3))
+        self.assertTrue(np.all(xs[0] == self.x0))
+        x = mcmc.tell([self.log_pdf(x) for x in xs])
+        self.assertTrue(np.all(x == self.x0))
+
+        # Each iteration asks for candidates, then reference points
+        chain = []
+        sizes = []
+        while len(chain) < 100:
+            xs = mcmc.ask()
+            sizes.append(len(xs))
+            sample = mcmc.tell([self.log_pdf(x) for x in xs])
+            if sample is not None:
+                chain.append(sample)
+                self.assertEqual(mcmc.current_log_pdf(), self.log_pdf(sample))
+        self.assertEqual(sizes, [5, 4] * 100)
+        self.assertGreater(mcmc.acceptance_rate(), 0)
+
+        # Independent proposals need a single batch per iteration
+        mcmc = pints.MultipleTryMCMC(self.x0, self.sigma0)
+        mcmc.set_independent_proposals()
+        self.assertTrue(mcmc.independent_proposals())
+        mcmc.tell([self.log_pdf(x) for x in mcmc.ask()])
+        for i in range(10):
+            xs = mcmc.ask()
+            self.assertEqual(xs.shape, (4, 3))
+            self.assertIsNotNone(mcmc.tell([self.log_pdf(x) for x in xs]))
+
+        # Candidates without finite log pdfs are rejected
+        for independent in (False, True):
+            mcmc = pints.MultipleTryMCMC(self.x0, self.sigma0)
+            mcmc.set_independent_proposals(independent)
+            mcmc.tell([self.log_pdf(x) for x in mcmc.ask()])
+            mcmc.ask()
+            x = mcmc.tell([-np.inf] * 4)
+            self.assertTrue(np.all(x == self.x0))
+            self.assertEqual(mcmc.acceptance_rate(), 0)
+
+    def test_sampling(self):
+        # Test sampling from a Gaussian, with and without independent
+        # proposals, and with a single try
+
+        for n_tries, independent in ((4, False), (4, True), (1, False)):
+            np.random.seed(1)
+            mcmc = pints.MCMCController(
+                self.log_pdf, 1, [self.x0], sigma0=self.sigma0,
+                method=pints.MultipleTryMCMC)
+            mcmc.samplers()[0].set_n_tries(n_tries)
+            mcmc.samplers()[0].set_independent_proposals(independent)
+            mcmc.set_max_iterations(3000)
+            mcmc.set_log_to_screen(False)
+            mcmc.set_log_pdf_storage(True)
+            chain = mcmc.run()[0]
+            self.assertTrue(np.allclose(
+                mcmc.log_pdfs()[0], [self.log_pdf(x) for x in chain]))
+
+            chain = chain[500:]
+            self.assertTrue(np.all(np.abs(np.mean(chain, axis=0) - [1, 2, 3])
+                                   < [0.2, 0.4, 0.6]))
+            self.assertTrue(np.all(np.abs(np.var(chain, axis=0) - [1, 4, 9])
+                                   < [0.3, 1.2, 2.7]))
+
+    def test_parallel(self):
+        # Test a single chain can use several workers
+
+        def run(parallel):
+            np.random.seed(1)
+            mcmc = pints.MCMCController(
+                self.log_pdf, 1, [self.x0], sigma0=self.sigma0,
+                method=pints.MultipleTryMCMC)
+            mcmc.set_max_iterations(20)
+            mcmc.set_parallel(parallel)
+            with StreamCapture() as c:
+                chains = mcmc.run()
+            return chains, c.text()
+
+        chains1, text = run(2)
+        self.assertIn('with 2 worker processes', text)
+        chains2, text = run(False)
+        self.assertTrue(np.all(chains1 == chains2))
+
+        # Not supported in asynchronous mode
+        mcmc = pints.MCMCController(
+            self.log_pdf, 1, [self.x0], method=pints.MultipleTryMCMC)
+        mcmc.set_asynchronous()
+        self.assertRaisesRegex(ValueError, 'batches', mcmc.run)
+
+        # Fused iterations evaluate batches sequentially
+        np.random.seed(1)
+        mcmc = pints.MCMCController(
+            self.log_pdf, 2, [self.x0] * 2, method=pints.MultipleTryMCMC)
+        mcmc.set_max_iterations(20)
+        mcmc.set_log_to_screen(False)
+        mcmc.set_fused_iterations()
+        self.assertEqual(mcmc.run().shape, (2, 20, 3))
+
+    def test_logging(self):
+        # Test logging includes name and custom fields
+
+        mcmc = pints.MCMCController(
+            self.log_pdf, 1, [self.x0], method=pints.MultipleTryMCMC)
+        mcmc.set_max_iterations(5)
+        with StreamCapture() as c:
+            mcmc.run()
+        text = c.text()
+        self.assertIn('Multiple-try Metropolis MCMC', text)
+        self.assertIn(' Accept.', text)
+
+    def test_flow(self):
+        # Test the ask-and-tell pattern
+
+        # Repeated asks return the same batch
+        mcmc = pints.MultipleTryMCMC(self.x0)
+        xs = mcmc.ask()
+        self.assertIs(mcmc.ask(), xs)
+
+        # Tell without ask
+        mcmc = pints.MultipleTryMCMC(self.x0)
+        self.assertRaisesRegex(RuntimeError, 'before', mcmc.tell, [0])
+
+        # Wrong number of evaluations
+        mcmc.ask()
+        self.assertRaisesRegex(ValueError, 'Expecting 1', mcmc.tell, [0, 0])
+
+        # Bad starting point
+        self.assertRaisesRegex(ValueError, 'finite', mcmc.tell, [-np.inf])
+
+        # Double initialisation
+        self.assertRaises(RuntimeError, mcmc._initialise)
+
+        # Proposal type can't be changed during run
+        self.assertRaisesRegex(
+            RuntimeError, 'during run', mcmc.set_independent_proposals)
+
+    def test_settings(self):
+        # Test the hyper-parameter interface
+
+        mcmc = pints.MultipleTryMCMC(self.x0)
+        self.assertEqual(mcmc.n_hyper_parameters(), 1)
+        self.assertEqual(mcmc.n_tries(), 4)
+        mcmc.set_hyper_parameters([7])
+        self.assertEqual(mcmc.n_tries(), 7)
+        self.assertRaisesRegex(ValueError, 'at least 1', mcmc.set_n_tries, 0)
+        self.assertFalse(mcmc.independent_proposals())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+#
+# Tests the No-U-Turn MCMC routine.
+#
+# This file is part of PINTS.
+#  Copyright (c) 2017-2019, University of Oxford.
+#  For licensing information, see the LICENSE file distributed with the PINTS
+#  software package.
+#
+import unittest
+import numpy as np
+
+import pints
+import pints.toy
+
+from shared import StreamCapture
+
+# Consistent unit testing in Python 2 and 3
+try:
+    unittest.TestCase.assertRaisesRegex
+except AttributeError:
+    unittest.TestCase.assertRaisesRegex = unittest.TestCase.assertRaisesRegexp
+
+
+class TestNoUTurnMCMC(unittest.TestCase):
+    """
+    Tests the No-U-Turn MCMC routine.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        """ Prepare a problem for testing. """
+        cls.log_pdf = pints.toy.GaussianLogPDF([1, 2, 3], [1, 4, 9])
+        cls.x0 = np.array([1.5, 2.5, 2])
+
+    def test_method(self):
+        # Test the ask-and-tell interface directly
+
+        np.random.seed(1)
+        mcmc = pints.NoUTurnMCMC(self.x0, [1, 4, 9])
+        self.assertTrue(mcmc.needs_sensitivities())
+        self.assertIsNone(mcmc.leapfrog_step_size())
+
+        chain = []
+        n_evaluations = 0
+        while len(chain) < 200:
+            x = mcmc.ask()
+            fx, gr = self.log_pdf.evaluateS1(x)
+            n_evaluations += 1
+            sample = mcmc.tell((fx, gr))
+            if sample is not None:
+                chain.append(sample)
+                self.assertEqual(mcmc.current_log_pdf(), self.log_pdf(sample))
+                self.assertLessEqual(mcmc._depth, mcmc.max_tree_depth())
+
+        # A step size was chosen, and at most 2**depth - 1 gradient
+        # evaluations were used per iteration
+        self.assertGreater(mcmc.leapfrog_step_size(), 0)
+        self.assertGreater(n_evaluations, 200)
+        self.assertLess(n_evaluations, 200 * 2**mcmc.max_tree_depth())
+        self.assertEqual(np.array(chain).shape, (200, 3))
+
+    def test_sampling(self):
+        # Test sampling from a Gaussian, with step size adaptation
+
+        np.random.seed(1)
+        mcmc = pints.MCMCController(
+            self.log_pdf, 1, [self.x0], method=pints.NoUTurnMCMC)
+        mcmc.set_max_iterations(1500)
+        mcmc.set_initial_phase_iterations(300)
+        mcmc.set_log_to_screen(False)
+        chain = mcmc.run()[0][300:]
+
+        self.assertTrue(np.all(np.abs(np.mean(chain, axis=0) - [1, 2, 3])
+                               < [0.15, 0.3, 0.45]))
+        self.assertTrue(np.all(np.abs(np.var(chain, axis=0) - [1, 4, 9])
+                               < [0.2, 0.8, 1.8]))
+
+        # Mean acceptance statistic is close to the target
+        sampler = mcmc.samplers()[0]
+        self.assertFalse(sampler.in_initial_phase())
+        self.assertTrue(abs(sampler._mcmc_acceptance - 0.8) < 0.1)
+
+        # No divergences after the initial phase
+        self.assertTrue(np.all(sampler.divergent_iterations() < 300))
+
+        # Step size is fixed after the initial phase
+        epsilon = sampler.leapfrog_step_size()
+        for i in range(10):
+            x = sampler.ask()
+            sampler.tell(self.log_pdf.evaluateS1(x))
+        self.assertEqual(sampler.leapfrog_step_size(), epsilon)
+
+    def test_divergence(self):
+        # Test divergent iterations are detected
+
+        np.random.seed(1)
+        mcmc = pints.NoUTurnMCMC(self.x0)
+        mcmc.set_leapfrog_step_size(1000)
+        mcmc.set_initial_phase(False)
+        for i in range(20):
+            x = mcmc.ask()
+            mcmc.tell(self.log_pdf.evaluateS1(x))
+        self.assertGreater(len(mcmc.divergent_iterations()), 0)
+        self.assertTrue(np.all(mcmc._current == self.x0))
+
+        # Non-finite log pdfs are also divergent
+        mcmc = pints.NoUTurnMCMC(self.x0)
+        mcmc.set_leapfrog_step_size(0.1)
+        x = mcmc.ask()
+        mcmc.tell(self.log_pdf.evaluateS1(x))
+        mcmc.ask()
+        sample = mcmc.tell((-np.inf, np.array([np.nan] * 3)))
+        self.assertTrue(np.all(sample == self.x0))
+        self.assertEqual(list(mcmc.divergent_iterations()), [0])
+        self.assertEqual(mcmc._depth, 1)
+
+    def test_logging(self):
+        # Test logging includes name and custom fields
+
+        x0 = [self.x0, self.x0 + 1]
+        mcmc = pints.MCMCController(
+            self.log_pdf, 2, x0, method=pints.NoUTurnMCMC)
+        mcmc.set_max_iterations(5)
+        with StreamCapture() as c:
+            mcmc.run()
+        text = c.text()
+
+        self.assertIn('No-U-Turn MCMC', text)
+        self.assertIn(' Accept.', text)
+        self.assertIn(' Depth', text)
+        self.assertIn(' Div.', text)
+
+    def test_flow(self):
+        # Test the ask-and-tell pattern
+
+        # Test initial proposal is first point
+        mcmc = pints.NoUTurnMCMC(self.x0)
+        self.assertTrue(np.all(mcmc.ask() == mcmc._x0))
+
+        # Repeated asks
+        self.assertRaisesRegex(RuntimeError, 'expecting', mcmc.ask)
+
+        # Tell without ask
+        mcmc = pints.NoUTurnMCMC(self.x0)
+        self.assertRaisesRegex(RuntimeError, 'before', mcmc.tell, 0)
+
+        # Repeated tells should fail
+        x = mcmc.ask()
+        mcmc.tell(self.log_pdf.evaluateS1(x))
+        self.assertRaises(
+            RuntimeError, mcmc.tell, self.log_pdf.evaluateS1(x))
+
+        # Bad starting point
+        mcmc = pints.NoUTurnMCMC(self.x0)
+        mcmc.ask()
+        self.assertRaisesRegex(
+            ValueError, 'finite', mcmc.tell, (-np.inf, np.ones(3)))
+
+    def test_settings(self):
+        # Test the hyper-parameter interface and other settings
+
+        mcmc = pints.NoUTurnMCMC(self.x0)
+        self.assertTrue(mcmc.needs_initial_phase())
+        self.assertTrue(mcmc.in_initial_phase())
+
+        self.assertEqual(mcmc.n_hyper_parameters(), 1)
+        self.assertEqual(mcmc.target_acceptance_rate(), 0.8)
+        mcmc.set_hyper_parameters([0.6])
+        self.assertEqual(mcmc.target_acceptance_rate(), 0.6)
+        self.assertRaisesRegex(
+            ValueError, 'greater than 0', mcmc.set_target_acceptance_rate, 0)
+        self.assertRaisesRegex(
+            ValueError, 'less than 1', mcmc.set_target_acceptance_rate, 1)
+
+        mcmc.set_leapfrog_step_size(0.5)
+        self.assertEqual(mcmc.leapfrog_step_size(), 0.5)
+        self.assertRaisesRegex(
+            ValueError, 'greater than zero', mcmc.set_leapfrog_step_size, 0)
+        mcmc.set_leapfrog_step_size(None)
+        self.assertIsNone(mcmc.leapfrog_step_size())
+
+        self.assertEqual(mcmc.max_tree_depth(), 10)
+        mcmc.set_max_tree_depth(5)
+        self.assertEqual(mcmc.max_tree_depth(), 5)
+        self.assertRaisesRegex(
+            ValueError, 'at least 1', mcmc.set_max_tree_depth, 0)
+
+        self.assertEqual(mcmc.hamiltonian_threshold(), 10**3)
+        mcmc.set_hamiltonian_threshold(10)
+        self.assertEqual(mcmc.hamiltonian_threshold(), 10)
+        self.assertRaisesRegex(
+            ValueError, 'non-negative', mcmc.set_hamiltonian_threshold, -1)
+
+
+if __name__ == '__main__':
+    unittest.main()
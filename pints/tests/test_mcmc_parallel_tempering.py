@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+#
+# Tests the parallel tempering MCMC routine.
+#
+# This file is part of PINTS.
+#  Copyright (c) 2017-2019, University of Oxford.
+#  For licensing information, see the LICENSE file distributed with the PINTS
+#  software package.
+#
+import unittest
+import numpy as np
+
+import pints
+import pints.toy
+
+from shared import StreamCapture
+
+# Consistent unit testing in Python 2 and 3
+try:
+    unittest.TestCase.assertRaisesRegex
+except AttributeError:
+    unittest.TestCase.assertRaisesRegex = unittest.TestCase.assertRaisesRegexp
+
+
+class TestParallelTemperingMCMC(unittest.TestCase):
+    """
+    Tests the parallel tempering MCMC routine.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        """ Prepare a problem for testing. """
+        cls.log_pdf = pints.toy.MultimodalGaussianLogPDF([[0, 0], [10, 10]])
+        cls.x0 = [[0.1, 0.1]] * 6
+
+    def test_method(self):
+        # Test the ask-and-tell interface directly
+
+        np.random.seed(1)
+        mcmc = pints.ParallelTemperingMCMC(6, self.x0)
+        mcmc.set_initial_phase(False)
+        for i in range(50):
+            xs = mcmc.ask()
+            self.assertEqual(xs.shape, (6, 2))
+            samples = mcmc.tell([self.log_pdf(x) for x in xs])
+            self.assertEqual(samples.shape, (6, 2))
+            self.assertTrue(np.all(mcmc.current_log_pdfs() == [
+                self.log_pdf(x) for x in samples]))
+
+        # Swaps were attempted for every other pair at each iteration (after
+        # the first)
+        self.assertEqual(list(mcmc._swaps_attempted), [24, 25, 24, 25, 24])
+        rates = mcmc.swap_acceptance_rates()
+        self.assertEqual(rates.shape, (5, ))
+        self.assertTrue(np.all(rates > 0))
+        self.assertTrue(np.all(rates <= 1))
+
+    def test_sampling(self):
+        # Test all modes are found, and the schedule is adapted
+
+        np.random.seed(1)
+        mcmc = pints.MCMCController(
+            self.log_pdf, 6, self.x0, sigma0=[1, 1],
+            method=pints.ParallelTemperingMCMC)
+        mcmc.set_max_iterations(2000)
+        mcmc.set_initial_phase_iterations(500)
+        mcmc.set_log_to_screen(False)
+        chains = mcmc.run()
+        self.assertEqual(chains.shape, (6, 2000, 2))
+
+        # The chain at T=0 visits both modes equally often
+        chain = chains[0, 500:]
+        self.assertLess(abs(np.mean(chain[:, 0] > 5) - 0.5), 0.1)
+
+        # The first and last temperatures are unchanged, and the swap
+        # acceptance rates are close to each other
+        sampler = mcmc.sampler()
+        schedule = sampler.temperature_schedule()
+        self.assertEqual(schedule[0], 0)
+        self.assertAlmostEqual(schedule[-1], 0.95)
+        self.assertTrue(np.all(np.diff(schedule) > 0))
+        rates = sampler.swap_acceptance_rates()
+        self.assertLess(np.max(rates) - np.min(rates), 0.2)
+
+        # The schedule is fixed after the initial phase
+        for i in range(10):
+            sampler.tell([self.log_pdf(x) for x in sampler.ask()])
+        self.assertTrue(np.all(sampler.temperature_schedule() == schedule))
+
+        # Without adaptation the schedule is unchanged
+        sampler = pints.ParallelTemperingMCMC(6, self.x0)
+        sampler.set_adaptive_temperature_schedule(False)
+        self.assertFalse(sampler.adaptive_temperature_schedule())
+        schedule = sampler.temperature_schedule()
+        for i in range(10):
+            sampler.tell([self.log_pdf(x) for x in sampler.ask()])
+        self.assertTrue(np.all(sampler.temperature_schedule() == schedule))
+
+    def test_gaussian_moments(self):
+        # Test every chain samples from its tempered distribution: for a
+        # standard normal target, chain i has variance 1 / (1 - T_i)
+
+        np.random.seed(1)
+        schedule = np.array([0, 0.5, 0.8, 0.95])
+        mcmc = pints.MCMCController(
+            pints.toy.GaussianLogPDF([0], [1]), 4, [[0.1]] * 4,
+            method=pints.ParallelTemperingMCMC)
+        sampler = mcmc.sampler()
+        sampler.set_temperature_schedule(schedule)
+        sampler.set_adaptive_temperature_schedule(False)
+        mcmc.set_max_iterations(20000)
+        mcmc.set_initial_phase_iterations(1000)
+        mcmc.set_log_to_screen(False)
+        chains = mcmc.run()[:, 2000:, 0]
+
+        # Chain 0 samples from the target
+        self.assertLess(abs(np.mean(chains[0])), 0.1)
+        self.assertLess(abs(np.var(chains[0]) - 1), 0.1)
+
+        # Tempered chains have variance 1 / (1 - T_i)
+        variances = np.var(chains, axis=1) * (1 - schedule)
+        self.assertTrue(np.all(np.abs(variances - 1) < 0.15))
+        self.assertTrue(np.all(np.diff(np.var(chains, axis=1)) > 0))
+
+    def test_log_pdf_storage(self):
+        # Test stored evaluations match the chains, after swaps
+
+        np.random.seed(1)
+        log_likelihood = pints.toy.GaussianLogPDF([0, 0], [1, 1])
+        log_prior = pints.UniformLogPrior([-5, -5], [10, 10])
+        log_posterior = pints.LogPosterior(log_likelihood, log_prior)
+        mcmc = pints.MCMCController(
+            log_posterior, 4, [[0.1, 0.1]] * 4,
+            method=pints.ParallelTemperingMCMC)
+        mcmc.set_max_iterations(300)
+        mcmc.set_log_pdf_storage(True)
+        mcmc.set_log_to_screen(False)
+        chains = mcmc.run()
+        evals = mcmc.log_pdfs()
+        self.assertEqual(evals.shape, (4, 300, 3))
+        self.assertGreater(np.sum(mcmc.sampler()._swaps_accepted), 0)
+
+        # Posterior, likelihood and prior are stored for every sample
+        for chain, e in zip(chains, evals):
+            self.assertTrue(np.allclose(
+                e[:, 0], [log_posterior(x) for x in chain]))
+            self.assertTrue(np.allclose(
+                e[:, 1], [log_likelihood(x) for x in chain]))
+            self.assertTrue(np.allclose(
+                e[:, 2], [log_prior(x) for x in chain]))
+
+    def test_logging(self):
+        # Test logging includes name and custom fields
+
+        mcmc = pints.MCMCController(
+            self.log_pdf, 6, self.x0, method=pints.ParallelTemperingMCMC)
+        mcmc.set_max_iterations(5)
+        with StreamCapture() as c:
+            mcmc.run()
+        text = c.text()
+        self.assertIn('Parallel tempering MCMC', text)
+        self.assertIn(' Swap', text)
+
+    def test_flow(self):
+        # Test the ask-and-tell pattern
+
+        # Test initial proposal is first point
+        mcmc = pints.ParallelTemperingMCMC(6, self.x0)
+        self.assertTrue(np.all(mcmc.ask() == mcmc._x0))
+
+        # Tell without ask
+        mcmc = pints.ParallelTemperingMCMC(6, self.x0)
+        self.assertRaisesRegex(RuntimeError, 'before', mcmc.tell, [0] * 6)
+
+        # Wrong number of evaluations
+        mcmc.ask()
+        self.assertRaisesRegex(
+            ValueError, 'Expecting 6', mcmc.tell, [0] * 5)
+
+        # Bad starting point
+        self.assertRaisesRegex(
+            ValueError, 'finite', mcmc.tell, [-np.inf] * 6)
+
+        # Schedule can't be changed during run
+        self.assertRaisesRegex(
+            RuntimeError, 'during run', mcmc.set_temperature_schedule)
+
+    def test_settings(self):
+        # Test the temperature schedule and other settings
+
+        self.assertRaisesRegex(
+            ValueError, 'at least two', pints.ParallelTemperingMCMC, 1,
+            [[0, 0]])
+
+        mcmc = pints.ParallelTemperingMCMC(3, self.x0[:3])
+        self.assertTrue(mcmc.needs_initial_phase())
+        self.assertTrue(mcmc.in_initial_phase())
+        self.assertTrue(mcmc.adaptive_temperature_schedule())
+        self.assertTrue(np.allclose(
+            mcmc.temperature_schedule(), [0, 1 - 0.05**0.5, 0.95]))
+
+        mcmc.set_temperature_schedule([0, 0.5, 0.9])
+        self.assertTrue(np.all(mcmc.temperature_schedule() == [0, 0.5, 0.9]))
+        self.assertRaisesRegex(
+            ValueError, 'each chain', mcmc.set_temperature_schedule, [0, 0.5])
+        self.assertRaisesRegex(
+            ValueError, 'must be 0', mcmc.set_temperature_schedule,
+            [0.1, 0.5, 0.9])
+        self.assertRaisesRegex(
+            ValueError, 'increasing', mcmc.set_temperature_schedule,
+            [0, 0.5, 0.5])
+        self.assertRaisesRegex(
+            ValueError, 'less than 1', mcmc.set_temperature_schedule,
+            [0, 0.5, 1])
+
+
+if __name__ == '__main__':
+    unittest.main()
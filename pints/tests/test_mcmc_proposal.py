@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+#
+# Tests the Gaussian proposal distribution used by MCMC methods.
+#
+# This file is part of PINTS.
+#  Copyright (c) 2017-2019, University of Oxford.
+#  For licensing information, see the LICENSE file distributed with the PINTS
+#  software package.
+#
+import unittest
+import numpy as np
+import scipy.stats
+
+from pints._mcmc._proposal import GaussianProposal
+
+# Consistent unit testing in Python 2 and 3
+try:
+    unittest.TestCase.assertRaisesRegex
+except AttributeError:
+    unittest.TestCase.assertRaisesRegex = unittest.TestCase.assertRaisesRegexp
+
+
+class TestGaussianProposal(unittest.TestCase):
+    """
+    Tests the GaussianProposal class.
+    """
+
+    def test_sampling(self):
+        # Test samples have the correct mean and covariance
+
+        np.random.seed(1)
+        sigma = np.array([[2, 0.5, 0], [0.5, 1, 0.3], [0, 0.3, 0.5]])
+        mean = np.array([1, 2, 3])
+        p = GaussianProposal(sigma, block_size=7)
+        self.assertEqual(p.n_parameters(), 3)
+        self.assertTrue(np.all(p.covariance() == sigma))
+
+        xs = np.array([p.sample(mean) for i in range(20000)])
+        self.assertTrue(np.allclose(np.mean(xs, axis=0), mean, atol=0.05))
+        self.assertTrue(np.allclose(np.cov(xs.T), sigma, atol=0.05))
+
+        # Scaled
+        xs = np.array([p.sample(mean, 4) for i in range(20000)])
+        self.assertTrue(np.allclose(np.cov(xs.T), 4 * sigma, atol=0.2))
+
+        # Diagonal
+        p = GaussianProposal([1, 4])
+        xs = np.array([p.sample(np.zeros(2)) for i in range(20000)])
+        self.assertTrue(np.allclose(np.var(xs, axis=0), [1, 4], atol=0.1))
+        self.assertTrue(np.all(p.covariance() == np.diag([1, 4])))
+
+        # Standard normal vectors are independent copies
+        z = p.standard_normal()
+        z[:] = 0
+        self.assertFalse(np.all(p.standard_normal() == 0))
+
+    def test_log_pdf(self):
+        # Test the log pdf against scipy
+
+        sigma = np.array([[2, 0.5, 0], [0.5, 1, 0.3], [0, 0.3, 0.5]])
+        mean = np.array([1, 2, 3])
+        x = np.array([0.5, 2.5, 2])
+        for s in (sigma, np.diag([1, 2, 3])):
+            p = GaussianProposal(s)
+            for scale in (1, 0.3):
+                self.assertAlmostEqual(
+                    p.log_pdf(x, mean, scale),
+                    scipy.stats.multivariate_normal.logpdf(
+                        x, mean, scale * s))
+
+        p = GaussianProposal([1, 2, 3])
+        self.assertAlmostEqual(
+            p.log_pdf(x, mean),
+            scipy.stats.multivariate_normal.logpdf(
+                x, mean, np.diag([1, 2, 3])))
+
+        # Singular covariance falls back to an eigendecomposition
+        p = GaussianProposal([[1, 1], [1, 1]])
+        x = p.sample(np.zeros(2))
+        self.assertAlmostEqual(x[0], x[1], places=5)
+        self.assertTrue(np.isfinite(p.log_pdf(x, np.zeros(2))))
+
+    def test_update(self):
+        # Test rank-one updates, for small and large dimensions
+
+        np.random.seed(1)
+        for n, threshold in ((5, 400), (5, 1), (60, 400), (60, 1)):
+            a = np.random.normal(size=(n, n))
+            sigma = np.dot(a, a.T) + np.eye(n)
+            p = GaussianProposal(sigma)
+            p._RANK_ONE_THRESHOLD = threshold
+            for i in range(10):
+                x = np.random.normal(size=n)
+                sigma = 0.9 * sigma + 0.1 * np.outer(x, x)
+                p.update(0.9, 0.1, x)
+            self.assertTrue(np.allclose(p.covariance(), sigma))
+
+            # Factor and determinant are consistent with the covariance
+            q = GaussianProposal(sigma)
+            self.assertTrue(np.allclose(p._u, q._u))
+            x = np.random.normal(size=n)
+            self.assertAlmostEqual(
+                p.log_pdf(x, np.zeros(n)), q.log_pdf(x, np.zeros(n)))
+
+        # Diagonal matrices are converted to full ones
+        p = GaussianProposal([1, 2])
+        p.update(0.5, 0.5, [1, 1])
+        self.assertTrue(np.allclose(
+            p.covariance(), [[1, 0.5], [0.5, 1.5]]))
+
+    def test_bad_settings(self):
+        # Test invalid arguments
+
+        self.assertRaisesRegex(
+            ValueError, 'matrix or a vector', GaussianProposal, 1)
+        self.assertRaisesRegex(
+            ValueError, 'Block size', GaussianProposal, [1], 0)
+        self.assertRaisesRegex(
+            ValueError, 'positive', GaussianProposal, [1, 0])
+        p = GaussianProposal([1, 2])
+        self.assertRaisesRegex(
+            ValueError, 'shape', p.set_covariance, [1, 2, 3])
+        p.set_covariance([[2, 0], [0, 1]])
+        self.assertTrue(np.all(p.covariance() == [[2, 0], [0, 1]]))
+
+
+if __name__ == '__main__':
+    unittest.main()
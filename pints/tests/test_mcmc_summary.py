@@ -13,8 +13,17 @@ import time
 import unittest
 
 import pints
+import pints.io
 import pints.toy as toy
 
+from shared import TemporaryDirectory
+
+# Consistent unit testing in Python 2 and 3
+try:
+    unittest.TestCase.assertRaisesRegex
+except AttributeError:
+    unittest.TestCase.assertRaisesRegex = unittest.TestCase.assertRaisesRegexp
+
 
 class TestAdaptiveCovarianceMC(unittest.TestCase):
     """
@@ -228,6 +237,84 @@ class TestAdaptiveCovarianceMC(unittest.TestCase):
         chains = mcmc.run()
         results = pints.MCMCSummary(chains)
 
+    def test_lazy_and_chunked(self):
+        # tests statistics are calculated when needed, and in chunks
+
+        # Statistics are only calculated when requested
+        results = pints.MCMCSummary(self.chains)
+        self.assertIsNone(results._mean)
+        results.mean()
+        self.assertIsNotNone(results._rhat)
+        self.assertIsNone(results._quantiles)
+        self.assertIsNone(results._ess)
+        results.summary()
+        self.assertIsNotNone(results._ess)
+
+        # Results do not depend on the chunk size
+        stacked = np.vstack(self.chains)
+        for chunk_size in (1, 7, 200, 10000):
+            chunked = pints.MCMCSummary(self.chains, chunk_size=chunk_size)
+            self.assertTrue(np.allclose(chunked.mean(), np.mean(stacked, 0)))
+            self.assertTrue(np.allclose(chunked.std(), np.std(stacked, 0)))
+            self.assertTrue(np.allclose(
+                chunked.rhat(), pints.rhat_all_params(self.chains)))
+            self.assertTrue(np.allclose(
+                chunked.ess(), pints.effective_sample_size(stacked)))
+            self.assertTrue(np.allclose(chunked.quantiles(), np.percentile(
+                stacked, [2.5, 25, 50, 75, 97.5], axis=0)))
+
+        # Long chains
+        np.random.seed(1)
+        chains = np.random.normal(size=(2, 6000, 2))
+        for i in range(1, 6000):
+            chains[:, i] += 0.99 * chains[:, i - 1]
+        stacked = np.vstack(chains)
+        chunked = pints.MCMCSummary(chains, chunk_size=500)
+        self.assertTrue(np.allclose(
+            chunked.ess(), pints.effective_sample_size(stacked)))
+        q = np.percentile(stacked, [2.5, 25, 50, 75, 97.5], axis=0)
+        self.assertTrue(np.all(chunked.quantiles() == q))
+
+        # Quantiles of long memory-mapped chains are estimated
+        with TemporaryDirectory() as d:
+            mapped = np.memmap(
+                d.path('chains.bin'), dtype=float, mode='w+',
+                shape=chains.shape)
+            mapped[:] = chains
+            chunked = pints.MCMCSummary(mapped, chunk_size=500)
+            self.assertFalse(chunked._exact_quantiles)
+            self.assertLess(np.max(np.abs(chunked.quantiles() - q)), 0.05)
+            del(mapped, chunked)
+
+        self.assertRaisesRegex(
+            ValueError, 'at least 1', pints.MCMCSummary, chains, None, None,
+            0)
+
+    def test_memmap_and_files(self):
+        # tests summarising memory-mapped chains, and chains in files
+
+        expected = pints.MCMCSummary(self.chains).summary()
+        with TemporaryDirectory() as d:
+            path = d.path('chains.bin')
+            chains = np.memmap(
+                path, dtype=float, mode='w+', shape=self.chains.shape)
+            chains[:] = self.chains
+            results = pints.MCMCSummary(chains, chunk_size=50)
+            self.assertTrue(np.allclose(
+                np.array(results.summary())[:, 1:].astype(float),
+                np.array(expected)[:, 1:].astype(float)))
+            del(chains, results)
+
+            path = d.path('chain.npy')
+            pints.io.save_samples(path, *self.chains)
+            results = pints.MCMCSummary(
+                [d.path('chain_' + str(i) + '.npy') for i in range(3)])
+            self.assertIsInstance(results.chains()[0], np.memmap)
+            self.assertTrue(np.allclose(
+                np.array(results.summary())[:, 1:].astype(float),
+                np.array(expected)[:, 1:].astype(float)))
+            del(results)
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -39,6 +39,13 @@ class TestMultiOutputProblem(unittest.TestCase):
         self.assertEqual(problem.n_outputs(), model.n_outputs(), 3)
         self.assertEqual(problem.n_times(), len(times))
 
+        # Test batch evaluation
+        xs = [[1, 1, 1], [0.5, 0.2, 3]]
+        ys = problem.evaluate_batch(xs)
+        self.assertEqual(ys.shape, (2, len(times), 2))
+        for x, y in zip(xs, ys):
+            self.assertTrue(np.all(y == problem.evaluate(x)))
+
         # Test errors
         times[0] = -2
         self.assertRaises(
@@ -124,6 +124,16 @@ class TestNestedController(unittest.TestCase):
         sampler.set_log_to_screen(True)
         self.assertEqual(sampler.parallel(), 2)
 
+        # Test with shared memory backend
+        sampler.set_parallel(2, backend='shared_memory')
+        sampler.set_log_to_screen(False)
+        sampler.run()
+        self.assertRaises(ValueError, sampler.set_parallel, 2, 'pipes')
+
+        # Test with threads backend
+        sampler.set_parallel(2, backend='threads')
+        sampler.run()
+
     def test_logging(self):
         # Tests logging to screen and file.
 
@@ -116,6 +116,42 @@ class TestCMAES(unittest.TestCase):
             opt.run()
         self.assertTrue('Ill-conditioned covariance matrix' in c.text())
 
+    def test_ask_one_tell_one(self):
+        # Tests the default (generational) ask_one() and tell_one() methods.
+        r, x, s, b = self.problem()
+        opt = method(x, s, b)
+        n = opt.population_size()
+
+        # Tell with unknown tag
+        self.assertRaisesRegex(
+            ValueError, 'Unknown tag', opt.tell_one, 0, 1.0)
+
+        # Points are handed out one generation at a time
+        tasks = []
+        task = opt.ask_one()
+        while task is not None:
+            tasks.append(task)
+            task = opt.ask_one()
+        self.assertEqual(len(tasks), n)
+        self.assertRaisesRegex(
+            ValueError, 'Unknown tag', opt.tell_one, n, 1.0)
+
+        # Pass back results out of order
+        for tag, y in reversed(tasks):
+            opt.tell_one(tag, r(y))
+        self.assertRaisesRegex(
+            ValueError, 'Unknown tag', opt.tell_one, 0, 1.0)
+        fs = [r(y) for tag, y in tasks]
+        self.assertEqual(opt.fbest(), min(fs))
+
+        # Next generation
+        for i in range(50):
+            task = opt.ask_one()
+            if task is None:
+                continue
+            opt.tell_one(task[0], r(task[1]))
+        self.assertTrue(opt.fbest() <= min(fs))
+
     def test_ask_tell(self):
         # Tests ask-and-tell related error handling.
         r, x, s, b = self.problem()
@@ -229,6 +229,69 @@ class TestOptimisationController(unittest.TestCase):
         opt.run()
         self.assertTrue(type(opt.parallel()) == int)
         self.assertEqual(opt.parallel(), 1)
+        u = opt.worker_utilisation()
+        self.assertEqual(len(u), 1)
+        self.assertTrue(0 <= u[0] <= 1)
+
+        # Run with shared memory backend
+        opt = pints.OptimisationController(r, x, boundaries=b, method=method)
+        opt.set_max_iterations(10)
+        opt.set_log_to_screen(debug)
+        opt.set_parallel(2, backend='shared_memory')
+        x1, f1 = opt.run()
+        self.assertAlmostEqual(r(x1), f1)
+        self.assertRaises(ValueError, opt.set_parallel, 2, 'threads and ropes')
+
+        # Run with threads backend
+        opt = pints.OptimisationController(r, x, boundaries=b, method=method)
+        opt.set_max_iterations(10)
+        opt.set_log_to_screen(debug)
+        opt.set_parallel(2, backend='threads')
+        x1, f1 = opt.run()
+        self.assertAlmostEqual(r(x1), f1)
+
+    def test_asynchronous(self):
+        # Test asynchronous (steady-state) running.
+
+        r = pints.toy.RosenbrockError()
+        x = np.array([1.1, 1.1])
+        b = pints.RectangularBoundaries([0.5, 0.5], [1.5, 1.5])
+
+        methods = [
+            pints.CMAES, pints.NelderMead, pints.PSO, pints.SNES, pints.XNES]
+        for m in methods:
+            opt = pints.OptimisationController(r, x, boundaries=b, method=m)
+            opt.set_max_iterations(10)
+            opt.set_log_to_screen(debug)
+            opt.set_parallel(3, backend='threads')
+            opt.set_asynchronous()
+            x1, f1 = opt.run()
+            self.assertAlmostEqual(r(x1), f1)
+            self.assertEqual(opt.iterations(), 10)
+            self.assertTrue(opt.evaluations() >= 10)
+            self.assertTrue(b.check(x1))
+
+        # Sequential mode, with processes backend, and disabling again
+        opt = pints.OptimisationController(r, x, method=pints.XNES)
+        opt.set_max_iterations(5)
+        opt.set_log_to_screen(debug)
+        opt.set_asynchronous()
+        x1, f1 = opt.run()
+        self.assertAlmostEqual(r(x1), f1)
+        opt.set_parallel(2)
+        x1, f1 = opt.run()
+        self.assertAlmostEqual(r(x1), f1)
+        opt.set_asynchronous(False)
+        x1, f1 = opt.run()
+        self.assertAlmostEqual(r(x1), f1)
+
+        # Check message
+        opt = pints.OptimisationController(r, x, method=pints.SNES)
+        opt.set_max_iterations(2)
+        opt.set_asynchronous()
+        with StreamCapture() as c:
+            opt.run()
+        self.assertIn('Running asynchronously.', c.text())
 
     def test_deprecated_alias(self):
         # Tests Optimisation()
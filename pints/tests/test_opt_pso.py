@@ -79,6 +79,32 @@ class TestPSO(unittest.TestCase):
         #found_parameters, found_solution = opt.run()
         #self.assertTrue(found_solution < 1e-3)
 
+    def test_ask_one_tell_one(self):
+        # Tests the steady-state ask_one() and tell_one() interface.
+        r, x, s, b = self.problem()
+        opt = method(x, s, b)
+        n = opt.population_size()
+
+        # Tell with unknown tag
+        self.assertRaisesRegex(
+            ValueError, 'Unknown tag', opt.tell_one, 0, 1.0)
+
+        # Run, passing back results in reverse order
+        for i in range(100):
+            tasks = [opt.ask_one() for j in range(3)]
+            for tag, y in reversed(tasks):
+                self.assertTrue(b.check(y))
+                opt.tell_one(tag, r(y))
+        self.assertTrue(opt.fbest() < 1e-3)
+        self.assertAlmostEqual(r(opt.xbest()), opt.fbest())
+        self.assertTrue(opt.population_size() == n)
+
+        # Tell twice
+        tag, y = opt.ask_one()
+        opt.tell_one(tag, r(y))
+        self.assertRaisesRegex(
+            ValueError, 'Unknown tag', opt.tell_one, tag, r(y))
+
     def test_ask_tell(self):
         # Tests ask-and-tell related error handling.
         r, x, s, b = self.problem()
@@ -90,6 +90,45 @@ class TestXNES(unittest.TestCase):
         self.assertRaisesRegex(
             ValueError, 'at least 1', m.set_hyper_parameters, [0])
 
+    def test_ask_one_tell_one(self):
+        # Tests the steady-state ask_one() and tell_one() interface.
+        r, x, s, b = self.problem()
+        opt = method(x, s, b)
+        n = opt.population_size()
+
+        # Tell with unknown tag
+        self.assertRaisesRegex(
+            ValueError, 'Unknown tag', opt.tell_one, 0, 1.0)
+
+        # Run, passing back results in reverse order
+        for i in range(100):
+            tasks = [opt.ask_one() for j in range(3)]
+            for tag, y in reversed(tasks):
+                self.assertTrue(b.check(y))
+                opt.tell_one(tag, r(y))
+        self.assertTrue(opt.fbest() < 1e-3)
+        self.assertAlmostEqual(r(opt.xbest()), opt.fbest())
+        self.assertTrue(opt.population_size() == n)
+
+        # Tell twice
+        tag, y = opt.ask_one()
+        opt.tell_one(tag, r(y))
+        self.assertRaisesRegex(
+            ValueError, 'Unknown tag', opt.tell_one, tag, r(y))
+
+    def test_ask_one_outside_boundaries(self):
+        # Tests ask_one() returns if a whole population is out of bounds.
+        b = CircularBoundaries([0, 0], 1e-9)
+        opt = method([0, 0], 10, b)
+        n = opt.population_size()
+        with self.assertLogs('pints', level='WARNING') as c:
+            tag, y = opt.ask_one()
+        self.assertIn('outside the boundaries', c.output[0])
+        self.assertFalse(b.check(y))
+        self.assertEqual(tag, n - 1)
+        opt.tell_one(tag, 1.0)
+        self.assertEqual(opt.fbest(), 1.0)
+
     def test_ask_tell(self):
         # Tests ask-and-tell related error handling.
         x = np.array([1.1, 1.1])
@@ -35,6 +35,13 @@ class TestSingleOutputProblem(unittest.TestCase):
         self.assertEqual(problem.n_outputs(), model.n_outputs(), 1)
         self.assertEqual(problem.n_times(), len(times))
 
+        # Test batch evaluation
+        xs = [[1, 1], [0.5, 10], [0.1, 3]]
+        ys = problem.evaluate_batch(xs)
+        self.assertEqual(ys.shape, (3, len(times)))
+        for x, y in zip(xs, ys):
+            self.assertTrue(np.all(y == problem.evaluate(x)))
+
         # Test errors
         times[0] = -2
         self.assertRaises(
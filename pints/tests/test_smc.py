@@ -0,0 +1,195 @@
+#!/usr/bin/env python
+#
+# Tests the adaptive tempered SMC controller.
+#
+# This file is part of PINTS.
+#  Copyright (c) 2017-2019, University of Oxford.
+#  For licensing information, see the LICENSE file distributed with the PINTS
+#  software package.
+#
+import unittest
+import numpy as np
+
+import pints
+import pints.toy
+
+from shared import StreamCapture, TemporaryDirectory
+
+# Unit testing in Python 2 and 3
+try:
+    unittest.TestCase.assertRaisesRegex
+except AttributeError:
+    unittest.TestCase.assertRaisesRegex = unittest.TestCase.assertRaisesRegexp
+
+
+class TestSMCController(unittest.TestCase):
+    """
+    Tests the :class:`SMCController`.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        """ Prepare for the test. """
+        # Normalised Gaussian likelihood, and a uniform prior on [-10, 10]^2,
+        # so that the marginal likelihood is (almost exactly) 1 / 400
+        cls.log_likelihood = pints.toy.GaussianLogPDF([1, 1], [0.5, 0.5])
+        cls.log_prior = pints.UniformLogPrior([-10, -10], [10, 10])
+        cls.log_z = -np.log(400)
+
+    def test_construction_errors(self):
+        # Tests if invalid constructor calls are picked up.
+
+        self.assertRaisesRegex(
+            ValueError, 'must extend pints.LogLikelihood',
+            pints.SMCController, 'hello', self.log_prior)
+        self.assertRaisesRegex(
+            ValueError, 'must extend pints.LogPrior',
+            pints.SMCController, self.log_likelihood, self.log_likelihood)
+        log_prior = pints.UniformLogPrior([0], [1])
+        self.assertRaisesRegex(
+            ValueError, 'same number of parameters',
+            pints.SMCController, self.log_likelihood, log_prior)
+
+    def test_getters_and_setters(self):
+        # Tests setting and getting settings.
+
+        smc = pints.SMCController(self.log_likelihood, self.log_prior)
+        self.assertIsNone(smc.marginal_log_likelihood())
+        self.assertIsNone(smc.temperatures())
+
+        self.assertEqual(smc.n_particles(), 1000)
+        smc.set_n_particles(20)
+        self.assertEqual(smc.n_particles(), 20)
+        self.assertRaisesRegex(
+            ValueError, 'at least 2', smc.set_n_particles, 1)
+
+        self.assertEqual(smc.n_mcmc_steps(), 5)
+        smc.set_n_mcmc_steps(0)
+        self.assertEqual(smc.n_mcmc_steps(), 0)
+        self.assertRaisesRegex(
+            ValueError, 'cannot be negative', smc.set_n_mcmc_steps, -1)
+
+        self.assertEqual(smc.resampling_threshold(), 0.5)
+        smc.set_resampling_threshold(1)
+        self.assertEqual(smc.resampling_threshold(), 1)
+        self.assertRaisesRegex(
+            ValueError, 'at most 1', smc.set_resampling_threshold, 0)
+        self.assertRaisesRegex(
+            ValueError, 'at most 1', smc.set_resampling_threshold, 1.1)
+
+        self.assertEqual(smc.target_cess(), 0.9)
+        smc.set_target_cess(0.5)
+        self.assertEqual(smc.target_cess(), 0.5)
+        self.assertRaisesRegex(
+            ValueError, 'between 0 and 1', smc.set_target_cess, 0)
+        self.assertRaisesRegex(
+            ValueError, 'between 0 and 1', smc.set_target_cess, 1)
+
+    def test_logging(self):
+        # Tests logging to screen and file.
+
+        np.random.seed(1)
+        smc = pints.SMCController(self.log_likelihood, self.log_prior)
+        smc.set_n_particles(50)
+        with StreamCapture() as c:
+            smc.run()
+        lines = c.text().splitlines()
+        self.assertEqual(lines[0], 'Running adaptive tempered SMC')
+        self.assertEqual(lines[1], 'Number of particles: 50')
+        self.assertEqual(lines[2], 'Rejuvenation steps per stage: 5')
+        self.assertIn('Temperature', lines[3])
+        self.assertEqual(len(lines), 4 + len(smc.temperatures()))
+
+        # No output
+        smc.set_log_to_screen(False)
+        with StreamCapture() as c:
+            smc.run()
+        self.assertEqual(c.text(), '')
+
+        # Log to file only
+        with TemporaryDirectory() as d:
+            filename = d.path('log.csv')
+            smc.set_log_to_file(filename, csv=True)
+            with StreamCapture() as c:
+                smc.run()
+            self.assertEqual(c.text(), '')
+            with open(filename, 'r') as f:
+                lines = f.read().splitlines()
+            self.assertEqual(lines[0].split(',')[0], '"Stage"')
+            self.assertEqual(len(lines), 1 + len(smc.temperatures()))
+        smc.set_log_to_file(False)
+
+    def test_marginal_likelihood(self):
+        # Tests the samples and marginal likelihood estimate.
+
+        np.random.seed(1)
+        smc = pints.SMCController(self.log_likelihood, self.log_prior)
+        smc.set_n_particles(500)
+        smc.set_log_to_screen(False)
+        samples = smc.run()
+
+        self.assertEqual(samples.shape, (500, 2))
+        self.assertTrue(np.all(np.abs(np.mean(samples, axis=0) - 1) < 0.15))
+        self.assertTrue(np.all(np.abs(np.var(samples, axis=0) - 0.5) < 0.15))
+        self.assertAlmostEqual(
+            smc.marginal_log_likelihood(), self.log_z, delta=0.2)
+
+        # Temperatures increase from 0 to 1
+        t = smc.temperatures()
+        self.assertEqual(t[0], 0)
+        self.assertEqual(t[-1], 1)
+        self.assertTrue(np.all(np.diff(t) > 0))
+
+        # Fewer stages with a lower target CESS
+        smc.set_target_cess(0.5)
+        smc.set_resampling_threshold(1)
+        smc.run()
+        self.assertLess(len(smc.temperatures()), len(t))
+        self.assertAlmostEqual(
+            smc.marginal_log_likelihood(), self.log_z, delta=0.3)
+
+    def test_outside_support(self):
+        # Tests a likelihood that is -inf on part of the prior's support.
+
+        class HalfPlane(pints.LogPDF):
+            def n_parameters(self):
+                return 1
+
+            def __call__(self, x):
+                return -0.5 * (x[0] - 1)**2 if x[0] > 0 else -np.inf
+
+        np.random.seed(1)
+        smc = pints.SMCController(
+            HalfPlane(), pints.UniformLogPrior([-5], [5]))
+        smc.set_n_particles(200)
+        smc.set_log_to_screen(False)
+        samples = smc.run()
+        self.assertTrue(np.all(samples > 0))
+        self.assertEqual(smc.temperatures()[-1], 1)
+
+        # No particles with a finite likelihood
+        smc = pints.SMCController(
+            HalfPlane(), pints.UniformLogPrior([-5], [-4]))
+        smc.set_log_to_screen(False)
+        self.assertRaisesRegex(ValueError, 'finite log-likelihood', smc.run)
+
+    def test_parallel(self):
+        # Test running with parallel evaluation.
+
+        smc = pints.SMCController(self.log_likelihood, self.log_prior)
+        smc.set_n_particles(50)
+        smc.set_log_to_screen(False)
+        self.assertFalse(smc.parallel())
+        smc.set_parallel(True)
+        self.assertTrue(smc.parallel())
+        smc.set_parallel(2, backend='threads')
+        self.assertEqual(smc.parallel(), 2)
+        samples = smc.run()
+        self.assertEqual(samples.shape, (50, 2))
+        self.assertRaises(ValueError, smc.set_parallel, 2, 'pipes')
+        smc.set_parallel(False)
+        self.assertFalse(smc.parallel())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -66,6 +66,24 @@ class TestLogistic(unittest.TestCase):
         self.assertTrue(np.all(values == np.zeros(4)))
         self.assertTrue(np.all(sensitivities == np.zeros((4, 2))))
 
+    def test_batch(self):
+        # Batch simulation gives the same results as individual simulations
+        times = [0, 1, 2, 10000]
+        xs = [[1, 1], [0.1, 50], [1, -1], [0.02, 3]]
+        model = pints.toy.LogisticModel(2)
+        ys = model.simulate_batch(xs, times)
+        self.assertEqual(ys.shape, (4, 4))
+        for x, y in zip(xs, ys):
+            self.assertTrue(np.all(y == model.simulate(x, times)))
+
+        # Zero initial population
+        model = pints.toy.LogisticModel(0)
+        ys = model.simulate_batch(xs, times)
+        self.assertTrue(np.all(ys == np.zeros((4, 4))))
+
+        # Times can't be negative
+        self.assertRaises(ValueError, model.simulate_batch, xs, [0, -1])
+
     def test_errors(self):
 
         model = pints.toy.LogisticModel(2)
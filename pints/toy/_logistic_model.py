@@ -57,6 +57,24 @@ class LogisticModel(pints.ForwardModelS1, ToyModel):
         """ See :meth:`pints.ForwardModel.simulate()`. """
         return self._simulate(parameters, times, False)
 
+    def simulate_batch(self, parameters, times):
+        """ See :meth:`pints.ForwardModel.simulate_batch()`. """
+        parameters = pints.matrix2d(parameters)
+        times = np.asarray(times)
+        if np.any(times < 0):
+            raise ValueError('Negative times are not allowed.')
+        if self._p0 == 0:
+            return np.zeros((len(parameters), len(times)))
+
+        # Evaluate all parameter sets at once, using broadcasting
+        r = parameters[:, 0:1]
+        k = parameters[:, 1:2]
+        exp = np.exp(-r * times)
+        c = (k / self._p0 - 1)
+        values = k / (1 + c * exp)
+        values[k[:, 0] < 0] = 0
+        return values
+
     def simulateS1(self, parameters, times):
         """ See :meth:`pints.ForwardModelS1.simulateS1()`. """
         return self._simulate(parameters, times, True)